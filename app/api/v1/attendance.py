@@ -6,7 +6,13 @@ from loguru import logger
 from app.core import deps
 from app.core.auth import AuthUser
 from app.core.rate_limiter import limiter
-from app.schemas.attendance import AttendanceEventCreate, AttendanceEventRead
+from app.schemas.attendance import (
+    AttendanceEventCreate,
+    AttendanceEventRead,
+    EvidenceUploadConfirm,
+    EvidenceUploadRequest,
+    EvidenceUploadTicket,
+)
 from app.services.attendance_service import AttendanceService
 
 
@@ -89,3 +95,45 @@ async def upload_event_audio(
         return await service.attach_audio(event_id, file)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+@router.post("/events/{event_id}/evidence/upload-url", response_model=EvidenceUploadTicket)
+@limiter.limit("30/minute")
+async def request_evidence_upload(
+    request: Request,
+    payload: EvidenceUploadRequest,
+    event_id: int = Path(..., ge=1, description="ID del evento"),
+    service: AttendanceService = Depends(deps.get_attendance_service),
+    user: AuthUser | None = Depends(deps.get_current_user_optional),
+    device_authenticated: bool = Depends(deps.verify_device_key),
+) -> EvidenceUploadTicket:
+    """Obtener un POST prefirmado para subir la foto o el audio directo al almacenamiento."""
+    if not device_authenticated:
+        if not user or user.role not in {"ADMIN", "DIRECTOR", "INSPECTOR", "TEACHER"}:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No autorizado")
+    try:
+        return await service.request_evidence_upload(
+            event_id, payload.kind, payload.content_type, payload.filename
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+
+
+@router.post("/events/{event_id}/evidence/confirm", response_model=AttendanceEventRead)
+@limiter.limit("30/minute")
+async def confirm_evidence_upload(
+    request: Request,
+    payload: EvidenceUploadConfirm,
+    event_id: int = Path(..., ge=1, description="ID del evento"),
+    service: AttendanceService = Depends(deps.get_attendance_service),
+    user: AuthUser | None = Depends(deps.get_current_user_optional),
+    device_authenticated: bool = Depends(deps.verify_device_key),
+) -> AttendanceEventRead:
+    """Asociar al evento la evidencia subida con el POST prefirmado."""
+    if not device_authenticated:
+        if not user or user.role not in {"ADMIN", "DIRECTOR", "INSPECTOR", "TEACHER"}:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No autorizado")
+    try:
+        return await service.confirm_evidence_upload(event_id, payload.key)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
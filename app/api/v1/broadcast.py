@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from app.core import deps
 from app.core.auth import AuthUser
 from app.core.rate_limiter import limiter
-from app.schemas.notifications import BroadcastCreate, BroadcastPreview
+from app.schemas.notifications import BroadcastCreate, BroadcastPreview, BroadcastStatus
 from app.services.broadcast_service import BroadcastService
 from app.services.feature_flag_service import FEATURE_BROADCASTS
 
@@ -47,3 +47,19 @@ async def send_broadcast(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     return {"job_id": job_id}
+
+
+@router.get(
+    "/{job_id}/status",
+    response_model=BroadcastStatus,
+    dependencies=[Depends(deps.require_feature(FEATURE_BROADCASTS))],
+)
+async def get_broadcast_status(
+    job_id: str,
+    service: BroadcastService = Depends(deps.get_broadcast_service),
+    _: AuthUser = Depends(deps.require_roles("ADMIN", "DIRECTOR")),
+) -> BroadcastStatus:
+    try:
+        return service.get_broadcast_status(job_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
@@ -3,6 +3,7 @@
 import csv
 from datetime import datetime
 from io import StringIO
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import Response
@@ -10,12 +11,14 @@ from fastapi.responses import Response
 from app.core import deps
 from app.core.auth import AuthUser
 from app.schemas.notifications import (
+    DeadLetterList,
+    DeadLetterReplayResponse,
     NotificationDispatchRequest,
     NotificationLog,
     NotificationRead,
     NotificationSummaryResponse,
 )
-from app.services.notification_service import NotificationService
+from app.services.notification_service import NotificationService, decode_cursor, encode_cursor
 from app.services.notifications.dispatcher import NotificationDispatcher
 
 
@@ -41,31 +44,44 @@ def _sanitize_csv_value(val: str | None) -> str:
 
 @router.get("", response_model=list[NotificationLog])
 async def list_notifications(
+    response: Response,
     status_filter: str | None = Query(default=None, alias="status"),
     channel: str | None = Query(default=None),
     template: str | None = Query(default=None),
     guardian_id: int | None = Query(default=None),
     student_id: int | None = Query(default=None),
+    cursor: str | None = Query(default=None, description="Valor de X-Next-Cursor de la página anterior"),
     limit: int = Query(default=200, ge=1, le=500),
     service: NotificationService = Depends(deps.get_notification_service),
     _: AuthUser = Depends(deps.require_roles("ADMIN", "DIRECTOR", "INSPECTOR")),
 ) -> list[NotificationLog]:
-    return await service.list_notifications(
+    try:
+        before = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+
+    logs = await service.list_notifications(
         guardian_id=guardian_id,
         student_id=student_id,
         status=status_filter,
         channel=channel,
         template=template,
+        before=before,
         limit=limit,
     )
+    # Keyset pagination: a full page means there may be older notifications
+    if len(logs) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(logs[-1].ts_created, logs[-1].id)
+    return logs
 
 
 @router.get("/summary", response_model=NotificationSummaryResponse)
 async def notifications_summary(
+    window: Literal["today", "7d", "30d"] = Query(default="today"),
     service: NotificationService = Depends(deps.get_notification_service),
     _: AuthUser = Depends(deps.require_roles("ADMIN", "DIRECTOR", "INSPECTOR")),
 ) -> NotificationSummaryResponse:
-    return await service.summary()
+    return await service.summary(window)
 
 
 @router.get("/export", response_class=Response)
@@ -130,3 +146,25 @@ async def dispatch_notification(
         return await dispatcher.enqueue_manual_notification(payload)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/dead-letter", response_model=DeadLetterList)
+async def list_dead_letters(
+    limit: int = Query(default=100, ge=1, le=500),
+    dispatcher: NotificationDispatcher = Depends(deps.get_notification_dispatcher),
+    _: AuthUser = Depends(deps.require_roles("ADMIN", "DIRECTOR")),
+) -> DeadLetterList:
+    """Envíos que agotaron sus reintentos o fallaron de forma permanente."""
+
+    return dispatcher.list_dead_letters(limit)
+
+
+@router.post("/dead-letter/replay", response_model=DeadLetterReplayResponse)
+async def replay_dead_letters(
+    limit: int = Query(default=500, ge=1, le=5000),
+    dispatcher: NotificationDispatcher = Depends(deps.get_notification_dispatcher),
+    _: AuthUser = Depends(deps.require_roles("ADMIN", "DIRECTOR")),
+) -> DeadLetterReplayResponse:
+    """Reencolar en bloque los envíos fallidos (por ejemplo, tras una caída del proveedor)."""
+
+    return await dispatcher.replay_dead_letters(limit)
@@ -15,6 +15,7 @@ from app.api.v1 import (
     parents,
     push_subscriptions,
     schedules,
+    storage,
     tags,
     teachers,
     tenant_setup,
@@ -50,4 +51,6 @@ api_router.include_router(absences.router, prefix="/absences", tags=["absences"]
 api_router.include_router(teachers.router, prefix="/teachers", tags=["teachers"])
 api_router.include_router(kiosk.router, prefix="/kiosk", tags=["kiosk"])
 api_router.include_router(webauthn.router, prefix="/webauthn", tags=["webauthn"])
+# Signed URLs of the local filesystem storage backend
+api_router.include_router(storage.router, prefix="/storage", tags=["storage"])
 api_router.include_router(push_subscriptions.router)
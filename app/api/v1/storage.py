@@ -0,0 +1,74 @@
+"""Signed download and upload routes for the local filesystem storage backend.
+
+These stand in for S3 presigned URLs when ``STORAGE_BACKEND=local``: the
+signature in the URL (or POST policy) is the authorization, so the routes
+need no tenant or user context.
+"""
+
+import asyncio
+
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile, status
+from fastapi.responses import FileResponse, Response
+
+from app.services.storage.local import LocalStorage, decode_upload_policy, verify_download
+from app.services.storage.registry import get_storage
+
+router = APIRouter()
+
+
+def _local_storage() -> LocalStorage:
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Almacenamiento local no habilitado")
+    return storage
+
+
+@router.get("/files/{path:path}")
+async def download_file(
+    path: str,
+    expires: int = Query(...),
+    signature: str = Query(...),
+) -> FileResponse:
+    """Serve a stored object; the file is sent by the server (sendfile when available)."""
+    storage = _local_storage()
+    if not verify_download(path, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Firma inválida o expirada")
+    try:
+        file_path = storage.path_for(path)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Firma inválida o expirada") from exc
+    if not file_path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Archivo no encontrado")
+    return FileResponse(
+        file_path,
+        media_type=storage.content_type(file_path),
+        headers={"Cache-Control": "private, max-age=3600"},
+    )
+
+
+@router.post("/upload", status_code=status.HTTP_204_NO_CONTENT)
+async def upload_file(
+    policy: str = Form(...),
+    signature: str = Form(...),
+    content_type: str = Form(..., alias="Content-Type"),
+    file: UploadFile = File(...),
+) -> Response:
+    """Store a file under the path pinned by a signed upload policy."""
+    storage = _local_storage()
+    document = decode_upload_policy(policy, signature)
+    if document is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Política inválida o expirada")
+    if content_type != document["content_type"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Tipo de contenido no permitido")
+    try:
+        size = await asyncio.to_thread(
+            storage.write, document["path"], file.file, document["content_type"], document["max_bytes"]
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)) from exc
+    finally:
+        await file.close()
+    if size == 0:
+        await asyncio.to_thread(storage.delete, document["path"])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Archivo vacío")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import deps
 from app.db.repositories.tenants import TenantRepository
 from app.db.repositories.tenant_configs import TenantConfigRepository
+from app.services.tenant_config_cache import tenant_config_cache
 
 router = APIRouter()
 
@@ -39,6 +40,16 @@ class S3ConfigUpdate(BaseModel):
     prefix: str | None = None
 
 
+class RateLimitConfigUpdate(BaseModel):
+    """Outbound notification rate limits (messages per minute).
+
+    null restores the platform default; 0 disables limiting for the channel.
+    """
+
+    whatsapp_rate_per_minute: int | None = Field(default=None, ge=0, le=10000)
+    email_rate_per_minute: int | None = Field(default=None, ge=0, le=10000)
+
+
 class TenantConfigSummary(BaseModel):
     """Summary of tenant configuration (no secrets)."""
 
@@ -51,6 +62,8 @@ class TenantConfigSummary(BaseModel):
     s3_bucket: str | None
     s3_prefix: str | None
     device_api_key_configured: bool
+    whatsapp_rate_per_minute: int | None = None
+    email_rate_per_minute: int | None = None
 
 
 # ==================== Endpoints ====================
@@ -86,6 +99,8 @@ async def get_tenant_config(
         s3_bucket=config.s3_bucket,
         s3_prefix=config.s3_prefix,
         device_api_key_configured=config.device_api_key_encrypted is not None,
+        whatsapp_rate_per_minute=config.whatsapp_rate_per_minute,
+        email_rate_per_minute=config.email_rate_per_minute,
     )
 
 
@@ -114,6 +129,8 @@ async def update_whatsapp_config(
         phone_number_id=payload.phone_number_id,
     )
     await session.commit()
+    # Workers cache decrypted credentials; make them reload
+    tenant_config_cache.invalidate(tenant_id)
 
     return {"message": "Configuración de WhatsApp actualizada exitosamente"}
 
@@ -145,6 +162,8 @@ async def update_ses_config(
         secret_key=payload.secret_key,
     )
     await session.commit()
+    # Workers cache decrypted credentials; make them reload
+    tenant_config_cache.invalidate(tenant_id)
 
     return {"message": "Configuración de email actualizada exitosamente"}
 
@@ -174,10 +193,43 @@ async def update_s3_config(
         prefix=payload.prefix,
     )
     await session.commit()
+    # Workers cache decrypted credentials; make them reload
+    tenant_config_cache.invalidate(tenant_id)
 
     return {"message": "Configuración de S3 actualizada exitosamente"}
 
 
+@router.put("/{tenant_id}/config/rate-limits")
+async def update_rate_limits(
+    tenant_id: int,
+    payload: RateLimitConfigUpdate,
+    admin: deps.SuperAdminUser = Depends(deps.get_current_super_admin),
+    session: AsyncSession = Depends(deps.get_public_db),
+) -> dict:
+    """Update tenant's outbound WhatsApp/email rate limits."""
+    tenant_repo = TenantRepository(session)
+    config_repo = TenantConfigRepository(session)
+
+    tenant = await tenant_repo.get(tenant_id)
+    if not tenant:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant no encontrado")
+
+    config = await config_repo.get(tenant_id)
+    if not config:
+        config = await config_repo.create(tenant_id)
+
+    await config_repo.update_rate_limits(
+        tenant_id,
+        whatsapp_rate_per_minute=payload.whatsapp_rate_per_minute,
+        email_rate_per_minute=payload.email_rate_per_minute,
+    )
+    await session.commit()
+    # Workers cache decrypted credentials; make them reload
+    tenant_config_cache.invalidate(tenant_id)
+
+    return {"message": "Límites de envío actualizados exitosamente"}
+
+
 @router.post("/{tenant_id}/config/generate-device-key")
 async def generate_device_api_key(
     tenant_id: int,
@@ -198,6 +250,7 @@ async def generate_device_api_key(
 
     new_key = await config_repo.generate_device_api_key(tenant_id)
     await session.commit()
+    tenant_config_cache.invalidate(tenant_id)
 
     return {
         "message": "Device API key generada exitosamente",
@@ -0,0 +1,33 @@
+"""Queue lane monitoring endpoints for Super Admin."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from loguru import logger
+from redis import Redis
+
+from app.core import deps
+from app.core.config import settings
+from app.workers.queues import LaneMetrics
+
+router = APIRouter()
+
+
+@router.get("/", summary="Profundidad y latencia de las colas por carril")
+def queue_lanes(
+    admin: deps.SuperAdminUser = Depends(deps.get_current_super_admin),
+) -> dict[str, Any]:
+    """Per-lane queue depth, oldest waiting job and wait-time percentiles."""
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        return LaneMetrics(redis).snapshot()
+    except Exception as exc:
+        logger.error("Failed to read queue metrics: %s", exc)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Métricas de colas no disponibles",
+        ) from exc
+    finally:
+        redis.close()
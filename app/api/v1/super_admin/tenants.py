@@ -2,22 +2,27 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from loguru import logger
 from pydantic import BaseModel, EmailStr, Field
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 
 from app.core import deps
 from app.db.models.tenant_audit_log import TenantAuditLog
 from app.db.models.tenant_feature import TenantFeature
+from app.db.models.usage_stat import UsageStat
 from app.db.repositories.tenants import TenantRepository
 from app.db.repositories.tenant_features import TenantFeatureRepository
+from app.db.repositories.usage_stats import UsageStatRepository
 
 router = APIRouter()
 
+USAGE_DEFAULT_DAYS = 30
+USAGE_MAX_DAYS = 366
+
 
 # ==================== Schemas ====================
 
@@ -57,7 +62,13 @@ class TenantSummary(BaseModel):
     is_active: bool
     plan: str
     max_students: int
-    student_count: int = 0
+    student_count: int = Field(
+        0,
+        description=(
+            "Alumnos con estado ACTIVE (los retirados o inactivos no cuentan), "
+            "según el último conteo de record_student_counts (hasta una hora de antigüedad)"
+        ),
+    )
     created_at: datetime
 
     class Config:
@@ -88,6 +99,24 @@ class TenantListResponse(BaseModel):
 
     items: list[TenantSummary]
     total: int
+    next_cursor: str | None = None
+
+
+class UsageDay(BaseModel):
+    """Usage counters of one day."""
+
+    date: date
+    values: dict[str, int]
+
+
+class TenantUsageResponse(BaseModel):
+    """Daily usage series of a tenant."""
+
+    tenant_id: int
+    start: date
+    end: date
+    metrics: list[str]
+    days: list[UsageDay]
 
 
 class FeatureToggleRequest(BaseModel):
@@ -99,31 +128,66 @@ class FeatureToggleRequest(BaseModel):
 # ==================== Endpoints ====================
 
 
+def encode_tenant_cursor(sort: str, tenant: Any, student_count: int) -> str:
+    """Keyset cursor pointing just after this tenant in ``sort`` order."""
+    value = {"name": tenant.name, "created_at": tenant.created_at.isoformat(), "student_count": student_count}[sort]
+    return f"{value}~{tenant.id}"
+
+
+def decode_tenant_cursor(sort: str, cursor: str) -> tuple[Any, int]:
+    """Parse a cursor from ``encode_tenant_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    value, _, tenant_id = cursor.rpartition("~")
+    parse = {"name": str, "created_at": datetime.fromisoformat, "student_count": int}[sort]
+    return parse(value), int(tenant_id)
+
+
 @router.get("/", response_model=TenantListResponse)
 async def list_tenants(
     include_inactive: bool = False,
+    sort: Literal["name", "created_at", "student_count"] = Query("name"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    cursor: str | None = Query(None, description="next_cursor de la página anterior"),
+    limit: int = Query(50, ge=1, le=200),
     admin: deps.SuperAdminUser = Depends(deps.get_current_super_admin),
     session: AsyncSession = Depends(deps.get_public_db),
 ) -> TenantListResponse:
-    """List all tenants with student counts."""
+    """List tenants with active student counts, one keyset page at a time.
+
+    Only students with status ACTIVE are counted (before the counts were
+    recorded, every student row was). Counts are the ones recorded by the
+    ``record_student_counts`` job; tenants it has not seen yet are counted
+    live with a single UNION ALL query.
+    """
+    try:
+        after = decode_tenant_cursor(sort, cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido") from exc
+
     repo = TenantRepository(session)
-    tenants = await repo.list_all(include_inactive=include_inactive)
+    rows = await repo.list_page(
+        include_inactive=include_inactive,
+        sort=sort,
+        descending=order == "desc",
+        after=after,
+        limit=limit,
+    )
     total = await repo.count(include_inactive=include_inactive)
 
-    # Get student counts for each tenant
-    tenant_summaries = []
-    for tenant in tenants:
-        student_count = 0
+    missing = {tenant.id: tenant.schema_name for tenant, count in rows if count is None}
+    live_counts: dict[int, int] = {}
+    if missing:
         try:
-            schema_name = f"tenant_{tenant.slug}"
-            result = await session.execute(
-                text(f"SELECT COUNT(*) FROM {schema_name}.students")
-            )
-            student_count = result.scalar() or 0
-        except Exception:
-            pass  # Schema may not exist yet
+            live_counts = await repo.count_active_students(missing)
+        except Exception as exc:
+            logger.warning("Live student count failed for %d tenant(s): %s", len(missing), exc)
+            await session.rollback()
 
-        summary = TenantSummary(
+    tenant_summaries = [
+        TenantSummary(
             id=tenant.id,
             slug=tenant.slug,
             name=tenant.name,
@@ -132,15 +196,19 @@ async def list_tenants(
             is_active=tenant.is_active,
             plan=tenant.plan,
             max_students=tenant.max_students,
-            student_count=student_count,
+            student_count=count if count is not None else live_counts.get(tenant.id, 0),
             created_at=tenant.created_at,
         )
-        tenant_summaries.append(summary)
+        for tenant, count in rows
+    ]
 
-    return TenantListResponse(
-        items=tenant_summaries,
-        total=total,
-    )
+    next_cursor = None
+    # Keyset pagination: a full page means there may be more tenants
+    if len(rows) == limit:
+        last_tenant, last_count = rows[-1]
+        next_cursor = encode_tenant_cursor(sort, last_tenant, last_count or 0)
+
+    return TenantListResponse(items=tenant_summaries, total=total, next_cursor=next_cursor)
 
 
 @router.get("/{tenant_id}", response_model=TenantDetail)
@@ -158,6 +226,9 @@ async def get_tenant(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant no encontrado")
 
     features = await feature_repo.list_by_tenant(tenant_id)
+    student_counts = await UsageStatRepository(session).latest_values(
+        UsageStat.METRIC_ACTIVE_STUDENTS, [tenant_id]
+    )
 
     return TenantDetail(
         id=tenant.id,
@@ -168,6 +239,7 @@ async def get_tenant(
         is_active=tenant.is_active,
         plan=tenant.plan,
         max_students=tenant.max_students,
+        student_count=student_counts.get(tenant_id, 0),
         config=tenant.config,
         created_at=tenant.created_at,
         updated_at=tenant.updated_at,
@@ -175,6 +247,52 @@ async def get_tenant(
     )
 
 
+@router.get("/{tenant_id}/usage", response_model=TenantUsageResponse)
+async def get_tenant_usage(
+    tenant_id: int = Path(..., ge=1, description="Tenant ID (must be >= 1)"),
+    start: date | None = Query(None, description="Primer día (por defecto, 30 días antes de end)"),
+    end: date | None = Query(None, description="Último día, inclusive (por defecto, hoy UTC)"),
+    metric: list[str] | None = Query(None, description="Métricas a incluir (por defecto, todas)"),
+    admin: deps.SuperAdminUser = Depends(deps.get_current_super_admin),
+    session: AsyncSession = Depends(deps.get_public_db),
+) -> TenantUsageResponse:
+    """Daily usage counters of a tenant, one entry per day (missing days are zero)."""
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=USAGE_DEFAULT_DAYS - 1)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start debe ser anterior a end")
+    if (end - start).days >= USAGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El rango no puede superar {USAGE_MAX_DAYS} días",
+        )
+    metrics = metric or list(UsageStat.ALL_METRICS)
+    unknown = sorted(set(metrics) - set(UsageStat.ALL_METRICS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Métrica desconocida: {', '.join(unknown)}"
+        )
+
+    if not await TenantRepository(session).get(tenant_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tenant no encontrado")
+
+    rows = await UsageStatRepository(session).series(tenant_id, start, end, metrics)
+    days = {
+        start + timedelta(days=offset): {name: 0 for name in metrics}
+        for offset in range((end - start).days + 1)
+    }
+    for row in rows:
+        days[row.stat_date][row.metric_name] = row.value
+
+    return TenantUsageResponse(
+        tenant_id=tenant_id,
+        start=start,
+        end=end,
+        metrics=metrics,
+        days=[UsageDay(date=day, values=values) for day, values in days.items()],
+    )
+
+
 @router.post("/", response_model=TenantDetail, status_code=status.HTTP_201_CREATED)
 async def create_tenant(
     payload: TenantCreate,
@@ -186,8 +304,8 @@ async def create_tenant(
 
     This will:
     1. Create the tenant record
-    2. Create the PostgreSQL schema
-    3. Run migrations on the schema
+    2. Claim a spare PostgreSQL schema (or build one)
+    3. Check the schema is at the current migration revision
     4. Initialize feature flags
     5. Send admin invitation email
     """
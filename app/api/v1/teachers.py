@@ -2,12 +2,15 @@
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, status
 
 from app.core import deps
 from app.core.auth import AuthUser
+from app.db.models.usage_stat import UsageStat
 from app.db.repositories.teachers import TeacherRepository
 from app.db.repositories.attendance import AttendanceRepository
+from app.db.repositories.no_show_alerts import NoShowAlertRepository
+from app.services.usage_meter import get_usage_meter
 from app.schemas.teachers import (
     TeacherMeResponse,
     TeacherRead,
@@ -34,6 +37,10 @@ def get_attendance_repo(session: AsyncSession = Depends(deps.get_tenant_db)) ->
     return AttendanceRepository(session)
 
 
+def get_no_show_repo(session: AsyncSession = Depends(deps.get_tenant_db)) -> NoShowAlertRepository:
+    return NoShowAlertRepository(session)
+
+
 @router.get("/me", response_model=TeacherMeResponse)
 async def get_current_teacher(
     user: AuthUser = Depends(deps.get_current_user),
@@ -132,10 +139,12 @@ async def list_course_students(
 
 @router.post("/attendance/bulk", response_model=BulkAttendanceResponse)
 async def submit_bulk_attendance(
+    request: Request,
     payload: BulkAttendanceRequest,
     user: AuthUser = Depends(deps.get_current_user),
     teacher_repo: TeacherRepository = Depends(get_teacher_repo),
     attendance_repo: AttendanceRepository = Depends(get_attendance_repo),
+    alert_repo: NoShowAlertRepository = Depends(get_no_show_repo),
     session: AsyncSession = Depends(deps.get_tenant_db),
 ) -> BulkAttendanceResponse:
     """Submit multiple attendance events at once.
@@ -179,6 +188,7 @@ async def submit_bulk_attendance(
 
     processed = 0
     errors: list[str] = []
+    checked_in: dict = {}  # UTC date -> student IDs with an IN event
 
     for item in payload.events:
         try:
@@ -196,9 +206,18 @@ async def submit_bulk_attendance(
                 occurred_at=occurred_at,
             )
             processed += 1
+            if item.type == "IN":
+                day = (occurred_at.astimezone(timezone.utc) if occurred_at.tzinfo else occurred_at).date()
+                checked_in.setdefault(day, set()).add(item.student_id)
         except Exception as e:
             errors.append(f"student_id={item.student_id}: {str(e)}")
 
+    # Late check-ins close the day's pending no-show alerts
+    for day, student_ids in checked_in.items():
+        await alert_repo.resolve_checked_in(student_ids, day, datetime.now(timezone.utc))
+
     await session.commit()
+    tenant = getattr(request.state, "tenant", None)
+    get_usage_meter().record(tenant.id if tenant else None, UsageStat.METRIC_ATTENDANCE_EVENTS, processed)
 
     return BulkAttendanceResponse(processed=processed, errors=errors)
@@ -29,6 +29,8 @@ from app.services.web_app_service import WebAppDataService
 from app.services.absence_service import AbsenceService
 from app.services.dashboard_service import DashboardService
 from app.services.notification_service import NotificationService
+from app.services.photo_service import PhotoService
+from app.services.storage.registry import tenant_storage
 from app.services.webauthn_service import WebAuthnService
 
 if TYPE_CHECKING:
@@ -223,22 +225,42 @@ async def get_attendance_notification_service(
     request: Request,
     session: AsyncSession = Depends(get_tenant_db),
 ) -> AttendanceNotificationService:
-    return AttendanceNotificationService(session)
+    tenant = getattr(request.state, "tenant", None)
+    return AttendanceNotificationService(session, tenant_id=tenant.id if tenant else None)
+
+
+async def get_photo_service(request: Request) -> PhotoService:
+    """Photo service on the current tenant's bucket/prefix (shared, cached backend)."""
+    tenant = getattr(request.state, "tenant", None)
+    return PhotoService(await tenant_storage(tenant_id=tenant.id if tenant else None))
 
 
 async def get_attendance_service(
     request: Request,
     session: AsyncSession = Depends(get_tenant_db),
     notification_service: AttendanceNotificationService = Depends(get_attendance_notification_service),
+    photo_service: PhotoService = Depends(get_photo_service),
 ) -> AttendanceService:
-    return AttendanceService(session, notification_service=notification_service)
+    tenant = getattr(request.state, "tenant", None)
+    return AttendanceService(
+        session,
+        notification_service=notification_service,
+        tenant_schema=getattr(request.state, "tenant_schema", None),
+        photo_service=photo_service,
+        tenant_id=tenant.id if tenant else None,
+    )
 
 
 async def get_notification_dispatcher(
     request: Request,
     session: AsyncSession = Depends(get_tenant_db),
 ) -> NotificationDispatcher:
-    return NotificationDispatcher(session)
+    tenant = getattr(request.state, "tenant", None)
+    return NotificationDispatcher(
+        session,
+        tenant_id=tenant.id if tenant else None,
+        tenant_schema=getattr(request.state, "tenant_schema", None),
+    )
 
 
 async def get_schedule_service(
@@ -252,7 +274,12 @@ async def get_broadcast_service(
     request: Request,
     session: AsyncSession = Depends(get_tenant_db),
 ) -> BroadcastService:
-    return BroadcastService(session)
+    tenant = getattr(request.state, "tenant", None)
+    return BroadcastService(
+        session,
+        tenant_id=tenant.id if tenant else None,
+        tenant_schema=getattr(request.state, "tenant_schema", None),
+    )
 
 
 async def get_consent_service(
@@ -304,15 +331,17 @@ async def get_absence_service(
 async def get_dashboard_service(
     request: Request,
     session: AsyncSession = Depends(get_tenant_db),
+    photo_service: PhotoService = Depends(get_photo_service),
 ) -> DashboardService:
-    return DashboardService(session)
+    return DashboardService(session, photo_service=photo_service)
 
 
 async def get_notification_service(
     request: Request,
     session: AsyncSession = Depends(get_tenant_db),
 ) -> NotificationService:
-    return NotificationService(session)
+    tenant = getattr(request.state, "tenant", None)
+    return NotificationService(session, tenant_id=tenant.id if tenant else None)
 
 
 async def get_webauthn_service(
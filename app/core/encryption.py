@@ -4,18 +4,17 @@ from __future__ import annotations
 
 import base64
 import logging
+from functools import lru_cache
 
-from cryptography.fernet import Fernet, InvalidToken
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
-def _get_fernet() -> Fernet:
-    """Get or create a Fernet instance with the configured key."""
-    key = settings.encryption_key
-
+def _build_fernet(key: str | bytes) -> Fernet:
+    """Build a Fernet instance for a single key."""
     # If key is not base64 encoded, encode it
     try:
         # Try to use directly as Fernet key
@@ -30,6 +29,24 @@ def _get_fernet() -> Fernet:
         return Fernet(encoded_key)
 
 
+@lru_cache(maxsize=4)
+def _fernet_for(key_setting: str) -> Fernet | MultiFernet:
+    """Build (once per key setting) the cipher used for tenant credentials.
+
+    A comma-separated ENCRYPTION_KEY enables key rotation: the first key
+    encrypts, all keys are tried when decrypting.
+    """
+    keys = [k.strip() for k in key_setting.split(",") if k.strip()]
+    if len(keys) > 1:
+        return MultiFernet([_build_fernet(k) for k in keys])
+    return _build_fernet(keys[0] if keys else key_setting)
+
+
+def _get_fernet() -> Fernet | MultiFernet:
+    """Get the cached Fernet/MultiFernet instance for the configured key."""
+    return _fernet_for(settings.encryption_key)
+
+
 def encrypt(plaintext: str) -> bytes:
     """
     Encrypt a string using Fernet symmetric encryption.
@@ -35,6 +35,7 @@ PUBLIC_ENDPOINTS = [
     "/api/v1/attendance/",  # Kiosk attendance events (device-authenticated)
     "/api/v1/kiosk/",  # Kiosk bootstrap and sync
     "/api/v1/webauthn/kiosk/",  # Kiosk biometric auth
+    "/api/v1/storage/",  # Local storage backend (signed URLs)
 ]
 
 # Web routes that don't require tenant context (session cookie auth)
@@ -204,6 +205,11 @@ class TenantMiddleware(BaseHTTPMiddleware):
             # Also set context vars for use outside of request context
             current_tenant.set(tenant)
             current_tenant_schema.set(schema_name)
+            if request.url.path.startswith("/api/"):
+                from app.db.models.usage_stat import UsageStat
+                from app.services.usage_meter import get_usage_meter
+
+                get_usage_meter().record(tenant.id, UsageStat.METRIC_API_CALLS)
         else:
             request.state.tenant_schema = None
             current_tenant.set(None)
@@ -0,0 +1,36 @@
+"""Add per-tenant outbound notification rate limits
+
+Revision ID: 0012_tenant_rate_limits
+Revises: 0011_push_subscriptions
+Create Date: 2026-01-05 10:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0012_tenant_rate_limits"
+down_revision = "0011_push_subscriptions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL means "use the platform default" from settings
+    op.add_column(
+        "tenant_configs",
+        sa.Column("whatsapp_rate_per_minute", sa.Integer(), nullable=True),
+        schema="public",
+    )
+    op.add_column(
+        "tenant_configs",
+        sa.Column("email_rate_per_minute", sa.Integer(), nullable=True),
+        schema="public",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tenant_configs", "email_rate_per_minute", schema="public")
+    op.drop_column("tenant_configs", "whatsapp_rate_per_minute", schema="public")
@@ -0,0 +1,82 @@
+"""Add indexed student_id to notifications
+
+Revision ID: 0013_notification_student_id
+Revises: 0012_tenant_rate_limits
+Create Date: 2026-01-12 10:00:00.000000
+
+Parents' notification history used to filter on ``payload->'student_id'``,
+which no index can serve. The value now lives in its own column, backfilled
+from the payload, next to (student_id, ts_created) and (guardian_id,
+ts_created) indexes for keyset pagination.
+
+Tenant schemas copy their tables from public (``CREATE TABLE ... LIKE``), so
+every schema that already has a ``notifications`` table is migrated too.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0013_notification_student_id"
+down_revision = "0012_tenant_rate_limits"
+branch_labels = None
+depends_on = None
+
+
+def _notification_schemas(conn) -> list[str | None]:
+    if conn.dialect.name != "postgresql":
+        return [None]
+    result = conn.execute(
+        sa.text(
+            "SELECT table_schema FROM information_schema.tables "
+            "WHERE table_name = 'notifications' "
+            "AND (table_schema = 'public' OR table_schema LIKE 'tenant\\_%') "
+            "ORDER BY table_schema"
+        )
+    )
+    return [row[0] for row in result]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for schema in _notification_schemas(conn):
+        # LIKE does not copy foreign keys, so tenant copies never had them
+        constraints = [sa.ForeignKey("students.id", ondelete="SET NULL")] if schema in (None, "public") else []
+        op.add_column(
+            "notifications",
+            sa.Column("student_id", sa.Integer(), *constraints, nullable=True),
+            schema=schema,
+        )
+
+        prefix = f"{schema}." if schema else ""
+        if conn.dialect.name == "postgresql":
+            student_ref = "(n.payload->>'student_id')"
+            valid = f"{student_ref} ~ '^[0-9]+$'"
+            as_int = f"{student_ref}::integer"
+        else:
+            student_ref = "json_extract(n.payload, '$.student_id')"
+            valid = f"typeof({student_ref}) = 'integer'"
+            as_int = student_ref
+        # Only IDs of students that still exist (the column is a foreign key)
+        op.execute(
+            f"UPDATE {prefix}notifications AS n SET student_id = {as_int} "
+            f"WHERE n.student_id IS NULL AND {valid} "
+            f"AND EXISTS (SELECT 1 FROM {prefix}students s WHERE s.id = {as_int})"
+        )
+
+        op.create_index(
+            "ix_notifications_student_ts", "notifications", ["student_id", "ts_created"], schema=schema
+        )
+        op.create_index(
+            "ix_notifications_guardian_ts", "notifications", ["guardian_id", "ts_created"], schema=schema
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for schema in _notification_schemas(conn):
+        op.drop_index("ix_notifications_guardian_ts", table_name="notifications", schema=schema)
+        op.drop_index("ix_notifications_student_ts", table_name="notifications", schema=schema)
+        op.drop_column("notifications", "student_id", schema=schema)
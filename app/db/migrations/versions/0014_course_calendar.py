@@ -0,0 +1,92 @@
+"""Add the materialized effective-schedule calendar
+
+Revision ID: 0014_course_calendar
+Revises: 0013_notification_student_id
+Create Date: 2026-01-19 10:00:00.000000
+
+``course_calendar_days`` holds the expected entry/exit of every course on
+every date (schedules with ``schedule_exceptions`` applied) and
+``excused_absence_days`` the dates covered by approved absence requests.
+Both are filled by ``CalendarService`` on first use, so no data migration
+is needed.
+
+Existing tenant schemas get the tables as copies of the public ones, the
+same way ``TenantProvisioningService`` creates new tenants.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0014_course_calendar"
+down_revision = "0013_notification_student_id"
+branch_labels = None
+depends_on = None
+
+
+TABLES = ("course_calendar_days", "excused_absence_days")
+
+
+def _tenant_schemas(conn) -> list[str]:
+    if conn.dialect.name != "postgresql":
+        return []
+    result = conn.execute(
+        sa.text(
+            "SELECT schema_name FROM information_schema.schemata "
+            "WHERE schema_name LIKE 'tenant\\_%' ORDER BY schema_name"
+        )
+    )
+    return [row[0] for row in result]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "course_calendar_days",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("course_id", sa.Integer(), sa.ForeignKey("courses.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("is_school_day", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("schedule_id", sa.Integer(), sa.ForeignKey("schedules.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("in_time", sa.Time(), nullable=True),
+        sa.Column("out_time", sa.Time(), nullable=True),
+        sa.UniqueConstraint("course_id", "date", name="uq_course_calendar_day"),
+    )
+    op.create_index("ix_course_calendar_days_date", "course_calendar_days", ["date"])
+
+    op.create_table(
+        "excused_absence_days",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column(
+            "absence_request_id",
+            sa.Integer(),
+            sa.ForeignKey("absence_requests.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.UniqueConstraint("student_id", "date", name="uq_excused_absence_day"),
+    )
+    op.create_index("ix_excused_absence_days_date", "excused_absence_days", ["date"])
+    op.create_index(
+        "ix_excused_absence_days_absence_request_id", "excused_absence_days", ["absence_request_id"]
+    )
+
+    conn = op.get_bind()
+    for schema in _tenant_schemas(conn):
+        for table in TABLES:
+            op.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table} (LIKE public.{table} INCLUDING ALL)")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for schema in _tenant_schemas(conn):
+        for table in TABLES:
+            op.execute(f"DROP TABLE IF EXISTS {schema}.{table}")
+
+    op.drop_index("ix_excused_absence_days_absence_request_id", table_name="excused_absence_days")
+    op.drop_index("ix_excused_absence_days_date", table_name="excused_absence_days")
+    op.drop_table("excused_absence_days")
+    op.drop_index("ix_course_calendar_days_date", table_name="course_calendar_days")
+    op.drop_table("course_calendar_days")
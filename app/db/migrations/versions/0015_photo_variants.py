@@ -0,0 +1,54 @@
+"""Add WebP photo variant references to attendance events
+
+Revision ID: 0015_photo_variants
+Revises: 0014_course_calendar
+Create Date: 2026-01-20 10:00:00.000000
+
+The ``photo_variants`` job stores a thumbnail and a medium-size WebP copy of
+every evidence photo; their keys live next to ``photo_ref`` so dashboards,
+the photo viewer and WhatsApp messages can link the lighter copy.
+
+Tenant schemas copy their tables from public (``CREATE TABLE ... LIKE``), so
+every schema that already has an ``attendance_events`` table is migrated too.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0015_photo_variants"
+down_revision = "0014_course_calendar"
+branch_labels = None
+depends_on = None
+
+COLUMNS = ("photo_thumb_ref", "photo_medium_ref")
+
+
+def _event_schemas(conn) -> list[str | None]:
+    if conn.dialect.name != "postgresql":
+        return [None]
+    result = conn.execute(
+        sa.text(
+            "SELECT table_schema FROM information_schema.tables "
+            "WHERE table_name = 'attendance_events' "
+            "AND (table_schema = 'public' OR table_schema LIKE 'tenant\\_%') "
+            "ORDER BY table_schema"
+        )
+    )
+    return [row[0] for row in result]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for schema in _event_schemas(conn):
+        for column in COLUMNS:
+            op.add_column("attendance_events", sa.Column(column, sa.String(length=512), nullable=True), schema=schema)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for schema in _event_schemas(conn):
+        for column in reversed(COLUMNS):
+            op.drop_column("attendance_events", column, schema=schema)
@@ -29,6 +29,8 @@ from app.db.models.associations import student_guardian_table, teacher_course_ta
 from app.db.models.no_show_alert import NoShowAlert
 from app.db.models.webauthn_credential import WebAuthnCredential
 from app.db.models.push_subscription import PushSubscription
+from app.db.models.course_calendar_day import CourseCalendarDay
+from app.db.models.excused_absence_day import ExcusedAbsenceDay
 
 __all__ = [
     # Multi-tenant models
@@ -60,4 +62,6 @@ __all__ = [
     "NoShowAlert",
     "WebAuthnCredential",
     "PushSubscription",
+    "CourseCalendarDay",
+    "ExcusedAbsenceDay",
 ]
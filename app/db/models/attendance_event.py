@@ -25,6 +25,9 @@ class AttendanceEvent(Base):
     occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     local_seq: Mapped[int | None] = mapped_column(Integer)
     photo_ref: Mapped[str | None] = mapped_column(String(512))
+    # WebP copies of photo_ref written by the photo_variants job
+    photo_thumb_ref: Mapped[str | None] = mapped_column(String(512))
+    photo_medium_ref: Mapped[str | None] = mapped_column(String(512))
     audio_ref: Mapped[str | None] = mapped_column(String(512))
     synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
@@ -0,0 +1,31 @@
+"""Effective school calendar, one row per course and date."""
+
+from datetime import date, time
+
+from sqlalchemy import Boolean, Date, ForeignKey, Integer, Time, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CourseCalendarDay(Base):
+    """Expected entry/exit of a course on a date, with exceptions applied.
+
+    Materialized by ``CalendarService`` from ``schedules`` and
+    ``schedule_exceptions``; every course has a row for every date of a
+    materialized range (``is_school_day=False`` for weekends, holidays and
+    suspended classes).
+    """
+
+    __tablename__ = "course_calendar_days"
+    __table_args__ = (
+        UniqueConstraint("course_id", "date", name="uq_course_calendar_day"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    course_id: Mapped[int] = mapped_column(ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    is_school_day: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    schedule_id: Mapped[int | None] = mapped_column(ForeignKey("schedules.id", ondelete="SET NULL"))
+    in_time: Mapped[time | None] = mapped_column(Time)
+    out_time: Mapped[time | None] = mapped_column(Time)
@@ -0,0 +1,24 @@
+"""Dates on which a student is excused by an approved absence request."""
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ExcusedAbsenceDay(Base):
+    """One row per student and date covered by an APPROVED absence request."""
+
+    __tablename__ = "excused_absence_days"
+    __table_args__ = (
+        UniqueConstraint("student_id", "date", name="uq_excused_absence_day"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    student_id: Mapped[int] = mapped_column(ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    absence_request_id: Mapped[int] = mapped_column(
+        ForeignKey("absence_requests.id", ondelete="CASCADE"), nullable=False, index=True
+    )
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -15,10 +15,17 @@ def _utc_now() -> datetime:
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination of a student's / guardian's history (newest first)
+        Index("ix_notifications_student_ts", "student_id", "ts_created"),
+        Index("ix_notifications_guardian_ts", "guardian_id", "ts_created"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     event_id: Mapped[int | None] = mapped_column(ForeignKey("attendance_events.id"), index=True)
     guardian_id: Mapped[int] = mapped_column(ForeignKey("guardians.id"), nullable=False, index=True)
+    # Student the message is about (None for broadcasts and multi-student digests)
+    student_id: Mapped[int | None] = mapped_column(ForeignKey("students.id", ondelete="SET NULL"))
     channel: Mapped[str] = mapped_column(String(32), nullable=False)
     template: Mapped[str] = mapped_column(String(64), nullable=False)
     # R15-MDL1 fix: Use lambda factory instead of mutable default dict
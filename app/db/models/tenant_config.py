@@ -47,6 +47,10 @@ class TenantConfig(Base):
     # Device API key (encrypted with Fernet)
     device_api_key_encrypted: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
 
+    # Outbound notification rate limits (messages per minute, NULL = platform default)
+    whatsapp_rate_per_minute: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    email_rate_per_minute: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
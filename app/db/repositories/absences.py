@@ -59,3 +59,20 @@ class AbsenceRepository:
         record.status = status
         await self.session.flush()
         return record
+
+    async def list_approved_between(
+        self,
+        start: date,
+        end: date,
+        student_ids: Iterable[int] | None = None,
+    ) -> list[AbsenceRequest]:
+        """Approved requests overlapping ``[start, end]``."""
+        stmt = select(AbsenceRequest).where(
+            AbsenceRequest.status == "APPROVED",
+            AbsenceRequest.start_date <= end,
+            AbsenceRequest.end_date >= start,
+        )
+        if student_ids is not None:
+            stmt = stmt.where(AbsenceRequest.student_id.in_(list(student_ids)))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
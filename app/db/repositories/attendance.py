@@ -1,11 +1,13 @@
 """Attendance repository stub."""
 
+from collections.abc import Collection
 from datetime import datetime, date
 
-from sqlalchemy import and_, select, func
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.models.associations import student_guardian_table
 from app.db.models.attendance_event import AttendanceEvent
 from app.db.models.student import Student
 
@@ -61,21 +63,89 @@ class AttendanceRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none() is not None
 
-    async def events_with_photo_before(self, cutoff: datetime) -> list[AttendanceEvent]:
-        stmt = select(AttendanceEvent).where(
-            AttendanceEvent.photo_ref.is_not(None), AttendanceEvent.occurred_at < cutoff
+    async def expired_evidence_page(
+        self,
+        cutoff: datetime,
+        *,
+        after_id: int = 0,
+        limit: int = 1000,
+    ) -> list[tuple[int, list[str], str | None]]:
+        """One keyset page of events older than ``cutoff`` that still have evidence.
+
+        Returns:
+            (event_id, photo keys, audio_ref) rows ordered by ID, all with
+            ``id > after_id``; photo keys are the original and its variants
+        """
+        stmt = (
+            select(
+                AttendanceEvent.id,
+                AttendanceEvent.photo_ref,
+                AttendanceEvent.photo_thumb_ref,
+                AttendanceEvent.photo_medium_ref,
+                AttendanceEvent.audio_ref,
+            )
+            .where(
+                AttendanceEvent.id > after_id,
+                AttendanceEvent.occurred_at < cutoff,
+                or_(AttendanceEvent.photo_ref.is_not(None), AttendanceEvent.audio_ref.is_not(None)),
+            )
+            .order_by(AttendanceEvent.id)
+            .limit(limit)
         )
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return [
+            (event_id, [key for key in (photo_ref, thumb_ref, medium_ref) if key], audio_ref)
+            for event_id, photo_ref, thumb_ref, medium_ref, audio_ref in result
+        ]
+
+    async def clear_evidence_refs(
+        self,
+        *,
+        photo_event_ids: Collection[int] = (),
+        audio_event_ids: Collection[int] = (),
+    ) -> None:
+        """Null the photo/audio references of events whose objects were deleted."""
+        if photo_event_ids:
+            await self.session.execute(
+                update(AttendanceEvent)
+                .where(AttendanceEvent.id.in_(list(photo_event_ids)))
+                .values(photo_ref=None, photo_thumb_ref=None, photo_medium_ref=None)
+                .execution_options(synchronize_session=False)
+            )
+        if audio_event_ids:
+            await self.session.execute(
+                update(AttendanceEvent)
+                .where(AttendanceEvent.id.in_(list(audio_event_ids)))
+                .values(audio_ref=None)
+                .execution_options(synchronize_session=False)
+            )
+
+    async def get_event(self, event_id: int) -> AttendanceEvent | None:
+        return await self.session.get(AttendanceEvent, event_id)
 
     async def update_photo_ref(self, event_id: int, photo_ref: str | None) -> AttendanceEvent:
         event = await self.session.get(AttendanceEvent, event_id)
         if event is None:
             raise ValueError("Evento no encontrado")
         event.photo_ref = photo_ref
+        # Variants belong to the previous photo; the photo_variants job rebuilds them
+        event.photo_thumb_ref = None
+        event.photo_medium_ref = None
         await self.session.flush()
         return event
 
+    async def set_photo_variants(
+        self, event_id: int, photo_ref: str, thumb_ref: str, medium_ref: str
+    ) -> bool:
+        """Store the variant keys if the event still points to ``photo_ref``."""
+        result = await self.session.execute(
+            update(AttendanceEvent)
+            .where(AttendanceEvent.id == event_id, AttendanceEvent.photo_ref == photo_ref)
+            .values(photo_thumb_ref=thumb_ref, photo_medium_ref=medium_ref)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
     async def update_audio_ref(self, event_id: int, audio_ref: str | None) -> AttendanceEvent:
         """Update the audio reference for an attendance event."""
         event = await self.session.get(AttendanceEvent, event_id)
@@ -120,3 +190,34 @@ class AttendanceRepository:
         )
         result = await self.session.execute(stmt)
         return set(result.scalars().all())
+
+    async def list_guardian_events_between(
+        self, guardian_ids: list[int], start: datetime, end: datetime
+    ) -> list[tuple[int, str, str, datetime]]:
+        """Events of the guardians' students in [start, end), for daily digests.
+
+        Returns:
+            (guardian_id, student_name, event type, occurred_at) rows ordered
+            by guardian and time
+        """
+        if not guardian_ids:
+            return []
+
+        stmt = (
+            select(
+                student_guardian_table.c.guardian_id,
+                Student.full_name,
+                AttendanceEvent.type,
+                AttendanceEvent.occurred_at,
+            )
+            .join(Student, Student.id == AttendanceEvent.student_id)
+            .join(student_guardian_table, student_guardian_table.c.student_id == Student.id)
+            .where(
+                student_guardian_table.c.guardian_id.in_(guardian_ids),
+                AttendanceEvent.occurred_at >= start,
+                AttendanceEvent.occurred_at < end,
+            )
+            .order_by(student_guardian_table.c.guardian_id, AttendanceEvent.occurred_at)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
@@ -0,0 +1,93 @@
+"""Repository for the materialized school calendar."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import date
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.course_calendar_day import CourseCalendarDay
+from app.db.models.excused_absence_day import ExcusedAbsenceDay
+
+
+# Rows per INSERT, well under the bind-parameter limits of both dialects
+CHUNK_SIZE = 500
+
+
+class CalendarRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _insert(self, model):
+        dialect = postgresql if self.session.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(model)
+
+    async def list_days(
+        self,
+        start: date,
+        end: date,
+        course_ids: Collection[int] | None = None,
+    ) -> list[CourseCalendarDay]:
+        stmt = (
+            select(CourseCalendarDay)
+            .where(CourseCalendarDay.date >= start, CourseCalendarDay.date <= end)
+            .order_by(CourseCalendarDay.date, CourseCalendarDay.course_id)
+            # Rows may have just been rewritten by upsert_days
+            .execution_options(populate_existing=True)
+        )
+        if course_ids is not None:
+            stmt = stmt.where(CourseCalendarDay.course_id.in_(list(course_ids)))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def upsert_days(self, rows: list[dict]) -> None:
+        """Insert or overwrite (course_id, date) rows."""
+        for offset in range(0, len(rows), CHUNK_SIZE):
+            stmt = self._insert(CourseCalendarDay).values(rows[offset:offset + CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["course_id", "date"],
+                set_={
+                    "is_school_day": stmt.excluded.is_school_day,
+                    "schedule_id": stmt.excluded.schedule_id,
+                    "in_time": stmt.excluded.in_time,
+                    "out_time": stmt.excluded.out_time,
+                },
+            )
+            await self.session.execute(stmt)
+
+    async def list_excused(
+        self,
+        start: date,
+        end: date,
+        student_ids: Collection[int] | None = None,
+    ) -> list[tuple[int, date]]:
+        stmt = select(ExcusedAbsenceDay.student_id, ExcusedAbsenceDay.date).where(
+            ExcusedAbsenceDay.date >= start, ExcusedAbsenceDay.date <= end
+        )
+        if student_ids is not None:
+            stmt = stmt.where(ExcusedAbsenceDay.student_id.in_(list(student_ids)))
+        result = await self.session.execute(stmt)
+        return [(student_id, day) for student_id, day in result]
+
+    async def replace_excused(
+        self,
+        start: date,
+        end: date,
+        rows: list[dict],
+        student_ids: Collection[int] | None = None,
+    ) -> None:
+        """Replace the excused days of ``[start, end]`` (optionally for some students)."""
+        stmt = delete(ExcusedAbsenceDay).where(ExcusedAbsenceDay.date >= start, ExcusedAbsenceDay.date <= end)
+        if student_ids is not None:
+            stmt = stmt.where(ExcusedAbsenceDay.student_id.in_(list(student_ids)))
+        await self.session.execute(stmt.execution_options(synchronize_session=False))
+        for offset in range(0, len(rows), CHUNK_SIZE):
+            # Overlapping approved requests cover the same day once
+            await self.session.execute(
+                self._insert(ExcusedAbsenceDay)
+                .values(rows[offset:offset + CHUNK_SIZE])
+                .on_conflict_do_nothing(index_elements=["student_id", "date"])
+            )
@@ -1,10 +1,13 @@
 """Guardian repository stub."""
 
-from sqlalchemy import select
+from sqlalchemy import Select, and_, case, distinct, exists, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.models.associations import student_guardian_table
+from app.db.models.course import Course
 from app.db.models.guardian import Guardian
+from app.db.models.push_subscription import PushSubscription
 from app.db.models.student import Student
 
 
@@ -48,3 +51,126 @@ class GuardianRepository:
             .limit(limit)
         )
         return list(result.scalars().all())
+
+    async def list_contacts(self, guardian_ids: list[int]) -> list[tuple[int, dict]]:
+        """Load only (id, contacts) for a chunk of guardians.
+
+        Bulk senders need the addresses, not the ORM objects and their
+        student relationships.
+        """
+        if not guardian_ids:
+            return []
+        result = await self.session.execute(
+            select(Guardian.id, Guardian.contacts).where(Guardian.id.in_(guardian_ids))
+        )
+        return [(row.id, row.contacts or {}) for row in result.all()]
+
+    async def list_notification_targets(
+        self,
+        student_id: int | None = None,
+        guardian_id: int | None = None,
+    ) -> list[dict]:
+        """Load everything needed to notify guardians in one query.
+
+        Targets are a student's guardians, or a single guardian (coalesced
+        notifications). Guardians are LEFT JOINed with their active push
+        subscriptions, so a guardian with N devices comes back as N rows and
+        is folded here.
+
+        Returns:
+            One dict per guardian with guardian_id, contacts, notification_prefs
+            and push_subscriptions (subscription_info dicts)
+        """
+        stmt = (
+            select(
+                Guardian.id,
+                Guardian.contacts,
+                Guardian.notification_prefs,
+                PushSubscription.endpoint,
+                PushSubscription.p256dh,
+                PushSubscription.auth,
+            )
+            .outerjoin(
+                PushSubscription,
+                and_(
+                    PushSubscription.guardian_id == Guardian.id,
+                    PushSubscription.is_active.is_(True),
+                ),
+            )
+            .order_by(Guardian.id, PushSubscription.id)
+        )
+        if student_id is not None:
+            stmt = stmt.join(
+                student_guardian_table, student_guardian_table.c.guardian_id == Guardian.id
+            ).where(student_guardian_table.c.student_id == student_id)
+        if guardian_id is not None:
+            stmt = stmt.where(Guardian.id == guardian_id)
+        targets: dict[int, dict] = {}
+        for row in (await self.session.execute(stmt)).all():
+            target = targets.setdefault(
+                row.id,
+                {
+                    "guardian_id": row.id,
+                    "contacts": row.contacts or {},
+                    "notification_prefs": row.notification_prefs or {},
+                    "push_subscriptions": [],
+                },
+            )
+            if row.endpoint:
+                target["push_subscriptions"].append(
+                    {"endpoint": row.endpoint, "keys": {"p256dh": row.p256dh, "auth": row.auth}}
+                )
+        return list(targets.values())
+
+    # ==================== Broadcast audiences ====================
+    # Audience builders return a SELECT of distinct guardian ids (column "id")
+    # so resolution and counting stay in SQL.
+
+    @staticmethod
+    def audience_all() -> Select:
+        return select(Guardian.id.label("id"))
+
+    @staticmethod
+    def audience_for_courses(course_ids: list[int]) -> Select:
+        return (
+            select(student_guardian_table.c.guardian_id.label("id"))
+            .join(Student, Student.id == student_guardian_table.c.student_id)
+            .where(Student.course_id.in_(course_ids))
+            .distinct()
+        )
+
+    @staticmethod
+    def audience_for_grades(grades: list[str]) -> Select:
+        return (
+            select(student_guardian_table.c.guardian_id.label("id"))
+            .join(Student, Student.id == student_guardian_table.c.student_id)
+            .join(Course, Course.id == Student.course_id)
+            .where(Course.grade.in_(grades))
+            .distinct()
+        )
+
+    @staticmethod
+    def audience_for_ids(guardian_ids: list[int]) -> Select:
+        return select(Guardian.id.label("id")).where(Guardian.id.in_(guardian_ids))
+
+    async def list_audience_ids(self, audience: Select) -> list[int]:
+        result = await self.session.execute(audience)
+        return list(result.scalars().all())
+
+    async def count_audience_channels(self, audience: Select) -> dict[str, int]:
+        """COUNT(DISTINCT) of the audience, split by reachable channel."""
+        audience_ids = audience.subquery()
+        has_whatsapp = func.coalesce(Guardian.contacts["whatsapp"].as_string(), "") != ""
+        has_email = func.coalesce(Guardian.contacts["email"].as_string(), "") != ""
+        has_push = exists().where(
+            PushSubscription.guardian_id == Guardian.id,
+            PushSubscription.is_active.is_(True),
+        )
+        stmt = select(
+            func.count(distinct(Guardian.id)),
+            func.count(distinct(case((has_whatsapp, Guardian.id)))),
+            func.count(distinct(case((has_email, Guardian.id)))),
+            func.count(distinct(case((has_push, Guardian.id)))),
+        ).where(Guardian.id.in_(select(audience_ids.c.id)))
+        total, whatsapp, email, push = (await self.session.execute(stmt)).one()
+        return {"total": total, "whatsapp": whatsapp, "email": email, "push": push}
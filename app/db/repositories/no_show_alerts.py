@@ -3,13 +3,19 @@
 from __future__ import annotations
 
 import logging
-from datetime import date, datetime
+from collections.abc import Collection
+from datetime import date, datetime, time, timedelta, timezone
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import Date, DateTime, Integer, Select, String, exists, func, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.db.models.associations import student_guardian_table
+from app.db.models.attendance_event import AttendanceEvent
+from app.db.models.course_calendar_day import CourseCalendarDay
+from app.db.models.excused_absence_day import ExcusedAbsenceDay
 from app.db.models.no_show_alert import NoShowAlert
 from app.db.models.guardian import Guardian
 from app.db.models.student import Student
@@ -113,6 +119,160 @@ class NoShowAlertRepository:
             # This shouldn't happen, but re-raise if it does
             raise
 
+    @staticmethod
+    def _has_in_event(student_id, alert_date: date):
+        """Correlated EXISTS: the student checked in on ``alert_date`` (UTC day)."""
+        start = datetime.combine(alert_date, time.min, tzinfo=timezone.utc)
+        return exists().where(
+            AttendanceEvent.student_id == student_id,
+            AttendanceEvent.type == "IN",
+            AttendanceEvent.occurred_at >= start,
+            AttendanceEvent.occurred_at < start + timedelta(days=1),
+        )
+
+    async def insert_missing(
+        self,
+        *,
+        cutoff: time | None,
+        alert_date: date,
+        alerted_at: datetime,
+        course_ids: Collection[int] | None = None,
+    ) -> list[int]:
+        """Create the day's alerts for every absent student/guardian in one statement.
+
+        ``INSERT INTO no_show_alerts ... SELECT`` over the courses with class
+        on ``alert_date`` (``course_calendar_days``, which must be
+        materialized) whose entry time is at or before ``cutoff``, their
+        students and guardians, keeping only students without an IN event
+        that day and not excused by an approved absence. Pairs already
+        alerted are skipped by the unique constraint (``ON CONFLICT DO
+        NOTHING``), so concurrent runs cannot duplicate alerts.
+
+        ``course_ids`` restricts the pass to those courses; callers that
+        already know their threshold has passed give ``cutoff=None``.
+
+        Returns:
+            IDs of the alerts created by this call
+        """
+        guardian_link = student_guardian_table.c
+        excused = exists().where(
+            ExcusedAbsenceDay.student_id == Student.id,
+            ExcusedAbsenceDay.date == alert_date,
+        )
+        rows = (
+            select(
+                Student.id,
+                guardian_link.guardian_id,
+                CourseCalendarDay.course_id,
+                CourseCalendarDay.schedule_id,
+                literal(alert_date, Date),
+                literal(alerted_at, DateTime(timezone=True)),
+                literal("PENDING", String),
+                literal(0, Integer),
+            )
+            .join_from(CourseCalendarDay, Student, Student.course_id == CourseCalendarDay.course_id)
+            .join(student_guardian_table, guardian_link.student_id == Student.id)
+            .where(
+                CourseCalendarDay.date == alert_date,
+                CourseCalendarDay.is_school_day.is_(True),
+                ~self._has_in_event(Student.id, alert_date),
+                ~excused,
+            )
+        )
+        if cutoff is not None:
+            rows = rows.where(CourseCalendarDay.in_time <= cutoff)
+        if course_ids is not None:
+            rows = rows.where(CourseCalendarDay.course_id.in_(list(course_ids)))
+        dialect = postgresql if self.session.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(NoShowAlert)
+            .from_select(
+                [
+                    "student_id", "guardian_id", "course_id", "schedule_id",
+                    "alert_date", "alerted_at", "status", "notification_attempts",
+                ],
+                rows,
+            )
+            .on_conflict_do_nothing(index_elements=["student_id", "guardian_id", "alert_date"])
+            .returning(NoShowAlert.id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def list_due(
+        self,
+        alert_date: date,
+        notified_before: datetime,
+        course_ids: Collection[int] | None = None,
+    ) -> list[NoShowAlert]:
+        """Pending alerts of the day that need a (first or reminder) notification.
+
+        Skips students who checked in since the alert was created and alerts
+        notified after ``notified_before``. Student, guardian and course are
+        joined in the same query.
+        """
+        stmt = (
+            select(NoShowAlert)
+            .options(
+                joinedload(NoShowAlert.student),
+                joinedload(NoShowAlert.guardian),
+                joinedload(NoShowAlert.course),
+            )
+            .where(
+                NoShowAlert.alert_date == alert_date,
+                NoShowAlert.status == "PENDING",
+                or_(
+                    NoShowAlert.last_notification_at.is_(None),
+                    NoShowAlert.last_notification_at <= notified_before,
+                ),
+                ~self._has_in_event(NoShowAlert.student_id, alert_date),
+            )
+            .order_by(NoShowAlert.id)
+        )
+        if course_ids is not None:
+            stmt = stmt.where(NoShowAlert.course_id.in_(list(course_ids)))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def resolve_checked_in(
+        self,
+        student_ids: Collection[int],
+        alert_date: date,
+        resolved_at: datetime,
+    ) -> int:
+        """Resolve the day's pending alerts of students who just checked in.
+
+        Returns:
+            Number of alerts resolved
+        """
+        if not student_ids:
+            return 0
+        result = await self.session.execute(
+            update(NoShowAlert)
+            .where(
+                NoShowAlert.student_id.in_(list(student_ids)),
+                NoShowAlert.alert_date == alert_date,
+                NoShowAlert.status == "PENDING",
+            )
+            .values(status="RESOLVED", resolved_at=resolved_at, notes="Ingreso registrado")
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    async def mark_notified_many(self, alert_ids: list[int], notified_at: datetime) -> None:
+        """Record one more notification for each alert in a single UPDATE."""
+        if not alert_ids:
+            return
+        await self.session.execute(
+            update(NoShowAlert)
+            .where(NoShowAlert.id.in_(alert_ids))
+            .values(
+                notification_attempts=func.coalesce(NoShowAlert.notification_attempts, 0) + 1,
+                last_notification_at=notified_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     async def mark_notified(self, alert_id: int, notified_at: datetime) -> None:
         alert = await self.session.get(NoShowAlert, alert_id)
         if alert is None:
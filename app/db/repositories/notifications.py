@@ -2,7 +2,22 @@
 
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    String,
+    and_,
+    case,
+    cast,
+    column,
+    func,
+    insert,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.models.notification import Notification
@@ -20,9 +35,11 @@ class NotificationRepository:
         template: str,
         payload: dict,
         event_id: int | None = None,
+        student_id: int | None = None,
     ) -> Notification:
         notification = Notification(
             guardian_id=guardian_id,
+            student_id=student_id,
             channel=channel,
             template=template,
             payload=payload,
@@ -36,6 +53,37 @@ class NotificationRepository:
         await self.session.flush()
         return notification
 
+    async def bulk_create(self, rows: list[dict]) -> list[int]:
+        """Insert many queued notifications in one statement.
+
+        Args:
+            rows: Dicts with guardian_id, channel, template, payload and
+                optionally event_id and student_id
+
+        Returns:
+            The new notification IDs, in the same order as ``rows``
+        """
+        if not rows:
+            return []
+        now = datetime.now(timezone.utc)
+        rows_to_insert = [
+            {
+                "event_id": None,
+                "student_id": None,
+                **row,
+                "status": "queued",
+                "ts_created": now,
+                "ts_sent": None,
+                "retries": 0,
+            }
+            for row in rows
+        ]
+        result = await self.session.execute(
+            insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+            rows_to_insert,
+        )
+        return list(result.scalars().all())
+
     async def get(self, notification_id: int) -> Notification | None:
         return await self.session.get(Notification, notification_id)
 
@@ -56,20 +104,154 @@ class NotificationRepository:
         await self.session.flush()
         return notification
 
+    async def bulk_update_status(self, statuses: dict[int, str]) -> None:
+        """Set per-notification status in a single UPDATE.
+
+        Args:
+            statuses: Map of notification_id -> "sent" | "failed"
+        """
+        if not statuses:
+            return
+        now = datetime.now(timezone.utc)
+        sent_ids = [nid for nid, status in statuses.items() if status == "sent"]
+        stmt = (
+            update(Notification)
+            .where(Notification.id.in_(list(statuses)))
+            .values(
+                status=case(statuses, value=Notification.id),
+                ts_sent=case(
+                    (Notification.id.in_(sent_ids), now),
+                    else_=Notification.ts_sent,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def apply_status_updates(self, updates: list[dict]) -> None:
+        """Write many (id, status, ts_sent, retries) updates in one statement.
+
+        On PostgreSQL this is a single ``UPDATE ... FROM (VALUES ...)``. A
+        ``None`` field keeps the stored value.
+
+        Args:
+            updates: Dicts with id, status, ts_sent and retries
+        """
+        if not updates:
+            return
+
+        if self.session.get_bind().dialect.name != "postgresql":
+            # Other backends (SQLite in tests) have no VALUES-with-column-aliases
+            for row in updates:
+                changes = {key: row[key] for key in ("status", "ts_sent", "retries") if row.get(key) is not None}
+                if changes:
+                    await self.session.execute(
+                        update(Notification)
+                        .where(Notification.id == row["id"])
+                        .values(**changes)
+                        .execution_options(synchronize_session=False)
+                    )
+            return
+
+        rows = values(
+            column("id", Integer),
+            column("status", String),
+            column("ts_sent", DateTime(timezone=True)),
+            column("retries", Integer),
+            name="updates",
+        ).data([(row["id"], row.get("status"), row.get("ts_sent"), row.get("retries")) for row in updates])
+        stmt = (
+            update(Notification)
+            .where(Notification.id == rows.c.id)
+            .values(
+                # Casts keep the types when a column is NULL in every row
+                status=func.coalesce(cast(rows.c.status, String), Notification.status),
+                ts_sent=func.coalesce(cast(rows.c.ts_sent, DateTime(timezone=True)), Notification.ts_sent),
+                retries=func.coalesce(cast(rows.c.retries, Integer), Notification.retries),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def reset_for_retry(self, notification_ids: list[int]) -> None:
+        """Put failed notifications back in the queue with a fresh retry budget."""
+        if not notification_ids:
+            return
+        stmt = (
+            update(Notification)
+            .where(Notification.id.in_(notification_ids))
+            .values(status="queued", retries=0)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def count_by_window(
+        self, windows: list[tuple[datetime, datetime, int]]
+    ) -> list[tuple[int, str, str, str, int, int, int]]:
+        """Count notifications per window, status, channel and template.
+
+        One ``GROUP BY`` over the ``ts_created`` index, however many windows
+        are requested.
+
+        Args:
+            windows: (start, end, after_id) tuples; a window holds the rows
+                with ``start <= ts_created < end`` and ``id > after_id``
+
+        Returns:
+            Rows of (window index, status, channel, template, count, min id, max id)
+        """
+        if not windows:
+            return []
+        conditions = [
+            and_(Notification.ts_created >= start, Notification.ts_created < end, Notification.id > after_id)
+            for start, end, after_id in windows
+        ]
+        bucket = case(*((condition, index) for index, condition in enumerate(conditions))).label("bucket")
+        stmt = (
+            select(
+                bucket,
+                Notification.status,
+                Notification.channel,
+                Notification.template,
+                func.count(),
+                func.min(Notification.id),
+                func.max(Notification.id),
+            )
+            .where(or_(*conditions))
+            # Group by the alias: repeating the CASE would repeat its parameters
+            .group_by(column("bucket"), Notification.status, Notification.channel, Notification.template)
+        )
+        result = await self.session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
     async def list_notifications(
         self,
         *,
         guardian_ids: list[int] | None = None,
+        student_ids: list[int] | None = None,
         status: str | None = None,
         channel: str | None = None,
         template: str | None = None,
         start: datetime | None = None,
         end: datetime | None = None,
+        before: tuple[datetime, int] | None = None,
         limit: int = 200,
     ) -> list[Notification]:
-        stmt = select(Notification).order_by(Notification.ts_created.desc()).limit(limit)
+        """List notifications newest first.
+
+        Args:
+            before: Keyset cursor (ts_created, id) of the last row of the
+                previous page; only older rows are returned
+        """
+        stmt = (
+            select(Notification)
+            .order_by(Notification.ts_created.desc(), Notification.id.desc())
+            .limit(limit)
+        )
         if guardian_ids:
             stmt = stmt.where(Notification.guardian_id.in_(guardian_ids))
+        if student_ids:
+            stmt = stmt.where(Notification.student_id.in_(student_ids))
         if status:
             stmt = stmt.where(Notification.status == status)
         if channel:
@@ -80,5 +262,7 @@ class NotificationRepository:
             stmt = stmt.where(Notification.ts_created >= start)
         if end:
             stmt = stmt.where(Notification.ts_created <= end)
+        if before:
+            stmt = stmt.where(tuple_(Notification.ts_created, Notification.id) < tuple(before))
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
@@ -111,13 +111,23 @@ class PushSubscriptionRepository:
 
     async def deactivate_by_endpoint(self, endpoint: str) -> bool:
         """Deactivate a subscription by endpoint. Returns True if found and deactivated."""
+        return await self.deactivate_by_endpoints([endpoint]) > 0
+
+    async def deactivate_by_endpoints(self, endpoints: list[str]) -> int:
+        """Deactivate every subscription whose endpoint is listed, in one UPDATE.
+
+        Used by the push worker to prune subscriptions the push service
+        reported as gone (404/410). Returns count of deactivated.
+        """
+        if not endpoints:
+            return 0
         stmt = (
             update(PushSubscription)
-            .where(PushSubscription.endpoint == endpoint)
+            .where(PushSubscription.endpoint.in_(set(endpoints)))
             .values(is_active=False, updated_at=datetime.now(timezone.utc))
         )
         result = await self.session.execute(stmt)
-        return result.rowcount > 0
+        return result.rowcount
 
     async def delete(self, subscription_id: int) -> bool:
         """Delete a subscription. Returns True if found and deleted."""
@@ -90,3 +90,19 @@ class ScheduleRepository:
         )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+    async def list_all(self) -> list[Schedule]:
+        result = await self.session.execute(select(Schedule).order_by(Schedule.course_id, Schedule.weekday))
+        return list(result.scalars().all())
+
+    async def get_exception(self, exception_id: int) -> ScheduleException | None:
+        return await self.session.get(ScheduleException, exception_id)
+
+    async def list_exceptions_between(self, start: date, end: date) -> list[ScheduleException]:
+        stmt = (
+            select(ScheduleException)
+            .where(ScheduleException.date >= start, ScheduleException.date <= end)
+            .order_by(ScheduleException.date, ScheduleException.id)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
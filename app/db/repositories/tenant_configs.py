@@ -30,6 +30,9 @@ class DecryptedTenantConfig:
     s3_prefix: str | None
     # Device
     device_api_key: str | None
+    # Rate limits (messages per minute, None = platform default)
+    whatsapp_rate_per_minute: int | None = None
+    email_rate_per_minute: int | None = None
 
 
 class TenantConfigRepository:
@@ -61,6 +64,8 @@ class TenantConfigRepository:
             s3_bucket=config.s3_bucket,
             s3_prefix=config.s3_prefix,
             device_api_key=decrypt_if_present(config.device_api_key_encrypted),
+            whatsapp_rate_per_minute=config.whatsapp_rate_per_minute,
+            email_rate_per_minute=config.email_rate_per_minute,
         )
 
     async def create(self, tenant_id: int) -> TenantConfig:
@@ -142,6 +147,25 @@ class TenantConfigRepository:
         await self.session.flush()
         return config
 
+    async def update_rate_limits(
+        self,
+        tenant_id: int,
+        *,
+        whatsapp_rate_per_minute: int | None,
+        email_rate_per_minute: int | None,
+    ) -> TenantConfig | None:
+        """Replace outbound rate limits (None restores the platform default)."""
+        config = await self.get(tenant_id)
+        if not config:
+            return None
+
+        config.whatsapp_rate_per_minute = whatsapp_rate_per_minute
+        config.email_rate_per_minute = email_rate_per_minute
+
+        config.updated_at = datetime.now(timezone.utc)
+        await self.session.flush()
+        return config
+
     async def update_device_api_key(
         self,
         tenant_id: int,
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
-from sqlalchemy import func, select
+from typing import Any
+
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models.tenant import Tenant
 from app.db.models.tenant_config import TenantConfig
 from app.db.models.tenant_feature import TenantFeature
+from app.db.models.usage_stat import UsageStat
+from app.db.repositories.usage_stats import latest_values_subquery
+
+# Sort keys accepted by list_page
+TENANT_SORTS = ("name", "created_at", "student_count")
 
 
 class TenantRepository:
@@ -60,6 +67,78 @@ class TenantRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_page(
+        self,
+        *,
+        include_inactive: bool = False,
+        sort: str = "name",
+        descending: bool = False,
+        after: tuple[Any, int] | None = None,
+        limit: int = 50,
+    ) -> list[tuple[Tenant, int | None]]:
+        """One keyset page of tenants with their latest active-student count.
+
+        The count comes from ``usage_stats`` (``METRIC_ACTIVE_STUDENTS``) and
+        is None for tenants without a recorded value yet.
+
+        Args:
+            sort: One of ``TENANT_SORTS``; ties are broken by ID
+            after: Keyset cursor (sort value, id) of the last row of the
+                previous page
+        """
+        counts = latest_values_subquery(UsageStat.METRIC_ACTIVE_STUDENTS)
+        sort_column = {
+            "name": Tenant.name,
+            "created_at": Tenant.created_at,
+            "student_count": func.coalesce(counts.c.value, 0),
+        }[sort]
+        stmt = (
+            select(Tenant, counts.c.value)
+            .outerjoin(counts, counts.c.tenant_id == Tenant.id)
+            .limit(limit)
+        )
+        if descending:
+            stmt = stmt.order_by(sort_column.desc(), Tenant.id.desc())
+        else:
+            stmt = stmt.order_by(sort_column, Tenant.id)
+        if not include_inactive:
+            stmt = stmt.where(Tenant.is_active == True)
+        if after:
+            position = tuple_(sort_column, Tenant.id)
+            stmt = stmt.where(position < tuple(after) if descending else position > tuple(after))
+        result = await self.session.execute(stmt)
+        return [(tenant, count) for tenant, count in result.all()]
+
+    async def count_active_students(self, schemas: dict[int, str]) -> dict[int, int]:
+        """Count active students of many tenants with one UNION ALL query.
+
+        Args:
+            schemas: Schema name by tenant ID; schemas without a students
+                table (not provisioned yet) are skipped on PostgreSQL
+        """
+        bind = self.session.get_bind()
+        if schemas and bind.dialect.name == "postgresql":
+            result = await self.session.execute(
+                text(
+                    "SELECT table_schema FROM information_schema.tables "
+                    "WHERE table_name = 'students' AND table_schema = ANY(:schemas)"
+                ),
+                {"schemas": list(schemas.values())},
+            )
+            existing = set(result.scalars().all())
+            schemas = {tenant_id: schema for tenant_id, schema in schemas.items() if schema in existing}
+        if not schemas:
+            return {}
+
+        quote_schema = bind.dialect.identifier_preparer.quote_schema
+        query = " UNION ALL ".join(
+            f"SELECT {int(tenant_id)} AS tenant_id, COUNT(*) AS students "
+            f"FROM {quote_schema(schema)}.students WHERE status = 'ACTIVE'"
+            for tenant_id, schema in schemas.items()
+        )
+        result = await self.session.execute(text(query))
+        return {tenant_id: students for tenant_id, students in result.all()}
+
     async def count(self, include_inactive: bool = False) -> int:
         """Count total tenants."""
         stmt = select(func.count(Tenant.id))
@@ -0,0 +1,108 @@
+"""Usage Stat repository for per-tenant usage metrics."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import date
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.usage_stat import UsageStat
+
+# Rows per INSERT, well under the bind-parameter limits of both dialects
+CHUNK_SIZE = 500
+
+
+def latest_values_subquery(metric_name: str):
+    """(tenant_id, value) of each tenant's most recent day for ``metric_name``."""
+    latest = (
+        select(UsageStat.tenant_id, func.max(UsageStat.stat_date).label("stat_date"))
+        .where(UsageStat.metric_name == metric_name)
+        .group_by(UsageStat.tenant_id)
+        .subquery()
+    )
+    return (
+        select(UsageStat.tenant_id, UsageStat.value)
+        .join(
+            latest,
+            and_(UsageStat.tenant_id == latest.c.tenant_id, UsageStat.stat_date == latest.c.stat_date),
+        )
+        .where(UsageStat.metric_name == metric_name)
+        .subquery()
+    )
+
+
+class UsageStatRepository:
+    """Repository for UsageStat rows (one per tenant, day and metric)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _insert(self):
+        dialect = postgresql if self.session.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(UsageStat)
+
+    async def set_values(self, metric_name: str, stat_date: date, values: dict[int, int]) -> None:
+        """Store absolute values (gauges such as active students) for ``stat_date``.
+
+        Args:
+            values: Value by tenant ID; existing rows for the day are overwritten
+        """
+        rows = [
+            {"tenant_id": tenant_id, "stat_date": stat_date, "metric_name": metric_name, "value": value}
+            for tenant_id, value in values.items()
+        ]
+        for offset in range(0, len(rows), CHUNK_SIZE):
+            stmt = self._insert().values(rows[offset:offset + CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["tenant_id", "stat_date", "metric_name"],
+                set_={"value": stmt.excluded.value},
+            )
+            await self.session.execute(stmt)
+
+    async def add_values(self, rows: list[tuple[int, date, str, int]]) -> None:
+        """Add counts to their (tenant, day, metric) rows, creating missing rows.
+
+        Args:
+            rows: (tenant_id, stat_date, metric_name, amount) tuples, one per key
+        """
+        values = [
+            {"tenant_id": tenant_id, "stat_date": stat_date, "metric_name": metric_name, "value": amount}
+            for tenant_id, stat_date, metric_name, amount in rows
+        ]
+        for offset in range(0, len(values), CHUNK_SIZE):
+            stmt = self._insert().values(values[offset:offset + CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["tenant_id", "stat_date", "metric_name"],
+                set_={"value": UsageStat.value + stmt.excluded.value},
+            )
+            await self.session.execute(stmt)
+
+    async def series(
+        self,
+        tenant_id: int,
+        start: date,
+        end: date,
+        metric_names: Collection[str] | None = None,
+    ) -> list[UsageStat]:
+        """Daily rows of a tenant between ``start`` and ``end`` (inclusive), oldest first."""
+        stmt = (
+            select(UsageStat)
+            .where(UsageStat.tenant_id == tenant_id, UsageStat.stat_date >= start, UsageStat.stat_date <= end)
+            .order_by(UsageStat.stat_date, UsageStat.metric_name)
+        )
+        if metric_names:
+            stmt = stmt.where(UsageStat.metric_name.in_(list(metric_names)))
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def latest_values(self, metric_name: str, tenant_ids: Collection[int] | None = None) -> dict[int, int]:
+        """Most recent value of ``metric_name`` by tenant ID (tenants without data are left out)."""
+        latest = latest_values_subquery(metric_name)
+        stmt = select(latest.c.tenant_id, latest.c.value)
+        if tenant_ids is not None:
+            stmt = stmt.where(latest.c.tenant_id.in_(list(tenant_ids)))
+        result = await self.session.execute(stmt)
+        return {tenant_id: value for tenant_id, value in result.all()}
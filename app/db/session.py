@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
@@ -28,6 +30,18 @@ engine = create_async_engine(
 async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
+def use_unpooled_engine() -> None:
+    """Open a new connection for every session instead of pooling them.
+
+    Pooled asyncpg connections belong to the event loop that opened them.
+    In-process RQ workers run each job under its own ``asyncio.run``, so a
+    pooled connection handed to the next job would belong to a closed loop.
+    """
+    global engine
+    engine = create_async_engine(settings.database_url, future=True, poolclass=NullPool)
+    async_session.configure(bind=engine)
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Get a database session with public schema (for super admin or backwards compatibility)."""
     async with async_session() as session:
@@ -58,7 +72,9 @@ def validate_schema_name(schema_name: str) -> bool:
     return True
 
 
-async def get_tenant_session(schema_name: str) -> AsyncGenerator[AsyncSession, None]:
+async def get_tenant_session(
+    schema_name: str, session_factory: async_sessionmaker[AsyncSession] | None = None
+) -> AsyncGenerator[AsyncSession, None]:
     """
     Get a database session with search_path set to tenant schema.
 
@@ -70,6 +86,8 @@ async def get_tenant_session(schema_name: str) -> AsyncGenerator[AsyncSession, N
 
     Args:
         schema_name: The tenant schema name (e.g., 'tenant_colegio_abc')
+        session_factory: Session factory to open the session from (defaults to
+            the application's ``async_session``)
 
     Yields:
         AsyncSession with search_path configured for the tenant
@@ -80,7 +98,7 @@ async def get_tenant_session(schema_name: str) -> AsyncGenerator[AsyncSession, N
     # TDD-BUG4.1 fix: Validate schema name before using in SQL
     validate_schema_name(schema_name)
 
-    async with async_session() as session:
+    async with (session_factory or async_session)() as session:
         # Set schema search path for this connection
         await session.execute(text(f"SET search_path TO {schema_name}, public"))
         try:
@@ -98,6 +116,34 @@ async def get_tenant_session(schema_name: str) -> AsyncGenerator[AsyncSession, N
                 pass  # Connection may be in bad state, will be recycled
 
 
+@asynccontextmanager
+async def tenant_session_scope(
+    schema_name: str | None, session_factory: async_sessionmaker[AsyncSession] | None = None
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Context manager form of get_tenant_session for background jobs.
+
+    Jobs carry the tenant schema in their payload; when it is missing
+    (single-tenant deployments) the public-schema session is used.
+
+    Args:
+        schema_name: The tenant schema name, or None for public schema
+        session_factory: Session factory to open the session from (defaults to
+            the application's ``async_session``)
+    """
+    if not schema_name:
+        async with (session_factory or async_session)() as session:
+            yield session
+        return
+
+    session_gen = get_tenant_session(schema_name, session_factory)
+    session = await session_gen.__anext__()
+    try:
+        yield session
+    finally:
+        await session_gen.aclose()
+
+
 async def get_session_for_tenant(tenant: "Tenant") -> AsyncGenerator[AsyncSession, None]:
     """
     Get a database session for a specific tenant.
@@ -0,0 +1,140 @@
+"""Building tenant schemas and the pool of pre-built spare schemas.
+
+A tenant schema holds every model table without an explicit schema, created
+from ``Base.metadata`` with ``schema_translate_map`` so foreign keys, indexes,
+enum types and serial sequences all live in the new schema. The model
+metadata is the template: it is what the running code expects, at the
+Alembic head revision shipped with it. Each built schema is stamped with that
+revision in its ``COMMENT``.
+
+Spare schemas (``tenant__spare_<hex>``) are built ahead of time. Creating a
+tenant claims one with ``ALTER SCHEMA ... RENAME``, which only touches the
+catalog, so onboarding does not wait for ~20 ``CREATE TABLE`` statements.
+Spares stamped with an older revision are never claimed; the replenish job
+drops and rebuilds them after a migration. Slugs are sanitized to start with
+a letter, so ``tenant__`` names never collide with a tenant.
+
+Schema DDL is PostgreSQL-only, like tenant schemas themselves.
+"""
+
+from __future__ import annotations
+
+import re
+import secrets
+from functools import lru_cache
+from pathlib import Path
+
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import Base
+
+SPARE_SCHEMA_PREFIX = "tenant__spare_"
+
+_SCHEMA_NAME_RE = re.compile(r"^tenant_[a-z0-9_]+$")
+_MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+
+def _validate(schema_name: str) -> str:
+    if not _SCHEMA_NAME_RE.match(schema_name) or len(schema_name) > 63:
+        raise ValueError(f"Invalid schema name: {schema_name}")
+    return schema_name
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """Alembic head revision of the code base (the revision the models match)."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", str(_MIGRATIONS_DIR))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+def tenant_tables() -> list[Table]:
+    """Model tables that live in each tenant schema, in dependency order."""
+    import app.db.models  # noqa: F401 - register every model on Base.metadata
+
+    return [table for table in Base.metadata.sorted_tables if table.schema is None]
+
+
+def create_tables(connection: Connection, schema_name: str) -> None:
+    """Create every tenant table inside ``schema_name`` (sync, for ``run_sync``)."""
+    translated = connection.execution_options(schema_translate_map={None: _validate(schema_name)})
+    Base.metadata.create_all(translated, tables=tenant_tables())
+
+
+async def database_revision(session: AsyncSession) -> str | None:
+    """Revision stamped in ``public.alembic_version`` (None if Alembic never ran)."""
+    if not await session.scalar(text("SELECT to_regclass('public.alembic_version') IS NOT NULL")):
+        return None
+    return await session.scalar(text("SELECT version_num FROM public.alembic_version"))
+
+
+async def build_schema(session: AsyncSession, schema_name: str) -> None:
+    """Create ``schema_name`` with all tenant tables and stamp the head revision."""
+    _validate(schema_name)
+    await session.execute(text(f"CREATE SCHEMA {schema_name}"))
+    connection = await session.connection()
+    await connection.run_sync(create_tables, schema_name)
+    await session.execute(text(f"COMMENT ON SCHEMA {schema_name} IS '{head_revision()}'"))
+
+
+async def list_spares(session: AsyncSession) -> dict[str, str | None]:
+    """Stamped revision of each spare schema, by name."""
+    result = await session.execute(
+        text(
+            "SELECT nspname, obj_description(oid, 'pg_namespace') FROM pg_namespace "
+            "WHERE nspname LIKE :pattern ORDER BY nspname"
+        ),
+        {"pattern": SPARE_SCHEMA_PREFIX.replace("_", "\\_") + "%"},
+    )
+    return {name: revision for name, revision in result.all()}
+
+
+async def claim_spare(session: AsyncSession, schema_name: str) -> bool:
+    """Rename a current spare schema to ``schema_name`` within the session's transaction.
+
+    Returns:
+        False if no spare at the head revision could be claimed
+    """
+    _validate(schema_name)
+    head = head_revision()
+    for spare, revision in (await list_spares(session)).items():
+        if revision != head:
+            continue
+        # Skip spares another transaction is claiming instead of waiting on its lock
+        if not await session.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext(:name))"), {"name": spare}):
+            continue
+        try:
+            async with session.begin_nested():
+                await session.execute(text(f"ALTER SCHEMA {spare} RENAME TO {schema_name}"))
+        except DBAPIError:
+            continue  # Claimed and committed by someone else since we listed it
+        return True
+    return False
+
+
+async def replenish_spares(session: AsyncSession, target: int) -> tuple[int, int]:
+    """Drop spares from older revisions and build new ones up to ``target``.
+
+    Each schema is committed on its own so a claim never waits on the whole batch.
+
+    Returns:
+        (created, dropped) schema counts
+    """
+    head = head_revision()
+    spares = await list_spares(session)
+    stale = [name for name, revision in spares.items() if revision != head]
+    for name in stale:
+        await session.execute(text(f"DROP SCHEMA {_validate(name)} CASCADE"))
+        await session.commit()
+
+    missing = max(target - (len(spares) - len(stale)), 0)
+    for _ in range(missing):
+        await build_schema(session, f"{SPARE_SCHEMA_PREFIX}{secrets.token_hex(6)}")
+        await session.commit()
+    return missing, len(stale)
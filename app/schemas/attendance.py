@@ -43,3 +43,28 @@ class AttendanceEventCreate(BaseModel):
 class AttendanceEventRead(AttendanceEventCreate):
     id: int
     synced_at: datetime | None = None
+
+
+class EvidenceKind(str, Enum):
+    PHOTO = "photo"
+    AUDIO = "audio"
+
+
+class EvidenceUploadRequest(BaseModel):
+    kind: EvidenceKind = EvidenceKind.PHOTO
+    content_type: str = Field(..., max_length=64)
+    filename: str | None = Field(default=None, max_length=255)
+
+
+class EvidenceUploadTicket(BaseModel):
+    """Presigned POST: send ``fields`` plus the file as multipart form data to ``url``."""
+
+    key: str
+    url: str
+    fields: dict[str, str]
+    max_bytes: int
+    expires_in: int
+
+
+class EvidenceUploadConfirm(BaseModel):
+    key: str = Field(..., max_length=255)
@@ -1,6 +1,6 @@
 """Notification schemas."""
 
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Any
 
@@ -18,6 +18,7 @@ class NotificationType(str, Enum):
     SALIDA_OK = "SALIDA_OK"
     NO_INGRESO_UMBRAL = "NO_INGRESO_UMBRAL"
     CAMBIO_HORARIO = "CAMBIO_HORARIO"
+    RESUMEN_DIARIO = "RESUMEN_DIARIO"
 
 
 class NotificationDispatchRequest(BaseModel):
@@ -31,6 +32,7 @@ class NotificationDispatchRequest(BaseModel):
 class NotificationRead(BaseModel):
     id: int
     guardian_id: int
+    student_id: int | None = None
     channel: NotificationChannel
     template: NotificationType
     status: str
@@ -42,13 +44,15 @@ class NotificationRead(BaseModel):
 class BroadcastScope(str, Enum):
     """R3-V3 fix: Valid broadcast scope values."""
     GLOBAL = "global"
+    GRADE = "grade"
     COURSE = "course"
     CUSTOM = "custom"
 
 
 class BroadcastAudience(BaseModel):
     # R3-V3 fix: Use enum for scope validation
-    scope: BroadcastScope = Field(..., description="global|course|custom")
+    scope: BroadcastScope = Field(..., description="global|grade|course|custom")
+    grades: list[str] | None = None
     course_ids: list[int] | None = None
     guardian_ids: list[int] | None = None
 
@@ -66,15 +70,56 @@ class BroadcastPreview(BaseModel):
     subject: str
     message: str
     recipients: int
+    # Guardians reachable per channel (a guardian may count in several)
+    with_whatsapp: int = 0
+    with_email: int = 0
+    with_push: int = 0
     dry_run: bool = True
 
 
+class BroadcastStatus(BaseModel):
+    """Progress of a broadcast job, polled by the broadcast page."""
+
+    job_id: str
+    status: str
+    guardians: int = 0
+    total: int = 0
+    queued: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
 class NotificationLog(NotificationRead):
     payload: dict[str, Any] | None = None
 
 
 class NotificationSummaryResponse(BaseModel):
+    window: str = "today"
+    since: date | None = None
     total: int
     by_status: dict[str, int] = Field(default_factory=dict)
     by_channel: dict[str, int] = Field(default_factory=dict)
     by_template: dict[str, int] = Field(default_factory=dict)
+
+
+class DeadLetterEntry(BaseModel):
+    """Send job that exhausted its retries or failed permanently."""
+
+    func: str
+    origin: str
+    reason: str
+    error: str
+    notification_ids: list[int] = Field(default_factory=list)
+    failed_at: datetime
+
+
+class DeadLetterList(BaseModel):
+    total: int
+    items: list[DeadLetterEntry] = Field(default_factory=list)
+
+
+class DeadLetterReplayResponse(BaseModel):
+    replayed_jobs: int
+    notifications: int
+    remaining: int
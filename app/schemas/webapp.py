@@ -126,6 +126,7 @@ class DashboardEvent(BaseModel):
     device_id: str
     photo_ref: str | None = None
     photo_url: str | None = None
+    photo_thumb_url: str | None = None
 
 
 class DashboardStats(BaseModel):
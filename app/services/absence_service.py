@@ -9,6 +9,7 @@ from app.db.repositories.absences import AbsenceRepository
 from app.db.repositories.guardians import GuardianRepository
 from app.db.repositories.students import StudentRepository
 from app.schemas.absences import AbsenceRequestCreate, AbsenceStatus
+from app.services.calendar_service import CalendarService
 
 
 class AbsenceService:
@@ -19,6 +20,7 @@ class AbsenceService:
         self.absence_repo = AbsenceRepository(session)
         self.student_repo = StudentRepository(session)
         self.guardian_repo = GuardianRepository(session)
+        self.calendar = CalendarService(session)
 
     async def submit_absence(self, user: AuthUser, payload: AbsenceRequestCreate):
         student = await self.student_repo.get(payload.student_id)
@@ -87,5 +89,7 @@ class AbsenceService:
 
     async def update_status(self, absence_id: int, status: AbsenceStatus) -> object:
         record = await self.absence_repo.update_status(absence_id, status.value)
+        # Approved requests excuse the student in dashboard, reports and alerts
+        await self.calendar.on_absence_changed(record.student_id, record.start_date, record.end_date)
         await self.session.commit()
         return record
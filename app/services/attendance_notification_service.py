@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from loguru import logger
@@ -9,27 +11,56 @@ from redis import Redis
 from rq import Queue
 
 from app.core.config import settings
+from app.core.tenant_middleware import current_tenant_schema
 from app.db.repositories.guardians import GuardianRepository
 from app.db.repositories.notifications import NotificationRepository
-from app.db.repositories.push_subscriptions import PushSubscriptionRepository
 from app.db.repositories.students import StudentRepository
 from app.schemas.notifications import NotificationChannel, NotificationType
+from app.services.notifications.coalescing import NotificationCoalescer, digest_enabled, merge_events
+from app.workers.queues import REALTIME_QUEUE
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from app.db.models.attendance_event import AttendanceEvent
+    from app.db.models.student import Student
+
+
+JOB_FUNCS = {
+    NotificationChannel.WHATSAPP: "app.workers.jobs.send_whatsapp.send_whatsapp_message",
+    NotificationChannel.EMAIL: "app.workers.jobs.send_email.send_email_message",
+}
+
+FLUSH_FUNC = "app.workers.jobs.flush_notifications.flush_coalesced_notifications"
+
+
+@dataclass(frozen=True)
+class PlannedDelivery:
+    """One notification to create: a guardian reached on a channel."""
+
+    guardian_id: int
+    channel: NotificationChannel
+    recipient: str
+    # Push only: endpoint and keys of the target device
+    subscription_info: dict | None = None
 
 
 class AttendanceNotificationService:
     """Handles notification dispatch when attendance events occur."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        tenant_id: int | None = None,
+        tenant_schema: str | None = None,
+    ) -> None:
         self.session = session
+        self.tenant_id = tenant_id
+        # Workers pass the schema explicitly; API requests take it from the middleware
+        self.tenant_schema = tenant_schema or current_tenant_schema.get()
         self.notification_repo = NotificationRepository(session)
         self.guardian_repo = GuardianRepository(session)
         self.student_repo = StudentRepository(session)
-        self.push_repo = PushSubscriptionRepository(session)
         self._redis: Redis | None = None
         self._queue: Queue | None = None
 
@@ -49,7 +80,7 @@ class AttendanceNotificationService:
                 self._redis = Redis.from_url(settings.redis_url)
                 # Test connection
                 self._redis.ping()
-                self._queue = Queue("notifications", connection=self._redis)
+                self._queue = Queue(REALTIME_QUEUE, connection=self._redis)
             except Exception as e:
                 logger.error(f"Redis unavailable, notifications disabled: {e}")
                 return None
@@ -59,24 +90,33 @@ class AttendanceNotificationService:
         self,
         event: AttendanceEvent,
         photo_url: str | None = None,
+        student: Student | None = None,
     ) -> list[int]:
         """
         Send notifications to all guardians of a student when an attendance event occurs.
 
+        Guardians, contacts, preferences and push subscriptions are loaded in
+        one query; all notification rows are inserted with one executemany and
+        all jobs are enqueued in one Redis pipeline. Guardians on the daily
+        digest are skipped, and scans inside a guardian's coalescing window
+        are buffered and sent as one merged message when it closes.
+
         Args:
             event: The attendance event (IN or OUT)
             photo_url: Optional presigned URL to the photo evidence
+            student: The event's student if the caller already loaded it
 
         Returns:
-            List of notification IDs created
+            List of notification IDs created (buffered events create none yet)
         """
-        student = await self.student_repo.get_with_guardians(event.student_id)
+        if student is None:
+            student = await self.student_repo.get(event.student_id)
         if not student:
             logger.warning(f"Student {event.student_id} not found for notification")
             return []
 
-        guardians = getattr(student, "guardians", [])
-        if not guardians:
+        targets = await self.guardian_repo.list_notification_targets(student.id)
+        if not targets:
             logger.info(f"No guardians found for student {event.student_id}")
             return []
 
@@ -92,69 +132,156 @@ class AttendanceNotificationService:
         evidence_pref = getattr(student, "effective_evidence_preference", "none")
         photo_allowed = evidence_pref == "photo"
 
-        notification_ids = []
+        # Build payload with event details (identical for every guardian)
+        payload = self._build_payload(
+            student=student,
+            event=event,
+            photo_url=photo_url if photo_allowed else None,
+        )
 
-        for guardian in guardians:
-            # Check guardian notification preferences
-            prefs = guardian.notification_prefs or {}
-            event_prefs = prefs.get(notification_type.value, {})
-
-            # Build payload with event details
-            payload = self._build_payload(
-                student=student,
-                event=event,
-                photo_url=photo_url if photo_allowed else None,
+        # Digest guardians get the evening summary instead of per-event messages
+        targets = [t for t in targets if not digest_enabled(t["notification_prefs"])]
+        targets = self._coalesce(targets, notification_type, payload)
+        if not targets:
+            return []
+
+        return await self._deliver(targets, notification_type, payload, event.id)
+
+    async def deliver_coalesced(self, guardian_id: int, entries: list[dict]) -> list[int]:
+        """Send the merged messages for a guardian's closed coalescing window.
+
+        Args:
+            guardian_id: Guardian whose buffer was drained
+            entries: Buffered ``{"type", "payload"}`` events
+
+        Returns:
+            List of notification IDs created
+        """
+        targets = await self.guardian_repo.list_notification_targets(guardian_id=guardian_id)
+        # The guardian may have switched to the digest while the window was open
+        targets = [t for t in targets if not digest_enabled(t["notification_prefs"])]
+        if not targets:
+            return []
+
+        notification_ids: list[int] = []
+        for notification_type, payload in merge_events(entries):
+            notification_ids.extend(
+                await self._deliver(targets, notification_type, payload, payload.get("event_id"))
             )
+        return notification_ids
+
+    def _coalesce(
+        self,
+        targets: list[dict],
+        notification_type: NotificationType,
+        payload: dict,
+    ) -> list[dict]:
+        """Buffer the event per guardian; return the targets to notify right away.
+
+        The first event of a window schedules the flush job. Without Redis (or
+        with NOTIFICATION_COALESCE_SECONDS=0) every target is notified now.
+        """
+        window = settings.notification_coalesce_seconds
+        queue = self.queue if window > 0 else None
+        if queue is None:
+            return targets
+
+        coalescer = NotificationCoalescer(queue.connection, self.tenant_schema, window)
+        immediate = []
+        for target in targets:
+            guardian_id = target["guardian_id"]
+            opened = coalescer.add(guardian_id, notification_type, payload)
+            if opened is None:
+                immediate.append(target)
+            elif opened:
+                try:
+                    queue.enqueue_in(
+                        timedelta(seconds=window), FLUSH_FUNC, guardian_id, self.tenant_id, self.tenant_schema
+                    )
+                except Exception as e:
+                    # Nobody would flush this window: take the event back and send it now
+                    logger.warning(f"Could not schedule coalesced flush for guardian {guardian_id}: {e}")
+                    coalescer.drain(guardian_id)
+                    immediate.append(target)
+        return immediate
+
+    async def _deliver(
+        self,
+        targets: list[dict],
+        notification_type: NotificationType,
+        payload: dict,
+        event_id: int | None,
+    ) -> list[int]:
+        """Create and enqueue the notifications for one message to these guardians."""
+        deliveries = self.plan_deliveries(targets, notification_type)
+        if not deliveries:
+            return []
+
+        notification_ids = await self.notification_repo.bulk_create(
+            [
+                {
+                    "guardian_id": delivery.guardian_id,
+                    "channel": delivery.channel.value,
+                    "template": notification_type.value,
+                    "payload": payload,
+                    "event_id": event_id,
+                    "student_id": payload.get("student_id"),
+                }
+                for delivery in deliveries
+            ]
+        )
+        # Rows must be visible to the send workers before their jobs exist
+        await self.session.commit()
+
+        self._enqueue_deliveries(
+            list(zip(notification_ids, deliveries)),
+            template=notification_type.value,
+            payload=payload,
+            push_payload=self._build_push_payload(notification_type, payload),
+        )
+        logger.info(
+            f"Queued {len(notification_ids)} {notification_type.value} notification(s) for "
+            f"{len(targets)} guardian(s) (event {event_id})"
+        )
+
+        return notification_ids
+
+    def plan_deliveries(
+        self,
+        targets: list[dict],
+        notification_type: NotificationType,
+    ) -> list[PlannedDelivery]:
+        """Compute the (guardian, channel, recipient) set from preferences and contacts."""
+        push_configured = bool(settings.vapid_public_key and settings.vapid_private_key)
+        deliveries: list[PlannedDelivery] = []
+
+        for target in targets:
+            # Check guardian notification preferences
+            event_prefs = target["notification_prefs"].get(notification_type.value, {})
 
-            # Process each enabled channel
             for channel in NotificationChannel:
                 if not self._is_channel_enabled(event_prefs, channel):
                     continue
 
-                # PUSH channel is handled separately - uses subscriptions, not contacts
+                # PUSH uses subscriptions, not contacts: one delivery per device
                 if channel == NotificationChannel.PUSH:
-                    push_ids = await self._process_push_notifications(
-                        guardian=guardian,
-                        notification_type=notification_type,
-                        payload=payload,
-                        event_id=event.id,
+                    if not push_configured:
+                        continue
+                    deliveries.extend(
+                        PlannedDelivery(target["guardian_id"], channel, subscription["endpoint"], subscription)
+                        for subscription in target["push_subscriptions"]
                     )
-                    notification_ids.extend(push_ids)
                     continue
 
-                recipient = self._get_recipient(guardian, channel)
+                recipient = self._get_recipient(target["contacts"], channel)
                 if not recipient:
                     logger.debug(
-                        f"Guardian {guardian.id} has no {channel.value} contact"
+                        f"Guardian {target['guardian_id']} has no {channel.value} contact"
                     )
                     continue
+                deliveries.append(PlannedDelivery(target["guardian_id"], channel, recipient))
 
-                # Create notification record
-                notification = await self.notification_repo.create(
-                    guardian_id=guardian.id,
-                    channel=channel.value,
-                    template=notification_type.value,
-                    payload=payload,
-                    event_id=event.id,
-                )
-                await self.session.flush()
-
-                # Enqueue for async delivery
-                self._enqueue_notification(
-                    notification_id=notification.id,
-                    channel=channel,
-                    recipient=recipient,
-                    template=notification_type.value,
-                    payload=payload,
-                )
-
-                notification_ids.append(notification.id)
-                logger.info(
-                    f"Queued {channel.value} notification {notification.id} "
-                    f"for guardian {guardian.id} (event {event.id})"
-                )
-
-        return notification_ids
+        return deliveries
 
     def _build_payload(
         self,
@@ -191,112 +318,11 @@ class AttendanceNotificationService:
         }
         return event_prefs.get(channel.value.lower(), defaults.get(channel, False))
 
-    def _get_recipient(self, guardian, channel: NotificationChannel) -> str | None:
+    def _get_recipient(self, contacts: dict, channel: NotificationChannel) -> str | None:
         """Get the recipient address for a channel from guardian contacts."""
-        contacts = guardian.contacts or {}
         channel_key = channel.value.lower()
         return contacts.get(channel_key)
 
-    def _enqueue_notification(
-        self,
-        notification_id: int,
-        channel: NotificationChannel,
-        recipient: str,
-        template: str,
-        payload: dict,
-    ) -> bool:
-        """Enqueue notification for async processing by worker.
-
-        Returns:
-            True if notification was enqueued, False if Redis unavailable.
-        """
-        queue = self.queue
-        if queue is None:
-            logger.warning(
-                f"Skipping notification {notification_id}: Redis unavailable"
-            )
-            return False
-
-        job_func_map = {
-            NotificationChannel.WHATSAPP: "app.workers.jobs.send_whatsapp.send_whatsapp_message",
-            NotificationChannel.EMAIL: "app.workers.jobs.send_email.send_email_message",
-        }
-
-        job_func = job_func_map.get(channel)
-        if not job_func:
-            logger.error(f"Unknown notification channel: {channel}")
-            return False
-
-        # Pass notification_id, recipient, template name, and variables
-        queue.enqueue(
-            job_func,
-            notification_id,
-            recipient,
-            template,
-            payload,
-        )
-        return True
-
-    async def _process_push_notifications(
-        self,
-        guardian,
-        notification_type: NotificationType,
-        payload: dict,
-        event_id: int,
-    ) -> list[int]:
-        """Process push notifications for a guardian's subscriptions.
-
-        Args:
-            guardian: The guardian to notify
-            notification_type: Type of notification
-            payload: Notification payload
-            event_id: The attendance event ID
-
-        Returns:
-            List of notification IDs created
-        """
-        # Check if VAPID is configured
-        if not settings.vapid_public_key or not settings.vapid_private_key:
-            logger.debug("VAPID not configured, skipping push notifications")
-            return []
-
-        # Get active push subscriptions for this guardian
-        subscriptions = await self.push_repo.list_active_by_guardian(guardian.id)
-        if not subscriptions:
-            logger.debug(f"Guardian {guardian.id} has no push subscriptions")
-            return []
-
-        notification_ids = []
-
-        # Build push-specific payload
-        push_payload = self._build_push_payload(notification_type, payload)
-
-        for subscription in subscriptions:
-            # Create notification record
-            notification = await self.notification_repo.create(
-                guardian_id=guardian.id,
-                channel=NotificationChannel.PUSH.value,
-                template=notification_type.value,
-                payload=payload,
-                event_id=event_id,
-            )
-            await self.session.flush()
-
-            # Enqueue push notification
-            self._enqueue_push_notification(
-                notification_id=notification.id,
-                subscription=subscription,
-                push_payload=push_payload,
-            )
-
-            notification_ids.append(notification.id)
-            logger.info(
-                f"Queued PUSH notification {notification.id} "
-                f"for guardian {guardian.id} (subscription {subscription.id})"
-            )
-
-        return notification_ids
-
     def _build_push_payload(
         self,
         notification_type: NotificationType,
@@ -331,39 +357,60 @@ class AttendanceNotificationService:
             "data": payload,
         }
 
-    def _enqueue_push_notification(
+    def _enqueue_deliveries(
         self,
-        notification_id: int,
-        subscription,
+        planned: list[tuple[int, PlannedDelivery]],
+        template: str,
+        payload: dict,
         push_payload: dict,
     ) -> bool:
-        """Enqueue a push notification for async processing.
+        """Enqueue every delivery of an event in a single Redis pipeline.
 
-        Args:
-            notification_id: ID of the notification record
-            subscription: PushSubscription model instance
-            push_payload: Push notification payload
+        WhatsApp and email get one job per notification; push deliveries are
+        grouped into one send_push_batch job that fans out concurrently.
 
         Returns:
-            True if enqueued successfully
+            True if notifications were enqueued, False if Redis unavailable.
         """
         queue = self.queue
         if queue is None:
-            logger.warning(f"Skipping push notification {notification_id}: Redis unavailable")
+            logger.warning(
+                f"Skipping {len(planned)} notification(s): Redis unavailable"
+            )
             return False
 
-        subscription_info = {
-            "endpoint": subscription.endpoint,
-            "keys": {
-                "p256dh": subscription.p256dh,
-                "auth": subscription.auth,
-            },
-        }
+        jobs = []
+        push_notifications = []
+        for notification_id, delivery in planned:
+            if delivery.channel == NotificationChannel.PUSH:
+                push_notifications.append(
+                    {
+                        "notification_id": notification_id,
+                        "subscription_info": delivery.subscription_info,
+                        "payload": push_payload,
+                    }
+                )
+                continue
+            # Pass notification_id, recipient, template name, variables and tenant
+            # (the tenant selects credentials and the rate-limit bucket in the worker,
+            # the schema is where the worker records the send status)
+            jobs.append(
+                Queue.prepare_data(
+                    JOB_FUNCS[delivery.channel],
+                    args=(
+                        notification_id, delivery.recipient, template, payload, self.tenant_id, self.tenant_schema
+                    ),
+                )
+            )
 
-        queue.enqueue(
-            "app.workers.jobs.send_push.send_push_notification",
-            notification_id,
-            subscription_info,
-            push_payload,
-        )
+        if push_notifications:
+            # The schema lets the worker record status and prune expired subscriptions
+            jobs.append(
+                Queue.prepare_data(
+                    "app.workers.jobs.send_push.send_push_batch",
+                    args=(push_notifications, self.tenant_id, self.tenant_schema),
+                )
+            )
+
+        queue.enqueue_many(jobs)
         return True
@@ -9,28 +9,49 @@ import uuid
 
 from loguru import logger
 
+from app.db.models.usage_stat import UsageStat
 from app.db.repositories.attendance import AttendanceRepository
 from app.db.repositories.guardians import GuardianRepository
 from app.db.repositories.schedules import ScheduleRepository
 from app.db.repositories.students import StudentRepository
 from app.db.repositories.no_show_alerts import NoShowAlertRepository
-from app.schemas.attendance import AttendanceEventCreate, AttendanceEventRead
+from app.schemas.attendance import (
+    AttendanceEventCreate,
+    AttendanceEventRead,
+    EvidenceKind,
+    EvidenceUploadTicket,
+)
 from app.core.config import settings
+from app.services.calendar_service import CalendarService
 from app.services.photo_service import PhotoService
+from app.services.usage_meter import get_usage_meter
 
 if TYPE_CHECKING:
     from app.services.attendance_notification_service import AttendanceNotificationService
 
 
 class AttendanceService:
-    def __init__(self, session, notification_service: AttendanceNotificationService | None = None):
+    def __init__(
+        self,
+        session,
+        notification_service: AttendanceNotificationService | None = None,
+        tenant_schema: str | None = None,
+        photo_service: PhotoService | None = None,
+        tenant_id: int | None = None,
+    ):
         self.session = session
+        # Schema handed to background jobs (evidence validation)
+        self.tenant_schema = tenant_schema
+        # Usage metering (usage_stats)
+        self.tenant_id = tenant_id
         self.attendance_repo = AttendanceRepository(session)
         self.student_repo = StudentRepository(session)
         self.schedule_repo = ScheduleRepository(session)
         self.guardian_repo = GuardianRepository(session)
-        self.photo_service = PhotoService()
+        # Tenant-routed storage when wired by deps/jobs, the default backend otherwise
+        self.photo_service = photo_service or PhotoService()
         self.no_show_repo = NoShowAlertRepository(session)
+        self.calendar = CalendarService(session)
         self._notification_service = notification_service
 
     async def register_event(self, payload: AttendanceEventCreate) -> AttendanceEventRead:
@@ -47,8 +68,11 @@ class AttendanceService:
             photo_ref=payload.photo_ref,
             local_seq=payload.local_seq,
         )
+        if payload.type.value == "IN":
+            await self.resolve_no_show_alerts([payload.student_id], event.occurred_at)
 
         await self.session.commit()
+        get_usage_meter().record(self.tenant_id, UsageStat.METRIC_ATTENDANCE_EVENTS)
 
         # Trigger notifications to guardians
         # R12-P1 fix: Pass student to avoid duplicate fetch
@@ -76,14 +100,16 @@ class AttendanceService:
                         # R2-B10 fix: Reduce presigned URL expiry from 7 days to 24 hours
                         # WhatsApp has 24h to download media, 7 days was excessive security risk
                         # R12-P5 fix: Now async, use await
+                        # Messages link the medium WebP variant when it is ready
                         photo_url = await self.photo_service.generate_presigned_url(
-                            event.photo_ref,
+                            event.photo_medium_ref or event.photo_ref,
                             expires=24 * 3600,  # 24 hours
                         )
 
             notification_ids = await self._notification_service.notify_attendance_event(
                 event=event,
                 photo_url=photo_url,
+                student=student,
             )
             await self.session.commit()
 
@@ -99,7 +125,24 @@ class AttendanceService:
         events = await self.attendance_repo.list_by_student(student_id)
         return [AttendanceEventRead.model_validate(event, from_attributes=True) for event in events]
 
-    async def detect_no_show_alerts(self, current_dt: datetime) -> list[dict]:
+    async def resolve_no_show_alerts(self, student_ids: list[int], occurred_at: datetime) -> None:
+        """Close the pending no-show alerts of students who checked in late."""
+        occurred_utc = occurred_at.astimezone(timezone.utc) if occurred_at.tzinfo else occurred_at
+        resolved = await self.no_show_repo.resolve_checked_in(
+            student_ids, occurred_utc.date(), datetime.now(timezone.utc)
+        )
+        if resolved:
+            logger.info("[NoShow] %d alert(s) resolved by check-in", resolved)
+
+    async def detect_no_show_alerts(self, current_dt: datetime, course_ids: set[int] | None = None) -> list[dict]:
+        """Create the missing no-show alerts and return those due for notification.
+
+        Args:
+            current_dt: Evaluation instant
+            course_ids: Only these courses, whose entry time + grace is known
+                to have passed. Without it, every course with class today
+                (per the effective calendar) past its grace period.
+        """
         # R15-DT2 fix: Work with timezone-aware datetimes consistently
         # Ensure current_dt is UTC-aware for consistent comparisons
         if current_dt.tzinfo:
@@ -108,55 +151,35 @@ class AttendanceService:
             # Assume naive datetime is UTC
             current_dt_utc = current_dt.replace(tzinfo=timezone.utc)
 
-        weekday = current_dt_utc.weekday()
-        schedules = await self.schedule_repo.list_by_weekday(weekday)
-        grace = timedelta(minutes=settings.no_show_grace_minutes)
         target_date = current_dt_utc.date()
-        alerts: list[dict] = []
-
-        for schedule in schedules:
-            # Course is eager-loaded via selectinload in list_by_weekday
-            # R15-DT2 fix: datetime.combine with explicit UTC timezone to avoid naive datetime
-            threshold = datetime.combine(target_date, schedule.in_time, tzinfo=timezone.utc) + grace
-            if current_dt_utc < threshold:
-                continue
-
-            students = await self.student_repo.list_by_course(schedule.course_id)
-            if not students:
-                continue
-
-            # R2-B3 fix: Use batch query instead of N+1 individual queries
-            student_ids = [s.id for s in students]
-            students_with_in = await self.attendance_repo.get_student_ids_with_in_event_on_date(
-                student_ids, target_date
+        grace = timedelta(minutes=settings.no_show_grace_minutes)
+        # A course is due once entry time + grace has passed today
+        cutoff_dt = current_dt_utc - grace
+        if course_ids is not None or cutoff_dt.date() == target_date:
+            # Holidays, moved entries and excused students come from the calendar
+            await self.calendar.get_days(target_date, target_date)
+            # One INSERT ... SELECT for every due course, absent student and guardian
+            created = await self.no_show_repo.insert_missing(
+                cutoff=None if course_ids is not None else cutoff_dt.time(),
+                alert_date=target_date,
+                # R15-DT2 fix: Pass naive datetime to repository (DB stores without TZ)
+                alerted_at=current_dt_utc.replace(tzinfo=None),
+                course_ids=course_ids,
             )
-            missing_students = [s for s in students if s.id not in students_with_in]
-
-            if not missing_students:
-                continue
-
-            for student in missing_students:
-                for guardian in getattr(student, "guardians", []):
-                    # Use get_or_create to handle race conditions atomically
-                    # R15-DT2 fix: Pass naive datetime to repository (DB stores without TZ)
-                    alert, _created = await self.no_show_repo.get_or_create(
-                        student_id=student.id,
-                        guardian_id=guardian.id,
-                        course_id=schedule.course_id,
-                        schedule_id=schedule.id,
-                        alert_date=target_date,
-                        alerted_at=current_dt_utc.replace(tzinfo=None),
-                    )
-                    alerts.append(
-                        {
-                            "alert": alert,
-                            "guardian": guardian,
-                            "student": student,
-                            "course": schedule.course,
-                        }
-                    )
-
-        return alerts
+            if created:
+                logger.info("[NoShow] %d new alert(s) for %s", len(created), target_date)
+
+        # New alerts, plus reminders for pending ones past the grace period
+        due = await self.no_show_repo.list_due(target_date, current_dt_utc - grace, course_ids)
+        return [
+            {
+                "alert": alert,
+                "guardian": alert.guardian,
+                "student": alert.student,
+                "course": alert.course,
+            }
+            for alert in due
+        ]
 
     # Security constants for file uploads
     ALLOWED_MIME_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
@@ -248,6 +271,8 @@ class AttendanceService:
         await self.photo_service.store_photo(key, data, content_type)
         event = await self.attendance_repo.update_photo_ref(event_id, key)
         await self.session.commit()
+        get_usage_meter().record(self.tenant_id, UsageStat.METRIC_PHOTOS_UPLOADED)
+        self._enqueue_photo_variants(event_id, key)
         return AttendanceEventRead.model_validate(event, from_attributes=True)
 
     # Audio evidence constants
@@ -348,9 +373,156 @@ class AttendanceService:
         await self.session.commit()
         return AttendanceEventRead.model_validate(event, from_attributes=True)
 
+    def _evidence_rules(self, kind: EvidenceKind) -> tuple[set[str], set[str], int, str]:
+        """(MIME types, extensions, max size, key prefix) allowed for an evidence kind."""
+        if kind == EvidenceKind.AUDIO:
+            return self.ALLOWED_AUDIO_MIME_TYPES, self.ALLOWED_AUDIO_EXTENSIONS, self.MAX_AUDIO_SIZE, "audio_"
+        return self.ALLOWED_MIME_TYPES, self.ALLOWED_EXTENSIONS, self.MAX_PHOTO_SIZE, ""
+
+    @staticmethod
+    def _evidence_kind_of(key: str) -> EvidenceKind:
+        return EvidenceKind.AUDIO if key.rsplit("/", 1)[-1].startswith("audio_") else EvidenceKind.PHOTO
+
+    async def request_evidence_upload(
+        self,
+        event_id: int,
+        kind: EvidenceKind,
+        content_type: str,
+        filename: str | None = None,
+    ) -> EvidenceUploadTicket:
+        """Issue a presigned POST so the kiosk uploads evidence straight to storage.
+
+        The file never goes through the API: the kiosk posts it to the bucket
+        and then calls ``confirm_evidence_upload`` with the returned key.
+        """
+        allowed_types, allowed_extensions, max_size, prefix = self._evidence_rules(kind)
+        content_type = (content_type or "").lower()
+        if content_type not in allowed_types:
+            raise ValueError(
+                f"Tipo de archivo no permitido: {content_type}. "
+                f"Tipos permitidos: {', '.join(allowed_types)}"
+            )
+
+        default_extension = "webm" if kind == EvidenceKind.AUDIO else "jpg"
+        filename = (filename or "").replace("\\", "/").split("/")[-1]
+        extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else default_extension
+        if extension not in allowed_extensions:
+            raise ValueError(
+                f"Extensión no permitida: {extension}. "
+                f"Extensiones permitidas: {', '.join(allowed_extensions)}"
+            )
+
+        if await self.attendance_repo.get_event(event_id) is None:
+            raise ValueError("Evento no encontrado")
+
+        key = f"events/{event_id}/{prefix}{uuid.uuid4().hex}.{extension}"
+        expires = settings.evidence_upload_url_ttl_seconds
+        presigned = await self.photo_service.generate_presigned_post(key, content_type, max_size, expires)
+        return EvidenceUploadTicket(
+            key=key,
+            url=presigned["url"],
+            fields=presigned["fields"],
+            max_bytes=max_size,
+            expires_in=expires,
+        )
+
+    async def confirm_evidence_upload(self, event_id: int, key: str) -> AttendanceEventRead:
+        """Attach an object uploaded with a presigned POST to its event.
+
+        The content is checked afterwards by the ``validate_evidence`` job,
+        which drops the reference and the object if it is not what it claims.
+        """
+        prefix = f"events/{event_id}/"
+        name = key[len(prefix):] if key.startswith(prefix) else ""
+        if not name or "/" in name or name.startswith("."):
+            raise ValueError("Clave de evidencia inválida")
+
+        is_audio = self._evidence_kind_of(key) == EvidenceKind.AUDIO
+        if is_audio:
+            event = await self.attendance_repo.update_audio_ref(event_id, key)
+        else:
+            event = await self.attendance_repo.update_photo_ref(event_id, key)
+        await self.session.commit()
+        if not is_audio:
+            get_usage_meter().record(self.tenant_id, UsageStat.METRIC_PHOTOS_UPLOADED)
+        result = AttendanceEventRead.model_validate(event, from_attributes=True)
+
+        try:
+            self._enqueue_evidence_validation(event_id, key)
+        except Exception as exc:
+            # Without a queue, validate in-request rather than keep unchecked content
+            logger.warning("Could not enqueue evidence validation key=%s: %s", key, exc)
+            if not await self.verify_uploaded_evidence(event_id, key):
+                raise ValueError(
+                    "El contenido del archivo no coincide con el tipo declarado."
+                ) from exc
+        return result
+
+    def _enqueue_job(self, func: str, *args) -> None:
+        from redis import Redis
+        from rq import Queue
+
+        from app.workers.queues import BULK_QUEUE
+
+        redis_conn = Redis.from_url(settings.redis_url)
+        try:
+            Queue(BULK_QUEUE, connection=redis_conn).enqueue(func, *args)
+        finally:
+            redis_conn.close()
+
+    def _enqueue_evidence_validation(self, event_id: int, key: str) -> None:
+        self._enqueue_job(
+            "app.workers.jobs.validate_evidence.validate_evidence_job", event_id, key, self.tenant_schema
+        )
+
+    def _enqueue_photo_variants(self, event_id: int, key: str) -> None:
+        """Queue the WebP thumbnail/medium rendering; the original is served until it runs."""
+        try:
+            self._enqueue_job(
+                "app.workers.jobs.photo_variants.generate_photo_variants_job", event_id, key, self.tenant_schema
+            )
+        except Exception as exc:
+            logger.warning("Could not enqueue photo variants key=%s: %s", key, exc)
+
+    async def verify_uploaded_evidence(self, event_id: int, key: str) -> bool:
+        """Check the magic bytes of an uploaded object with a ranged read.
+
+        Invalid or missing objects are deleted and unlinked from the event.
+
+        Returns:
+            True if the object's content matches its declared type
+        """
+        kind = self._evidence_kind_of(key)
+        header = await self.photo_service.read_header(key)
+        if header is not None:
+            data, content_type = header
+            validate = (
+                self._validate_audio_magic_bytes if kind == EvidenceKind.AUDIO else self._validate_magic_bytes
+            )
+            if validate(data, (content_type or "").lower()):
+                if kind == EvidenceKind.PHOTO:
+                    self._enqueue_photo_variants(event_id, key)
+                return True
+
+        logger.warning("Rejected evidence event_id=%s key=%s (missing or invalid content)", event_id, key)
+        event = await self.attendance_repo.get_event(event_id)
+        if event is not None:
+            if kind == EvidenceKind.AUDIO and event.audio_ref == key:
+                await self.attendance_repo.update_audio_ref(event_id, None)
+            elif kind == EvidenceKind.PHOTO and event.photo_ref == key:
+                await self.attendance_repo.update_photo_ref(event_id, None)
+            await self.session.commit()
+        if header is not None:
+            await self.photo_service.delete_photo(key)
+        return False
+
     async def list_recent_photo_events(self, limit: int = 20):
         return await self.attendance_repo.list_recent_with_photos(limit)
 
+    def get_photo_urls(self, photo_refs, expires: int = 3600) -> dict[str, str]:
+        """Presigned URLs of many photos in one batch, by key."""
+        return self.photo_service.presign_urls(photo_refs, expires)
+
     async def get_photo_url(self, photo_ref: str, expires: int = 3600) -> str | None:
         # R12-P5 fix: Now async
         return await self.photo_service.generate_presigned_url(photo_ref, expires)
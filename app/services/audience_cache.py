@@ -0,0 +1,118 @@
+"""Broadcast audience segment cache keyed by tenant data version.
+
+Resolving an audience (all-school, a grade, a set of courses) depends only
+on guardians, students, their links, push subscriptions and the courses
+(name and grade) students belong to. Every commit that touches those models
+bumps a per-tenant "audience version" in Redis. Cached segments embed the
+version in their key, so a bump makes all of the tenant's segments
+unreachable at once. Nothing has to be deleted, and the TTL collects the
+old keys.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import chain
+from typing import Any, Optional
+
+import redis
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tenant_middleware import current_tenant_schema
+from app.db.models.course import Course
+from app.db.models.guardian import Guardian
+from app.db.models.push_subscription import PushSubscription
+from app.db.models.student import Student
+
+
+# Models whose changes can alter who is in a broadcast audience
+AUDIENCE_MODELS = (Guardian, Student, PushSubscription, Course)
+
+
+class AudienceSegmentCache:
+    """Redis cache of resolved audience segments for one tenant."""
+
+    VERSION_KEY = "audience:version:{tenant}"
+    SEGMENT_KEY = "audience:segment:{tenant}:{version}:{segment}"
+    TTL_SECONDS = 3600
+
+    def __init__(self, redis_client: Any, tenant_key: str | None):
+        self._redis = redis_client
+        self._tenant = tenant_key or "public"
+
+    def _segment_key(self, segment: str) -> str:
+        version = self._redis.get(self.VERSION_KEY.format(tenant=self._tenant))
+        if isinstance(version, bytes):
+            version = version.decode()
+        return self.SEGMENT_KEY.format(tenant=self._tenant, version=version or "0", segment=segment)
+
+    def get(self, segment: str) -> Any | None:
+        """Return the cached value, or None on miss or Redis failure."""
+        try:
+            raw = self._redis.get(self._segment_key(segment))
+        except Exception as exc:
+            logger.debug("Audience cache read failed segment=%s: %s", segment, exc)
+            return None
+        return json.loads(raw) if raw else None
+
+    def set(self, segment: str, value: Any) -> None:
+        try:
+            self._redis.setex(self._segment_key(segment), self.TTL_SECONDS, json.dumps(value))
+        except Exception as exc:
+            logger.debug("Audience cache write failed segment=%s: %s", segment, exc)
+
+
+# ==================== Data version tracking ====================
+
+_version_redis: Optional[redis.Redis] = None
+_version_redis_checked = False
+
+
+def _get_version_redis() -> Optional[redis.Redis]:
+    """Connect once; if Redis is down, stop trying (cache entries then expire by TTL)."""
+    global _version_redis, _version_redis_checked
+    if not _version_redis_checked:
+        _version_redis_checked = True
+        try:
+            client = redis.from_url(settings.redis_url)
+            client.ping()
+            _version_redis = client
+        except Exception:
+            _version_redis = None
+    return _version_redis
+
+
+def bump_audience_version(tenant_key: str | None = None) -> None:
+    """Invalidate every cached segment of a tenant."""
+    client = _get_version_redis()
+    if client is None:
+        return
+    tenant = tenant_key or current_tenant_schema.get() or "public"
+    try:
+        client.incr(AudienceSegmentCache.VERSION_KEY.format(tenant=tenant))
+    except Exception as exc:
+        logger.warning("Failed to bump audience version tenant=%s: %s", tenant, exc)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_audience_changes(session: Session, flush_context: Any) -> None:
+    if session.info.get("audience_changed"):
+        return
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, AUDIENCE_MODELS):
+            session.info["audience_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    if session.info.pop("audience_changed", False):
+        bump_audience_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_on_rollback(session: Session) -> None:
+    session.info.pop("audience_changed", None)
@@ -6,50 +6,99 @@ from typing import Set
 from loguru import logger
 from redis import Redis
 from rq import Queue
+from sqlalchemy import Select
 
 from app.core.config import settings
 from app.db.repositories.guardians import GuardianRepository
-from app.db.repositories.students import StudentRepository
-from app.schemas.notifications import BroadcastCreate, BroadcastPreview
+from app.schemas.notifications import BroadcastCreate, BroadcastPreview, BroadcastStatus
+from app.services.audience_cache import AudienceSegmentCache
+from app.services.notifications.broadcast_progress import BroadcastProgress
+from app.workers.queues import BROADCASTS_QUEUE
 
 
 class BroadcastService:
-    def __init__(self, session):
+    def __init__(self, session, tenant_id: int | None = None, tenant_schema: str | None = None):
         self.session = session
+        self.tenant_id = tenant_id
+        # The worker opens its own session, so it needs the schema explicitly
+        self.tenant_schema = tenant_schema
         self.guardian_repo = GuardianRepository(session)
-        self.student_repo = StudentRepository(session)
         self.redis = Redis.from_url(settings.redis_url)
-        self.queue = Queue("broadcasts", connection=self.redis)
+        self.queue = Queue(BROADCASTS_QUEUE, connection=self.redis)
+        self.progress = BroadcastProgress(self.redis)
+        self.segment_cache = AudienceSegmentCache(self.redis, tenant_schema)
 
     def close(self) -> None:
         """R7-S5 fix: Close Redis connection to prevent leaks."""
         if self.redis:
             self.redis.close()
 
-    async def _resolve_guardian_ids(self, payload: BroadcastCreate) -> Set[int]:
+    def _audience_segment(self, payload: BroadcastCreate) -> tuple[str | None, Select | None]:
+        """Build the SQL audience for a broadcast.
+
+        Returns:
+            Tuple of (cache segment key or None if not cacheable, audience SELECT
+            of distinct guardian ids or None if the audience is empty)
+        """
         audience = payload.audience
-        guardian_ids: Set[int] = set()
+        scope = audience.scope.lower()
 
         # R7-S6 fix: Use elif to prevent multiple scopes being processed
-        if audience.scope.lower() == "global":
-            guardians = await self.guardian_repo.list_all()
-            guardian_ids.update(g.id for g in guardians)
-        elif audience.scope.lower() == "course" and audience.course_ids:
-            for course_id in audience.course_ids:
-                students = await self.student_repo.list_by_course(course_id)
-                g_list = await self.guardian_repo.list_by_student_ids([s.id for s in students])
-                guardian_ids.update(g.id for g in g_list)
-        elif audience.scope.lower() == "custom" and audience.guardian_ids:
-            guardian_ids.update(audience.guardian_ids)
-
-        return guardian_ids
+        if scope == "global":
+            return "global", self.guardian_repo.audience_all()
+        elif scope == "grade" and audience.grades:
+            grades = sorted(set(audience.grades))
+            return f"grade:{','.join(grades)}", self.guardian_repo.audience_for_grades(grades)
+        elif scope == "course" and audience.course_ids:
+            course_ids = sorted(set(audience.course_ids))
+            segment = f"course:{','.join(map(str, course_ids))}"
+            return segment, self.guardian_repo.audience_for_courses(course_ids)
+        elif scope == "custom" and audience.guardian_ids:
+            # Ad-hoc lists are rarely reused; don't cache them
+            return None, self.guardian_repo.audience_for_ids(sorted(set(audience.guardian_ids)))
+        return None, None
+
+    async def _resolve_guardian_ids(self, payload: BroadcastCreate) -> Set[int]:
+        segment, audience = self._audience_segment(payload)
+        if audience is None:
+            return set()
+
+        cache_key = f"{segment}:ids" if segment else None
+        if cache_key:
+            cached = self.segment_cache.get(cache_key)
+            if cached is not None:
+                return set(cached)
+
+        guardian_ids = await self.guardian_repo.list_audience_ids(audience)
+        if cache_key:
+            self.segment_cache.set(cache_key, guardian_ids)
+        return set(guardian_ids)
+
+    async def _count_audience(self, payload: BroadcastCreate) -> dict[str, int]:
+        segment, audience = self._audience_segment(payload)
+        if audience is None:
+            return {"total": 0, "whatsapp": 0, "email": 0, "push": 0}
+
+        cache_key = f"{segment}:counts" if segment else None
+        if cache_key:
+            cached = self.segment_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        counts = await self.guardian_repo.count_audience_channels(audience)
+        if cache_key:
+            self.segment_cache.set(cache_key, counts)
+        return counts
 
     async def preview_broadcast(self, payload: BroadcastCreate) -> BroadcastPreview:
-        guardian_ids = await self._resolve_guardian_ids(payload)
+        counts = await self._count_audience(payload)
         return BroadcastPreview(
             subject=payload.subject,
             message=payload.message,
-            recipients=len(guardian_ids),
+            recipients=counts["total"],
+            with_whatsapp=counts["whatsapp"],
+            with_email=counts["email"],
+            with_push=counts["push"],
             dry_run=True,
         )
 
@@ -59,6 +108,12 @@ class BroadcastService:
             raise ValueError("No hay destinatarios para el broadcast solicitado")
         job_id = secrets.token_hex(8)
 
+        # Progress is best-effort and must exist before the worker starts counting
+        try:
+            self.progress.start(job_id, tenant_id=self.tenant_id, guardians=len(guardian_ids))
+        except Exception as e:
+            logger.warning("Failed to init broadcast progress job_id=%s error=%s", job_id, e)
+
         # R10-S8 fix: Log enqueue operations for debugging
         try:
             self.queue.enqueue(
@@ -67,6 +122,8 @@ class BroadcastService:
                     "job_id": job_id,
                     "payload": payload.model_dump(),
                     "guardian_ids": guardian_ids,
+                    "tenant_id": self.tenant_id,
+                    "tenant_schema": self.tenant_schema,
                 },
                 job_id=job_id,
             )
@@ -81,3 +138,11 @@ class BroadcastService:
             raise
 
         return job_id
+
+    def get_broadcast_status(self, job_id: str) -> BroadcastStatus:
+        """Return delivery progress for a broadcast of the current tenant."""
+        data = self.progress.get(job_id)
+        # Never expose another tenant's broadcast
+        if data is None or data["tenant_id"] != self.tenant_id:
+            raise ValueError("Broadcast no encontrado")
+        return BroadcastStatus(job_id=job_id, **{k: v for k, v in data.items() if k != "tenant_id"})
@@ -0,0 +1,206 @@
+"""Effective school calendar shared by the dashboard, reports and no-show alerts.
+
+For every course and date the calendar stores whether there is class and
+the expected entry/exit time, after applying ``ScheduleException`` rows;
+approved ``AbsenceRequest``s are expanded into excused (student, date)
+pairs. Consumers read these rows instead of combining ``Schedule`` rows
+themselves, so holidays, suspended classes and excused students never
+count as late or absent, nor raise no-show alerts.
+
+The calendar is materialized per school year (the calendar year, which
+contains the Chilean school year):
+
+- reads materialize any (course, date) not built yet, so new courses and
+  new years fill themselves in; the rows join the caller's transaction and
+  are never committed by the read itself;
+- schedule, exception and absence changes rebuild the affected rows
+  (schedule edits only from today on: past days keep the schedule that
+  applied then);
+- ``materialize_calendar`` builds the current year every night.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from datetime import date, datetime, time, timedelta, timezone
+
+from loguru import logger
+
+from app.db.models.course_calendar_day import CourseCalendarDay
+from app.db.models.schedule import Schedule
+from app.db.models.schedule_exception import ScheduleException
+from app.db.repositories.absences import AbsenceRepository
+from app.db.repositories.calendar import CalendarRepository
+from app.db.repositories.courses import CourseRepository
+from app.db.repositories.schedules import ScheduleRepository
+
+
+def school_year_bounds(day: date) -> tuple[date, date]:
+    """First and last date of the school year containing ``day``."""
+    return date(day.year, 1, 1), date(day.year, 12, 31)
+
+
+def iter_dates(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def effective_day(
+    course_id: int,
+    day: date,
+    schedule: Schedule | None,
+    exception: ScheduleException | None,
+) -> dict:
+    """Calendar row of one course on one date.
+
+    A course exception wins over a global one (the caller picks which
+    applies); an exception without ``in_time`` suspends the class, one with
+    ``in_time`` moves the entry (and the exit, if given). Global exceptions
+    never create classes for courses without a schedule that weekday.
+    """
+    in_time: time | None = schedule.in_time if schedule else None
+    out_time: time | None = schedule.out_time if schedule else None
+    if exception is not None and (schedule is not None or exception.scope == "COURSE"):
+        in_time = exception.in_time
+        out_time = (exception.out_time or out_time) if in_time else None
+    return {
+        "course_id": course_id,
+        "date": day,
+        "is_school_day": in_time is not None,
+        "schedule_id": schedule.id if schedule else None,
+        "in_time": in_time,
+        "out_time": out_time,
+    }
+
+
+class CalendarService:
+    """Reads and maintains the materialized calendar of a tenant."""
+
+    def __init__(self, session):
+        self.session = session
+        self.repository = CalendarRepository(session)
+        self.schedule_repo = ScheduleRepository(session)
+        self.course_repo = CourseRepository(session)
+        self.absence_repo = AbsenceRepository(session)
+
+    async def get_days(
+        self,
+        start: date,
+        end: date,
+        course_ids: Collection[int] | None = None,
+    ) -> dict[tuple[int, date], CourseCalendarDay]:
+        """Calendar rows of ``[start, end]``, keyed by (course_id, date).
+
+        Dates not materialized yet are built first, within the session's
+        transaction: they persist if the caller commits, and are rebuilt on
+        a later read (or by ``materialize_calendar``) otherwise. Committing
+        here would also commit whatever the caller had pending.
+        """
+        days = await self.repository.list_days(start, end, course_ids)
+        if course_ids is None:
+            expected = {course.id for course in await self.course_repo.list_all()}
+        else:
+            expected = set(course_ids)
+        covered = {(day.course_id, day.date) for day in days}
+        missing = [
+            current for current in iter_dates(start, end)
+            if any((course_id, current) not in covered for course_id in expected)
+        ]
+        if missing:
+            await self.materialize(missing[0], missing[-1])
+            days = await self.repository.list_days(start, end, course_ids)
+        return {(day.course_id, day.date): day for day in days}
+
+    async def school_days(
+        self,
+        start: date,
+        end: date,
+        course_ids: Collection[int] | None = None,
+    ) -> dict[tuple[int, date], CourseCalendarDay]:
+        """Like ``get_days``, without the dates on which a course has no class."""
+        days = await self.get_days(start, end, course_ids)
+        return {key: day for key, day in days.items() if day.is_school_day}
+
+    async def entry_times(self, day: date) -> dict[int, time]:
+        """Expected entry time of every course with class on ``day``."""
+        return {course_id: row.in_time for (course_id, _), row in (await self.school_days(day, day)).items()}
+
+    async def excused(
+        self,
+        start: date,
+        end: date,
+        student_ids: Collection[int] | None = None,
+    ) -> set[tuple[int, date]]:
+        """(student_id, date) pairs covered by an approved absence request."""
+        return set(await self.repository.list_excused(start, end, student_ids))
+
+    async def materialize(
+        self,
+        start: date,
+        end: date,
+        course_ids: Collection[int] | None = None,
+    ) -> int:
+        """Rebuild the calendar rows of ``[start, end]`` (all courses by default).
+
+        Rebuilding every course also rebuilds the excused days of the range.
+
+        Returns:
+            Number of calendar rows written
+        """
+        if course_ids is None:
+            courses = [course.id for course in await self.course_repo.list_all()]
+        else:
+            courses = list(course_ids)
+        schedules = {
+            (schedule.course_id, schedule.weekday): schedule
+            for schedule in await self.schedule_repo.list_all()
+        }
+        overrides: dict[date, dict[int | None, ScheduleException]] = {}
+        for exception in await self.schedule_repo.list_exceptions_between(start, end):
+            key = None if exception.scope == "GLOBAL" else exception.course_id
+            overrides.setdefault(exception.date, {})[key] = exception
+
+        rows = []
+        for current in iter_dates(start, end):
+            day_overrides = overrides.get(current, {})
+            for course_id in courses:
+                rows.append(
+                    effective_day(
+                        course_id,
+                        current,
+                        schedules.get((course_id, current.weekday())),
+                        day_overrides.get(course_id) or day_overrides.get(None),
+                    )
+                )
+        await self.repository.upsert_days(rows)
+        if course_ids is None:
+            await self.refresh_excused(start, end)
+        logger.debug("[Calendar] %d day(s) materialized for %s..%s", len(rows), start, end)
+        return len(rows)
+
+    async def refresh_excused(
+        self,
+        start: date,
+        end: date,
+        student_ids: Collection[int] | None = None,
+    ) -> None:
+        """Rebuild the excused days of ``[start, end]`` from approved absences."""
+        rows = []
+        for absence in await self.absence_repo.list_approved_between(start, end, student_ids):
+            for current in iter_dates(max(start, absence.start_date), min(end, absence.end_date)):
+                rows.append(
+                    {"student_id": absence.student_id, "date": current, "absence_request_id": absence.id}
+                )
+        await self.repository.replace_excused(start, end, rows, student_ids)
+
+    async def on_schedule_changed(self, course_id: int) -> None:
+        """A course's weekly schedule changed: rebuild it from today on."""
+        today = datetime.now(timezone.utc).date()
+        await self.materialize(today, school_year_bounds(today)[1], [course_id])
+
+    async def on_exception_changed(self, day: date, course_id: int | None) -> None:
+        """An exception was created or deleted: rebuild its date."""
+        await self.materialize(day, day, None if course_id is None else [course_id])
+
+    async def on_absence_changed(self, student_id: int, start: date, end: date) -> None:
+        """An absence request was approved, rejected or reopened."""
+        await self.refresh_excused(start, end, [student_id])
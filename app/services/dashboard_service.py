@@ -13,9 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.db.models.attendance_event import AttendanceEvent
 from app.db.models.course import Course
-from app.db.models.schedule import Schedule
+from app.db.models.course_calendar_day import CourseCalendarDay
 from app.db.models.student import Student
-from app.db.repositories.schedules import ScheduleRepository
 from app.db.repositories.students import StudentRepository
 from app.schemas.webapp import (
     DashboardEvent,
@@ -25,6 +24,7 @@ from app.schemas.webapp import (
     ReportTrendPoint,
     ReportsSnapshot,
 )
+from app.services.calendar_service import CalendarService
 from app.services.photo_service import PhotoService
 
 MAX_EVENTS = 500
@@ -33,11 +33,11 @@ MAX_EVENTS = 500
 class DashboardService:
     """Generates dashboard snapshots and exports for staff roles."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, photo_service: PhotoService | None = None):
         self.session = session
-        self.schedule_repo = ScheduleRepository(session)
+        self.calendar = CalendarService(session)
         self.student_repo = StudentRepository(session)
-        self.photo_service = PhotoService()
+        self.photo_service = photo_service or PhotoService()
 
     async def get_snapshot(
         self,
@@ -51,15 +51,23 @@ class DashboardService:
         search_query = search.strip().lower() if search else None
 
         events = await self._fetch_events(target_date, course_id, normalized_type, search_query)
-        schedules = await self.schedule_repo.list_by_weekday(target_date.weekday())
-        if course_id is not None:
-            schedules = [schedule for schedule in schedules if schedule.course_id == course_id]
+        # Courses with class today, after holidays and schedule exceptions
+        calendar_days = list(
+            (
+                await self.calendar.school_days(
+                    target_date, target_date, None if course_id is None else [course_id]
+                )
+            ).values()
+        )
 
-        course_ids = {schedule.course_id for schedule in schedules}
+        course_ids = {day.course_id for day in calendar_days}
         students = await self.student_repo.list_by_course_ids(course_ids) if course_ids else []
+        excused = {
+            student_id
+            for student_id, _ in await self.calendar.excused(target_date, target_date, [s.id for s in students])
+        }
 
-        stats = self._compute_stats(target_date, events, schedules, students)
-        # R12-P5 fix: Use async map for presigned URLs
+        stats = self._compute_stats(target_date, events, calendar_days, students, excused)
         mapped_events = await self._map_events_async(events)
 
         return DashboardSnapshot(date=target_date, stats=stats, events=mapped_events)
@@ -121,11 +129,11 @@ class DashboardService:
                 start_date=start_date, end_date=end_date, courses=[], trend=[]
             )
 
-        schedules = await self.schedule_repo.list_by_course_ids(course_ids)
-        schedules_map = {(schedule.course_id, schedule.weekday): schedule for schedule in schedules}
+        # Only school days count; excused students are neither expected nor absent
+        school_days = await self.calendar.school_days(start_date, end_date, course_ids)
 
         students = await self.student_repo.list_by_course_ids(course_ids)
-        student_course = {student.id: student.course_id for student in students}
+        excused = await self.calendar.excused(start_date, end_date, [student.id for student in students])
         students_by_course: dict[int, list[Student]] = {cid: [] for cid in course_ids}
         for student in students:
             students_by_course.setdefault(student.course_id, []).append(student)
@@ -184,15 +192,16 @@ class DashboardService:
             expected_sessions = 0
 
             for current_day in date_range:
-                weekday = current_day.weekday()
-                schedule = schedules_map.get((course.id, weekday))
-                if not schedule:
+                calendar_day = school_days.get((course.id, current_day))
+                if not calendar_day:
                     continue
-                expected_sessions += len(course_students)
-                threshold = datetime.combine(current_day, schedule.in_time) + grace
+                threshold = datetime.combine(current_day, calendar_day.in_time) + grace
 
                 for student in course_students:
                     key = (student.id, current_day)
+                    if key in excused:
+                        continue
+                    expected_sessions += 1
                     first_in = earliest_in.get(key)
                     if not first_in:
                         absent_total += 1
@@ -278,8 +287,9 @@ class DashboardService:
         self,
         target_date: date,
         events: Iterable[tuple[AttendanceEvent, Student, Course]],
-        schedules: Iterable[Schedule],
+        calendar_days: Iterable[CourseCalendarDay],
         students: Iterable[Student],
+        excused: set[int] | None = None,
     ) -> DashboardStats:
         total_in = 0
         total_out = 0
@@ -299,12 +309,16 @@ class DashboardService:
                 photo_count += 1
 
         thresholds: dict[int, datetime] = {}
-        for schedule in schedules:
-            thresholds[schedule.course_id] = datetime.combine(
-                target_date, schedule.in_time
+        for calendar_day in calendar_days:
+            thresholds[calendar_day.course_id] = datetime.combine(
+                target_date, calendar_day.in_time
             ) + timedelta(minutes=settings.no_show_grace_minutes)
 
-        student_course = {student.id: student.course_id for student in students}
+        # Students excused by an approved absence are neither late nor missing
+        excused = excused or set()
+        student_course = {
+            student.id: student.course_id for student in students if student.id not in excused
+        }
         late_students: set[int] = set()
         for student_id, first_in_at in first_in_by_student.items():
             course = student_course.get(student_id)
@@ -323,26 +337,39 @@ class DashboardService:
         )
 
     async def _map_events_async(self, events: list) -> list[DashboardEvent]:
-        """R12-P5 fix: Map events asynchronously for presigned URL generation."""
-        import asyncio
-
-        async def _map_single(event, student, course):
-            photo_url = await self.photo_service.generate_presigned_url(event.photo_ref) if event.photo_ref else None
-            return DashboardEvent(
-                id=event.id,
-                student_id=student.id,
-                student_name=student.full_name,
-                course_id=course.id,
-                course_name=course.name,
-                type=event.type,
-                gate_id=event.gate_id,
-                ts=self._format_ts(event.occurred_at),
-                device_id=event.device_id,
-                photo_ref=event.photo_ref,
-                photo_url=photo_url,
-            )
+        """Map events, signing all their photo URLs in one batch.
+
+        Medium WebP variant to view, thumbnail for lists, original as fallback.
+        """
+        keys = []
+        for event, _, _ in events:
+            if event.photo_ref:
+                keys += [event.photo_medium_ref or event.photo_ref, event.photo_thumb_ref]
+        urls = self.photo_service.presign_urls(keys)
 
-        return await asyncio.gather(*[_map_single(e, s, c) for e, s, c in events])
+        mapped = []
+        for event, student, course in events:
+            photo_url = thumb_url = None
+            if event.photo_ref:
+                photo_url = urls.get(event.photo_medium_ref or event.photo_ref)
+                thumb_url = urls.get(event.photo_thumb_ref) if event.photo_thumb_ref else photo_url
+            mapped.append(
+                DashboardEvent(
+                    id=event.id,
+                    student_id=student.id,
+                    student_name=student.full_name,
+                    course_id=course.id,
+                    course_name=course.name,
+                    type=event.type,
+                    gate_id=event.gate_id,
+                    ts=self._format_ts(event.occurred_at),
+                    device_id=event.device_id,
+                    photo_ref=event.photo_ref,
+                    photo_url=photo_url,
+                    photo_thumb_url=thumb_url,
+                )
+            )
+        return mapped
 
     def _map_event(self, event: AttendanceEvent, student: Student, course: Course) -> DashboardEvent:
         """Sync version for backwards compatibility (no photo URL)."""
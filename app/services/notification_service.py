@@ -2,19 +2,45 @@
 
 from __future__ import annotations
 
+import base64
 from collections import Counter
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 
-from app.db.repositories.guardians import GuardianRepository
 from app.db.repositories.notifications import NotificationRepository
 from app.schemas.notifications import NotificationLog, NotificationSummaryResponse
+from app.services.notifications.summary_cache import DayCounts, day_bounds, get_summary_cache
+
+
+def encode_cursor(ts_created: datetime, notification_id: int) -> str:
+    """Keyset cursor pointing just after this notification (newest first).
+
+    Opaque and URL-safe: the raw timestamp's ``+00:00`` would turn into a
+    space when passed back unencoded in ``?cursor=``.
+    """
+    raw = f"{ts_created.isoformat()}~{notification_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Parse a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    ts_created, _, notification_id = raw.rpartition("~")
+    return datetime.fromisoformat(ts_created), int(notification_id)
+
+
+# Days covered by each bitácora summary window (today included)
+SUMMARY_WINDOWS = {"today": 1, "7d": 7, "30d": 30}
 
 
 class NotificationService:
-    def __init__(self, session):
+    def __init__(self, session, tenant_id: int | None = None):
         self.session = session
+        self.tenant_id = tenant_id
         self.repository = NotificationRepository(session)
-        self.guardian_repo = GuardianRepository(session)
 
     async def list_notifications(
         self,
@@ -26,34 +52,87 @@ class NotificationService:
         template: str | None = None,
         start: datetime | None = None,
         end: datetime | None = None,
+        before: tuple[datetime, int] | None = None,
         limit: int = 200,
     ) -> list[NotificationLog]:
-        guardian_ids = None
-        if student_id is not None:
-            guardians = await self.guardian_repo.list_by_student_ids([student_id])
-            guardian_ids = [g.id for g in guardians]
-        elif guardian_id is not None:
-            guardian_ids = [guardian_id]
-
         records = await self.repository.list_notifications(
-            guardian_ids=guardian_ids,
+            guardian_ids=[guardian_id] if guardian_id is not None else None,
+            student_ids=[student_id] if student_id is not None else None,
             status=status,
             channel=channel,
             template=template,
             start=start,
             end=end,
+            before=before,
             limit=limit,
         )
         return [NotificationLog.model_validate(item, from_attributes=True) for item in records]
 
-    async def summary(self) -> NotificationSummaryResponse:
-        records = await self.repository.list_notifications(limit=500)
-        by_status = Counter(record.status for record in records)
-        by_channel = Counter(record.channel for record in records)
-        by_template = Counter(record.template for record in records)
+    async def summary(self, window: str = "today") -> NotificationSummaryResponse:
+        """Count notifications by status, channel and template over a window.
+
+        Days are read from the tenant's Redis counters; only days missing
+        there, and rows created since today's and yesterday's counters were
+        last read, are counted with SQL. Without Redis the whole window is
+        one ``GROUP BY``.
+
+        Args:
+            window: "today", "7d" or "30d" (UTC days, today included)
+        """
+        today = datetime.now(timezone.utc).date()
+        days = [today - timedelta(days=offset) for offset in range(SUMMARY_WINDOWS[window])]
+
+        cache = get_summary_cache()
+        cached = cache.load(self.tenant_id, days)
+        if cached is None:
+            start, end = day_bounds(days[-1])[0], day_bounds(today)[1]
+            totals = DayCounts()
+            for _, *row in await self.repository.count_by_window([(start, end, 0)]):
+                totals.add(*row)
+            return self._summary_response(window, days[-1], [totals])
+
+        # Days to build from scratch, and open days to bring up to date
+        pending = [(day, None) for day in days if cached[day] is None]
+        pending += [
+            (day, cached[day])
+            for day in (today, today - timedelta(days=1))
+            if day in cached and cached[day] is not None
+        ]
+        rows = await self.repository.count_by_window(
+            [(*day_bounds(day), counts.hi if counts else 0) for day, counts in pending]
+        )
+        deltas = [DayCounts() for _ in pending]
+        for index, *row in rows:
+            deltas[index].add(*row)
+
+        for (day, counts), delta in zip(pending, deltas):
+            if counts is None:
+                cache.fold(self.tenant_id, day, None, delta)
+                cached[day] = delta
+            elif delta.counts:
+                cache.fold(self.tenant_id, day, counts.hi, delta)
+                for field, count in delta.counts.items():
+                    counts.counts[field] = counts.counts.get(field, 0) + count
+
+        return self._summary_response(window, days[-1], [cached[day] for day in days])
+
+    @staticmethod
+    def _summary_response(window: str, since: date, days: list[DayCounts]) -> NotificationSummaryResponse:
+        by_status: Counter[str] = Counter()
+        by_channel: Counter[str] = Counter()
+        by_template: Counter[str] = Counter()
+        for day in days:
+            for field, count in day.counts.items():
+                status, channel, template = field.split("|", 2)
+                by_status[status] += count
+                by_channel[channel] += count
+                by_template[template] += count
+        # Unary plus drops counts that went negative (drift until the day is rebuilt)
         return NotificationSummaryResponse(
-            total=len(records),
-            by_status=by_status,
-            by_channel=by_channel,
-            by_template=by_template,
+            window=window,
+            since=since,
+            total=sum(by_channel.values()),
+            by_status=+by_status,
+            by_channel=+by_channel,
+            by_template=+by_template,
         )
@@ -0,0 +1,99 @@
+"""Broadcast progress tracking in Redis.
+
+Each broadcast job keeps a hash ``broadcast:progress:<job_id>`` with:
+
+- ``status``: queued | processing | completed | failed
+- ``tenant_id``: owner, checked before exposing progress
+- ``guardians``: audience size resolved by the API
+- ``total``: notifications created (one per guardian and reachable channel)
+- ``queued``: notifications handed to the send queue
+- ``sent`` / ``failed``: delivery results reported by the send workers
+- ``skipped``: guardians without any contact for the broadcast channels
+"""
+
+from __future__ import annotations
+
+from loguru import logger
+from redis import Redis
+
+from app.core.config import settings
+
+
+class BroadcastProgress:
+    """Read/write broadcast counters stored in a Redis hash."""
+
+    KEY = "broadcast:progress:{job_id}"
+    TTL_SECONDS = 7 * 24 * 3600
+    COUNTERS = ("guardians", "total", "queued", "sent", "failed", "skipped")
+
+    def __init__(self, redis_client: Redis):
+        self._redis = redis_client
+
+    def _key(self, job_id: str) -> str:
+        return self.KEY.format(job_id=job_id)
+
+    def start(self, job_id: str, *, tenant_id: int | None, guardians: int) -> None:
+        """Create the progress hash when the broadcast is enqueued."""
+        key = self._key(job_id)
+        pipe = self._redis.pipeline()
+        pipe.hset(
+            key,
+            mapping={
+                "status": "queued",
+                "tenant_id": tenant_id if tenant_id is not None else "",
+                "guardians": guardians,
+                "total": 0,
+                "queued": 0,
+                "sent": 0,
+                "failed": 0,
+                "skipped": 0,
+            },
+        )
+        pipe.expire(key, self.TTL_SECONDS)
+        pipe.execute()
+
+    def set_status(self, job_id: str, status: str) -> None:
+        self._redis.hset(self._key(job_id), "status", status)
+
+    def incr(self, job_id: str, **amounts: int) -> None:
+        """Increment one or more counters in a single round trip."""
+        key = self._key(job_id)
+        pipe = self._redis.pipeline()
+        for field, amount in amounts.items():
+            if amount:
+                pipe.hincrby(key, field, amount)
+        pipe.execute()
+
+    def get(self, job_id: str) -> dict | None:
+        """Return the decoded progress hash, or None if unknown/expired."""
+        raw = self._redis.hgetall(self._key(job_id))
+        if not raw:
+            return None
+        data = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in raw.items()
+        }
+        for field in self.COUNTERS:
+            data[field] = int(data.get(field) or 0)
+        data["tenant_id"] = int(data["tenant_id"]) if data.get("tenant_id") else None
+        return data
+
+
+_worker_progress: BroadcastProgress | None = None
+
+
+def record_broadcast_delivery(broadcast_id: str | None, outcome: str, count: int = 1) -> None:
+    """Count delivery results ("sent" or "failed") for a broadcast.
+
+    Called by the send workers; never raises so progress tracking can't
+    break delivery.
+    """
+    global _worker_progress
+    if not broadcast_id:
+        return
+    try:
+        if _worker_progress is None:
+            _worker_progress = BroadcastProgress(Redis.from_url(settings.redis_url))
+        _worker_progress.incr(broadcast_id, **{outcome: count})
+    except Exception as exc:
+        logger.debug("Failed to record broadcast progress job=%s: %s", broadcast_id, exc)
@@ -0,0 +1,122 @@
+"""Per-guardian coalescing of attendance notifications.
+
+At a busy gate a student may be scanned IN twice, or IN/OUT/IN within a
+couple of minutes, and siblings usually cross the gate together. Instead of
+one WhatsApp/email/push per scan, the first scan for a guardian opens a
+short window (``NOTIFICATION_COALESCE_SECONDS``); scans arriving inside it
+are appended to a Redis list and a delayed job sends one merged message
+when the window closes.
+
+Guardians who opt into the daily digest (``RESUMEN_DIARIO`` preference)
+get no per-event messages at all; ``send_daily_digest`` summarizes the day.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from loguru import logger
+
+from app.schemas.notifications import NotificationType
+
+
+DIGEST_PREF_KEY = NotificationType.RESUMEN_DIARIO.value
+
+
+def digest_enabled(prefs: dict | None) -> bool:
+    """True if the guardian asked for the daily digest on any channel."""
+    digest_prefs = (prefs or {}).get(DIGEST_PREF_KEY)
+    return isinstance(digest_prefs, dict) and any(bool(v) for v in digest_prefs.values())
+
+
+def join_names(names: list[str]) -> str:
+    """Spanish list join: "Ana", "Ana y Pedro", "Ana, Pedro y Luis"."""
+    if len(names) <= 1:
+        return names[0] if names else ""
+    return f"{', '.join(names[:-1])} y {names[-1]}"
+
+
+def merge_events(entries: list[dict]) -> list[tuple[NotificationType, dict]]:
+    """Merge buffered attendance events into as few messages as possible.
+
+    Each student keeps only their latest scan (IN, IN -> IN; IN, OUT, IN ->
+    IN). Students whose final scan has the same type share one message whose
+    ``student_name`` lists all of them. The photo is kept only when the
+    message is about a single student.
+
+    Args:
+        entries: Buffered ``{"type": <NotificationType>, "payload": {...}}``
+
+    Returns:
+        (notification type, merged payload) pairs, in scan order
+    """
+    latest: dict[Any, dict] = {}
+    for entry in entries:
+        student_id = entry["payload"].get("student_id")
+        # Later entries win; re-insert to keep the order of the final scans
+        latest.pop(student_id, None)
+        latest[student_id] = entry
+
+    by_type: dict[str, list[dict]] = {}
+    for entry in latest.values():
+        by_type.setdefault(entry["type"], []).append(entry["payload"])
+
+    merged: list[tuple[NotificationType, dict]] = []
+    for type_value, payloads in by_type.items():
+        last = payloads[-1]
+        payload = {
+            **last,
+            "student_name": join_names([p.get("student_name", "") for p in payloads]),
+            "student_ids": [p.get("student_id") for p in payloads],
+            "coalesced_events": len(entries),
+        }
+        if len(payloads) > 1:
+            payload["photo_url"] = None
+            payload["has_photo"] = False
+        merged.append((NotificationType(type_value), payload))
+    return merged
+
+
+class NotificationCoalescer:
+    """Redis buffer of pending attendance events, one list per guardian."""
+
+    KEY = "notif:coalesce:{tenant}:{guardian_id}"
+
+    def __init__(self, redis_client: Any, tenant_key: str | None, window_seconds: int):
+        self._redis = redis_client
+        self._tenant = tenant_key or "public"
+        self.window_seconds = window_seconds
+
+    def _key(self, guardian_id: int) -> str:
+        return self.KEY.format(tenant=self._tenant, guardian_id=guardian_id)
+
+    def add(self, guardian_id: int, notification_type: NotificationType, payload: dict) -> bool | None:
+        """Buffer an event for a guardian.
+
+        Returns:
+            True if this event opened the window (caller schedules the flush),
+            False if it joined an open window, None if Redis failed (caller
+            should notify immediately)
+        """
+        key = self._key(guardian_id)
+        entry = json.dumps({"type": notification_type.value, "payload": payload}, default=str)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.rpush(key, entry)
+            # Safety net if the flush job never runs
+            pipe.expire(key, self.window_seconds * 10)
+            length, _ = pipe.execute()
+        except Exception as exc:
+            logger.warning("Notification coalescing unavailable guardian=%s: %s", guardian_id, exc)
+            return None
+        return length == 1
+
+    def drain(self, guardian_id: int) -> list[dict]:
+        """Atomically read and clear a guardian's buffered events."""
+        key = self._key(guardian_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.lrange(key, 0, -1)
+        pipe.delete(key)
+        raw_entries, _ = pipe.execute()
+        return [json.loads(raw) for raw in raw_entries]
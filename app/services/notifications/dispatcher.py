@@ -9,16 +9,37 @@ from rq import Queue
 from app.core.config import settings
 from app.db.repositories.guardians import GuardianRepository
 from app.db.repositories.notifications import NotificationRepository
-from app.schemas.notifications import NotificationDispatchRequest, NotificationRead, NotificationChannel
+from app.schemas.notifications import (
+    DeadLetterEntry,
+    DeadLetterList,
+    DeadLetterReplayResponse,
+    NotificationChannel,
+    NotificationDispatchRequest,
+    NotificationRead,
+)
+from app.services.notifications.resilience import DeadLetterQueue
+from app.workers.jobs.send_email_batch import prepare_email_batches
+from app.workers.queues import ALERTS_QUEUE
 
 
 class NotificationDispatcher:
-    def __init__(self, session):
+    def __init__(
+        self,
+        session,
+        tenant_id: int | None = None,
+        queue_name: str = ALERTS_QUEUE,
+        tenant_schema: str | None = None,
+    ):
         self.session = session
+        # Tenant owning the notifications: selects credentials and rate-limit bucket in workers
+        self.tenant_id = tenant_id
+        # Schema the workers write delivery results to
+        self.tenant_schema = tenant_schema
         self.repository = NotificationRepository(session)
         self.guardian_repo = GuardianRepository(session)
         self._redis = Redis.from_url(settings.redis_url)
-        self._queue = Queue("notifications", connection=self._redis)
+        self._queue = Queue(queue_name, connection=self._redis)
+        self.dead_letters = DeadLetterQueue(self._redis)
 
     def __del__(self):
         """Close Redis connection on cleanup (B7 fix)."""
@@ -49,6 +70,7 @@ class NotificationDispatcher:
             template=payload.template.value,
             payload=payload.variables,
             event_id=None,
+            student_id=payload.student_id,
         )
         await self.session.commit()
 
@@ -57,7 +79,103 @@ class NotificationDispatcher:
             NotificationChannel.EMAIL: "app.workers.jobs.send_email.send_email_message",
         }[payload.channel]
 
-        job_args = (notification.id, recipient, payload.template.value, payload.variables)
+        job_args = (
+            notification.id, recipient, payload.template.value, payload.variables, self.tenant_id, self.tenant_schema
+        )
         self._queue.enqueue(job_func, *job_args)
 
         return NotificationRead.model_validate(notification, from_attributes=True)
+
+    def enqueue_whatsapp_messages(self, template: str, destinations: list[dict]) -> int:
+        """Enqueue already-created WhatsApp notifications in one round trip.
+
+        Args:
+            template: Template shared by every destination
+            destinations: Dicts with notification_id, to and variables
+
+        Returns:
+            Number of jobs enqueued
+        """
+        if not destinations:
+            return 0
+        self._queue.enqueue_many(
+            [
+                Queue.prepare_data(
+                    "app.workers.jobs.send_whatsapp.send_whatsapp_message",
+                    args=(
+                        dest["notification_id"], dest["to"], template, dest["variables"],
+                        self.tenant_id, self.tenant_schema,
+                    ),
+                )
+                for dest in destinations
+            ]
+        )
+        return len(destinations)
+
+    def enqueue_email_batches(self, template: str, destinations: list[dict]) -> int:
+        """Enqueue already-created email notifications as bulk SES jobs.
+
+        Args:
+            template: Template shared by every destination
+            destinations: Dicts with notification_id, to and variables
+
+        Returns:
+            Number of batch jobs enqueued
+        """
+        if not destinations:
+            return 0
+        jobs = prepare_email_batches(template, destinations, self.tenant_id, self.tenant_schema)
+        self._queue.enqueue_many(jobs)
+        return len(jobs)
+
+    def list_dead_letters(self, limit: int = 100) -> DeadLetterList:
+        """Oldest dead-lettered send jobs of this tenant."""
+        return DeadLetterList(
+            total=self.dead_letters.count(self.tenant_id),
+            items=[DeadLetterEntry(**entry) for entry in self.dead_letters.peek(self.tenant_id, limit)],
+        )
+
+    async def replay_dead_letters(self, limit: int = 500) -> DeadLetterReplayResponse:
+        """Re-enqueue up to ``limit`` dead-lettered jobs on their original queues.
+
+        The notifications get a fresh retry budget before their jobs exist.
+        """
+        entries = self.dead_letters.pop(self.tenant_id, limit)
+        if not entries:
+            return DeadLetterReplayResponse(replayed_jobs=0, notifications=0, remaining=0)
+
+        notification_ids = [nid for entry in entries for nid in entry.get("notification_ids", [])]
+        try:
+            await self.repository.reset_for_retry(notification_ids)
+            await self.session.commit()
+
+            jobs_by_queue: dict[str, list] = {}
+            for entry in entries:
+                jobs_by_queue.setdefault(entry["origin"], []).append(
+                    Queue.prepare_data(entry["func"], args=tuple(entry["args"]))
+                )
+            for origin, jobs in jobs_by_queue.items():
+                Queue(origin, connection=self._redis).enqueue_many(jobs)
+        except Exception:
+            # Keep the entries for the next replay
+            for entry in entries:
+                self.dead_letters.push(
+                    self.tenant_id,
+                    entry["func"],
+                    entry["args"],
+                    origin=entry["origin"],
+                    reason=entry["reason"],
+                    error=entry["error"],
+                    notification_ids=entry.get("notification_ids", []),
+                )
+            raise
+
+        logger.info(
+            "Replayed %d dead-lettered job(s) tenant_id=%s notifications=%d",
+            len(entries), self.tenant_id, len(notification_ids),
+        )
+        return DeadLetterReplayResponse(
+            replayed_jobs=len(entries),
+            notifications=len(notification_ids),
+            remaining=self.dead_letters.count(self.tenant_id),
+        )
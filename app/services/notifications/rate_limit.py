@@ -0,0 +1,252 @@
+"""Per-tenant token-bucket rate limiting for outbound notifications.
+
+Every (tenant, channel) pair owns a bucket that refills at the tenant's
+configured messages-per-minute rate. Workers call ``reserve()`` right before
+talking to the provider:
+
+- A delay of ``0`` means a token was available and the message can go out now.
+- A positive delay means the bucket is empty. The token is still reserved
+  (the bucket goes into debt), and the caller reschedules the job to run
+  after ``delay`` seconds instead of failing it.
+
+Because each reservation pushes the next free slot of *that* tenant further
+out, a school flooding the queue with a broadcast only delays its own
+messages. Other tenants' jobs keep their own buckets and interleave fairly
+in the shared queue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from typing import Any
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+
+
+# Atomic reserve: refill, take ``cost`` tokens (possibly going negative), and
+# return the wait time as a string (Lua numbers are truncated to ints).
+_RESERVE_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local cost = tonumber(ARGV[5])
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+tokens = tokens - cost
+
+local delay = 0
+if tokens < 0 then
+    delay = -tokens / rate
+end
+
+redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', key, ttl)
+return tostring(delay)
+"""
+
+
+def resolve_rate_per_minute(config: Any, channel: str) -> int:
+    """Return the effective rate for a channel.
+
+    Tenant overrides in ``TenantConfig`` win over the global defaults.
+    A value of ``0`` or less disables limiting for that channel.
+
+    Args:
+        config: DecryptedTenantConfig (or None for the global client)
+        channel: Notification channel value ("WHATSAPP" or "EMAIL")
+    """
+    channel = channel.upper()
+    override = None
+    if config is not None:
+        override = getattr(config, f"{channel.lower()}_rate_per_minute", None)
+    if override is not None:
+        return int(override)
+    if channel == "WHATSAPP":
+        return settings.whatsapp_rate_per_minute
+    if channel == "EMAIL":
+        return settings.email_rate_per_minute
+    return 0
+
+
+class NotificationRateLimiter:
+    """Token bucket with Redis backend and in-memory fallback."""
+
+    KEY_PREFIX = "notif:ratelimit"
+
+    def __init__(self, redis_client: redis.Redis | None = None) -> None:
+        self._memory_buckets: dict[str, tuple[float, float]] = {}  # key -> (tokens, ts)
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._script = None
+        self._redis_available = False
+        self._init_redis()
+
+    def _init_redis(self) -> None:
+        """Initialize Redis connection and register the reserve script."""
+        try:
+            if self._redis is None:
+                self._redis = redis.from_url(settings.redis_url, decode_responses=True)
+                self._redis.ping()
+            self._script = self._redis.register_script(_RESERVE_SCRIPT)
+            self._redis_available = True
+        except Exception:
+            self._redis_available = False
+
+    def _key(self, tenant_id: int | None, channel: str) -> str:
+        return f"{self.KEY_PREFIX}:{tenant_id or 'global'}:{channel.upper()}"
+
+    @staticmethod
+    def _capacity(rate_per_minute: int) -> float:
+        """Bucket size: a few seconds' worth of messages, never below one."""
+        return max(1.0, rate_per_minute * settings.notification_rate_burst_seconds / 60.0)
+
+    def reserve(
+        self,
+        tenant_id: int | None,
+        channel: str,
+        rate_per_minute: int,
+        cost: int = 1,
+    ) -> float:
+        """Reserve send slots.
+
+        Args:
+            tenant_id: Tenant owning the message (None for the global client)
+            channel: Notification channel value
+            rate_per_minute: Bucket refill rate; ``<= 0`` means unlimited
+            cost: Messages sent by this call (bulk sends take several tokens)
+
+        Returns:
+            Seconds the caller must wait before sending (0.0 = send now)
+        """
+        if rate_per_minute <= 0:
+            return 0.0
+
+        key = self._key(tenant_id, channel)
+        rate = rate_per_minute / 60.0
+        capacity = self._capacity(rate_per_minute)
+        now = time.time()
+
+        if self._redis_available and self._script is not None:
+            try:
+                # Keep idle buckets around just long enough to refill
+                ttl = int(capacity / rate) + 60
+                return float(self._script(keys=[key], args=[rate, capacity, now, ttl, cost]))
+            except Exception as exc:
+                logger.warning("Redis rate limiter failed, using memory fallback: %s", exc)
+
+        with self._lock:
+            tokens, ts = self._memory_buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate) - cost
+            self._memory_buckets[key] = (tokens, now)
+        return -tokens / rate if tokens < 0 else 0.0
+
+
+def reschedule_current_job(delay_seconds: float, func: str, *args: Any, **kwargs: Any) -> bool:
+    """Re-enqueue the running RQ job's work to run after ``delay_seconds``.
+
+    The job is scheduled on the queue it came from, so the RQ scheduler
+    (workers run ``with_scheduler=True``) moves it back when it is due.
+
+    Returns:
+        True if the job was rescheduled, False when not running inside RQ
+    """
+    from rq import Queue, get_current_job
+
+    job = get_current_job()
+    if job is None:
+        return False
+
+    queue = Queue(job.origin, connection=job.connection)
+    queue.enqueue_in(timedelta(seconds=max(1.0, delay_seconds)), func, *args, **kwargs)
+    return True
+
+
+def provider_throttle_delay(exc: BaseException) -> float | None:
+    """Return a back-off delay if ``exc`` is a provider throttling response.
+
+    Recognizes WhatsApp Cloud API ``429`` (honouring ``Retry-After``) and
+    SES ``Throttling`` errors. Returns None for any other error.
+    """
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if status_code == 429:
+        retry_after = response.headers.get("Retry-After") if response.headers else None
+        try:
+            return max(1.0, float(retry_after)) if retry_after else 60.0
+        except ValueError:
+            return 60.0
+
+    # botocore ClientError exposes the parsed error as a dict
+    if isinstance(response, dict):
+        code = response.get("Error", {}).get("Code", "")
+        if code in ("Throttling", "ThrottlingException", "TooManyRequestsException"):
+            return 60.0
+    return None
+
+
+async def defer_if_rate_limited(
+    tenant_id: int | None,
+    channel: str,
+    config: Any,
+    job_func: str,
+    *job_args: Any,
+    cost: int = 1,
+    **job_kwargs: Any,
+) -> bool:
+    """Take tokens for this send, rescheduling the job if the bucket is empty.
+
+    Args:
+        tenant_id: Tenant owning the message
+        channel: Notification channel value
+        config: DecryptedTenantConfig with optional rate overrides
+        job_func: Dotted path of the RQ job to reschedule
+        job_args: Positional args for the rescheduled job
+        cost: Number of messages the job sends
+        job_kwargs: Keyword args for the rescheduled job
+
+    Returns:
+        True if the job was deferred and the caller must not send now
+    """
+    rate = resolve_rate_per_minute(config, channel)
+    delay = get_rate_limiter().reserve(tenant_id, channel, rate, cost)
+    if delay <= 0:
+        return False
+
+    # The token is already reserved, so the deferred run must not take another
+    if reschedule_current_job(delay, job_func, *job_args, reserved=True, **job_kwargs):
+        logger.info(
+            "[RateLimit] %s tenant_id=%s over %d/min, deferred %.1fs",
+            channel, tenant_id, rate, delay,
+        )
+        return True
+
+    # Not inside an RQ worker (e.g. direct call): just wait for the slot
+    await asyncio.sleep(delay)
+    return False
+
+
+_rate_limiter: NotificationRateLimiter | None = None
+
+
+def get_rate_limiter() -> NotificationRateLimiter:
+    """Return the process-wide limiter (created lazily inside workers)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = NotificationRateLimiter()
+    return _rate_limiter
@@ -0,0 +1,288 @@
+"""Retry back-off, circuit breaking and dead-lettering for notification sends.
+
+- ``backoff_delay``: "full jitter" exponential back-off. Retries of many jobs
+  that failed together spread out instead of hitting the provider in waves.
+- ``CircuitBreaker``: counts provider failures (network errors, 5xx) in a
+  rolling window per provider, both globally and per tenant. When the error
+  rate crosses ``CIRCUIT_BREAKER_ERROR_RATE`` the circuit opens for
+  ``CIRCUIT_BREAKER_COOLDOWN_SECONDS``. While it is open, send jobs are
+  rescheduled for when it closes instead of calling a dead endpoint.
+- ``DeadLetterQueue``: jobs that exhausted their retries (or failed
+  permanently) are stored per tenant, with their original job call, so an
+  admin can replay them in bulk once the cause is fixed.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+import redis
+from loguru import logger
+from rq import get_current_job
+
+from app.core.config import settings
+from app.services.notifications.rate_limit import reschedule_current_job
+from app.workers.queues import ALERTS_QUEUE
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number ``attempt + 1`` (full jitter).
+
+    Args:
+        attempt: Retries already made (0 for the first retry)
+    """
+    ceiling = min(
+        settings.notification_retry_max_seconds,
+        settings.notification_retry_base_seconds * (2 ** attempt),
+    )
+    # Never retry sooner than one second
+    return max(1.0, random.uniform(0, ceiling))
+
+
+def is_provider_failure(exc: BaseException, transient_errors: tuple[type[BaseException], ...]) -> bool:
+    """True for errors that say the provider is unhealthy, not the message.
+
+    Network errors and 5xx responses count; 4xx (bad number, invalid
+    template) and throttling are the caller's problem and do not.
+    """
+    if isinstance(exc, transient_errors):
+        return True
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code >= 500
+    # botocore ClientError
+    if isinstance(response, dict):
+        http_status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        return isinstance(http_status, int) and http_status >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker with Redis backend and in-memory fallback."""
+
+    KEY_PREFIX = "notif:circuit"
+
+    def __init__(self, redis_client: redis.Redis | None = None) -> None:
+        self._memory_stats: dict[str, list[int]] = {}  # key -> [total, errors]
+        self._memory_open: dict[str, float] = {}  # scope -> open until (epoch)
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._redis_available = False
+        self._init_redis()
+
+    def _init_redis(self) -> None:
+        try:
+            if self._redis is None:
+                self._redis = redis.from_url(settings.redis_url, decode_responses=True)
+                self._redis.ping()
+            self._redis_available = True
+        except Exception:
+            self._redis_available = False
+
+    @staticmethod
+    def _scopes(provider: str, tenant_id: int | None) -> list[str]:
+        """Provider-wide scope plus the tenant's own (its credentials)."""
+        scopes = [f"{provider.upper()}:*"]
+        if tenant_id:
+            scopes.append(f"{provider.upper()}:{tenant_id}")
+        return scopes
+
+    def _open_key(self, scope: str) -> str:
+        return f"{self.KEY_PREFIX}:open:{scope}"
+
+    def _stats_key(self, scope: str, now: float) -> str:
+        bucket = int(now // settings.circuit_breaker_window_seconds)
+        return f"{self.KEY_PREFIX}:stats:{scope}:{bucket}"
+
+    def open_for(self, provider: str, tenant_id: int | None) -> float:
+        """Seconds until sending may resume (0.0 = circuit closed)."""
+        scopes = self._scopes(provider, tenant_id)
+        if self._redis_available:
+            try:
+                pipe = self._redis.pipeline()
+                for scope in scopes:
+                    pipe.pttl(self._open_key(scope))
+                return max([0.0, *(ttl / 1000.0 for ttl in pipe.execute() if ttl and ttl > 0)])
+            except Exception as exc:
+                logger.warning("Redis circuit breaker failed, using memory fallback: %s", exc)
+
+        now = time.time()
+        with self._lock:
+            return max([0.0, *(self._memory_open.get(scope, 0.0) - now for scope in scopes)])
+
+    def record(self, provider: str, tenant_id: int | None, success: bool) -> None:
+        """Count a send outcome and open the circuit if the error rate is too high."""
+        now = time.time()
+        for scope in self._scopes(provider, tenant_id):
+            total, errors = self._count(scope, now, success)
+            if success or total < settings.circuit_breaker_min_requests:
+                continue
+            if errors / total >= settings.circuit_breaker_error_rate:
+                self._trip(scope, now)
+
+    def _count(self, scope: str, now: float, success: bool) -> tuple[int, int]:
+        key = self._stats_key(scope, now)
+        if self._redis_available:
+            try:
+                pipe = self._redis.pipeline()
+                pipe.hincrby(key, "total", 1)
+                pipe.hincrby(key, "errors", 0 if success else 1)
+                pipe.expire(key, settings.circuit_breaker_window_seconds * 2)
+                total, errors, _ = pipe.execute()
+                return int(total), int(errors)
+            except Exception as exc:
+                logger.warning("Redis circuit breaker failed, using memory fallback: %s", exc)
+
+        with self._lock:
+            stats = self._memory_stats.setdefault(key, [0, 0])
+            stats[0] += 1
+            stats[1] += 0 if success else 1
+            return stats[0], stats[1]
+
+    def _trip(self, scope: str, now: float) -> None:
+        cooldown = settings.circuit_breaker_cooldown_seconds
+        if self._redis_available:
+            try:
+                # NX: concurrent failures must not keep extending the pause
+                if self._redis.set(self._open_key(scope), "1", ex=cooldown, nx=True):
+                    logger.warning("[Circuit] %s opened for %ds", scope, cooldown)
+                return
+            except Exception as exc:
+                logger.warning("Redis circuit breaker failed, using memory fallback: %s", exc)
+
+        with self._lock:
+            if self._memory_open.get(scope, 0.0) <= now:
+                self._memory_open[scope] = now + cooldown
+                logger.warning("[Circuit] %s opened for %ds", scope, cooldown)
+
+
+class DeadLetterQueue:
+    """Per-tenant Redis list of send jobs that will not be retried again."""
+
+    KEY = "notif:dlq:{tenant}"
+    MAX_ENTRIES = 10000
+
+    def __init__(self, redis_client: Any):
+        self._redis = redis_client
+
+    def _key(self, tenant_id: int | None) -> str:
+        return self.KEY.format(tenant=tenant_id or "global")
+
+    def push(
+        self,
+        tenant_id: int | None,
+        func: str,
+        args: tuple | list,
+        *,
+        origin: str,
+        reason: str,
+        error: str,
+        notification_ids: list[int],
+    ) -> None:
+        entry = json.dumps(
+            {
+                "func": func,
+                "args": list(args),
+                "origin": origin,
+                "reason": reason,
+                "error": error[:500],
+                "notification_ids": notification_ids,
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+            },
+            default=str,
+        )
+        key = self._key(tenant_id)
+        pipe = self._redis.pipeline()
+        pipe.rpush(key, entry)
+        # Oldest entries are dropped first if an outage goes unnoticed
+        pipe.ltrim(key, -self.MAX_ENTRIES, -1)
+        pipe.execute()
+
+    def count(self, tenant_id: int | None) -> int:
+        return int(self._redis.llen(self._key(tenant_id)))
+
+    def peek(self, tenant_id: int | None, limit: int) -> list[dict]:
+        return [json.loads(raw) for raw in self._redis.lrange(self._key(tenant_id), 0, limit - 1)]
+
+    def pop(self, tenant_id: int | None, limit: int) -> list[dict]:
+        """Atomically remove and return the oldest ``limit`` entries."""
+        key = self._key(tenant_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.lrange(key, 0, limit - 1)
+        pipe.ltrim(key, limit, -1)
+        raw_entries, _ = pipe.execute()
+        return [json.loads(raw) for raw in raw_entries]
+
+
+def defer_if_circuit_open(
+    provider: str,
+    tenant_id: int | None,
+    job_func: str,
+    *job_args: Any,
+    **job_kwargs: Any,
+) -> bool:
+    """Reschedule the running job for when the provider's circuit closes.
+
+    Returns:
+        True if the job was deferred and the caller must not send now
+    """
+    pause = get_circuit_breaker().open_for(provider, tenant_id)
+    if pause <= 0:
+        return False
+    # Spread the backlog over the first seconds after the circuit closes
+    delay = pause + random.uniform(0, max(1.0, pause * 0.2))
+    if reschedule_current_job(delay, job_func, *job_args, **job_kwargs):
+        logger.info("[Circuit] %s tenant_id=%s open, deferred %.0fs", provider, tenant_id, delay)
+        return True
+    # Not inside an RQ worker: try anyway
+    return False
+
+
+def dead_letter(
+    tenant_id: int | None,
+    func: str,
+    args: tuple | list,
+    *,
+    reason: str,
+    error: BaseException,
+    notification_ids: list[int],
+) -> None:
+    """Store a failed send job for bulk replay. Never raises."""
+    job = get_current_job()
+    try:
+        get_dead_letter_queue().push(
+            tenant_id,
+            func,
+            args,
+            origin=job.origin if job is not None else ALERTS_QUEUE,
+            reason=reason,
+            error=f"{type(error).__name__}: {error}",
+            notification_ids=notification_ids,
+        )
+    except Exception as exc:
+        logger.error("Failed to dead-letter %s notification_ids=%s: %s", func, notification_ids, exc)
+
+
+_circuit_breaker: CircuitBreaker | None = None
+_dead_letter_queue: DeadLetterQueue | None = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """Return the process-wide breaker (created lazily inside workers)."""
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker()
+    return _circuit_breaker
+
+
+def get_dead_letter_queue() -> DeadLetterQueue:
+    global _dead_letter_queue
+    if _dead_letter_queue is None:
+        _dead_letter_queue = DeadLetterQueue(redis.from_url(settings.redis_url, decode_responses=True))
+    return _dead_letter_queue
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import threading
 from typing import TYPE_CHECKING, Any
 
 import boto3
@@ -27,9 +29,105 @@ def mask_email(email: str) -> str:
     return f"{masked_local}@{domain}"
 
 
-class SESEmailClient:
+# SES accepts at most 50 destinations per SendBulkTemplatedEmail call
+SES_BULK_MAX_DESTINATIONS = 50
+
+
+class _SESBulkTemplateMixin:
+    """SendBulkTemplatedEmail support shared by the SES clients.
+
+    Subclasses provide ``_get_client()``, ``_source``, ``_region`` and
+    ``_log_prefix``.
+    """
+
+    # (account, region, template name) already created in SES by this process
+    _known_templates: set[tuple[str, str, str]] = set()
+    _templates_lock = threading.Lock()
+
+    def _template_account(self) -> str:
+        return "default"
+
+    async def ensure_template(self, name: str, subject: str, html: str) -> None:
+        """Create an SES template once; existing templates are left as is.
+
+        Template names embed a content hash, so changing a template creates
+        a new one instead of mutating what in-flight jobs use.
+        """
+        cache_key = (self._template_account(), self._region, name)
+        if cache_key in self._known_templates or not settings.enable_real_notifications:
+            return
+
+        client = self._get_client()
+
+        def _create():
+            try:
+                client.create_template(
+                    Template={"TemplateName": name, "SubjectPart": subject, "HtmlPart": html}
+                )
+            except ClientError as exc:
+                if exc.response.get("Error", {}).get("Code") not in ("AlreadyExists", "AlreadyExistsException"):
+                    raise
+
+        await asyncio.to_thread(_create)
+        with self._templates_lock:
+            self._known_templates.add(cache_key)
+
+    async def send_bulk_templated_email(
+        self,
+        template_name: str,
+        destinations: list[tuple[str, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """Send one templated email per destination in a single SES call.
+
+        Args:
+            template_name: SES template created with ensure_template
+            destinations: Up to 50 (recipient, template data) pairs
+
+        Returns:
+            One SES status dict per destination, in the same order
+            (``{"Status": "Success", "MessageId": ...}`` or an error status)
+        """
+        if len(destinations) > SES_BULK_MAX_DESTINATIONS:
+            raise ValueError(f"SES bulk send accepts at most {SES_BULK_MAX_DESTINATIONS} destinations")
+
+        if not settings.enable_real_notifications:
+            logger.info(
+                "%s Dry-run bulk email template=%s destinations=%d",
+                self._log_prefix,
+                template_name,
+                len(destinations),
+            )
+            return [{"Status": "Success"} for _ in destinations]
+
+        client = self._get_client()
+
+        def _send():
+            return client.send_bulk_templated_email(
+                Source=self._source,
+                Template=template_name,
+                DefaultTemplateData="{}",
+                Destinations=[
+                    {
+                        "Destination": {"ToAddresses": [to]},
+                        "ReplacementTemplateData": json.dumps(data),
+                    }
+                    for to, data in destinations
+                ],
+            )
+
+        try:
+            response = await asyncio.to_thread(_send)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error("%s Bulk send failed: %s", self._log_prefix, exc)
+            raise
+        return response.get("Status", [])
+
+
+class SESEmailClient(_SESBulkTemplateMixin):
     """SES email client with connection reuse."""
 
+    _log_prefix = "[SES]"
+
     def __init__(self) -> None:
         self._region = settings.ses_region
         self._source = settings.ses_source_email
@@ -82,7 +180,7 @@ class SESEmailClient:
             raise
 
 
-class TenantSESEmailClient:
+class TenantSESEmailClient(_SESBulkTemplateMixin):
     """SES email client using tenant-specific credentials."""
 
     def __init__(self, config: "DecryptedTenantConfig") -> None:
@@ -102,6 +200,11 @@ class TenantSESEmailClient:
             raise ValueError(f"SES source email not configured for tenant {config.tenant_id}")
 
         self._client = None
+        self._log_prefix = f"[SES:tenant={config.tenant_id}]"
+
+    def _template_account(self) -> str:
+        # Tenants with their own credentials may live in another AWS account
+        return self._access_key or "default"
 
     def _get_client(self):
         """Lazy initialize boto3 SES client with tenant credentials."""
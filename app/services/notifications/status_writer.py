@@ -0,0 +1,200 @@
+"""Batched notification status writes for the send workers.
+
+Send jobs no longer load their notification row or commit a transaction
+just to flip its status. They ``submit()`` the outcome (status, ts_sent,
+retries) to a process-wide buffer, and the buffer is written with one
+``UPDATE ... FROM (VALUES ...)`` per tenant schema, each inside
+``tenant_session_scope`` so the rows land in the tenant that sent them:
+
+- In-process workers (``RQ_SIMPLE_WORKER``) run a background flusher thread
+  that writes every ``NOTIFICATION_STATUS_FLUSH_MS`` or as soon as
+  ``NOTIFICATION_STATUS_FLUSH_ROWS`` updates are pending.
+- Forking workers lose process memory when the work-horse exits, so each job
+  flushes its own updates before returning (``after_job``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.repositories.notifications import NotificationRepository
+from app.db.session import async_session, tenant_session_scope
+from app.workers.queues import jobs_run_in_process
+
+
+@dataclass(frozen=True)
+class StatusUpdate:
+    """Pending change for one notification; ``None`` fields are left as is."""
+
+    notification_id: int
+    status: str | None = None
+    ts_sent: datetime | None = None
+    retries: int | None = None
+    tenant_schema: str | None = None
+
+    def merge(self, newer: "StatusUpdate") -> "StatusUpdate":
+        return replace(
+            self,
+            status=newer.status or self.status,
+            ts_sent=newer.ts_sent or self.ts_sent,
+            retries=newer.retries if newer.retries is not None else self.retries,
+        )
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "id": self.notification_id,
+            "status": self.status,
+            "ts_sent": self.ts_sent,
+            "retries": self.retries,
+        }
+
+
+class NotificationStatusWriter:
+    """Thread-safe buffer of notification status updates."""
+
+    def __init__(self, flush_interval_ms: int, max_rows: int, background: bool = False) -> None:
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_rows = max_rows
+        self.background = background
+        self._pending: dict[tuple[str | None, int], StatusUpdate] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def submit(
+        self,
+        notification_id: int | None,
+        status: str | None = None,
+        *,
+        ts_sent: datetime | None = None,
+        retries: int | None = None,
+        tenant_schema: str | None = None,
+    ) -> None:
+        """Buffer an update; later updates for the same notification win.
+
+        Args:
+            tenant_schema: Schema holding the notification row (None for public)
+        """
+        if notification_id is None:
+            # Untracked sends (e.g. invitation emails) have no row to update
+            return
+        update = StatusUpdate(notification_id, status, ts_sent, retries, tenant_schema)
+        key = (tenant_schema, notification_id)
+        with self._lock:
+            previous = self._pending.get(key)
+            self._pending[key] = previous.merge(update) if previous else update
+            full = len(self._pending) >= self.max_rows
+        if self.background:
+            self._ensure_started()
+            if full:
+                self._wakeup.set()
+
+    def _drain(self) -> list[StatusUpdate]:
+        with self._lock:
+            updates = list(self._pending.values())
+            self._pending.clear()
+        return updates
+
+    def _restore(self, updates: list[StatusUpdate]) -> None:
+        with self._lock:
+            for update in updates:
+                key = (update.tenant_schema, update.notification_id)
+                newer = self._pending.get(key)
+                self._pending[key] = update.merge(newer) if newer else update
+
+    async def flush(self, session_factory: Callable[[], Any] | None = None) -> int:
+        """Write the pending updates, one statement per tenant schema.
+
+        Returns:
+            Number of notifications written (updates for a schema whose write
+            failed stay buffered for the next flush)
+        """
+        by_schema: dict[str | None, list[StatusUpdate]] = {}
+        for update in self._drain():
+            by_schema.setdefault(update.tenant_schema, []).append(update)
+
+        written = 0
+        for schema, group in by_schema.items():
+            try:
+                async with tenant_session_scope(schema, session_factory or async_session) as session:
+                    await NotificationRepository(session).apply_status_updates([u.as_row() for u in group])
+                    await session.commit()
+            except Exception as exc:
+                self._restore(group)
+                logger.error(
+                    "Failed to write %d notification status update(s) for schema %s: %s",
+                    len(group), schema or "public", exc,
+                )
+                continue
+            written += len(group)
+        return written
+
+    async def after_job(self) -> None:
+        """Flush now unless the background thread owns the buffer."""
+        if not self.background:
+            await self.flush()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=lambda: asyncio.run(self._run()),
+                    name="notification-status-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    async def _run(self) -> None:
+        # Own engine: the jobs' event loops come and go, this one stays
+        engine = create_async_engine(settings.database_url, pool_size=1, max_overflow=0, pool_pre_ping=True)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._stopped.is_set():
+                await loop.run_in_executor(None, self._wakeup.wait, self.flush_interval)
+                self._wakeup.clear()
+                await self.flush(session_factory)
+            await self.flush(session_factory)
+        finally:
+            await engine.dispose()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the background flusher after a final flush."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+_status_writer: NotificationStatusWriter | None = None
+
+
+def get_status_writer() -> NotificationStatusWriter:
+    """Return the process-wide writer (created lazily inside workers)."""
+    global _status_writer
+    if _status_writer is None:
+        _status_writer = NotificationStatusWriter(
+            settings.notification_status_flush_ms,
+            settings.notification_status_flush_rows,
+            # Only in-process workers live long enough for a flusher thread
+            background=jobs_run_in_process(),
+        )
+    return _status_writer
@@ -0,0 +1,245 @@
+"""Per-tenant, per-day notification counters for the bitácora summary.
+
+Each UTC day of a tenant is a Redis hash whose fields are
+``status|channel|template`` counts, plus the ``_lo``/``_hi`` range of
+notification IDs it covers:
+
+- A missing day is built with one ``GROUP BY`` (``NotificationService``
+  reads it through ``NotificationRepository.count_by_window``).
+- Notifications created after the hash was built (``id > _hi``) are folded
+  in on the next read, again with a ``GROUP BY`` restricted to those rows.
+- Send workers move counts from ``queued`` to ``sent``/``failed`` as they
+  finish, for notifications already covered by today's or yesterday's hash.
+
+Counts that drift (dead-letter replays, Web Push results) are corrected
+when the hash expires ``NOTIFICATION_SUMMARY_CACHE_SECONDS`` after it was
+built (folds do not extend it) and is rebuilt from SQL.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.db.models.usage_stat import UsageStat
+from app.services.usage_meter import get_usage_meter
+
+
+# Only store or add to a day if nobody folded it since we read ``_hi``
+_FOLD_SCRIPT = """
+local key = KEYS[1]
+local expected = ARGV[1]
+local current = redis.call('HGET', key, '_hi')
+if (current or '') ~= expected then
+    return 0
+end
+local lo = tonumber(redis.call('HGET', key, '_lo'))
+if current == false or lo > tonumber(current) then
+    redis.call('HSET', key, '_lo', ARGV[2])
+end
+redis.call('HSET', key, '_hi', ARGV[3])
+for i = 5, #ARGV, 2 do
+    redis.call('HINCRBY', key, ARGV[i], tonumber(ARGV[i + 1]))
+end
+if current == false then
+    -- Only on creation: folds must not postpone the rebuild that fixes drift
+    redis.call('EXPIRE', key, tonumber(ARGV[4]))
+end
+return 1
+"""
+
+# Move each finished notification out of ``queued`` in the day that covers it
+_TRANSITION_SCRIPT = """
+local suffix = '|' .. ARGV[1] .. '|' .. ARGV[2]
+local applied = 0
+for i = 3, #ARGV, 2 do
+    local id = tonumber(ARGV[i])
+    for _, key in ipairs(KEYS) do
+        local range = redis.call('HMGET', key, '_lo', '_hi')
+        local lo = tonumber(range[1])
+        local hi = tonumber(range[2])
+        if lo and hi and id >= lo and id <= hi then
+            redis.call('HINCRBY', key, 'queued' .. suffix, -1)
+            redis.call('HINCRBY', key, ARGV[i + 1] .. suffix, 1)
+            applied = applied + 1
+            break
+        end
+    end
+end
+return applied
+"""
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Start and end (exclusive) of a UTC day."""
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+class DayCounts:
+    """Counts for one day, as stored in (or about to be stored in) Redis."""
+
+    def __init__(self, counts: dict[str, int] | None = None, lo: int = 1, hi: int = 0) -> None:
+        self.counts = counts or {}
+        self.lo = lo
+        self.hi = hi
+
+    @classmethod
+    def from_hash(cls, data: dict[str, str]) -> "DayCounts":
+        counts = {field: int(value) for field, value in data.items() if not field.startswith("_")}
+        return cls(counts, int(data.get("_lo", 1)), int(data.get("_hi", 0)))
+
+    def add(self, status: str, channel: str, template: str, count: int, min_id: int, max_id: int) -> None:
+        field = f"{status}|{channel}|{template}"
+        self.counts[field] = self.counts.get(field, 0) + count
+        if self.lo > self.hi:
+            self.lo = min_id
+        else:
+            self.lo = min(self.lo, min_id)
+        self.hi = max(self.hi, max_id)
+
+
+class NotificationSummaryCache:
+    """Redis-backed day counters; every method is a no-op without Redis."""
+
+    KEY = "notif:summary:{tenant}:{day}"
+
+    def __init__(self, redis_client: redis.Redis | None = None) -> None:
+        self._redis = redis_client
+        self._fold = None
+        self._transition = None
+        self._redis_available = False
+        self._init_redis()
+
+    def _init_redis(self) -> None:
+        try:
+            if self._redis is None:
+                self._redis = redis.from_url(settings.redis_url, decode_responses=True)
+                self._redis.ping()
+            self._fold = self._redis.register_script(_FOLD_SCRIPT)
+            self._transition = self._redis.register_script(_TRANSITION_SCRIPT)
+            self._redis_available = True
+        except Exception:
+            self._redis_available = False
+
+    @property
+    def available(self) -> bool:
+        return self._redis_available
+
+    def _key(self, tenant_id: int | None, day: date) -> str:
+        return self.KEY.format(tenant=tenant_id or "global", day=day.isoformat())
+
+    def load(self, tenant_id: int | None, days: list[date]) -> dict[date, DayCounts | None] | None:
+        """Read the cached days (None for days not built yet).
+
+        Returns:
+            Map of day -> counts, or None if Redis is unreachable
+        """
+        if not self._redis_available:
+            return None
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for day in days:
+                pipe.hgetall(self._key(tenant_id, day))
+            hashes = pipe.execute()
+        except Exception as exc:
+            logger.warning("Redis notification summary read failed: %s", exc)
+            return None
+        return {
+            day: DayCounts.from_hash(_decode(data)) if data else None
+            for day, data in zip(days, hashes)
+        }
+
+    def fold(
+        self,
+        tenant_id: int | None,
+        day: date,
+        expected_hi: int | None,
+        delta: DayCounts,
+    ) -> bool:
+        """Create a day (``expected_hi=None``) or add newer rows to it.
+
+        Returns:
+            False if another reader changed the day first (the delta is dropped)
+        """
+        if not self._redis_available:
+            return False
+        args: list[Any] = [
+            "" if expected_hi is None else str(expected_hi),
+            delta.lo,
+            max(delta.hi, expected_hi or 0),
+            settings.notification_summary_cache_seconds,
+        ]
+        for field, count in delta.counts.items():
+            args.extend((field, count))
+        try:
+            return bool(self._fold(keys=[self._key(tenant_id, day)], args=args))
+        except Exception as exc:
+            logger.warning("Redis notification summary write failed: %s", exc)
+            return False
+
+    def record_outcomes(
+        self,
+        tenant_id: int | None,
+        channel: str,
+        template: str,
+        statuses: dict[int, str],
+    ) -> None:
+        """Move finished notifications from ``queued`` to their final status."""
+        if not self._redis_available or not statuses:
+            return
+        today = datetime.now(timezone.utc).date()
+        keys = [self._key(tenant_id, today), self._key(tenant_id, today - timedelta(days=1))]
+        args: list[Any] = [channel, template]
+        for notification_id, status in statuses.items():
+            args.extend((notification_id, status))
+        try:
+            self._transition(keys=keys, args=args)
+        except Exception as exc:
+            logger.warning("Redis notification summary update failed: %s", exc)
+
+
+def _decode(data: dict) -> dict[str, str]:
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in data.items()
+    }
+
+
+_summary_cache: NotificationSummaryCache | None = None
+
+_CHANNEL_METRICS = {
+    "WHATSAPP": UsageStat.METRIC_WHATSAPP_MESSAGES,
+    "EMAIL": UsageStat.METRIC_EMAIL_MESSAGES,
+}
+
+
+def get_summary_cache() -> NotificationSummaryCache:
+    """Return the process-wide counters (created lazily)."""
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = NotificationSummaryCache()
+    return _summary_cache
+
+
+def record_send_outcomes(
+    tenant_id: int | None,
+    channel: str,
+    template: str,
+    statuses: dict[int | None, str],
+) -> None:
+    """Count the outcome of a send job in the tenant's summary and usage counters."""
+    get_summary_cache().record_outcomes(
+        tenant_id, channel, template, {nid: status for nid, status in statuses.items() if nid}
+    )
+    sent = sum(1 for status in statuses.values() if status == "sent")
+    if sent:
+        meter = get_usage_meter()
+        meter.record(tenant_id, UsageStat.METRIC_NOTIFICATIONS_SENT, sent)
+        channel_metric = _CHANNEL_METRICS.get(channel)
+        if channel_metric:
+            meter.record(tenant_id, channel_metric, sent)
@@ -0,0 +1,146 @@
+"""Async Web Push client with VAPID header reuse."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+from py_vapid import Vapid
+from pywebpush import WebPusher
+
+# Push services reject VAPID tokens valid for more than 24h; pywebpush uses 12h
+VAPID_TOKEN_LIFETIME_SECONDS = 12 * 3600
+# Re-sign this long before expiry so in-flight requests never carry a stale token
+VAPID_REFRESH_MARGIN_SECONDS = 600
+
+# Status codes meaning the subscription is gone for good
+EXPIRED_STATUS_CODES = (404, 410)
+
+
+def push_origin(endpoint: str) -> str:
+    """Return the push-service origin (VAPID ``aud`` claim) of an endpoint."""
+    url = urlparse(endpoint)
+    return f"{url.scheme}://{url.netloc}"
+
+
+def mask_endpoint(endpoint: str) -> str:
+    return f"{endpoint[:50]}..." if len(endpoint) > 50 else endpoint
+
+
+class VapidHeaderCache:
+    """Signed VAPID Authorization headers, one per push-service origin.
+
+    Signing a JWT costs an ECDSA operation; the token only depends on the
+    origin, so it is reused for every subscription of that push service
+    until shortly before it expires.
+    """
+
+    def __init__(self, private_key: str, subject: str) -> None:
+        self._private_key = private_key
+        self._subject = subject
+        self._signer: Vapid | None = None
+        self._entries: dict[str, tuple[dict[str, str], int]] = {}
+        self._lock = threading.Lock()
+
+    def headers_for(self, endpoint: str) -> dict[str, str]:
+        origin = push_origin(endpoint)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry and entry[1] - VAPID_REFRESH_MARGIN_SECONDS > now:
+                return entry[0]
+            if self._signer is None:
+                self._signer = Vapid.from_string(private_key=self._private_key)
+            expires_at = int(now) + VAPID_TOKEN_LIFETIME_SECONDS
+            headers = self._signer.sign({"sub": self._subject, "aud": origin, "exp": expires_at})
+            self._entries[origin] = (headers, expires_at)
+            return headers
+
+
+_vapid_caches: dict[tuple[str, str], VapidHeaderCache] = {}
+_vapid_caches_lock = threading.Lock()
+
+
+def get_vapid_cache(private_key: str, subject: str) -> VapidHeaderCache:
+    """Process-wide header cache for a VAPID key pair (survives event loops)."""
+    with _vapid_caches_lock:
+        cache = _vapid_caches.get((private_key, subject))
+        if cache is None:
+            cache = VapidHeaderCache(private_key, subject)
+            _vapid_caches[(private_key, subject)] = cache
+        return cache
+
+
+@dataclass
+class PushResult:
+    """Outcome of one push: "sent", "expired" (remove subscription) or "failed"."""
+
+    endpoint: str
+    status: str
+    status_code: int | None = None
+
+
+class AsyncWebPushSender:
+    """Send Web Push messages concurrently over one shared HTTP client."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        vapid: VapidHeaderCache,
+        concurrency: int = 20,
+        ttl: int = 0,
+    ) -> None:
+        self._client = client
+        self._vapid = vapid
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._ttl = ttl
+
+    def _prepare(self, subscription_info: dict[str, Any], payload: dict[str, Any]) -> tuple[bytes, dict[str, str]]:
+        encoded = WebPusher(subscription_info).encode(json.dumps(payload).encode(), "aes128gcm")
+        headers = {
+            **self._vapid.headers_for(subscription_info["endpoint"]),
+            "Content-Encoding": "aes128gcm",
+            "TTL": str(self._ttl),
+        }
+        return encoded["body"], headers
+
+    async def send(self, subscription_info: dict[str, Any], payload: dict[str, Any]) -> PushResult:
+        endpoint = subscription_info.get("endpoint", "")
+        try:
+            body, headers = self._prepare(subscription_info, payload)
+        except Exception as exc:
+            logger.error("[Push] Invalid subscription %s: %s", mask_endpoint(endpoint), exc)
+            return PushResult(endpoint, "failed")
+
+        async with self._semaphore:
+            try:
+                response = await self._client.post(endpoint, content=body, headers=headers)
+            except httpx.HTTPError as exc:
+                logger.error("[Push] Request to %s failed: %s", mask_endpoint(endpoint), exc)
+                return PushResult(endpoint, "failed")
+
+        if response.status_code in EXPIRED_STATUS_CODES:
+            logger.info("[Push] Subscription expired (%s): %s", response.status_code, mask_endpoint(endpoint))
+            return PushResult(endpoint, "expired", response.status_code)
+        if response.status_code > 202:
+            logger.error(
+                "[Push] Push service rejected %s: %s %s",
+                mask_endpoint(endpoint),
+                response.status_code,
+                response.text[:200],
+            )
+            return PushResult(endpoint, "failed", response.status_code)
+        return PushResult(endpoint, "sent", response.status_code)
+
+    async def send_many(
+        self, messages: list[tuple[dict[str, Any], dict[str, Any]]]
+    ) -> list[PushResult]:
+        """Send (subscription_info, payload) pairs; results keep input order."""
+        return list(await asyncio.gather(*(self.send(sub, payload) for sub, payload in messages)))
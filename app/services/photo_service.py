@@ -4,34 +4,81 @@ from __future__ import annotations
 
 import asyncio
 import io
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
 from typing import BinaryIO
 
-import boto3
-from botocore.client import Config
 from loguru import logger
 
 from app.core.config import settings
+from app.services.storage.base import DELETE_BATCH_SIZE, StorageBackend
+from app.services.storage.registry import create_storage
+
+
+class PresignedUrlCache:
+    """LRU of presigned GET URLs, shared by every ``PhotoService``.
+
+    Signing is a local HMAC, but dashboards re-sign the same hundreds of keys
+    on every refresh. A URL is reused for the same (storage namespace, key,
+    expiry) until only ``min_remaining`` of its lifetime is left, so a cached
+    URL always stays valid for at least that fraction of ``expires``.
+    """
+
+    def __init__(self, max_entries: int, min_remaining: float = 0.25) -> None:
+        self._max_entries = max_entries
+        self._min_remaining = min_remaining
+        self._entries: OrderedDict[tuple[str, str, int], tuple[str, float]] = OrderedDict()
+        # PhotoService is also used from worker threads
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str, expires: int, now: float) -> str | None:
+        with self._lock:
+            entry = self._entries.get((namespace, key, expires))
+            if entry is None:
+                return None
+            url, reuse_until = entry
+            if now >= reuse_until:
+                del self._entries[(namespace, key, expires)]
+                return None
+            self._entries.move_to_end((namespace, key, expires))
+            return url
+
+    def put(self, namespace: str, key: str, expires: int, url: str, now: float) -> None:
+        reuse_until = now + expires * (1 - self._min_remaining)
+        with self._lock:
+            self._entries[(namespace, key, expires)] = (url, reuse_until)
+            self._entries.move_to_end((namespace, key, expires))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+presigned_url_cache = PresignedUrlCache(settings.presigned_url_cache_size)
 
 
 class PhotoService:
-    """Photo storage service with proper resource cleanup."""
-
-    def __init__(self) -> None:
-        self._client = boto3.client(
-            "s3",
-            endpoint_url=settings.s3_endpoint,
-            aws_access_key_id=settings.s3_access_key,
-            aws_secret_access_key=settings.s3_secret_key,
-            region_name=settings.s3_region,
-            config=Config(signature_version="s3v4"),
-            use_ssl=settings.s3_secure,
-        )
-        self._bucket = settings.s3_bucket
+    """Async photo storage on top of a ``StorageBackend``.
+
+    Backend calls block, so they run in a thread. Without ``storage`` the
+    service creates a default backend of its own and closes it in
+    ``close()``; a backend passed in (e.g. from ``tenant_storage``) is
+    shared and left open.
+    """
+
+    def __init__(self, storage: StorageBackend | None = None) -> None:
+        self._owns_storage = storage is None
+        self.storage = storage if storage is not None else create_storage()
 
     def close(self) -> None:
-        """R3-R6 fix: Close boto3 client connection."""
-        if self._client:
-            self._client.close()
+        """R3-R6 fix: Close the storage client we created."""
+        if self._owns_storage and self.storage:
+            self.storage.close()
+            self.storage = None
 
     def __del__(self) -> None:
         """R3-R6 fix: Cleanup on garbage collection."""
@@ -44,47 +91,95 @@ class PhotoService:
         # R2-B20 fix: Use asyncio.to_thread to prevent blocking event loop
         # TDD-R3-BUG5 fix: Properly close BytesIO buffer in all paths
         buffer: BinaryIO = io.BytesIO(data)
-
-        def _upload():
-            self._client.upload_fileobj(
-                buffer,
-                Bucket=self._bucket,
-                Key=key,
-                ExtraArgs={"ContentType": content_type, "ACL": "private"},
-            )
-
         try:
-            await asyncio.to_thread(_upload)
-            logger.info("Stored photo in bucket=%s key=%s", self._bucket, key)
+            await asyncio.to_thread(self.storage.put, key, buffer, content_type)
+            logger.info("Stored photo in %s key=%s", self.storage.namespace, key)
             return key
         finally:
             buffer.close()
 
     async def delete_photo(self, key: str) -> None:
         # R2-B20 fix: Use asyncio.to_thread to prevent blocking event loop
-        await asyncio.to_thread(self._client.delete_object, Bucket=self._bucket, Key=key)
-        logger.info("Deleted photo bucket=%s key=%s", self._bucket, key)
+        await asyncio.to_thread(self.storage.delete, key)
+        logger.info("Deleted photo %s key=%s", self.storage.namespace, key)
+
+    async def delete_photos(self, keys: list[str]) -> set[str]:
+        """Delete up to ``DELETE_BATCH_SIZE`` objects in one request.
+
+        Missing objects count as deleted.
+
+        Returns:
+            The keys the backend could not delete
+        """
+        if not keys:
+            return set()
+        if len(keys) > DELETE_BATCH_SIZE:
+            raise ValueError(f"DeleteObjects admite como máximo {DELETE_BATCH_SIZE} claves")
+
+        failed = await asyncio.to_thread(self.storage.delete_many, keys)
+        logger.info("Deleted %d object(s) from %s", len(keys) - len(failed), self.storage.namespace)
+        return failed
+
+    async def generate_presigned_post(
+        self, key: str, content_type: str, max_bytes: int, expires: int = 300
+    ) -> dict:
+        """Presigned POST letting a client upload ``key`` directly to storage.
+
+        The policy pins the key and content type and bounds the size to
+        ``1..max_bytes``, so the backend rejects anything else.
+
+        Returns:
+            ``{"url": ..., "fields": {...}}``
+        """
+        return await asyncio.to_thread(self.storage.presign_post, key, content_type, max_bytes, expires)
+
+    async def read_header(self, key: str, length: int = 16) -> tuple[bytes, str] | None:
+        """Read the first ``length`` bytes of an object.
+
+        Returns:
+            (header bytes, stored content type), or None if the object does not exist
+        """
+        return await asyncio.to_thread(self.storage.read_range, key, length)
+
+    async def read_object(self, key: str) -> bytes | None:
+        """Download a whole object, or None if it does not exist."""
+        return await asyncio.to_thread(self.storage.get, key)
+
+    def presign_urls(self, keys: Iterable[str | None], expires: int = 3600) -> dict[str, str]:
+        """Presigned GET URLs for many keys in one in-process call.
+
+        Signing needs no network round trip, so it runs on the caller's
+        thread; URLs come from ``presigned_url_cache`` when possible.
+
+        Returns:
+            URL by key; keys that fail to sign are left out
+        """
+        now = time.monotonic()
+        namespace = self.storage.namespace
+        urls: dict[str, str] = {}
+        for key in keys:
+            if not key or key in urls:
+                continue
+            url = presigned_url_cache.get(namespace, key, expires, now)
+            if url is None:
+                try:
+                    url = self.storage.presign_get(key, expires)
+                except Exception as exc:  # pragma: no cover - best effort URL generation
+                    logger.error("Failed to generate presigned URL for %s: %s", key, exc)
+                    continue
+                presigned_url_cache.put(namespace, key, expires, url, now)
+            urls[key] = url
+        return urls
 
     async def generate_presigned_url(self, key: str, expires: int = 3600) -> str | None:
         """Generate a presigned URL for accessing a photo.
 
-        R12-P5 fix: Made async to avoid blocking event loop during S3 API call.
+        Signing is local and cached (see ``presign_urls``); prefer
+        ``presign_urls`` when signing several keys.
 
         Returns:
             The presigned URL string, or None if generation fails.
         """
         if not key:
             return None
-
-        def _generate():
-            return self._client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": self._bucket, "Key": key},
-                ExpiresIn=expires,
-            )
-
-        try:
-            return await asyncio.to_thread(_generate)
-        except Exception as exc:  # pragma: no cover - best effort URL generation
-            logger.error("Failed to generate presigned URL for %s: %s", key, exc)
-            return None
+        return self.presign_urls([key], expires).get(key)
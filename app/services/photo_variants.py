@@ -0,0 +1,57 @@
+"""WebP variants of evidence photos.
+
+Kiosk photos are stored as uploaded (often several MB). Lists and messages
+only need a fraction of that, so the ``photo_variants`` job stores two WebP
+copies next to the original:
+
+- ``thumb``: list and dashboard thumbnails;
+- ``medium``: the photo viewer and WhatsApp/email messages.
+
+Consumers link a variant when it exists and fall back to the original.
+"""
+
+from __future__ import annotations
+
+import io
+
+# Longest side, in pixels
+VARIANT_SIZES = {"thumb": 160, "medium": 960}
+WEBP_QUALITY = 75
+
+
+def variant_key(photo_ref: str, variant: str) -> str:
+    """``events/1/abc.jpg`` -> ``events/1/abc.thumb.webp``."""
+    stem = photo_ref.rsplit(".", 1)[0] if "." in photo_ref.rsplit("/", 1)[-1] else photo_ref
+    return f"{stem}.{variant}.webp"
+
+
+def render_variants(data: bytes) -> dict[str, bytes]:
+    """Encode every variant of an image as WebP.
+
+    CPU bound: callers run it in a thread.
+
+    Raises:
+        ValueError: The data is not an image Pillow can read
+    """
+    # Pillow is only needed by the worker that renders the variants
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    largest = max(VARIANT_SIZES.values())
+    try:
+        with Image.open(io.BytesIO(data)) as original:
+            # JPEG: decode at a reduced scale directly instead of full resolution
+            original.draft("RGB", (largest, largest))
+            # Kiosk cameras store the rotation in EXIF instead of the pixels
+            image = ImageOps.exif_transpose(original)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+    except (UnidentifiedImageError, OSError) as exc:
+        raise ValueError(f"Imagen no válida: {exc}") from exc
+
+    variants: dict[str, bytes] = {}
+    for name, size in VARIANT_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+        variants[name] = buffer.getvalue()
+    return variants
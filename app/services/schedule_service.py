@@ -1,5 +1,6 @@
 """Schedule service implementation."""
 
+from datetime import date, datetime, timezone
 from typing import List
 
 from app.db.repositories.schedules import ScheduleRepository
@@ -9,12 +10,15 @@ from app.schemas.schedules import (
     ScheduleExceptionRead,
     ScheduleRead,
 )
+from app.services.calendar_service import CalendarService
+from app.workers.no_show_timeline import request_replan
 
 
 class ScheduleService:
     def __init__(self, session):
         self.session = session
         self.repository = ScheduleRepository(session)
+        self.calendar = CalendarService(session)
 
     async def list_course_schedule(self, course_id: int) -> List[ScheduleRead]:
         schedules = await self.repository.list_by_course(course_id)
@@ -27,7 +31,9 @@ class ScheduleService:
             in_time=payload.in_time,
             out_time=payload.out_time,
         )
+        await self.calendar.on_schedule_changed(course_id)
         await self.session.commit()
+        request_replan()
         return ScheduleRead.model_validate(schedule, from_attributes=True)
 
     async def update_schedule_entry(self, schedule_id: int, payload: ScheduleCreate) -> ScheduleRead:
@@ -37,7 +43,9 @@ class ScheduleService:
             in_time=payload.in_time,
             out_time=payload.out_time,
         )
+        await self.calendar.on_schedule_changed(schedule.course_id)
         await self.session.commit()
+        request_replan()
         return ScheduleRead.model_validate(schedule, from_attributes=True)
 
     async def create_exception(self, payload: ScheduleExceptionCreate) -> ScheduleExceptionRead:
@@ -50,11 +58,23 @@ class ScheduleService:
             reason=payload.reason,
             created_by=None,
         )
+        await self.calendar.on_exception_changed(payload.date, payload.course_id)
         await self.session.commit()
+        self._replan_if_today(payload.date)
         return ScheduleExceptionRead.model_validate(exception, from_attributes=True)
 
     async def delete_exception(self, exception_id: int) -> None:
-        deleted = await self.repository.delete_exception(exception_id)
-        if not deleted:
+        exception = await self.repository.get_exception(exception_id)
+        if exception is None:
             raise ValueError("Excepción no encontrada")
+        day, course_id = exception.date, exception.course_id
+        await self.repository.delete_exception(exception_id)
+        await self.calendar.on_exception_changed(day, course_id)
         await self.session.commit()
+        self._replan_if_today(day)
+
+    @staticmethod
+    def _replan_if_today(day: date) -> None:
+        # Only today's no-show timers exist; other days are planned when they come
+        if day == datetime.now(timezone.utc).date():
+            request_replan()
@@ -0,0 +1,55 @@
+"""Evidence storage backend interface."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import BinaryIO
+
+# S3 DeleteObjects accepts at most 1,000 keys per request
+DELETE_BATCH_SIZE = 1000
+
+
+class StorageBackend(ABC):
+    """Object storage for evidence files.
+
+    Methods are blocking: ``PhotoService`` runs the ones doing I/O in a
+    thread. Keys are relative to the backend (``events/1/abc.jpg``); a
+    tenant prefix, if any, is applied by the backend itself.
+    """
+
+    @property
+    @abstractmethod
+    def namespace(self) -> str:
+        """Identifies where keys live (bucket and prefix), for caches."""
+
+    @abstractmethod
+    def put(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Whole object, or None if it does not exist."""
+
+    @abstractmethod
+    def read_range(self, key: str, length: int) -> tuple[bytes, str] | None:
+        """First ``length`` bytes and stored content type, or None if missing/empty."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete_many(self, keys: Sequence[str]) -> set[str]:
+        """Delete up to ``DELETE_BATCH_SIZE`` keys; return the ones that failed."""
+
+    @abstractmethod
+    def presign_get(self, key: str, expires: int) -> str:
+        """Time-limited download URL (computed locally, no network)."""
+
+    @abstractmethod
+    def presign_post(self, key: str, content_type: str, max_bytes: int, expires: int) -> dict:
+        """``{"url": ..., "fields": {...}}`` for a direct multipart upload of ``key``."""
+
+    def close(self) -> None:
+        """Release resources owned by the backend."""
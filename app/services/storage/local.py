@@ -0,0 +1,180 @@
+"""Local filesystem storage backend.
+
+Objects are plain files under ``root``. Downloads and uploads go through
+the API's ``/api/v1/storage`` routes with HMAC-signed, expiring URLs (the
+local equivalent of S3 presigned URLs); downloads are served with
+``FileResponse`` so the server can use ``sendfile`` instead of copying the
+file through Python.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import BinaryIO
+from urllib.parse import quote, urlencode
+
+from loguru import logger
+
+from app.core.config import settings
+from app.services.storage.base import DELETE_BATCH_SIZE, StorageBackend
+
+# Media type sidecar, next to each object
+CONTENT_TYPE_SUFFIX = ".content-type"
+
+
+def _signature(message: str) -> str:
+    digest = hmac.new(settings.secret_key.encode(), message.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def sign_download(path: str, expires_at: int) -> str:
+    return _signature(f"GET\n{path}\n{expires_at}")
+
+
+def verify_download(path: str, expires_at: int, signature: str) -> bool:
+    if expires_at < time.time():
+        return False
+    return hmac.compare_digest(sign_download(path, expires_at), signature)
+
+
+def encode_upload_policy(policy: dict) -> tuple[str, str]:
+    """Base64 policy document and its signature, as sent in the POST form."""
+    encoded = base64.urlsafe_b64encode(json.dumps(policy, separators=(",", ":")).encode()).decode()
+    return encoded, _signature(f"POST\n{encoded}")
+
+
+def decode_upload_policy(encoded: str, signature: str) -> dict | None:
+    """Policy document if the signature matches and it has not expired."""
+    if not hmac.compare_digest(_signature(f"POST\n{encoded}"), signature):
+        return None
+    try:
+        policy = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+    except ValueError:
+        return None
+    if policy.get("expires_at", 0) < time.time():
+        return None
+    return policy
+
+
+class LocalStorage(StorageBackend):
+    """Objects stored under ``root/prefix``."""
+
+    def __init__(self, root: str | Path, prefix: str = "", base_url: str | None = None) -> None:
+        self.root = Path(root).resolve()
+        self.prefix = prefix.strip("/")
+        self.base_url = (base_url or f"{str(settings.public_base_url).rstrip('/')}/api/v1/storage").rstrip("/")
+
+    @property
+    def namespace(self) -> str:
+        return f"local:{self.root}/{self.prefix}"
+
+    def relative_path(self, key: str) -> str:
+        """Path of ``key`` relative to ``root`` (what signed URLs carry)."""
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def path_for(self, relative: str) -> Path:
+        """Absolute file path for ``relative``, refusing anything outside ``root``."""
+        path = (self.root / relative).resolve()
+        if path == self.root or self.root not in path.parents:
+            raise ValueError(f"Ruta fuera del almacenamiento: {relative}")
+        return path
+
+    def _path(self, key: str) -> Path:
+        return self.path_for(self.relative_path(key))
+
+    def write(self, relative: str, fileobj: BinaryIO, content_type: str, max_bytes: int | None = None) -> int:
+        """Atomically write ``fileobj`` at ``relative``; return its size.
+
+        Raises:
+            ValueError: If more than ``max_bytes`` are read
+        """
+        path = self.path_for(relative)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while chunk := fileobj.read(1024 * 1024):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise ValueError("Archivo excede el tamaño máximo")
+                    tmp.write(chunk)
+            Path(f"{path}{CONTENT_TYPE_SUFFIX}").write_text(content_type)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return size
+
+    def content_type(self, path: Path) -> str:
+        sidecar = Path(f"{path}{CONTENT_TYPE_SUFFIX}")
+        try:
+            return sidecar.read_text()
+        except FileNotFoundError:
+            return mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    def put(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        self.write(self.relative_path(key), fileobj, content_type)
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def read_range(self, key: str, length: int) -> tuple[bytes, str] | None:
+        path = self._path(key)
+        try:
+            with path.open("rb") as fh:
+                header = fh.read(length)
+        except FileNotFoundError:
+            return None
+        if not header:
+            return None
+        return header, self.content_type(path)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        path.unlink(missing_ok=True)
+        Path(f"{path}{CONTENT_TYPE_SUFFIX}").unlink(missing_ok=True)
+
+    def delete_many(self, keys: Sequence[str]) -> set[str]:
+        if len(keys) > DELETE_BATCH_SIZE:
+            raise ValueError(f"DeleteObjects admite como máximo {DELETE_BATCH_SIZE} claves")
+        failed = set()
+        for key in keys:
+            try:
+                self.delete(key)
+            except OSError as exc:
+                logger.error("Failed to delete local object key=%s: %s", key, exc)
+                failed.add(key)
+        return failed
+
+    def presign_get(self, key: str, expires: int) -> str:
+        relative = self.relative_path(key)
+        expires_at = int(time.time()) + expires
+        query = urlencode({"expires": expires_at, "signature": sign_download(relative, expires_at)})
+        return f"{self.base_url}/files/{quote(relative)}?{query}"
+
+    def presign_post(self, key: str, content_type: str, max_bytes: int, expires: int) -> dict:
+        policy, signature = encode_upload_policy(
+            {
+                "path": self.relative_path(key),
+                "content_type": content_type,
+                "max_bytes": max_bytes,
+                "expires_at": int(time.time()) + expires,
+            }
+        )
+        return {
+            "url": f"{self.base_url}/upload",
+            "fields": {"key": key, "Content-Type": content_type, "policy": policy, "signature": signature},
+        }
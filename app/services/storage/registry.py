@@ -0,0 +1,98 @@
+"""Storage backend selection and per-tenant routing.
+
+``STORAGE_BACKEND`` picks S3 or the local filesystem. Tenants may have
+their own bucket and prefix in ``TenantConfig`` (``s3_bucket``,
+``s3_prefix``); backends are cached per (bucket, prefix) and all S3
+backends share one thread-safe boto3 client, so routing a request to its
+tenant costs a dict lookup once the tenant config is cached.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from loguru import logger
+
+from app.core.config import settings
+from app.db.repositories.tenants import TenantRepository
+from app.db.session import async_session
+from app.services.storage.base import StorageBackend
+from app.services.storage.local import LocalStorage
+from app.services.storage.s3 import S3Storage, create_s3_client
+
+_lock = threading.Lock()
+_shared_s3_client = None
+_backends: dict[tuple[str, str, str], StorageBackend] = {}
+# Tenant IDs by schema, for jobs that only know the schema
+_tenant_ids: dict[str, int | None] = {}
+
+
+def create_storage(bucket: str | None = None, prefix: str | None = None) -> StorageBackend:
+    """New backend with its own client, closed with the backend."""
+    if settings.storage_backend == "local":
+        return LocalStorage(settings.local_storage_root, prefix or "")
+    return S3Storage(create_s3_client(), bucket or settings.s3_bucket, prefix or "", owns_client=True)
+
+
+def get_storage(bucket: str | None = None, prefix: str | None = None) -> StorageBackend:
+    """Shared backend for (bucket, prefix); the defaults come from settings."""
+    global _shared_s3_client
+    kind = settings.storage_backend
+    cache_key = (kind, bucket or settings.s3_bucket, prefix or "")
+    with _lock:
+        backend = _backends.get(cache_key)
+        if backend is None:
+            if kind == "local":
+                backend = LocalStorage(settings.local_storage_root, prefix or "")
+            else:
+                if _shared_s3_client is None:
+                    _shared_s3_client = create_s3_client()
+                backend = S3Storage(_shared_s3_client, cache_key[1], prefix or "")
+            _backends[cache_key] = backend
+        return backend
+
+
+async def _tenant_id_for_schema(tenant_schema: str) -> int | None:
+    if tenant_schema not in _tenant_ids:
+        async with async_session() as session:
+            tenant = await TenantRepository(session).get_by_slug(tenant_schema.removeprefix("tenant_"))
+        _tenant_ids[tenant_schema] = tenant.id if tenant else None
+    return _tenant_ids[tenant_schema]
+
+
+async def tenant_storage(tenant_id: int | None = None, tenant_schema: str | None = None) -> StorageBackend:
+    """Backend for a tenant's bucket and prefix (the default one if unset).
+
+    Args:
+        tenant_id: Tenant, when known
+        tenant_schema: Used to find the tenant when ``tenant_id`` is not given
+    """
+    # Imported here: the cache connects to Redis on import
+    from app.services.tenant_config_cache import tenant_config_cache
+
+    try:
+        if tenant_id is None and tenant_schema:
+            tenant_id = await _tenant_id_for_schema(tenant_schema)
+        if tenant_id is None:
+            return get_storage()
+        async with async_session() as session:
+            config = await tenant_config_cache.get(session, tenant_id)
+    except Exception as exc:
+        logger.warning(
+            "Tenant storage lookup failed tenant_id=%s schema=%s, using default: %s", tenant_id, tenant_schema, exc
+        )
+        return get_storage()
+    if config is None:
+        return get_storage()
+    return get_storage(config.s3_bucket, config.s3_prefix)
+
+
+def reset_storage() -> None:
+    """Drop cached backends and close the shared client (for testing)."""
+    global _shared_s3_client
+    with _lock:
+        _backends.clear()
+        _tenant_ids.clear()
+        if _shared_s3_client is not None:
+            _shared_s3_client.close()
+            _shared_s3_client = None
@@ -0,0 +1,128 @@
+"""S3 (or MinIO) storage backend."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import BinaryIO
+
+import boto3
+from botocore.client import Config
+from botocore.exceptions import ClientError
+from loguru import logger
+
+from app.core.config import settings
+from app.services.storage.base import DELETE_BATCH_SIZE, StorageBackend
+
+
+def create_s3_client():
+    """boto3 S3 client from settings; thread-safe, shared by every bucket."""
+    return boto3.client(
+        "s3",
+        endpoint_url=settings.s3_endpoint,
+        aws_access_key_id=settings.s3_access_key,
+        aws_secret_access_key=settings.s3_secret_key,
+        region_name=settings.s3_region,
+        config=Config(
+            signature_version="s3v4",
+            connect_timeout=5,
+            read_timeout=30,
+            retries={"max_attempts": 3, "mode": "standard"},
+            # Tenants share the client: size the pool for concurrent requests
+            max_pool_connections=50,
+        ),
+        use_ssl=settings.s3_secure,
+    )
+
+
+class S3Storage(StorageBackend):
+    """Keys live in ``bucket`` under ``prefix``."""
+
+    def __init__(self, client, bucket: str, prefix: str = "", owns_client: bool = False) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix and prefix.strip("/") else ""
+        self._owns_client = owns_client
+
+    @property
+    def namespace(self) -> str:
+        return f"s3:{self.bucket}/{self.prefix}"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def put(self, key: str, fileobj: BinaryIO, content_type: str) -> None:
+        self.client.upload_fileobj(
+            fileobj,
+            Bucket=self.bucket,
+            Key=self._key(key),
+            ExtraArgs={"ContentType": content_type, "ACL": "private"},
+        )
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+                return None
+            raise
+        try:
+            return response["Body"].read()
+        finally:
+            response["Body"].close()
+
+    def read_range(self, key: str, length: int) -> tuple[bytes, str] | None:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._key(key), Range=f"bytes=0-{length - 1}"
+            )
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404", "InvalidRange"}:
+                return None
+            raise
+        try:
+            return response["Body"].read(), response.get("ContentType", "")
+        finally:
+            response["Body"].close()
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def delete_many(self, keys: Sequence[str]) -> set[str]:
+        if len(keys) > DELETE_BATCH_SIZE:
+            raise ValueError(f"DeleteObjects admite como máximo {DELETE_BATCH_SIZE} claves")
+        response = self.client.delete_objects(
+            Bucket=self.bucket,
+            Delete={"Objects": [{"Key": self._key(key)} for key in keys], "Quiet": True},
+        )
+        failed = set()
+        for error in response.get("Errors", []):
+            logger.error(
+                "Failed to delete bucket=%s key=%s: %s", self.bucket, error.get("Key"), error.get("Message")
+            )
+            if "Key" in error:
+                failed.add(error["Key"][len(self.prefix):])
+        return failed
+
+    def presign_get(self, key: str, expires: int) -> str:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self._key(key)},
+            ExpiresIn=expires,
+        )
+
+    def presign_post(self, key: str, content_type: str, max_bytes: int, expires: int) -> dict:
+        # The policy pins key and content type and bounds the size, so S3 rejects anything else
+        return self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=expires,
+        )
+
+    def close(self) -> None:
+        if self._owns_client:
+            self.client.close()
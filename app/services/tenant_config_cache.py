@@ -0,0 +1,106 @@
+"""Process-local cache of decrypted tenant credentials.
+
+Notification workers look up the same tenant's WhatsApp/SES credentials for
+every job. Loading them means a DB query plus several Fernet decryptions, so
+workers keep the decrypted config in memory for a short TTL. Workers that
+run jobs in-process (``RQ_SIMPLE_WORKER``) share one cached entry across
+every job of the process; forking workers only reuse it per job.
+
+Invalidation goes through Redis: each tenant has a version counter that the
+super-admin config endpoints bump after changing credentials. A cached entry
+is only served while its version still matches, so every worker process
+drops stale credentials on its next lookup. If Redis is down the TTL alone
+bounds staleness.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.db.repositories.tenant_configs import DecryptedTenantConfig, TenantConfigRepository
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class TenantConfigCache:
+    """TTL cache of DecryptedTenantConfig with Redis-versioned invalidation."""
+
+    VERSION_KEY = "tenant_config:version:{tenant_id}"
+
+    def __init__(self, ttl_seconds: int | None = None, redis_client: redis.Redis | None = None):
+        self._ttl = ttl_seconds if ttl_seconds is not None else settings.tenant_config_cache_ttl_seconds
+        # tenant_id -> (expires_at, version, config)
+        self._entries: dict[int, tuple[float, str, DecryptedTenantConfig | None]] = {}
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = redis_client
+        self._redis_available = redis_client is not None
+        if redis_client is None:
+            self._init_redis()
+
+    def _init_redis(self) -> None:
+        """Initialize Redis connection if available."""
+        try:
+            self._redis = redis.from_url(settings.redis_url, decode_responses=True)
+            self._redis.ping()
+            self._redis_available = True
+        except Exception:
+            self._redis_available = False
+
+    def _current_version(self, tenant_id: int) -> str:
+        """Read the tenant's config version from Redis ("0" if unknown)."""
+        if self._redis_available and self._redis:
+            try:
+                value = self._redis.get(self.VERSION_KEY.format(tenant_id=tenant_id))
+                if isinstance(value, bytes):
+                    value = value.decode()
+                return value or "0"
+            except Exception as exc:
+                logger.warning("Redis tenant config version read failed: %s", exc)
+        return "0"
+
+    async def get(self, session: AsyncSession, tenant_id: int) -> DecryptedTenantConfig | None:
+        """Return the decrypted config, loading it from the DB on miss.
+
+        Args:
+            session: Session used only when the entry must be (re)loaded
+            tenant_id: Tenant whose credentials are needed
+        """
+        version = self._current_version(tenant_id)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(tenant_id)
+        if entry and entry[0] > now and entry[1] == version:
+            return entry[2]
+
+        config = await TenantConfigRepository(session).get_decrypted(tenant_id)
+        with self._lock:
+            self._entries[tenant_id] = (now + self._ttl, version, config)
+        return config
+
+    def invalidate(self, tenant_id: int) -> None:
+        """Drop the tenant's entry here and in every other worker process."""
+        with self._lock:
+            self._entries.pop(tenant_id, None)
+
+        if self._redis_available and self._redis:
+            try:
+                self._redis.incr(self.VERSION_KEY.format(tenant_id=tenant_id))
+            except Exception as exc:
+                logger.warning("Redis tenant config invalidation failed tenant_id=%s: %s", tenant_id, exc)
+
+    def clear(self) -> None:
+        """Clear all local entries (for testing)."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Singleton instance
+tenant_config_cache = TenantConfigCache()
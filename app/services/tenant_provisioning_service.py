@@ -18,7 +18,7 @@ from app.db.models.tenant_config import TenantConfig
 from app.db.models.tenant_feature import TenantFeature
 from app.db.repositories.tenants import TenantRepository
 from app.db.repositories.tenant_features import TenantFeatureRepository
-from app.db.session import create_tenant_schema
+from app.db import tenant_schemas
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +26,7 @@ logger = logging.getLogger(__name__)
 class TenantProvisioningService:
     """
     Handles complete tenant lifecycle:
-    - Schema creation
-    - Table migration
+    - Schema creation (from the spare pool when possible)
     - Initial admin user creation
     - Feature initialization
     - Admin invitation emails
@@ -67,8 +66,8 @@ class TenantProvisioningService:
 
         1. Validate slug uniqueness and format
         2. Create tenant record in public.tenants
-        3. Create PostgreSQL schema: tenant_<slug>
-        4. Run Alembic migrations on new schema
+        3. Claim a spare schema (or build one) as tenant_<slug>
+        4. Check it is at the current Alembic revision
         5. Create tenant config with default values
         6. Initialize feature flags
         7. Send admin invitation email
@@ -94,13 +93,9 @@ class TenantProvisioningService:
         await self.session.flush()
         logger.info(f"Created tenant record: id={tenant.id}")
 
-        # 3. Create schema
-        await self._create_schema(schema_name)
-        logger.info(f"Created PostgreSQL schema: {schema_name}")
-
-        # 4. Run migrations
-        await self._run_migrations_for_schema(schema_name)
-        logger.info(f"Ran migrations for schema: {schema_name}")
+        # 3-4. Claim a spare schema or build one at the current revision
+        claimed = await self._provision_schema(schema_name)
+        logger.info(f"{'Claimed spare' if claimed else 'Built'} schema: {schema_name}")
 
         # 5. Create config
         await self._create_tenant_config(tenant.id)
@@ -120,71 +115,29 @@ class TenantProvisioningService:
 
         return tenant
 
-    async def _create_schema(self, schema_name: str) -> None:
-        """Create PostgreSQL schema for tenant."""
-        # Validate schema name to prevent SQL injection
-        if not re.match(r"^tenant_[a-z0-9_]+$", schema_name):
-            raise ValueError(f"Invalid schema name: {schema_name}")
-
-        await self.session.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema_name}"))
-        logger.debug(f"Schema created: {schema_name}")
-
-    async def _run_migrations_for_schema(self, schema_name: str) -> None:
-        """
-        Run Alembic migrations targeting specific schema.
-
-        This creates all tenant tables in the new schema.
+    async def _provision_schema(self, schema_name: str) -> bool:
         """
-        # For now, we'll create tables directly using SQLAlchemy
-        # In production, you might want to use Alembic programmatically
-
-        # Get all table definitions from models (excluding public schema tables)
-        from app.db.base import Base
-        from app.db.models import (
-            Student, Guardian, Course, Enrollment, Device, Tag,
-            AttendanceEvent, AbsenceRequest, Notification, Consent,
-            Schedule, ScheduleException, AuditLog, User, Teacher,
-            NoShowAlert, WebAuthnCredential,
-        )
+        Give the tenant a schema at the current revision.
 
-        # Set search path to target schema
-        await self.session.execute(text(f"SET search_path TO {schema_name}"))
-
-        # Create tables in the schema
-        # Note: This is a simplified approach. For production, consider using
-        # Alembic's programmatic API with schema_translate_map
-        tables_to_create = [
-            # Core tables
-            "courses", "guardians", "students", "teachers", "users",
-            "devices", "tags", "enrollments",
-            # Association tables
-            "student_guardian", "teacher_course",
-            # Event tables
-            "attendance_events", "absence_requests", "notifications",
-            "schedules", "schedule_exceptions", "no_show_alerts",
-            # Other tables
-            "consents", "audit_logs", "webauthn_credentials",
-        ]
-
-        # Create tables by executing raw SQL (simplified approach)
-        # This copies the table structure from the current schema
-        for table_name in tables_to_create:
-            try:
-                # Check if table exists in public schema and create similar in tenant schema
-                await self.session.execute(
-                    text(f"""
-                        CREATE TABLE IF NOT EXISTS {schema_name}.{table_name}
-                        (LIKE public.{table_name} INCLUDING ALL)
-                    """)
-                )
-            except Exception as e:
-                # Table might not exist in public schema (first tenant)
-                logger.warning(f"Could not copy table {table_name}: {e}")
+        Claims a pre-built spare schema when one is available and builds the
+        schema from the model metadata otherwise. Both happen inside the
+        provisioning transaction, so a failed onboarding leaves no schema
+        behind (and a claimed spare goes back to the pool).
 
-        # Reset search path
-        await self.session.execute(text("SET search_path TO public"))
+        Returns:
+            True if a spare schema was claimed
+        """
+        head = tenant_schemas.head_revision()
+        revision = await tenant_schemas.database_revision(self.session)
+        if revision is not None and revision != head:
+            raise RuntimeError(
+                f"Database is at revision {revision} but the code expects {head}; run 'alembic upgrade head'"
+            )
 
-        logger.debug(f"Tables created in schema: {schema_name}")
+        if await tenant_schemas.claim_spare(self.session, schema_name):
+            return True
+        await tenant_schemas.build_schema(self.session, schema_name)
+        return False
 
     async def _create_tenant_config(self, tenant_id: int) -> TenantConfig:
         """Create default configuration for tenant."""
@@ -276,9 +229,11 @@ class TenantProvisioningService:
         from redis import Redis
         from rq import Queue
 
+        from app.workers.queues import ALERTS_QUEUE
+
         try:
             redis_conn = Redis.from_url(settings.redis_url)
-            queue = Queue("notifications", connection=redis_conn)
+            queue = Queue(ALERTS_QUEUE, connection=redis_conn)
 
             # Queue the email job
             queue.enqueue(
@@ -0,0 +1,155 @@
+"""In-process usage counters flushed to ``usage_stats``.
+
+Hot paths (event registration, uploads, worker sends, API requests) only
+bump a counter in a process-wide dict. The counters are written in batches
+with ``INSERT ... ON CONFLICT DO UPDATE SET value = value + excluded.value``:
+
+- Long-lived processes (the API, in-process workers) run a background
+  flusher thread that writes every ``USAGE_METER_FLUSH_SECONDS``.
+- Forked RQ work-horses lose process memory when the job ends, so each job
+  flushes its own counters before returning (``after_job``).
+
+If a write fails the counts go back into the buffer for the next flush.
+Requests without a tenant (single-tenant deployments) are not metered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Any, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.repositories.usage_stats import UsageStatRepository
+from app.db.session import async_session
+
+CounterKey = tuple[int, date, str]
+
+
+class UsageMeter:
+    """Thread-safe per-tenant, per-day metric counters."""
+
+    def __init__(self, flush_interval_seconds: float, background: bool = False, enabled: bool = True) -> None:
+        self.flush_interval = flush_interval_seconds
+        self.background = background
+        self.enabled = enabled
+        self._counts: Counter[CounterKey] = Counter()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._counts)
+
+    def record(self, tenant_id: int | None, metric_name: str, amount: int = 1) -> None:
+        """Add ``amount`` to today's (UTC) ``metric_name`` for the tenant."""
+        if not self.enabled or tenant_id is None or amount <= 0:
+            return
+        key = (tenant_id, datetime.now(timezone.utc).date(), metric_name)
+        with self._lock:
+            self._counts[key] += amount
+        if self.background:
+            self._ensure_started()
+
+    def _drain(self) -> Counter[CounterKey]:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return counts
+
+    def _restore(self, counts: Counter[CounterKey]) -> None:
+        with self._lock:
+            self._counts.update(counts)
+
+    async def flush(self, session_factory: Callable[[], Any] | None = None) -> int:
+        """Add every pending count to ``usage_stats`` in one batched upsert.
+
+        Returns:
+            Number of counters written (0 if the write failed; the counts
+            stay buffered for the next flush)
+        """
+        counts = self._drain()
+        if not counts:
+            return 0
+        try:
+            async with (session_factory or async_session)() as session:
+                await UsageStatRepository(session).add_values([(*key, value) for key, value in counts.items()])
+                await session.commit()
+        except Exception as exc:
+            self._restore(counts)
+            logger.error("Failed to write %d usage counter(s): %s", len(counts), exc)
+            return 0
+        return len(counts)
+
+    async def after_job(self) -> None:
+        """Flush now unless the background thread owns the buffer."""
+        if not self.background:
+            await self.flush()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=lambda: asyncio.run(self._run()),
+                    name="usage-meter",
+                    daemon=True,
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    async def _run(self) -> None:
+        # Own engine: it must outlive the event loops of the callers
+        engine = create_async_engine(settings.database_url, pool_size=1, max_overflow=0, pool_pre_ping=True)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        loop = asyncio.get_running_loop()
+        try:
+            while not self._stopped.is_set():
+                await loop.run_in_executor(None, self._wakeup.wait, self.flush_interval)
+                self._wakeup.clear()
+                await self.flush(session_factory)
+            await self.flush(session_factory)
+        finally:
+            await engine.dispose()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the background flusher after a final flush."""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+_usage_meter: UsageMeter | None = None
+
+
+def _in_forked_job() -> bool:
+    """True inside an RQ work-horse that exits when its job ends."""
+    try:
+        from rq import get_current_job
+
+        from app.workers.queues import jobs_run_in_process
+    except ImportError:  # pragma: no cover - rq is a worker dependency
+        return False
+    return not jobs_run_in_process() and get_current_job() is not None
+
+
+def get_usage_meter() -> UsageMeter:
+    """Return the process-wide meter (created lazily)."""
+    global _usage_meter
+    if _usage_meter is None:
+        _usage_meter = UsageMeter(
+            settings.usage_meter_flush_seconds,
+            background=not _in_forked_job(),
+            enabled=settings.usage_meter_enabled,
+        )
+    return _usage_meter
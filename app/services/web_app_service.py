@@ -209,7 +209,7 @@ class WebAppDataService:
             return list(result.scalars().all())
 
         # For parents, restrict to notifications tied to their students
-        stmt = stmt.where(Notification.payload["student_id"].as_integer().in_(student_ids))
+        stmt = stmt.where(Notification.student_id.in_(student_ids))
         result = await self.session.execute(stmt.limit(200))
         return list(result.scalars().all())
 
@@ -20,6 +20,7 @@ from urllib.parse import urlencode
 
 from app.db.repositories.users import UserRepository
 from app.services.attendance_service import AttendanceService
+from app.services.photo_service import PhotoService
 from app.services.alert_service import AlertService
 
 
@@ -290,15 +291,19 @@ async def alerts_page(
 
 @web_router.get("/photos", response_class=HTMLResponse)
 async def photos_page(
-    request: Request, session: AsyncSession = Depends(deps.get_tenant_db)
+    request: Request,
+    session: AsyncSession = Depends(deps.get_tenant_db),
+    photo_service: PhotoService = Depends(deps.get_photo_service),
 ) -> HTMLResponse:
     auth = await _require_staff_user(request, session)
     if isinstance(auth, RedirectResponse):
         return auth
     user, api_token = auth
 
-    attendance_service = AttendanceService(session)
+    attendance_service = AttendanceService(session, photo_service=photo_service)
     events = await attendance_service.list_recent_photo_events()
+    # The viewer links the medium WebP variant when it exists
+    urls = attendance_service.get_photo_urls(event.photo_medium_ref or event.photo_ref for event in events)
     photo_events = []
     for event in events:
         student = getattr(event, "student", None)
@@ -308,7 +313,7 @@ async def photos_page(
                 "event": event,
                 "student_name": getattr(student, "full_name", "Alumno"),
                 "course_name": getattr(course, "name", "Curso"),
-                "url": attendance_service.get_photo_url(event.photo_ref) if event.photo_ref else None,
+                "url": urls.get(event.photo_medium_ref or event.photo_ref),
             }
         )
 
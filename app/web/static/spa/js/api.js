@@ -358,4 +358,15 @@ const API = {
     }
     return response.json();
   },
+
+  /**
+   * Get broadcast delivery progress (sent/total) for polling
+   */
+  async getBroadcastStatus(jobId) {
+    const response = await this.request(`/broadcast/${encodeURIComponent(jobId)}/status`);
+    if (!response.ok) {
+      throw new Error('No se pudo obtener el estado del envío');
+    }
+    return response.json();
+  },
 };
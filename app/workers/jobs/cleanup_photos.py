@@ -1,4 +1,15 @@
-"""RQ job for deleting expired photos."""
+"""RQ job for deleting expired evidence (photos and audio).
+
+Every tenant schema is cleaned concurrently (``run_for_each_tenant``). Within
+a tenant, expired events are read in keyset pages ordered by ID, so memory
+stays bounded however large the backlog is. The photo (with its WebP
+variants) and audio objects of a page are removed from the tenant's storage
+with ``DeleteObjects`` batches (1,000 keys per request, at most
+``EVIDENCE_CLEANUP_CONCURRENCY`` requests in flight), then the references
+of the objects actually deleted are nulled with one UPDATE and the page is
+committed. Objects the backend fails to delete keep their reference and
+are retried on the next run.
+"""
 
 from __future__ import annotations
 
@@ -8,31 +19,82 @@ from datetime import datetime, timedelta, timezone
 from loguru import logger
 
 from app.core.config import settings
-from app.db.session import async_session
-from app.services.photo_service import PhotoService
 from app.db.repositories.attendance import AttendanceRepository
+from app.db.session import async_session, tenant_session_scope
+from app.services.photo_service import DELETE_BATCH_SIZE, PhotoService
+from app.services.storage.registry import tenant_storage
+from app.workers.tenant_fanout import run_for_each_tenant
+
+
+async def _delete_objects(photo_service: PhotoService, keys: list[str]) -> set[str]:
+    """Delete ``keys`` in parallel DeleteObjects batches; return the keys that failed."""
+    semaphore = asyncio.Semaphore(settings.evidence_cleanup_concurrency)
+
+    async def delete_batch(batch: list[str]) -> set[str]:
+        async with semaphore:
+            try:
+                return await photo_service.delete_photos(batch)
+            except Exception as exc:
+                logger.error("[CleanupPhotos] DeleteObjects of %d key(s) failed: %s", len(batch), exc)
+                return set(batch)
+
+    batches = [keys[offset:offset + DELETE_BATCH_SIZE] for offset in range(0, len(keys), DELETE_BATCH_SIZE)]
+    failed: set[str] = set()
+    for batch_failed in await asyncio.gather(*(delete_batch(batch) for batch in batches)):
+        failed |= batch_failed
+    return failed
+
+
+async def _cleanup_tenant(tenant_id: int | None, tenant_schema: str | None, cutoff: datetime) -> None:
+    tenant_key = tenant_schema or "public"
+    session_scope = tenant_session_scope(tenant_schema) if tenant_schema else async_session()
+    photo_service = PhotoService(await tenant_storage(tenant_id=tenant_id, tenant_schema=tenant_schema))
+    photos_removed = audios_removed = 0
+    try:
+        async with session_scope as session:
+            repo = AttendanceRepository(session)
+            after_id = 0
+            while True:
+                page = await repo.expired_evidence_page(
+                    cutoff, after_id=after_id, limit=settings.evidence_cleanup_page_size
+                )
+                if not page:
+                    break
+                after_id = page[-1][0]
+
+                keys = [key for _, photo_keys, audio_ref in page for key in [*photo_keys, audio_ref] if key]
+                failed = await _delete_objects(photo_service, keys)
+                # A photo is gone once the original and all its variants are
+                photo_ids = [
+                    event_id for event_id, photo_keys, _ in page if photo_keys and failed.isdisjoint(photo_keys)
+                ]
+                audio_ids = [event_id for event_id, _, audio_ref in page if audio_ref and audio_ref not in failed]
+                await repo.clear_evidence_refs(photo_event_ids=photo_ids, audio_event_ids=audio_ids)
+                await session.commit()
+
+                photos_removed += len(photo_ids)
+                audios_removed += len(audio_ids)
+                if len(page) < settings.evidence_cleanup_page_size:
+                    break
+    finally:
+        photo_service.close()
+
+    logger.info(
+        "[CleanupPhotos] tenant=%s: removed %d photo(s) and %d audio(s) before %s",
+        tenant_key, photos_removed, audios_removed, cutoff,
+    )
 
 
 async def _cleanup() -> None:
     cutoff = datetime.now(timezone.utc) - timedelta(days=settings.photo_retention_days)
-    async with async_session() as session:
-        repo = AttendanceRepository(session)
-        photo_service = PhotoService()
-        expired = await repo.events_with_photo_before(cutoff)
-        if not expired:
-            logger.info("[CleanupPhotos] No expired photos before %s", cutoff)
-            return
-
-        for event in expired:
-            if not event.photo_ref:
-                continue
-            try:
-                await photo_service.delete_photo(event.photo_ref)
-                await repo.update_photo_ref(event.id, None)
-            except Exception as exc:  # pragma: no cover
-                logger.error("[CleanupPhotos] Failed to delete %s: %s", event.photo_ref, exc)
-        await session.commit()
-        logger.info("[CleanupPhotos] Removed %s expired photos", len(expired))
+    try:
+        await run_for_each_tenant(
+            "CleanupPhotos",
+            lambda tenant_id, tenant_schema: _cleanup_tenant(tenant_id, tenant_schema, cutoff),
+            timeout=settings.evidence_cleanup_timeout_seconds,
+        )
+    except Exception as exc:
+        logger.error("[CleanupPhotos] Cleanup failed: %s", exc)
 
 
 def cleanup_expired_photos() -> None:
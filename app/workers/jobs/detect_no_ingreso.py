@@ -3,55 +3,71 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 
 from loguru import logger
 
-from app.core.config import settings
-from app.db.session import async_session
-from app.schemas.notifications import NotificationChannel, NotificationDispatchRequest, NotificationType
+from app.db.session import async_session, tenant_session_scope
+from app.schemas.notifications import NotificationChannel, NotificationType
 from app.services.attendance_service import AttendanceService
 from app.services.notifications.dispatcher import NotificationDispatcher
 from app.db.repositories.no_show_alerts import NoShowAlertRepository
+from app.workers.tenant_fanout import run_for_each_tenant
 
 
-async def _detect_and_notify(target_dt: datetime | None = None) -> None:
+async def _detect_all_tenants(target_dt: datetime | None = None) -> None:
+    """Run no-show detection for every active tenant concurrently."""
     current_dt = target_dt or datetime.now(timezone.utc)
-    async with async_session() as session:
+    await run_for_each_tenant(
+        "NoIngreso",
+        lambda tenant_id, tenant_schema: _detect_and_notify(current_dt, tenant_id, tenant_schema),
+    )
+
+
+async def _detect_and_notify(
+    target_dt: datetime | None = None,
+    tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    course_ids: set[int] | None = None,
+) -> set[int]:
+    """Create and notify the due no-show alerts of one tenant.
+
+    Args:
+        target_dt: Evaluation instant (now by default)
+        tenant_id: Tenant owning the schema
+        tenant_schema: Tenant schema, or None for public
+        course_ids: Only these courses (see ``NoShowTimeline``)
+
+    Returns:
+        IDs of the courses whose alerts were notified
+    """
+    current_dt = target_dt or datetime.now(timezone.utc)
+    session_scope = tenant_session_scope(tenant_schema) if tenant_schema else async_session()
+    async with session_scope as session:
         attendance_service = AttendanceService(session)
-        dispatcher = NotificationDispatcher(session)
+        dispatcher = NotificationDispatcher(session, tenant_id=tenant_id, tenant_schema=tenant_schema)
         alert_repo = NoShowAlertRepository(session)
 
-        alerts = await attendance_service.detect_no_show_alerts(current_dt)
+        alerts = await attendance_service.detect_no_show_alerts(current_dt, course_ids)
         if not alerts:
-            logger.info("[NoIngreso] No pending alerts at %s", current_dt)
-            return
-
-        reminder_delta = timedelta(minutes=settings.no_show_grace_minutes)
+            logger.info("[NoIngreso] No pending alerts tenant=%s at %s", tenant_schema or "public", current_dt)
+            return set()
 
-        success_count = 0
-        error_count = 0
+        template = NotificationType.NO_INGRESO_UMBRAL
+        rows: list[dict] = []
+        destinations: list[tuple[NotificationChannel, str]] = []
+        notified_alert_ids: set[int] = set()
+        notified_course_ids: set[int] = set()
 
         for entry in alerts:
             alert_record = entry["alert"]
             guardian = entry["guardian"]
             student = entry["student"]
 
-            if alert_record.status == "RESOLVED":
-                continue
-            if (
-                alert_record.last_notification_at
-                and current_dt - alert_record.last_notification_at < reminder_delta
-            ):
-                continue
-
-            student_names = student.full_name
-
             channels = {NotificationChannel.WHATSAPP, NotificationChannel.EMAIL}
             prefs = guardian.notification_prefs or {}
-            template_key = NotificationType.NO_INGRESO_UMBRAL.value
             # TDD-R4-BUG1 fix: Validate prefs[template_key] is a list before iterating
-            pref_value = prefs.get(template_key)
+            pref_value = prefs.get(template.value)
             if isinstance(pref_value, list):
                 resolved_channels: set[NotificationChannel] = set()
                 for item in pref_value:
@@ -65,53 +81,76 @@ async def _detect_and_notify(target_dt: datetime | None = None) -> None:
                 if resolved_channels:
                     channels = resolved_channels
 
+            # Templates use student_name/date/time; students/course_id/timestamp
+            # are kept for existing consumers of the payload
+            variables = {
+                "student_name": student.full_name,
+                "date": current_dt.strftime("%d/%m/%Y"),
+                "time": current_dt.strftime("%H:%M"),
+                "students": student.full_name,
+                "course_id": str(entry["course"].name if entry.get("course") else alert_record.course_id),
+                "timestamp": current_dt.strftime("%H:%M"),
+            }
+            # B11 fix: handle NULL contacts gracefully
+            contacts = guardian.contacts or {}
             for channel in channels:
-                # B11 fix: handle NULL contacts gracefully
-                contacts = guardian.contacts or {}
-                if channel == NotificationChannel.WHATSAPP and not contacts.get("whatsapp"):
-                    continue
-                if channel == NotificationChannel.EMAIL and not contacts.get("email"):
+                recipient = contacts.get(channel.value.lower())
+                if channel not in (NotificationChannel.WHATSAPP, NotificationChannel.EMAIL) or not recipient:
                     continue
-                payload = NotificationDispatchRequest(
-                    guardian_id=guardian.id,
-                    student_id=None,
-                    channel=channel,
-                    template=NotificationType.NO_INGRESO_UMBRAL,
-                    variables={
-                        "students": student_names,
-                        "course_id": str(entry["course"].name if entry.get("course") else alert_record.course_id),
-                        "timestamp": current_dt.strftime("%H:%M"),
-                    },
+                rows.append(
+                    {
+                        "guardian_id": guardian.id,
+                        "student_id": alert_record.student_id,
+                        "channel": channel.value,
+                        "template": template.value,
+                        "payload": variables,
+                    }
                 )
-                try:
-                    await dispatcher.enqueue_manual_notification(payload)
-                    await alert_repo.mark_notified(alert_record.id, current_dt)
-                    # Commit each successful notification individually
-                    await session.commit()
-                    success_count += 1
-                except Exception as exc:  # pragma: no cover - handled downstream
-                    # Rollback failed notification, continue with others
-                    await session.rollback()
-                    error_count += 1
-                    logger.error(
-                        "[NoIngreso] Failed to enqueue notification guardian=%s channel=%s error=%s",
-                        guardian.id,
-                        channel,
-                        exc,
-                    )
+                destinations.append((channel, recipient))
+                notified_alert_ids.add(alert_record.id)
+                notified_course_ids.add(alert_record.course_id)
+
+        if not rows:
+            logger.info("[NoIngreso] No reachable guardians tenant=%s", tenant_schema or "public")
+            return set()
+
+        # One INSERT for the notifications and one UPDATE for the alerts
+        try:
+            notification_ids = await dispatcher.repository.bulk_create(rows)
+            await alert_repo.mark_notified_many(sorted(notified_alert_ids), current_dt)
+            await session.commit()
+        except Exception as exc:
+            await session.rollback()
+            logger.error("[NoIngreso] Failed to create notifications tenant=%s error=%s", tenant_schema, exc)
+            raise
+
+        by_channel: dict[NotificationChannel, list[dict]] = {}
+        for notification_id, row, (channel, recipient) in zip(notification_ids, rows, destinations):
+            by_channel.setdefault(channel, []).append(
+                {"notification_id": notification_id, "to": recipient, "variables": row["payload"]}
+            )
+        try:
+            # WhatsApp in one enqueue_many; email 50 per SES call
+            dispatcher.enqueue_whatsapp_messages(template.value, by_channel.get(NotificationChannel.WHATSAPP, []))
+            dispatcher.enqueue_email_batches(template.value, by_channel.get(NotificationChannel.EMAIL, []))
+        except Exception as exc:  # pragma: no cover - notifications stay queued
+            logger.error("[NoIngreso] Failed to enqueue notifications tenant=%s error=%s", tenant_schema, exc)
+            raise
 
         logger.info(
-            "[NoIngreso] Completed: %d notifications sent, %d errors",
-            success_count,
-            error_count,
+            "[NoIngreso] Completed tenant=%s: %d notification(s) for %d alert(s)",
+            tenant_schema or "public",
+            len(notification_ids),
+            len(notified_alert_ids),
         )
+        return notified_course_ids
 
 
 def detect_no_ingreso_job(target_iso: str | None = None) -> None:
     """R2-B8 fix: Wrap asyncio.run with error handling."""
     target_dt = datetime.fromisoformat(target_iso) if target_iso else None
     try:
-        asyncio.run(_detect_and_notify(target_dt))
+        asyncio.run(_detect_all_tenants(target_dt))
     except Exception as exc:
         logger.error("[NoIngreso] Job failed with error: %s", exc)
         raise  # Re-raise to let RQ handle the failure
@@ -0,0 +1,59 @@
+"""RQ job that sends a guardian's coalesced attendance notifications."""
+
+from __future__ import annotations
+
+import asyncio
+
+from loguru import logger
+from redis import Redis
+
+from app.core.config import settings
+from app.db.session import tenant_session_scope
+from app.services.attendance_notification_service import AttendanceNotificationService
+from app.services.notifications.coalescing import NotificationCoalescer
+
+
+async def _flush(guardian_id: int, tenant_id: int | None, tenant_schema: str | None) -> None:
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        coalescer = NotificationCoalescer(redis, tenant_schema, settings.notification_coalesce_seconds)
+        entries = coalescer.drain(guardian_id)
+        if not entries:
+            return
+
+        async with tenant_session_scope(tenant_schema) as session:
+            service = AttendanceNotificationService(session, tenant_id, tenant_schema)
+            notification_ids = await service.deliver_coalesced(guardian_id, entries)
+            await session.commit()
+
+        logger.info(
+            "[Coalesce] guardian=%s events=%d notifications=%d",
+            guardian_id,
+            len(entries),
+            len(notification_ids),
+        )
+    finally:
+        redis.close()
+
+
+def flush_coalesced_notifications(
+    guardian_id: int,
+    tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+) -> None:
+    """Merge and send the attendance events buffered for a guardian.
+
+    Args:
+        guardian_id: Guardian whose coalescing window closed
+        tenant_id: Tenant ID (credentials and rate-limit bucket)
+        tenant_schema: Tenant schema holding the guardian and notifications
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_flush(guardian_id, tenant_id, tenant_schema))
+    else:
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            future = executor.submit(lambda: asyncio.run(_flush(guardian_id, tenant_id, tenant_schema)))
+            future.result()
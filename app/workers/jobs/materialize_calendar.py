@@ -0,0 +1,35 @@
+"""Job to keep each tenant's effective calendar materialized."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+
+from loguru import logger
+
+from app.db.session import async_session, tenant_session_scope
+from app.services.calendar_service import CalendarService, school_year_bounds
+from app.workers.tenant_fanout import run_for_each_tenant
+
+
+async def _materialize_tenant(tenant_id: int | None, tenant_schema: str | None) -> None:
+    start, end = school_year_bounds(datetime.now(timezone.utc).date())
+    session_scope = tenant_session_scope(tenant_schema) if tenant_schema else async_session()
+    async with session_scope as session:
+        # Builds only the days not materialized yet; this job owns the write
+        days = await CalendarService(session).get_days(start, end)
+        await session.commit()
+    logger.info("[Calendar] tenant=%s: %d day(s) for %s..%s", tenant_schema or "public", len(days), start, end)
+
+
+async def _materialize_all_tenants() -> None:
+    """Make sure every tenant's calendar covers the current school year."""
+    await run_for_each_tenant("MaterializeCalendar", _materialize_tenant)
+
+
+def materialize_calendar_job() -> None:
+    try:
+        asyncio.run(_materialize_all_tenants())
+    except Exception as exc:
+        logger.error("[Calendar] Job failed with error: %s", exc)
+        raise
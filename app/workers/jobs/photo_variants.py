@@ -0,0 +1,54 @@
+"""RQ job rendering the WebP thumbnail and medium variants of a photo."""
+
+from __future__ import annotations
+
+import asyncio
+
+from loguru import logger
+
+from app.db.repositories.attendance import AttendanceRepository
+from app.db.session import tenant_session_scope
+from app.services.photo_service import PhotoService
+from app.services.photo_variants import render_variants, variant_key
+from app.services.storage.registry import tenant_storage
+
+
+async def _generate(event_id: int, photo_ref: str, tenant_schema: str | None) -> bool:
+    photo_service = PhotoService(await tenant_storage(tenant_schema=tenant_schema))
+    try:
+        data = await photo_service.read_object(photo_ref)
+        if data is None:
+            logger.info("[PhotoVariants] event_id=%s key=%s no longer exists", event_id, photo_ref)
+            return False
+
+        variants = await asyncio.to_thread(render_variants, data)
+        keys = {name: variant_key(photo_ref, name) for name in variants}
+        await asyncio.gather(
+            *(photo_service.store_photo(keys[name], body, "image/webp") for name, body in variants.items())
+        )
+
+        async with tenant_session_scope(tenant_schema) as session:
+            stored = await AttendanceRepository(session).set_photo_variants(
+                event_id, photo_ref, keys["thumb"], keys["medium"]
+            )
+            await session.commit()
+        if not stored:
+            # The photo was replaced or removed while rendering
+            await photo_service.delete_photos(list(keys.values()))
+        logger.info(
+            "[PhotoVariants] event_id=%s %s: %s",
+            event_id,
+            "stored" if stored else "discarded",
+            ", ".join(f"{name}={len(body)}B" for name, body in variants.items()),
+        )
+        return stored
+    finally:
+        photo_service.close()
+
+
+def generate_photo_variants_job(event_id: int, photo_ref: str, tenant_schema: str | None = None) -> bool:
+    try:
+        return asyncio.run(_generate(event_id, photo_ref, tenant_schema))
+    except Exception as exc:
+        logger.error("[PhotoVariants] event_id=%s key=%s failed: %s", event_id, photo_ref, exc)
+        raise
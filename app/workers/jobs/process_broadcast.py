@@ -4,10 +4,96 @@ from __future__ import annotations
 
 import asyncio
 from loguru import logger
+from redis import Redis
+from rq import Queue
 
-from app.db.session import async_session
-from app.schemas.notifications import NotificationChannel, NotificationDispatchRequest, NotificationType
-from app.services.notifications.dispatcher import NotificationDispatcher
+from app.core.config import settings
+from app.db.repositories.guardians import GuardianRepository
+from app.db.repositories.notifications import NotificationRepository
+from app.db.session import tenant_session_scope
+from app.schemas.notifications import NotificationChannel, NotificationType
+from app.services.notifications.broadcast_progress import BroadcastProgress
+from app.workers.jobs.send_email_batch import prepare_email_batches, supports_bulk
+from app.workers.queues import BULK_QUEUE
+
+
+# Guardians loaded, inserted and enqueued per round trip
+BROADCAST_CHUNK_SIZE = 500
+
+BROADCAST_CHANNELS = (NotificationChannel.WHATSAPP, NotificationChannel.EMAIL)
+
+JOB_FUNCS = {
+    NotificationChannel.WHATSAPP: "app.workers.jobs.send_whatsapp.send_whatsapp_message",
+    NotificationChannel.EMAIL: "app.workers.jobs.send_email.send_email_message",
+}
+
+
+async def _dispatch_chunk(
+    guardian_repo: GuardianRepository,
+    notification_repo: NotificationRepository,
+    queue: Queue,
+    guardian_ids: list[int],
+    template: str,
+    variables: dict,
+    tenant_id: int | None,
+    tenant_schema: str | None = None,
+) -> tuple[int, int]:
+    """Create and enqueue notifications for one chunk of guardians.
+
+    Returns:
+        Tuple of (notifications queued, guardians skipped for lack of contacts)
+    """
+    contacts = await guardian_repo.list_contacts(guardian_ids)
+
+    rows: list[dict] = []
+    recipients: list[tuple[NotificationChannel, str]] = []
+    reachable: set[int] = set()
+    for guardian_id, guardian_contacts in contacts:
+        for channel in BROADCAST_CHANNELS:
+            recipient = guardian_contacts.get(channel.value.lower())
+            if not recipient:
+                continue
+            rows.append(
+                {
+                    "guardian_id": guardian_id,
+                    "channel": channel.value,
+                    "template": template,
+                    "payload": variables,
+                }
+            )
+            recipients.append((channel, recipient))
+            reachable.add(guardian_id)
+
+    skipped = len(guardian_ids) - len(reachable)
+    if not rows:
+        return 0, skipped
+
+    notification_ids = await notification_repo.bulk_create(rows)
+    # Rows must be visible to the send workers before their jobs exist
+    await notification_repo.session.commit()
+
+    jobs = []
+    email_destinations: list[dict] = []
+    bulk_email = supports_bulk(template)
+    for notification_id, (channel, recipient) in zip(notification_ids, recipients):
+        if channel == NotificationChannel.EMAIL and bulk_email:
+            # Emails go out 50 per SES call instead of one job each
+            email_destinations.append(
+                {"notification_id": notification_id, "to": recipient, "variables": variables}
+            )
+            continue
+        jobs.append(
+            Queue.prepare_data(
+                JOB_FUNCS[channel],
+                args=(notification_id, recipient, template, variables, tenant_id, tenant_schema),
+            )
+        )
+    if email_destinations:
+        jobs.extend(prepare_email_batches(template, email_destinations, tenant_id, tenant_schema))
+
+    # One pipelined round trip for the whole chunk
+    queue.enqueue_many(jobs)
+    return len(notification_ids), skipped
 
 
 async def _process(job_payload: dict) -> None:
@@ -16,36 +102,62 @@ async def _process(job_payload: dict) -> None:
     payload = job_payload.get("payload", {})
     message = payload.get("message", "")
     subject = payload.get("subject", "")
-    variables_base = {"message": message, "subject": subject}
-
-    async with async_session() as session:
-        dispatcher = NotificationDispatcher(session)
-        notification_template = payload.get("template", NotificationType.CAMBIO_HORARIO.value)
-        template_enum = (
-            notification_template
-            if isinstance(notification_template, NotificationType)
-            else NotificationType(notification_template)
-        )
+    # broadcast_id lets the send workers report delivery progress
+    variables_base = {"message": message, "subject": subject, "broadcast_id": job_id}
+    tenant_id = job_payload.get("tenant_id")
+    tenant_schema = job_payload.get("tenant_schema")
+
+    notification_template = payload.get("template", NotificationType.CAMBIO_HORARIO.value)
+    template_enum = (
+        notification_template
+        if isinstance(notification_template, NotificationType)
+        else NotificationType(notification_template)
+    )
 
-        for guardian_id in guardian_ids:
-            for channel in (NotificationChannel.WHATSAPP, NotificationChannel.EMAIL):
-                request = NotificationDispatchRequest(
-                    guardian_id=guardian_id,
-                    student_id=None,
-                    channel=channel,
-                    template=template_enum,
-                    variables=variables_base,
-                )
+    redis = Redis.from_url(settings.redis_url)
+    queue = Queue(BULK_QUEUE, connection=redis)
+    progress = BroadcastProgress(redis)
+    progress.set_status(job_id, "processing")
+
+    try:
+        async with tenant_session_scope(tenant_schema) as session:
+            guardian_repo = GuardianRepository(session)
+            notification_repo = NotificationRepository(session)
+
+            for start in range(0, len(guardian_ids), BROADCAST_CHUNK_SIZE):
+                chunk = guardian_ids[start:start + BROADCAST_CHUNK_SIZE]
                 try:
-                    await dispatcher.enqueue_manual_notification(request)
+                    queued, skipped = await _dispatch_chunk(
+                        guardian_repo,
+                        notification_repo,
+                        queue,
+                        chunk,
+                        template_enum.value,
+                        variables_base,
+                        tenant_id,
+                        tenant_schema,
+                    )
                 except Exception as exc:  # pragma: no cover
+                    # A failed chunk must not abort the rest of the broadcast
+                    await session.rollback()
+                    progress.incr(job_id, skipped=len(chunk))
                     logger.error(
-                        "[BroadcastJob] Failed guardian=%s channel=%s job=%s error=%s",
-                        guardian_id,
-                        channel,
+                        "[BroadcastJob] Failed chunk offset=%s size=%s job=%s error=%s",
+                        start,
+                        len(chunk),
                         job_id,
                         exc,
                     )
+                    continue
+                progress.incr(job_id, total=queued, queued=queued, skipped=skipped)
+
+        progress.set_status(job_id, "completed")
+        logger.info("[BroadcastJob] Completed job=%s guardians=%d", job_id, len(guardian_ids))
+    except Exception:
+        progress.set_status(job_id, "failed")
+        raise
+    finally:
+        redis.close()
 
 
 def process_broadcast_job(job_payload: dict) -> None:
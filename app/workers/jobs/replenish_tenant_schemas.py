@@ -0,0 +1,35 @@
+"""Job keeping the pool of pre-built spare tenant schemas full.
+
+``TenantProvisioningService`` claims a spare schema when creating a tenant;
+this job builds replacements up to ``TENANT_SPARE_SCHEMAS`` and drops spares
+left at an older Alembic revision by a migration.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from loguru import logger
+
+from app.core.config import settings
+from app.db import tenant_schemas
+from app.db.session import async_session
+
+
+async def _replenish_tenant_schemas() -> tuple[int, int]:
+    """Refill the spare pool; return (created, dropped) schema counts."""
+    async with async_session() as session:
+        if session.get_bind().dialect.name != "postgresql":
+            return 0, 0
+        created, dropped = await tenant_schemas.replenish_spares(session, settings.tenant_spare_schemas)
+    if created or dropped:
+        logger.info("[SpareSchemas] Built %d and dropped %d spare schema(s)", created, dropped)
+    return created, dropped
+
+
+def replenish_tenant_schemas_job() -> None:
+    try:
+        asyncio.run(_replenish_tenant_schemas())
+    except Exception as exc:
+        logger.error("[SpareSchemas] Job failed with error: %s", exc)
+        raise
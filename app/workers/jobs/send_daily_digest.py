@@ -0,0 +1,136 @@
+"""Job sending the daily attendance digest to guardians who opted in."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+
+from loguru import logger
+from redis import Redis
+from rq import Queue
+
+from app.core.config import settings
+from app.db.repositories.attendance import AttendanceRepository
+from app.db.repositories.guardians import GuardianRepository
+from app.db.repositories.notifications import NotificationRepository
+from app.db.session import tenant_session_scope
+from app.schemas.notifications import NotificationChannel, NotificationType
+from app.services.attendance_notification_service import JOB_FUNCS
+from app.services.notifications.coalescing import DIGEST_PREF_KEY, digest_enabled, join_names
+from app.workers.queues import BULK_QUEUE
+from app.workers.tenant_fanout import run_for_each_tenant
+
+
+EVENT_LABELS = {"IN": "ingreso", "OUT": "salida"}
+
+
+def build_digest_summary(rows: list[tuple]) -> tuple[list[str], str]:
+    """Summarize one guardian's events as one line per student.
+
+    Args:
+        rows: (guardian_id, student_name, type, occurred_at) ordered by time
+
+    Returns:
+        Tuple of (student names, summary text)
+    """
+    lines: dict[str, list[str]] = {}
+    for _, student_name, event_type, occurred_at in rows:
+        label = EVENT_LABELS.get(getattr(event_type, "value", event_type), str(event_type))
+        lines.setdefault(student_name, []).append(f"{label} {occurred_at.strftime('%H:%M')}")
+    summary = "\n".join(f"{name}: {', '.join(events)}" for name, events in lines.items())
+    return list(lines), summary
+
+
+async def _send_digests(
+    target_date: date | None = None,
+    tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+) -> None:
+    day = target_date or datetime.now(timezone.utc).date()
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    end = start + timedelta(days=1)
+
+    async with tenant_session_scope(tenant_schema) as session:
+        targets = [
+            target
+            for target in await GuardianRepository(session).list_notification_targets()
+            if digest_enabled(target["notification_prefs"])
+        ]
+        if not targets:
+            logger.info("[Digest] No guardians opted in for %s", day)
+            return
+
+        events_by_guardian: dict[int, list[tuple]] = {}
+        for row in await AttendanceRepository(session).list_guardian_events_between(
+            [t["guardian_id"] for t in targets], start, end
+        ):
+            events_by_guardian.setdefault(row[0], []).append(row)
+
+        rows: list[dict] = []
+        recipients: list[tuple[NotificationChannel, str]] = []
+        for target in targets:
+            guardian_events = events_by_guardian.get(target["guardian_id"])
+            if not guardian_events:
+                continue
+            names, summary = build_digest_summary(guardian_events)
+            variables = {
+                "student_name": join_names(names),
+                "date": day.strftime("%d/%m/%Y"),
+                "summary": summary,
+            }
+            channel_prefs = target["notification_prefs"][DIGEST_PREF_KEY]
+            for channel in (NotificationChannel.WHATSAPP, NotificationChannel.EMAIL):
+                recipient = target["contacts"].get(channel.value.lower())
+                if not channel_prefs.get(channel.value.lower()) or not recipient:
+                    continue
+                rows.append(
+                    {
+                        "guardian_id": target["guardian_id"],
+                        "channel": channel.value,
+                        "template": NotificationType.RESUMEN_DIARIO.value,
+                        "payload": variables,
+                    }
+                )
+                recipients.append((channel, recipient))
+
+        if not rows:
+            logger.info("[Digest] No events to summarize for %s", day)
+            return
+
+        notification_repo = NotificationRepository(session)
+        notification_ids = await notification_repo.bulk_create(rows)
+        # Rows must be visible to the send workers before their jobs exist
+        await session.commit()
+
+    redis = Redis.from_url(settings.redis_url)
+    try:
+        Queue(BULK_QUEUE, connection=redis).enqueue_many(
+            [
+                Queue.prepare_data(
+                    JOB_FUNCS[channel],
+                    args=(notification_id, recipient, row["template"], row["payload"], tenant_id, tenant_schema),
+                )
+                for notification_id, row, (channel, recipient) in zip(notification_ids, rows, recipients)
+            ]
+        )
+    finally:
+        redis.close()
+
+    logger.info("[Digest] Queued %d digest notification(s) for %s", len(notification_ids), day)
+
+
+async def _send_all_digests(target_date: date | None = None) -> None:
+    """Send the digest of every active tenant concurrently."""
+    await run_for_each_tenant(
+        "SendDailyDigest",
+        lambda tenant_id, tenant_schema: _send_digests(target_date, tenant_id, tenant_schema),
+    )
+
+
+def send_daily_digest_job(target_iso: str | None = None) -> None:
+    target_date = date.fromisoformat(target_iso) if target_iso else None
+    try:
+        asyncio.run(_send_all_digests(target_date))
+    except Exception as exc:
+        logger.error("[Digest] Job failed with error: %s", exc)
+        raise
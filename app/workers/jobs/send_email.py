@@ -4,12 +4,29 @@ from __future__ import annotations
 
 import asyncio
 import html
+from datetime import datetime, timezone
+
 from loguru import logger
 from requests.exceptions import ConnectionError, Timeout
 
-from app.db.repositories.notifications import NotificationRepository
-from app.db.repositories.tenant_configs import TenantConfigRepository
 from app.db.session import async_session
+from app.services.notifications.broadcast_progress import record_broadcast_delivery
+from app.services.notifications.rate_limit import (
+    defer_if_rate_limited,
+    provider_throttle_delay,
+    reschedule_current_job,
+)
+from app.services.notifications.resilience import (
+    backoff_delay,
+    dead_letter,
+    defer_if_circuit_open,
+    get_circuit_breaker,
+    is_provider_failure,
+)
+from app.services.notifications.status_writer import get_status_writer
+from app.services.notifications.summary_cache import record_send_outcomes
+from app.services.usage_meter import get_usage_meter
+from app.services.tenant_config_cache import tenant_config_cache
 from app.services.notifications.ses_email import SESEmailClient, TenantSESEmailClient, mask_email
 
 
@@ -17,6 +34,8 @@ from app.services.notifications.ses_email import SESEmailClient, TenantSESEmailC
 MAX_RETRIES = 3
 TRANSIENT_ERRORS = (ConnectionError, Timeout, TimeoutError, OSError)
 
+JOB_FUNC = "app.workers.jobs.send_email.send_email_message"
+
 
 # Email templates for attendance notifications
 EMAIL_TEMPLATES = {
@@ -88,6 +107,33 @@ EMAIL_TEMPLATES = {
         </div>
         """,
     },
+    "CAMBIO_HORARIO": {
+        "subject": "{subject}",
+        "body": """
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #1565c0;">{subject}</h2>
+            <p>Estimado/a apoderado/a,</p>
+            <p style="white-space: pre-line;">{message}</p>
+            <p style="color: #666; font-size: 12px;">
+                Este es un mensaje automático del Sistema de Control de Asistencia.
+            </p>
+        </div>
+        """,
+    },
+    "RESUMEN_DIARIO": {
+        "subject": "Resumen de asistencia del {date}",
+        "body": """
+        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
+            <h2 style="color: #1565c0;">Resumen de asistencia</h2>
+            <p>Estimado/a apoderado/a,</p>
+            <p>Estos son los registros del {date} para <strong>{student_name}</strong>:</p>
+            <p style="white-space: pre-line;">{summary}</p>
+            <p style="color: #666; font-size: 12px;">
+                Este es un mensaje automático del Sistema de Control de Asistencia.
+            </p>
+        </div>
+        """,
+    },
 }
 
 
@@ -98,11 +144,11 @@ def _escape_html_value(value: str) -> str:
     return html.escape(value)
 
 
-def _build_email_content(template: str, variables: dict) -> tuple[str, str]:
-    """Build email subject and HTML body from template and variables.
+def _build_template_vars(variables: dict) -> dict:
+    """Escape variables for HTML and pre-render the optional photo section.
 
-    Returns:
-        Tuple of (subject, body_html)
+    Shared by the single-send path (str.format) and the SES bulk path,
+    which inserts these pre-escaped values unescaped ({{{var}}}).
     """
     # Escape all variables for HTML safety
     safe_vars = {k: _escape_html_value(str(v)) if v is not None else "" for k, v in variables.items()}
@@ -122,6 +168,16 @@ def _build_email_content(template: str, variables: dict) -> tuple[str, str]:
         '''
     else:
         safe_vars["photo_section"] = ""
+    return safe_vars
+
+
+def _build_email_content(template: str, variables: dict) -> tuple[str, str]:
+    """Build email subject and HTML body from template and variables.
+
+    Returns:
+        Tuple of (subject, body_html)
+    """
+    safe_vars = _build_template_vars(variables)
 
     # Get template or fallback to generic
     email_template = EMAIL_TEMPLATES.get(template)
@@ -138,7 +194,7 @@ def _build_email_content(template: str, variables: dict) -> tuple[str, str]:
     body_lines = [
         f"<p><strong>{_escape_html_value(key)}</strong>: {_escape_html_value(str(value))}</p>"
         for key, value in variables.items()
-        if key not in ("photo_url", "has_photo", "photo_section")
+        if key not in ("photo_url", "has_photo", "photo_section", "broadcast_id")
     ]
     body_html = f"""
     <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
@@ -153,73 +209,118 @@ def _build_email_content(template: str, variables: dict) -> tuple[str, str]:
 
 
 async def _send(
-    notification_id: int,
+    notification_id: int | None,
     to: str,
     template: str,
     variables: dict,
     tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    reserved: bool = False,
+    attempt: int = 0,
 ) -> None:
-    async with async_session() as session:
-        repo = NotificationRepository(session)
-        notification = await repo.get(notification_id)
-        if notification is None:
-            logger.error("Notification %s not found", notification_id)
-            return
+    # The job carries everything needed to send: the notification row is not
+    # loaded, and its outcome goes through the batched status writer
+    status_writer = get_status_writer()
 
-        # Use tenant-specific client if tenant_id is provided
-        client = None
-        if tenant_id:
-            try:
-                config_repo = TenantConfigRepository(session)
-                config = await config_repo.get_decrypted(tenant_id)
-                if config and config.ses_source_email:
-                    client = TenantSESEmailClient(config)
-                    logger.debug("Using tenant SES client for tenant_id=%s", tenant_id)
-            except Exception as e:
-                logger.warning(
-                    "Failed to load tenant SES config for tenant_id=%s, falling back to default: %s",
-                    tenant_id, e
-                )
+    # Use tenant-specific client if tenant_id is provided
+    client = None
+    config = None
+    if tenant_id:
+        try:
+            # Cached per process; invalidated via Redis when credentials change
+            async with async_session() as session:
+                config = await tenant_config_cache.get(session, tenant_id)
+            if config and config.ses_source_email:
+                client = TenantSESEmailClient(config)
+                logger.debug("Using tenant SES client for tenant_id=%s", tenant_id)
+        except Exception as e:
+            logger.warning(
+                "Failed to load tenant SES config for tenant_id=%s, falling back to default: %s",
+                tenant_id, e
+            )
 
-        # Fall back to global client if no tenant config
-        if client is None:
-            client = SESEmailClient()
+    # Fall back to global client if no tenant config
+    if client is None:
+        client = SESEmailClient()
 
-        # Build email content from template
-        subject, body_html = _build_email_content(template, variables)
+    job_args = (notification_id, to, template, variables, tenant_id, tenant_schema)
 
-        try:
-            await client.send_email(to=to, subject=subject, body_html=body_html)
-            await repo.mark_sent(notification)
-            await session.commit()
-            logger.info(
-                "[Worker] Email sent notification_id=%s to=%s template=%s",
-                notification_id, mask_email(to), template
+    # Provider (or this tenant's account) is failing: wait out the cool-down
+    if defer_if_circuit_open("EMAIL", tenant_id, JOB_FUNC, *job_args, reserved=reserved, attempt=attempt):
+        return
+
+    # Per-tenant token bucket: over-limit jobs are rescheduled, not failed
+    if not reserved and await defer_if_rate_limited(
+        tenant_id, "EMAIL", config, JOB_FUNC, *job_args, attempt=attempt
+    ):
+        return
+
+    # Build email content from template
+    subject, body_html = _build_email_content(template, variables)
+
+    try:
+        await client.send_email(to=to, subject=subject, body_html=body_html)
+        status_writer.submit(
+            notification_id, "sent", ts_sent=datetime.now(timezone.utc), tenant_schema=tenant_schema
+        )
+        record_send_outcomes(tenant_id, "EMAIL", template, {notification_id: "sent"})
+        get_circuit_breaker().record("EMAIL", tenant_id, success=True)
+        record_broadcast_delivery(variables.get("broadcast_id"), "sent")
+        logger.info(
+            "[Worker] Email sent notification_id=%s to=%s template=%s",
+            notification_id, mask_email(to), template
+        )
+    except TRANSIENT_ERRORS as exc:
+        # R6-W1 fix: Transient errors should allow retry
+        get_circuit_breaker().record("EMAIL", tenant_id, success=False)
+        if attempt < MAX_RETRIES:
+            status_writer.submit(notification_id, retries=attempt + 1, tenant_schema=tenant_schema)
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "Email transient error notification_id=%s retry=%d/%d in %.0fs error=%s",
+                notification_id, attempt + 1, MAX_RETRIES, delay, exc
             )
-        except TRANSIENT_ERRORS as exc:
-            # R6-W1 fix: Transient errors should allow retry
-            current_retries = notification.retries or 0
-            if current_retries < MAX_RETRIES:
-                notification.retries = current_retries + 1
-                await session.commit()
-                logger.warning(
-                    "Email transient error notification_id=%s retry=%d/%d error=%s",
-                    notification_id, current_retries + 1, MAX_RETRIES, exc
-                )
-                raise  # Let RQ retry the job
-            else:
-                await repo.mark_failed(notification)
-                await session.commit()
-                logger.error(
-                    "Email send failed after %d retries notification_id=%s error=%s",
-                    MAX_RETRIES, notification_id, exc
-                )
-                raise
-        except Exception as exc:  # pragma: no cover - permanent failure
-            await repo.mark_failed(notification)
-            await session.commit()
-            logger.error("Email send failed notification_id=%s error=%s", notification_id, exc)
-            raise
+            if reschedule_current_job(delay, JOB_FUNC, *job_args, attempt=attempt + 1):
+                return
+            raise  # Not inside RQ: let the caller retry
+        else:
+            status_writer.submit(notification_id, "failed", tenant_schema=tenant_schema)
+            record_send_outcomes(tenant_id, "EMAIL", template, {notification_id: "failed"})
+            record_broadcast_delivery(variables.get("broadcast_id"), "failed")
+            dead_letter(
+                tenant_id, JOB_FUNC, job_args,
+                reason="retries_exhausted", error=exc, notification_ids=[notification_id],
+            )
+            logger.error(
+                "Email send failed after %d retries notification_id=%s error=%s",
+                MAX_RETRIES, notification_id, exc
+            )
+            # Kept in the dead-letter queue for replay: not an RQ failure too
+            return
+    except Exception as exc:
+        # Provider throttled us: back off and retry later instead of failing
+        throttle_delay = provider_throttle_delay(exc)
+        if throttle_delay is not None and reschedule_current_job(
+            throttle_delay, JOB_FUNC, *job_args, attempt=attempt
+        ):
+            logger.warning(
+                "Email throttled by provider notification_id=%s tenant_id=%s, retry in %.0fs",
+                notification_id, tenant_id, throttle_delay
+            )
+            return
+        if is_provider_failure(exc, TRANSIENT_ERRORS):
+            get_circuit_breaker().record("EMAIL", tenant_id, success=False)
+        status_writer.submit(notification_id, "failed", tenant_schema=tenant_schema)
+        record_send_outcomes(tenant_id, "EMAIL", template, {notification_id: "failed"})
+        record_broadcast_delivery(variables.get("broadcast_id"), "failed")
+        dead_letter(
+            tenant_id, JOB_FUNC, job_args,
+            reason="permanent_error", error=exc, notification_ids=[notification_id],
+        )
+        logger.error("Email send failed notification_id=%s error=%s", notification_id, exc)
+    finally:
+        await status_writer.after_job()
+        await get_usage_meter().after_job()
 
 
 def send_email_message(
@@ -228,6 +329,9 @@ def send_email_message(
     template: str,
     variables: dict,
     tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    reserved: bool = False,
+    attempt: int = 0,
 ) -> None:
     """
     Send an email message.
@@ -239,18 +343,24 @@ def send_email_message(
         variables: Template variables
         tenant_id: Optional tenant ID for multi-tenant deployments.
                    If provided, uses tenant-specific SES credentials.
+        tenant_schema: Schema holding the notification row (None for public).
+        reserved: True when a rate-limit token was already taken for this
+                  send (set on jobs rescheduled by the rate limiter).
+        attempt: Retries already made after transient errors.
     """
     # TDD-R3-BUG2 fix: Handle case when event loop is already running (same as WhatsApp)
     try:
         asyncio.get_running_loop()
     except RuntimeError:
         # No running loop - use asyncio.run() normally
-        asyncio.run(_send(notification_id, to, template, variables, tenant_id))
+        asyncio.run(_send(notification_id, to, template, variables, tenant_id, tenant_schema, reserved, attempt))
     else:
         # Loop is already running - run in separate thread with new event loop
         import concurrent.futures
         with concurrent.futures.ThreadPoolExecutor() as executor:
             future = executor.submit(
-                lambda: asyncio.run(_send(notification_id, to, template, variables, tenant_id))
+                lambda: asyncio.run(
+                    _send(notification_id, to, template, variables, tenant_id, tenant_schema, reserved, attempt)
+                )
             )
             future.result()  # Wait for completion
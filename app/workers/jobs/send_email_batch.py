@@ -0,0 +1,283 @@
+"""RQ job for bulk templated email through SES.
+
+Broadcasts and no-show alerts send the same template to many guardians.
+Instead of one ``send_email_message`` job (and one SES call) per recipient,
+they enqueue one ``send_email_batch`` job per tenant, template and group of
+up to 50 destinations. The job renders nothing itself: the HTML lives in an
+SES template precompiled from ``EMAIL_TEMPLATES``, and each destination only
+carries its pre-escaped template data.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+from typing import Any
+
+from loguru import logger
+from requests.exceptions import ConnectionError, Timeout
+from rq import Queue
+
+from app.db.repositories.notifications import NotificationRepository
+from app.db.session import tenant_session_scope
+from app.services.notifications.broadcast_progress import record_broadcast_delivery
+from app.services.notifications.rate_limit import (
+    defer_if_rate_limited,
+    provider_throttle_delay,
+    reschedule_current_job,
+)
+from app.services.notifications.resilience import (
+    backoff_delay,
+    dead_letter,
+    defer_if_circuit_open,
+    get_circuit_breaker,
+    is_provider_failure,
+)
+from app.services.notifications.ses_email import (
+    SES_BULK_MAX_DESTINATIONS,
+    SESEmailClient,
+    TenantSESEmailClient,
+)
+from app.services.notifications.summary_cache import record_send_outcomes
+from app.services.usage_meter import get_usage_meter
+from app.services.tenant_config_cache import tenant_config_cache
+from app.workers.jobs.send_email import EMAIL_TEMPLATES, MAX_RETRIES, _build_template_vars
+
+
+TRANSIENT_ERRORS = (ConnectionError, Timeout, TimeoutError, OSError)
+
+JOB_FUNC = "app.workers.jobs.send_email_batch.send_email_batch"
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def _compile_ses_template(template: str) -> tuple[str, str, str]:
+    """Convert an EMAIL_TEMPLATES entry to an SES (Handlebars) template.
+
+    ``{var}`` becomes ``{{{var}}}``: values are already HTML-escaped by
+    ``_build_template_vars``, so SES must insert them verbatim.
+
+    Returns:
+        Tuple of (template name, subject part, html part)
+    """
+    source = EMAIL_TEMPLATES[template]
+    subject = _PLACEHOLDER.sub(r"{{{\1}}}", source["subject"])
+    html_part = _PLACEHOLDER.sub(r"{{{\1}}}", source["body"])
+    digest = hashlib.sha1(f"{subject}\n{html_part}".encode()).hexdigest()[:10]
+    return f"school-attendance-{template.lower()}-{digest}", subject, html_part
+
+
+# Precompiled once per process
+SES_TEMPLATES = {name: _compile_ses_template(name) for name in EMAIL_TEMPLATES}
+
+
+def supports_bulk(template: str) -> bool:
+    return template in SES_TEMPLATES
+
+
+def prepare_email_batches(
+    template: str,
+    destinations: list[dict[str, Any]],
+    tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+) -> list:
+    """Build RQ enqueue data for one batch job per 50 destinations.
+
+    Args:
+        template: Notification template (must satisfy ``supports_bulk``)
+        destinations: Dicts with notification_id, to and variables
+        tenant_id: Tenant owning the notifications
+        tenant_schema: Tenant schema holding the notifications
+
+    Returns:
+        EnqueueData list for ``Queue.enqueue_many``
+    """
+    return [
+        Queue.prepare_data(
+            JOB_FUNC,
+            args=(template, destinations[start:start + SES_BULK_MAX_DESTINATIONS], tenant_id, tenant_schema),
+        )
+        for start in range(0, len(destinations), SES_BULK_MAX_DESTINATIONS)
+    ]
+
+
+def _record_broadcast_results(destinations: list[dict], statuses: dict[int, str]) -> None:
+    counts: dict[tuple[str, str], int] = {}
+    for dest in destinations:
+        broadcast_id = (dest.get("variables") or {}).get("broadcast_id")
+        outcome = statuses.get(dest["notification_id"])
+        if broadcast_id and outcome:
+            counts[(broadcast_id, outcome)] = counts.get((broadcast_id, outcome), 0) + 1
+    for (broadcast_id, outcome), count in counts.items():
+        record_broadcast_delivery(broadcast_id, outcome, count)
+
+
+async def _fail_batch(
+    repo: NotificationRepository,
+    template: str,
+    destinations: list[dict[str, Any]],
+    tenant_id: int | None,
+    tenant_schema: str | None,
+    reason: str,
+    exc: BaseException,
+) -> None:
+    """Mark a whole batch failed and keep it for replay."""
+    notification_ids = [dest["notification_id"] for dest in destinations]
+    statuses = {nid: "failed" for nid in notification_ids}
+    await repo.bulk_update_status(statuses)
+    await repo.session.commit()
+    _record_broadcast_results(destinations, statuses)
+    record_send_outcomes(tenant_id, "EMAIL", template, statuses)
+    dead_letter(
+        tenant_id, JOB_FUNC, (template, destinations, tenant_id, tenant_schema),
+        reason=reason, error=exc, notification_ids=notification_ids,
+    )
+    logger.error("Bulk email failed template=%s size=%d error=%s", template, len(destinations), exc)
+
+
+async def _send_batch(
+    template: str,
+    destinations: list[dict[str, Any]],
+    tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    reserved: bool = False,
+    attempt: int = 0,
+) -> None:
+    async with tenant_session_scope(tenant_schema) as session:
+        repo = NotificationRepository(session)
+
+        # Use tenant-specific client if tenant_id is provided
+        client = None
+        config = None
+        if tenant_id:
+            try:
+                config = await tenant_config_cache.get(session, tenant_id)
+                if config and config.ses_source_email:
+                    client = TenantSESEmailClient(config)
+            except Exception as e:
+                logger.warning(
+                    "Failed to load tenant SES config for tenant_id=%s, falling back to default: %s",
+                    tenant_id, e
+                )
+        if client is None:
+            client = SESEmailClient()
+
+        # Provider (or this tenant's account) is failing: wait out the cool-down
+        if defer_if_circuit_open(
+            "EMAIL", tenant_id, JOB_FUNC, template, destinations, tenant_id, tenant_schema,
+            reserved=reserved, attempt=attempt,
+        ):
+            return
+
+        # One bucket token per recipient, like the single-send path
+        if not reserved and await defer_if_rate_limited(
+            tenant_id,
+            "EMAIL",
+            config,
+            JOB_FUNC,
+            template, destinations, tenant_id, tenant_schema,
+            cost=len(destinations),
+        ):
+            return
+
+        template_name, subject_part, html_part = SES_TEMPLATES[template]
+        notification_ids = [dest["notification_id"] for dest in destinations]
+
+        try:
+            await client.ensure_template(template_name, subject_part, html_part)
+            results = await client.send_bulk_templated_email(
+                template_name,
+                [(dest["to"], _build_template_vars(dest.get("variables") or {})) for dest in destinations],
+            )
+        except TRANSIENT_ERRORS as exc:
+            # Nothing was sent; retry the whole batch after a back-off
+            get_circuit_breaker().record("EMAIL", tenant_id, success=False)
+            if attempt < MAX_RETRIES:
+                delay = backoff_delay(attempt)
+                logger.warning(
+                    "Bulk email transient error template=%s size=%d retry=%d/%d in %.0fs",
+                    template, len(destinations), attempt + 1, MAX_RETRIES, delay,
+                )
+                if reschedule_current_job(
+                    delay, JOB_FUNC, template, destinations, tenant_id, tenant_schema, attempt=attempt + 1
+                ):
+                    return
+                raise  # Not inside RQ: let the caller retry
+            # Kept in the dead-letter queue for replay: not an RQ failure too
+            await _fail_batch(repo, template, destinations, tenant_id, tenant_schema, "retries_exhausted", exc)
+            return
+        except Exception as exc:
+            throttle_delay = provider_throttle_delay(exc)
+            if throttle_delay is not None and reschedule_current_job(
+                throttle_delay, JOB_FUNC, template, destinations, tenant_id, tenant_schema, attempt=attempt
+            ):
+                logger.warning(
+                    "Bulk email throttled by provider tenant_id=%s, retry in %.0fs", tenant_id, throttle_delay
+                )
+                return
+            if is_provider_failure(exc, TRANSIENT_ERRORS):
+                get_circuit_breaker().record("EMAIL", tenant_id, success=False)
+            await _fail_batch(repo, template, destinations, tenant_id, tenant_schema, "permanent_error", exc)
+            return
+
+        get_circuit_breaker().record("EMAIL", tenant_id, success=True)
+
+        # SES answers with one status per destination, in request order
+        statuses = {
+            nid: "sent" if (result or {}).get("Status") == "Success" else "failed"
+            for nid, result in zip(notification_ids, results)
+        }
+        # A short response means the tail was not accepted
+        for nid in notification_ids[len(results):]:
+            statuses[nid] = "failed"
+
+        await repo.bulk_update_status(statuses)
+        await session.commit()
+        _record_broadcast_results(destinations, statuses)
+        record_send_outcomes(tenant_id, "EMAIL", template, statuses)
+
+        failed = sum(1 for status in statuses.values() if status == "failed")
+        logger.info(
+            "[Worker] Bulk email template=%s tenant_id=%s sent=%d failed=%d",
+            template, tenant_id, len(statuses) - failed, failed,
+        )
+
+
+async def _run_batch(*args: Any) -> None:
+    try:
+        await _send_batch(*args)
+    finally:
+        await get_usage_meter().after_job()
+
+
+def send_email_batch(
+    template: str,
+    destinations: list[dict[str, Any]],
+    tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    reserved: bool = False,
+    attempt: int = 0,
+) -> None:
+    """
+    Send one templated email to up to 50 guardians with a single SES call.
+
+    Args:
+        template: Email template name (key of EMAIL_TEMPLATES)
+        destinations: Dicts with notification_id, to and variables
+        tenant_id: Optional tenant ID; selects SES credentials and rate bucket
+        tenant_schema: Tenant schema holding the notifications (None: public)
+        reserved: True when rate-limit tokens were already taken
+        attempt: Retries already made after transient errors
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_run_batch(template, destinations, tenant_id, tenant_schema, reserved, attempt))
+    else:
+        import concurrent.futures
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            future = executor.submit(
+                lambda: asyncio.run(_run_batch(template, destinations, tenant_id, tenant_schema, reserved, attempt))
+            )
+            future.result()
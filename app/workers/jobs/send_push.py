@@ -1,21 +1,79 @@
 """Web Push notification worker job."""
 
 import asyncio
-import json
 import logging
 from typing import Any
 
-from pywebpush import WebPushException, webpush
+import httpx
 
 from app.core.config import settings
+from app.db.repositories.notifications import NotificationRepository
+from app.db.repositories.push_subscriptions import PushSubscriptionRepository
+from app.db.session import tenant_session_scope
+from app.services.notifications.web_push import AsyncWebPushSender, PushResult, get_vapid_cache
 
 logger = logging.getLogger(__name__)
 
+PUSH_TIMEOUT_SECONDS = 10.0
+
+
+async def _record_results(
+    notification_ids: list[int | None],
+    results: list[PushResult],
+    tenant_schema: str | None,
+) -> None:
+    """Persist delivery status and prune expired subscriptions in one transaction."""
+    expired = [result.endpoint for result in results if result.status == "expired"]
+    statuses = {
+        notification_id: "sent" if result.status == "sent" else "failed"
+        for notification_id, result in zip(notification_ids, results)
+        if notification_id
+    }
+    if not expired and not statuses:
+        return
+
+    try:
+        async with tenant_session_scope(tenant_schema) as session:
+            if expired:
+                removed = await PushSubscriptionRepository(session).deactivate_by_endpoints(expired)
+                logger.info(f"[Push] Deactivated {removed} expired subscription(s)")
+            await NotificationRepository(session).bulk_update_status(statuses)
+            await session.commit()
+    except Exception as e:
+        # Delivery already happened; a bookkeeping failure must not trigger a resend
+        logger.error(f"[Push] Failed to record push results: {e}")
+
+
+async def _send_push_many(
+    notifications: list[dict[str, Any]],
+    tenant_schema: str | None = None,
+) -> list[PushResult]:
+    """Send pushes concurrently over one HTTP client and record the outcome.
+
+    Args:
+        notifications: Dicts with notification_id, subscription_info, payload
+        tenant_schema: Tenant schema holding the notifications and subscriptions
+
+    Returns:
+        One PushResult per notification, in input order
+    """
+    vapid = get_vapid_cache(settings.vapid_private_key, settings.vapid_subject)
+    limits = httpx.Limits(max_connections=settings.push_concurrency)
+    async with httpx.AsyncClient(timeout=PUSH_TIMEOUT_SECONDS, limits=limits) as client:
+        sender = AsyncWebPushSender(client, vapid, concurrency=settings.push_concurrency)
+        results = await sender.send_many(
+            [(notif.get("subscription_info", {}), notif.get("payload", {})) for notif in notifications]
+        )
+
+    await _record_results([notif.get("notification_id") for notif in notifications], results, tenant_schema)
+    return results
+
 
 async def _send_push_async(
     subscription_info: dict[str, Any],
     payload: dict[str, Any],
     notification_id: int | None = None,
+    tenant_schema: str | None = None,
 ) -> bool:
     """Send a single push notification asynchronously.
 
@@ -23,44 +81,31 @@ async def _send_push_async(
         subscription_info: Push subscription data (endpoint, keys)
         payload: Notification payload (title, body, url, etc.)
         notification_id: Optional notification ID for logging
+        tenant_schema: Tenant schema holding the notification and subscription
 
     Returns:
         True if sent successfully, False otherwise
     """
-    if not settings.vapid_private_key or not settings.vapid_public_key:
-        logger.warning("[Push] VAPID keys not configured, skipping push notification")
-        return False
-
-    try:
-        # Convert payload to JSON string
-        data = json.dumps(payload)
-
-        # Send push notification
-        response = webpush(
-            subscription_info=subscription_info,
-            data=data,
-            vapid_private_key=settings.vapid_private_key,
-            vapid_claims={"sub": settings.vapid_subject},
-        )
-
+    results = await _send_push_many(
+        [{"notification_id": notification_id, "subscription_info": subscription_info, "payload": payload}],
+        tenant_schema,
+    )
+    sent = results[0].status == "sent"
+    if sent:
         log_id = notification_id or "unknown"
         logger.info(f"[Push] Sent notification {log_id} to {subscription_info.get('endpoint', '')[:50]}...")
-        return True
-
-    except WebPushException as e:
-        logger.error(f"[Push] WebPush error: {e}")
+    return sent
 
-        # Check for subscription expired/invalid
-        if e.response and e.response.status_code in (404, 410):
-            logger.warning(
-                f"[Push] Subscription expired or invalid for {subscription_info.get('endpoint', '')[:50]}..., "
-                "should be removed"
-            )
-        return False
 
-    except Exception as e:
-        logger.error(f"[Push] Unexpected error sending push: {e}")
-        return False
+def _run(coro):
+    """Run a coroutine from a sync RQ job, even if a loop is already running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    import concurrent.futures
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        return executor.submit(asyncio.run, coro).result()
 
 
 def send_push_notification(
@@ -68,6 +113,7 @@ def send_push_notification(
     subscription_info: dict[str, Any],
     payload: dict[str, Any],
     tenant_id: int | None = None,
+    tenant_schema: str | None = None,
 ) -> bool:
     """Worker job to send a push notification.
 
@@ -76,6 +122,7 @@ def send_push_notification(
         subscription_info: Push subscription (endpoint, keys.p256dh, keys.auth)
         payload: Notification content (title, body, icon, url, tag, etc.)
         tenant_id: Optional tenant ID for multi-tenant support
+        tenant_schema: Tenant schema where the notification lives
 
     Returns:
         True if successful, False otherwise
@@ -87,18 +134,12 @@ def send_push_notification(
         logger.debug(f"{log_prefix} Payload: {payload}")
         return True
 
-    try:
-        # Run async function in event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(
-                _send_push_async(subscription_info, payload, notification_id)
-            )
-            return result
-        finally:
-            loop.close()
+    if not settings.vapid_private_key or not settings.vapid_public_key:
+        logger.warning("[Push] VAPID keys not configured, skipping push notification")
+        return False
 
+    try:
+        return _run(_send_push_async(subscription_info, payload, notification_id, tenant_schema))
     except Exception as e:
         logger.error(f"{log_prefix} Error in send_push_notification: {e}")
         return False
@@ -107,29 +148,38 @@ def send_push_notification(
 def send_push_batch(
     notifications: list[dict[str, Any]],
     tenant_id: int | None = None,
+    tenant_schema: str | None = None,
 ) -> dict[str, int]:
-    """Send multiple push notifications in batch.
+    """Send multiple push notifications concurrently.
+
+    Expired subscriptions (404/410) are deactivated in a single UPDATE.
 
     Args:
         notifications: List of dicts with notification_id, subscription_info, payload
         tenant_id: Optional tenant ID
+        tenant_schema: Tenant schema where the notifications live
 
     Returns:
         Dict with success/failure counts
     """
-    success = 0
-    failed = 0
-
-    for notif in notifications:
-        result = send_push_notification(
-            notification_id=notif.get("notification_id", 0),
-            subscription_info=notif.get("subscription_info", {}),
-            payload=notif.get("payload", {}),
-            tenant_id=tenant_id,
-        )
-        if result:
-            success += 1
-        else:
-            failed += 1
+    log_prefix = f"[Push][Tenant:{tenant_id or 'default'}]"
+
+    if not settings.enable_real_notifications:
+        for notif in notifications:
+            endpoint = notif.get("subscription_info", {}).get("endpoint", "")
+            logger.info(f"{log_prefix} SIMULATED push to {endpoint[:50]}...")
+        return {"success": len(notifications), "failed": 0}
+
+    if not settings.vapid_private_key or not settings.vapid_public_key:
+        logger.warning("[Push] VAPID keys not configured, skipping push notifications")
+        return {"success": 0, "failed": len(notifications)}
+
+    try:
+        results = _run(_send_push_many(notifications, tenant_schema))
+    except Exception as e:
+        logger.error(f"{log_prefix} Error in send_push_batch: {e}")
+        return {"success": 0, "failed": len(notifications)}
 
-    return {"success": success, "failed": failed}
+    success = sum(1 for result in results if result.status == "sent")
+    logger.info(f"{log_prefix} Batch done: {success}/{len(results)} sent")
+    return {"success": success, "failed": len(results) - success}
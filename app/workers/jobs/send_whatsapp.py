@@ -3,12 +3,29 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import datetime, timezone
+
 from loguru import logger
 from requests.exceptions import ConnectionError, Timeout
 
-from app.db.repositories.notifications import NotificationRepository
-from app.db.repositories.tenant_configs import TenantConfigRepository
 from app.db.session import async_session
+from app.services.notifications.broadcast_progress import record_broadcast_delivery
+from app.services.notifications.rate_limit import (
+    defer_if_rate_limited,
+    provider_throttle_delay,
+    reschedule_current_job,
+)
+from app.services.notifications.resilience import (
+    backoff_delay,
+    dead_letter,
+    defer_if_circuit_open,
+    get_circuit_breaker,
+    is_provider_failure,
+)
+from app.services.notifications.status_writer import get_status_writer
+from app.services.notifications.summary_cache import record_send_outcomes
+from app.services.usage_meter import get_usage_meter
+from app.services.tenant_config_cache import tenant_config_cache
 from app.services.notifications.whatsapp import WhatsAppClient, TenantWhatsAppClient, mask_phone
 
 
@@ -16,6 +33,8 @@ from app.services.notifications.whatsapp import WhatsAppClient, TenantWhatsAppCl
 MAX_RETRIES = 3
 TRANSIENT_ERRORS = (ConnectionError, Timeout, TimeoutError, OSError)
 
+JOB_FUNC = "app.workers.jobs.send_whatsapp.send_whatsapp_message"
+
 
 # Message templates for attendance notifications
 ATTENDANCE_MESSAGES = {
@@ -23,6 +42,12 @@ ATTENDANCE_MESSAGES = {
     "SALIDA_OK": "Salida registrada: {student_name} salió del colegio el {date} a las {time}.",
 }
 
+# Body parameters of each approved WhatsApp template (default: attendance templates)
+TEMPLATE_PARAMS = {
+    "RESUMEN_DIARIO": ("date", "summary"),
+}
+DEFAULT_TEMPLATE_PARAMS = ("student_name", "date", "time")
+
 
 def _sanitize_format_value(value: str) -> str:
     """Sanitize a value to prevent format string injection.
@@ -88,98 +113,142 @@ async def _send(
     template: str,
     variables: dict,
     tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    reserved: bool = False,
+    attempt: int = 0,
 ) -> None:
-    async with async_session() as session:
-        repo = NotificationRepository(session)
-        notification = await repo.get(notification_id)
-        if notification is None:
-            logger.error("Notification %s not found", notification_id)
-            return
-
-        # Use tenant-specific client if tenant_id is provided
-        client = None
-        if tenant_id:
-            try:
-                config_repo = TenantConfigRepository(session)
-                config = await config_repo.get_decrypted(tenant_id)
-                if config and config.whatsapp_access_token:
-                    client = TenantWhatsAppClient(config)
-                    logger.debug("Using tenant WhatsApp client for tenant_id=%s", tenant_id)
-            except Exception as e:
-                logger.warning(
-                    "Failed to load tenant WhatsApp config for tenant_id=%s, falling back to default: %s",
-                    tenant_id, e
-                )
+    # The job carries everything needed to send: the notification row is not
+    # loaded, and its outcome goes through the batched status writer
+    status_writer = get_status_writer()
 
-        # Fall back to global client if no tenant config
-        if client is None:
-            client = WhatsAppClient()
+    # Use tenant-specific client if tenant_id is provided
+    client = None
+    config = None
+    if tenant_id:
         try:
-            photo_url = variables.get("photo_url")
-            has_photo = variables.get("has_photo", False)
-
-            if has_photo and photo_url:
-                # Send image message with caption
-                caption = _build_caption(template, variables)
-                await client.send_image_message(
-                    to=to,
-                    image_url=photo_url,
-                    caption=caption,
-                )
-            else:
-                # Send template message without image
-                # Build components for WhatsApp template
-                template_params = [
-                    variables.get("student_name", ""),
-                    variables.get("date", ""),
-                    variables.get("time", ""),
-                ]
-                components = [
-                    {
-                        "type": "body",
-                        "parameters": [
-                            {"type": "text", "text": str(param)}
-                            for param in template_params
-                            if param
-                        ],
-                    }
-                ]
-                await client.send_template(to=to, template=template, components=components)
-
-            await repo.mark_sent(notification)
-            await session.commit()
-            logger.info(
-                "[Worker] WhatsApp sent notification_id=%s to=%s with_photo=%s",
-                notification_id,
-                mask_phone(to),
-                has_photo and photo_url is not None,
+            # Cached per process; invalidated via Redis when credentials change
+            async with async_session() as session:
+                config = await tenant_config_cache.get(session, tenant_id)
+            if config and config.whatsapp_access_token:
+                client = TenantWhatsAppClient(config)
+                logger.debug("Using tenant WhatsApp client for tenant_id=%s", tenant_id)
+        except Exception as e:
+            logger.warning(
+                "Failed to load tenant WhatsApp config for tenant_id=%s, falling back to default: %s",
+                tenant_id, e
             )
-        except TRANSIENT_ERRORS as exc:
-            # R2-B4 fix: Transient errors should allow retry
-            current_retries = notification.retries or 0
-            if current_retries < MAX_RETRIES:
-                # Don't mark as failed, just increment retry count for next attempt
-                notification.retries = current_retries + 1
-                await session.commit()
-                logger.warning(
-                    "WhatsApp transient error notification_id=%s retry=%d/%d error=%s",
-                    notification_id, current_retries + 1, MAX_RETRIES, exc
-                )
-                raise  # Let RQ retry the job
-            else:
-                await repo.mark_failed(notification)
-                await session.commit()
-                logger.error(
-                    "WhatsApp send failed after %d retries notification_id=%s error=%s",
-                    MAX_RETRIES, notification_id, exc
-                )
-                raise
-        except Exception as exc:  # pragma: no cover - permanent failure
-            # Non-transient errors (e.g., 400 Bad Request) - mark as failed immediately
-            await repo.mark_failed(notification)
-            await session.commit()
-            logger.error("WhatsApp send failed notification_id=%s error=%s", notification_id, exc)
-            raise
+
+    # Fall back to global client if no tenant config
+    if client is None:
+        client = WhatsAppClient()
+
+    job_args = (notification_id, to, template, variables, tenant_id, tenant_schema)
+
+    # Provider (or this tenant's account) is failing: wait out the cool-down
+    if defer_if_circuit_open("WHATSAPP", tenant_id, JOB_FUNC, *job_args, reserved=reserved, attempt=attempt):
+        return
+
+    # Per-tenant token bucket: over-limit jobs are rescheduled, not failed
+    if not reserved and await defer_if_rate_limited(
+        tenant_id, "WHATSAPP", config, JOB_FUNC, *job_args, attempt=attempt
+    ):
+        return
+    try:
+        photo_url = variables.get("photo_url")
+        has_photo = variables.get("has_photo", False)
+
+        if has_photo and photo_url:
+            # Send image message with caption
+            caption = _build_caption(template, variables)
+            await client.send_image_message(
+                to=to,
+                image_url=photo_url,
+                caption=caption,
+            )
+        else:
+            # Send template message without image
+            # Build components for WhatsApp template
+            template_params = [
+                variables.get(name, "")
+                for name in TEMPLATE_PARAMS.get(template, DEFAULT_TEMPLATE_PARAMS)
+            ]
+            components = [
+                {
+                    "type": "body",
+                    "parameters": [
+                        {"type": "text", "text": str(param)}
+                        for param in template_params
+                        if param
+                    ],
+                }
+            ]
+            await client.send_template(to=to, template=template, components=components)
+
+        status_writer.submit(
+            notification_id, "sent", ts_sent=datetime.now(timezone.utc), tenant_schema=tenant_schema
+        )
+        record_send_outcomes(tenant_id, "WHATSAPP", template, {notification_id: "sent"})
+        get_circuit_breaker().record("WHATSAPP", tenant_id, success=True)
+        record_broadcast_delivery(variables.get("broadcast_id"), "sent")
+        logger.info(
+            "[Worker] WhatsApp sent notification_id=%s to=%s with_photo=%s",
+            notification_id,
+            mask_phone(to),
+            has_photo and photo_url is not None,
+        )
+    except TRANSIENT_ERRORS as exc:
+        # R2-B4 fix: Transient errors should allow retry
+        get_circuit_breaker().record("WHATSAPP", tenant_id, success=False)
+        if attempt < MAX_RETRIES:
+            # Don't mark as failed, just record the retry count for the next attempt
+            status_writer.submit(notification_id, retries=attempt + 1, tenant_schema=tenant_schema)
+            delay = backoff_delay(attempt)
+            logger.warning(
+                "WhatsApp transient error notification_id=%s retry=%d/%d in %.0fs error=%s",
+                notification_id, attempt + 1, MAX_RETRIES, delay, exc
+            )
+            if reschedule_current_job(delay, JOB_FUNC, *job_args, attempt=attempt + 1):
+                return
+            raise  # Not inside RQ: let the caller retry
+        else:
+            status_writer.submit(notification_id, "failed", tenant_schema=tenant_schema)
+            record_send_outcomes(tenant_id, "WHATSAPP", template, {notification_id: "failed"})
+            record_broadcast_delivery(variables.get("broadcast_id"), "failed")
+            dead_letter(
+                tenant_id, JOB_FUNC, job_args,
+                reason="retries_exhausted", error=exc, notification_ids=[notification_id],
+            )
+            logger.error(
+                "WhatsApp send failed after %d retries notification_id=%s error=%s",
+                MAX_RETRIES, notification_id, exc
+            )
+            # Kept in the dead-letter queue for replay: not an RQ failure too
+            return
+    except Exception as exc:
+        # Provider throttled us: back off and retry later instead of failing
+        throttle_delay = provider_throttle_delay(exc)
+        if throttle_delay is not None and reschedule_current_job(
+            throttle_delay, JOB_FUNC, *job_args, attempt=attempt
+        ):
+            logger.warning(
+                "WhatsApp throttled by provider notification_id=%s tenant_id=%s, retry in %.0fs",
+                notification_id, tenant_id, throttle_delay
+            )
+            return
+        # Non-transient errors (e.g., 400 Bad Request) - mark as failed immediately
+        if is_provider_failure(exc, TRANSIENT_ERRORS):
+            get_circuit_breaker().record("WHATSAPP", tenant_id, success=False)
+        status_writer.submit(notification_id, "failed", tenant_schema=tenant_schema)
+        record_send_outcomes(tenant_id, "WHATSAPP", template, {notification_id: "failed"})
+        record_broadcast_delivery(variables.get("broadcast_id"), "failed")
+        dead_letter(
+            tenant_id, JOB_FUNC, job_args,
+            reason="permanent_error", error=exc, notification_ids=[notification_id],
+        )
+        logger.error("WhatsApp send failed notification_id=%s error=%s", notification_id, exc)
+    finally:
+        await status_writer.after_job()
+        await get_usage_meter().after_job()
 
 
 def send_whatsapp_message(
@@ -188,6 +257,9 @@ def send_whatsapp_message(
     template: str,
     variables: dict,
     tenant_id: int | None = None,
+    tenant_schema: str | None = None,
+    reserved: bool = False,
+    attempt: int = 0,
 ) -> None:
     """
     Send a WhatsApp message.
@@ -199,6 +271,10 @@ def send_whatsapp_message(
         variables: Template variables
         tenant_id: Optional tenant ID for multi-tenant deployments.
                    If provided, uses tenant-specific WhatsApp credentials.
+        tenant_schema: Schema holding the notification row (None for public).
+        reserved: True when a rate-limit token was already taken for this
+                  send (set on jobs rescheduled by the rate limiter).
+        attempt: Retries already made after transient errors.
     """
     # TDD-BUG3 fix: Handle case when event loop is already running (e.g., async RQ workers)
     # TDD-R3-BUG1 fix: Use lambda to avoid coroutine evaluation before executor.submit
@@ -206,12 +282,14 @@ def send_whatsapp_message(
         asyncio.get_running_loop()
     except RuntimeError:
         # No running loop - use asyncio.run() normally
-        asyncio.run(_send(notification_id, to, template, variables, tenant_id))
+        asyncio.run(_send(notification_id, to, template, variables, tenant_id, tenant_schema, reserved, attempt))
     else:
         # Loop is already running - run in separate thread with new event loop
         import concurrent.futures
         with concurrent.futures.ThreadPoolExecutor() as executor:
             future = executor.submit(
-                lambda: asyncio.run(_send(notification_id, to, template, variables, tenant_id))
+                lambda: asyncio.run(
+                    _send(notification_id, to, template, variables, tenant_id, tenant_schema, reserved, attempt)
+                )
             )
             future.result()  # Wait for completion
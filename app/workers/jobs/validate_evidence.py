@@ -0,0 +1,31 @@
+"""RQ job validating evidence uploaded directly to storage."""
+
+from __future__ import annotations
+
+import asyncio
+
+from loguru import logger
+
+from app.db.session import tenant_session_scope
+from app.services.attendance_service import AttendanceService
+from app.services.photo_service import PhotoService
+from app.services.storage.registry import tenant_storage
+
+
+async def _validate(event_id: int, key: str, tenant_schema: str | None) -> bool:
+    photo_service = PhotoService(await tenant_storage(tenant_schema=tenant_schema))
+    async with tenant_session_scope(tenant_schema) as session:
+        service = AttendanceService(session, tenant_schema=tenant_schema, photo_service=photo_service)
+        try:
+            return await service.verify_uploaded_evidence(event_id, key)
+        finally:
+            service.photo_service.close()
+
+
+def validate_evidence_job(event_id: int, key: str, tenant_schema: str | None = None) -> bool:
+    """Range-read the object header and reject content that does not match its type."""
+    try:
+        return asyncio.run(_validate(event_id, key, tenant_schema))
+    except Exception as exc:
+        logger.error("[Evidence] Validation of event_id=%s key=%s failed: %s", event_id, key, exc)
+        raise
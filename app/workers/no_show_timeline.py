@@ -0,0 +1,212 @@
+"""Event-driven no-show detection: one timer per threshold instant.
+
+Instead of scanning every schedule of the weekday every five minutes, the
+scheduler keeps a per-tenant timeline of today's thresholds (course entry
+time from the effective calendar of ``CalendarService`` +
+``NO_SHOW_GRACE_MINUTES``). Each distinct instant is one APScheduler
+``DateTrigger`` job that evaluates only the courses due at that instant:
+
+- ``plan()`` builds the timeline for every tenant. It runs at startup, at
+  midnight UTC and then hourly as a safety net.
+- Schedule and exception edits call ``request_replan()``, which queues the
+  tenant in Redis; the scheduler drains that set every
+  ``REPLAN_POLL_SECONDS`` and rebuilds only those tenants' timelines.
+- Thresholds that already fired are not armed again. That record is only
+  kept in memory: after a restart past thresholds fire once more, which is
+  harmless because alerts are inserted with ``ON CONFLICT DO NOTHING`` and
+  only alerts not notified within the grace period are sent again (the
+  same rule as reminders).
+- When courses still have guardians to remind, a reminder timer for those
+  courses is armed one grace period later.
+- Late IN events resolve pending alerts as they are registered
+  (``NoShowAlertRepository.resolve_checked_in``), so reminders stop by
+  themselves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import redis
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.date import DateTrigger
+from loguru import logger
+
+from app.core.config import settings
+from app.core.tenant_middleware import current_tenant, current_tenant_schema
+from app.db.session import async_session, tenant_session_scope
+from app.services.calendar_service import CalendarService
+from app.workers.jobs.detect_no_ingreso import _detect_and_notify
+from app.workers.tenant_fanout import run_for_each_tenant
+
+
+REPLAN_KEY = "no_show:replan"
+REPLAN_POLL_SECONDS = 15
+
+
+def request_replan() -> None:
+    """Ask the scheduler to rebuild the current tenant's timeline. Never raises.
+
+    Called after a schedule or exception change is committed; the tenant
+    comes from the request context (public for single-tenant deployments).
+    """
+    tenant = current_tenant.get()
+    member = f"{tenant.id if tenant else ''}:{current_tenant_schema.get() or ''}"
+    try:
+        client = redis.from_url(settings.redis_url)
+        try:
+            client.sadd(REPLAN_KEY, member)
+        finally:
+            client.close()
+    except Exception as exc:
+        logger.warning("[NoIngreso] Failed to request a timeline rebuild for %s: %s", member, exc)
+
+
+def threshold_instants(day: date, entry_times: dict, grace: timedelta) -> dict[datetime, set[int]]:
+    """Group courses by the UTC instant their grace period ends on ``day``."""
+    instants: dict[datetime, set[int]] = {}
+    for course_id, in_time in entry_times.items():
+        when = datetime.combine(day, in_time, tzinfo=timezone.utc) + grace
+        instants.setdefault(when, set()).add(course_id)
+    return instants
+
+
+class NoShowTimeline:
+    """Arms one APScheduler job per tenant and threshold instant."""
+
+    JOB_PREFIX = "no_show"
+
+    def __init__(self, scheduler: AsyncIOScheduler) -> None:
+        self._scheduler = scheduler
+        self._day: date | None = None
+        # tenant key -> course IDs whose first threshold already fired today
+        # (memory only; see the module docstring for restarts)
+        self._fired: dict[str, set[int]] = {}
+        # tenant key -> IDs of the threshold jobs armed by the last plan
+        self._armed: dict[str, set[str]] = {}
+
+    @property
+    def grace(self) -> timedelta:
+        return timedelta(minutes=settings.no_show_grace_minutes)
+
+    async def plan(self, now: datetime | None = None) -> None:
+        """(Re)build today's timeline for every active tenant."""
+        now = now or datetime.now(timezone.utc)
+        if now.date() != self._day:
+            self._day = now.date()
+            self._fired.clear()
+        await run_for_each_tenant(
+            "NoIngresoPlan",
+            lambda tenant_id, tenant_schema: self._plan_tenant(self._day, tenant_id, tenant_schema),
+        )
+
+    async def apply_replan_requests(self, redis_client: redis.Redis | None = None) -> int:
+        """Rebuild the timelines of the tenants queued by ``request_replan``.
+
+        Returns:
+            Number of tenants replanned
+        """
+        client = redis_client or redis.from_url(settings.redis_url)
+        try:
+            members = client.spop(REPLAN_KEY, 1000) or []
+        except Exception as exc:
+            logger.warning("[NoIngreso] Failed to read timeline rebuild requests: %s", exc)
+            return 0
+        finally:
+            if redis_client is None:
+                client.close()
+        if not members:
+            return 0
+
+        today = datetime.now(timezone.utc).date()
+        if today != self._day:
+            # New day: every tenant needs a fresh timeline anyway
+            await self.plan()
+            return len(members)
+        for member in members:
+            tenant_id, _, tenant_schema = (member.decode() if isinstance(member, bytes) else member).partition(":")
+            try:
+                await asyncio.wait_for(
+                    self._plan_tenant(today, int(tenant_id) if tenant_id else None, tenant_schema or None),
+                    settings.scheduler_tenant_timeout_seconds,
+                )
+            except Exception as exc:
+                logger.error("[NoIngreso] Failed to rebuild timeline tenant=%s: %s", tenant_schema or "public", exc)
+        return len(members)
+
+    async def _plan_tenant(self, day: date, tenant_id: int | None, tenant_schema: str | None) -> None:
+        session_scope = tenant_session_scope(tenant_schema) if tenant_schema else async_session()
+        async with session_scope as session:
+            entry_times = await CalendarService(session).entry_times(day)
+
+        tenant_key = tenant_schema or "public"
+        fired = self._fired.setdefault(tenant_key, set())
+        pending = {course_id: in_time for course_id, in_time in entry_times.items() if course_id not in fired}
+
+        armed: set[str] = set()
+        for when, course_ids in threshold_instants(day, pending, self.grace).items():
+            armed.add(self._arm(tenant_id, tenant_schema, when, course_ids))
+
+        # Thresholds moved or cancelled by a schedule exception
+        for job_id in self._armed.get(tenant_key, set()) - armed:
+            if self._scheduler.get_job(job_id):
+                self._scheduler.remove_job(job_id)
+        self._armed[tenant_key] = armed
+        logger.info(
+            "[NoIngreso] tenant=%s: %d course(s) on %d timer(s) for %s",
+            tenant_key, len(pending), len(armed), day,
+        )
+
+    def _arm(
+        self,
+        tenant_id: int | None,
+        tenant_schema: str | None,
+        when: datetime,
+        course_ids: set[int],
+        reminder: bool = False,
+    ) -> str:
+        kind = "reminder" if reminder else "threshold"
+        job_id = f"{self.JOB_PREFIX}:{tenant_schema or 'public'}:{kind}:{when.isoformat()}"
+        existing = self._scheduler.get_job(job_id) if reminder else None
+        if existing is not None:
+            # Another course is already reminded at this instant
+            course_ids = course_ids | set(existing.args[2])
+        self._scheduler.add_job(
+            self._fire,
+            DateTrigger(run_date=when),
+            id=job_id,
+            name=f"detect_no_ingreso:{tenant_schema or 'public'}",
+            args=[tenant_id, tenant_schema, sorted(course_ids), reminder],
+            replace_existing=True,
+            # A timer missed while the scheduler was down still runs on startup
+            misfire_grace_time=None,
+            coalesce=True,
+            max_instances=1,
+        )
+        return job_id
+
+    async def _fire(
+        self,
+        tenant_id: int | None,
+        tenant_schema: str | None,
+        course_ids: list[int],
+        reminder: bool = False,
+    ) -> None:
+        tenant_key = tenant_schema or "public"
+        if not reminder:
+            self._fired.setdefault(tenant_key, set()).update(course_ids)
+
+        now = datetime.now(timezone.utc)
+        try:
+            notified = await asyncio.wait_for(
+                _detect_and_notify(now, tenant_id, tenant_schema, set(course_ids)),
+                settings.scheduler_tenant_timeout_seconds,
+            )
+        except Exception as exc:
+            logger.error("[NoIngreso] tenant=%s courses=%s failed: %s", tenant_key, course_ids, exc)
+            return
+
+        next_reminder = now + self.grace
+        if notified and next_reminder.date() == now.date():
+            self._arm(tenant_id, tenant_schema, next_reminder, notified, reminder=True)
@@ -0,0 +1,178 @@
+"""RQ queue lanes and their latency metrics.
+
+Jobs are split into three lanes so a large broadcast can never sit ahead of
+morning check-in notices:
+
+- ``realtime``: attendance notifications (INGRESO_OK/SALIDA_OK), coalesced
+  flushes and Web Push batches. Kept on the historical ``notifications``
+  queue so jobs already enqueued before a deploy are still served.
+- ``alerts``: no-show alerts, manual dispatches and transactional emails.
+- ``bulk``: broadcast fan-out and its per-guardian jobs, daily digests and
+  anything else that can wait.
+
+Each lane has its own workers (``RQ_LANE_WORKERS``). Realtime workers only
+listen to the realtime queue; alert workers help with realtime jobs when
+their own queue is empty; bulk workers never take realtime or alert jobs.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any
+
+from loguru import logger
+from rq import Queue, SimpleWorker, Worker
+
+
+REALTIME_QUEUE = "notifications"
+ALERTS_QUEUE = "alerts"
+BULK_QUEUE = "bulk"
+BROADCASTS_QUEUE = "broadcasts"
+DEFAULT_QUEUE = "default"
+
+# Queues each lane's workers listen to, highest priority first
+LANES: dict[str, tuple[str, ...]] = {
+    "realtime": (REALTIME_QUEUE,),
+    "alerts": (ALERTS_QUEUE, REALTIME_QUEUE),
+    "bulk": (BROADCASTS_QUEUE, BULK_QUEUE, DEFAULT_QUEUE),
+}
+
+
+def parse_lane_workers(spec: str) -> dict[str, int]:
+    """Parse ``"realtime=2,alerts=1,bulk=2"`` into worker counts per lane.
+
+    Raises:
+        ValueError: Unknown lane or non-positive count
+    """
+    counts: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        lane, _, count = item.partition("=")
+        lane = lane.strip()
+        if lane not in LANES:
+            raise ValueError(f"Unknown queue lane: {lane}")
+        counts[lane] = int(count or 1)
+        if counts[lane] < 1:
+            raise ValueError(f"Lane {lane} needs at least one worker")
+    return counts
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class LaneMetrics:
+    """Queue depth and wait-time (enqueue to start) samples per queue.
+
+    Workers push each job's wait time to a capped Redis list per queue; the
+    snapshot combines those samples with live queue and registry counts.
+    """
+
+    KEY = "rq:lane:wait:{queue}"
+    MAX_SAMPLES = 1000
+
+    def __init__(self, redis_client: Any):
+        self._redis = redis_client
+
+    def record_wait(self, queue_name: str, seconds: float) -> None:
+        key = self.KEY.format(queue=queue_name)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.lpush(key, round(seconds, 3))
+            pipe.ltrim(key, 0, self.MAX_SAMPLES - 1)
+            pipe.execute()
+        except Exception as exc:
+            # Metrics must never fail a job
+            logger.debug("Failed to record queue wait queue=%s: %s", queue_name, exc)
+
+    def wait_stats(self, queue_name: str) -> dict[str, float | int | None]:
+        """p50/p95/max of the most recent wait samples, in seconds."""
+        raw = self._redis.lrange(self.KEY.format(queue=queue_name), 0, -1)
+        samples = sorted(float(value) for value in raw)
+        if not samples:
+            return {"samples": 0, "p50": None, "p95": None, "max": None}
+
+        def percentile(fraction: float) -> float:
+            return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+        return {
+            "samples": len(samples),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "max": samples[-1],
+        }
+
+    def queue_stats(self, queue_name: str) -> dict[str, Any]:
+        queue = Queue(queue_name, connection=self._redis)
+        oldest_wait = None
+        head = queue.get_job_ids(0, 1)
+        if head:
+            job = queue.fetch_job(head[0])
+            if job is not None and job.enqueued_at is not None:
+                oldest_wait = round(
+                    (datetime.now(timezone.utc) - _as_utc(job.enqueued_at)).total_seconds(), 3
+                )
+        return {
+            "queue": queue_name,
+            "depth": queue.count,
+            "started": queue.started_job_registry.count,
+            "scheduled": queue.scheduled_job_registry.count,
+            "failed": queue.failed_job_registry.count,
+            "oldest_wait_seconds": oldest_wait,
+            "wait_seconds": self.wait_stats(queue_name),
+        }
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-lane queue stats and the number of workers serving each lane."""
+        workers = Worker.all(connection=self._redis)
+        result: dict[str, dict[str, Any]] = {}
+        reported: set[str] = set()
+        for lane, queue_names in LANES.items():
+            # Queues borrowed from a higher-priority lane are reported there
+            owned = [name for name in queue_names if name not in reported]
+            reported.update(owned)
+            result[lane] = {
+                # A lane's workers are those whose first queue is the lane's own
+                "workers": sum(1 for w in workers if w.queue_names()[:1] == [queue_names[0]]),
+                "queues": [self.queue_stats(name) for name in owned],
+            }
+        return result
+
+
+class _LaneMetricsMixin:
+    """Record how long each job waited in its queue before starting."""
+
+    def prepare_job_execution(self, job, remove_from_intermediate_queue: bool = False) -> None:
+        super().prepare_job_execution(job, remove_from_intermediate_queue)
+        if job.enqueued_at is not None:
+            waited = (datetime.now(timezone.utc) - _as_utc(job.enqueued_at)).total_seconds()
+            LaneMetrics(self.connection).record_wait(job.origin, max(0.0, waited))
+
+
+class LaneWorker(_LaneMetricsMixin, Worker):
+    """Forking worker that records queue wait times."""
+
+
+class SimpleLaneWorker(_LaneMetricsMixin, SimpleWorker):
+    """In-process worker that records queue wait times."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        global _jobs_in_process
+        from app.db.session import use_unpooled_engine
+
+        super().__init__(*args, **kwargs)
+        # Every job runs its own event loop: pooled connections must not outlive it
+        use_unpooled_engine()
+        _jobs_in_process = True
+
+
+# Set once a SimpleLaneWorker runs in this process
+_jobs_in_process = False
+
+
+def jobs_run_in_process() -> bool:
+    """True inside a worker that runs its jobs without forking.
+
+    Process-wide caches and flusher threads only outlive a job there; in a
+    forked work-horse they die with the job.
+    """
+    return _jobs_in_process
@@ -1,17 +1,52 @@
 """RQ worker bootstrap (stub)."""
 
-from rq import Worker
+import sys
+from multiprocessing import Process
+
 from redis import Redis
 
 from app.core.config import settings
+from app.core.encryption import _get_fernet
+from app.workers.queues import LANES, LaneWorker, SimpleLaneWorker, parse_lane_workers
+
 
+def run_worker(lane: str | None = None, queues: list[str] | None = None) -> None:  # pragma: no cover - runtime only
+    """Run one worker serving a lane (or an explicit queue list).
 
-def run_worker(queues: list[str] | None = None) -> None:  # pragma: no cover - runtime only
-    queues = queues or ["default", "notifications", "broadcasts"]
+    Without a lane or queues the worker serves every lane in priority order.
+    """
+    if queues is None:
+        if lane is not None:
+            queues = list(LANES[lane])
+        else:
+            queues = list(dict.fromkeys(name for names in LANES.values() for name in names))
     redis = Redis.from_url(settings.redis_url)
-    worker = Worker(queues, connection=redis)
+    # Build the credentials cipher once so forked work-horses inherit it
+    _get_fernet()
+    # Without forking, process-local caches (tenant credentials, rate limiter,
+    # buffered status writes) survive across jobs instead of dying with each
+    # work-horse
+    worker_class = SimpleLaneWorker if settings.rq_simple_worker else LaneWorker
+    worker = worker_class(queues, connection=redis)
     worker.work(with_scheduler=True)
 
 
+def run_worker_pool() -> None:  # pragma: no cover - runtime only
+    """Start the workers reserved for each lane (RQ_LANE_WORKERS) and wait."""
+    processes = [
+        Process(target=run_worker, args=(lane,), name=f"rq-{lane}-{index}")
+        for lane, count in parse_lane_workers(settings.rq_lane_workers).items()
+        for index in range(count)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
 if __name__ == "__main__":  # pragma: no cover - script entry
-    run_worker()
+    # python -m app.workers.rq_worker [realtime|alerts|bulk]
+    if len(sys.argv) > 1:
+        run_worker(sys.argv[1])
+    else:
+        run_worker_pool()
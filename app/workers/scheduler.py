@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from loguru import logger
 
-from app.workers.jobs.detect_no_ingreso import _detect_and_notify
+from app.core.config import settings
 from app.workers.jobs.cleanup_photos import _cleanup
+from app.workers.jobs.materialize_calendar import _materialize_all_tenants
+from app.workers.jobs.record_student_counts import _record_student_counts
+from app.workers.jobs.replenish_tenant_schemas import _replenish_tenant_schemas
+from app.workers.jobs.send_daily_digest import _send_all_digests
+from app.workers.no_show_timeline import REPLAN_POLL_SECONDS, NoShowTimeline
 
 
 async def run_scheduler() -> None:
@@ -19,10 +25,54 @@ async def run_scheduler() -> None:
     # R14-WRK1 fix: Add max_instances=1 to prevent overlapping job execution
     # coalesce=True ensures if multiple triggers fire while job is running,
     # only one execution happens after current one finishes
+    # No-show detection fires per course when its grace period ends. Schedule
+    # edits queue their tenant for a rebuild within seconds; the full hourly
+    # (and midnight) plan is the safety net
+    no_show_timeline = NoShowTimeline(scheduler)
     scheduler.add_job(
-        _detect_and_notify,
-        CronTrigger(minute="*/5"),
-        name="detect_no_ingreso",
+        no_show_timeline.plan,
+        CronTrigger(minute=0),
+        name="plan_no_ingreso",
+        next_run_time=datetime.now(timezone.utc),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        no_show_timeline.apply_replan_requests,
+        IntervalTrigger(seconds=REPLAN_POLL_SECONDS),
+        name="replan_no_ingreso",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _send_all_digests,
+        CronTrigger(hour=settings.notification_digest_hour_utc, minute=0),
+        name="send_daily_digest",
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _materialize_all_tenants,
+        CronTrigger(hour="1", minute=30),
+        name="materialize_calendar",
+        max_instances=1,
+        coalesce=True,
+    )
+    # Student counts shown in the super-admin tenant list
+    scheduler.add_job(
+        _record_student_counts,
+        CronTrigger(minute=15),
+        name="record_student_counts",
+        next_run_time=datetime.now(timezone.utc),
+        max_instances=1,
+        coalesce=True,
+    )
+    # Spare tenant schemas claimed by new tenants (and rebuilt after migrations)
+    scheduler.add_job(
+        _replenish_tenant_schemas,
+        CronTrigger(minute="*/10"),
+        name="replenish_tenant_schemas",
+        next_run_time=datetime.now(timezone.utc),
         max_instances=1,
         coalesce=True,
     )
@@ -0,0 +1,125 @@
+"""Run a scheduled job once per active tenant, concurrently.
+
+Cron jobs (no-show detection every 5 minutes) must see every tenant's
+schema, and scanning schools one after another does not fit the cron
+window once there are many of them. ``run_for_each_tenant`` runs the job
+for all active tenants at once, bounded by ``SCHEDULER_TENANT_CONCURRENCY``:
+
+- each tenant run has its own ``SCHEDULER_TENANT_TIMEOUT_SECONDS`` timeout;
+- a failing or slow tenant is logged and skipped, the others still run;
+- the outcome and duration of each run is logged and kept in Redis
+  (``scheduler:runs:{job}``, one field per tenant) for monitoring.
+
+Deployments without tenants (no ``tenants`` table, or none active) run the
+job once on the public schema.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+from app.db.repositories.tenants import TenantRepository
+from app.db.session import async_session
+
+
+TenantJob = Callable[[int | None, str | None], Awaitable[None]]
+
+
+@dataclass
+class TenantRunResult:
+    """Outcome of one tenant's run."""
+
+    tenant: str
+    status: str  # "ok", "timeout" or "error"
+    duration_ms: int
+    error: str | None = None
+
+
+async def list_active_tenants() -> list[tuple[int, str, str]]:
+    """Return (id, slug, schema) of every active tenant ([] if single-tenant)."""
+    try:
+        async with async_session() as session:
+            tenants = await TenantRepository(session).list_all()
+    except Exception as exc:
+        # No tenants table: single-tenant deployment on the public schema
+        logger.debug("Tenant registry unavailable, using public schema: %s", exc)
+        return []
+    return [(tenant.id, tenant.slug, tenant.schema_name) for tenant in tenants]
+
+
+def _record_metrics(job_name: str, results: list[TenantRunResult]) -> None:
+    try:
+        client = redis.from_url(settings.redis_url, decode_responses=True)
+        finished_at = datetime.now(timezone.utc).isoformat()
+        key = f"scheduler:runs:{job_name}"
+        pipe = client.pipeline()
+        pipe.hset(
+            key,
+            mapping={r.tenant: json.dumps({**asdict(r), "finished_at": finished_at}) for r in results},
+        )
+        pipe.expire(key, 86400)
+        pipe.execute()
+        client.close()
+    except Exception as exc:
+        logger.debug("Could not store scheduler metrics for %s: %s", job_name, exc)
+
+
+async def run_for_each_tenant(
+    job_name: str,
+    job: TenantJob,
+    *,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+) -> list[TenantRunResult]:
+    """Run ``job(tenant_id, tenant_schema)`` for every active tenant.
+
+    Args:
+        job_name: Name used in logs and metrics
+        job: Coroutine function taking (tenant_id, tenant_schema)
+        concurrency: Tenants processed at once (default from settings)
+        timeout: Seconds allowed per tenant (default from settings)
+
+    Returns:
+        One result per tenant, in tenant order
+    """
+    concurrency = concurrency or settings.scheduler_tenant_concurrency
+    timeout = timeout or settings.scheduler_tenant_timeout_seconds
+    tenants = await list_active_tenants() or [(None, "public", None)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(tenant_id: int | None, slug: str, schema: str | None) -> TenantRunResult:
+        async with semaphore:
+            started = time.perf_counter()
+            status, error = "ok", None
+            try:
+                await asyncio.wait_for(job(tenant_id, schema), timeout)
+            except asyncio.TimeoutError:
+                status, error = "timeout", f"exceeded {timeout:.0f}s"
+            except Exception as exc:
+                status, error = "error", str(exc)[:500]
+            duration_ms = int((time.perf_counter() - started) * 1000)
+
+        if status == "ok":
+            logger.info("[%s] tenant=%s done in %dms", job_name, slug, duration_ms)
+        else:
+            logger.error("[%s] tenant=%s %s after %dms: %s", job_name, slug, status, duration_ms, error)
+        return TenantRunResult(slug, status, duration_ms, error)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_one(*tenant) for tenant in tenants))
+    failed = sum(1 for result in results if result.status != "ok")
+    logger.info(
+        "[%s] %d tenant(s) in %.1fs, %d failed",
+        job_name, len(results), time.perf_counter() - started, failed,
+    )
+    _record_metrics(job_name, results)
+    return list(results)
@@ -157,15 +157,43 @@ const Sync = {
       // Convert base64 to blob
       const blob = await this.dataURLToBlob(photoData);
 
+      const headers = {
+        'Content-Type': 'application/json',
+        'X-Device-Key': config.deviceKey
+      };
+      const eventUrl = `${config.baseUrl}/attendance/events/${eventId}/evidence`;
+
+      // 1. Presigned POST: the photo goes straight to storage, not through the API
+      const ticketResponse = await fetch(`${eventUrl}/upload-url`, {
+        method: 'POST',
+        headers,
+        body: JSON.stringify({
+          kind: 'photo',
+          content_type: blob.type || 'image/jpeg',
+          filename: `photo_${eventId}.jpg`
+        })
+      });
+      if (!ticketResponse.ok) {
+        console.error('Photo upload URL failed:', ticketResponse.status);
+        return false;
+      }
+      const ticket = await ticketResponse.json();
+
       const formData = new FormData();
+      Object.entries(ticket.fields).forEach(([name, value]) => formData.append(name, value));
+      // The file must be the last field of the form
       formData.append('file', blob, `photo_${eventId}.jpg`);
+      const storageResponse = await fetch(ticket.url, { method: 'POST', body: formData });
+      if (!storageResponse.ok) {
+        console.error('Photo upload to storage failed:', storageResponse.status);
+        return false;
+      }
 
-      const response = await fetch(`${config.baseUrl}/attendance/events/${eventId}/photo`, {
+      // 2. Link the stored object to the event
+      const response = await fetch(`${eventUrl}/confirm`, {
         method: 'POST',
-        headers: {
-          'X-Device-Key': config.deviceKey
-        },
-        body: formData
+        headers,
+        body: JSON.stringify({ key: ticket.key })
       });
 
       if (response.ok) {
@@ -237,11 +237,21 @@ const API = Object.assign(createApiClient('webAppConfig'), {
   // ==================== Super Admin API ====================
 
   /**
-   * List all tenants (super admin only)
+   * List tenants, one page at a time (super admin only)
+   * @param {boolean|Object} options - includeInactive flag, or { includeInactive, sort, order, cursor, limit }
+   * @returns {Promise<{items: Array, total: number, next_cursor: string|null}>}
    */
-  async listTenants(includeInactive = false) {
-    const params = includeInactive ? '?include_inactive=true' : '';
-    const response = await this.request(`/super-admin/tenants${params}`);
+  async listTenants(options = false) {
+    const { includeInactive = false, sort, order, cursor, limit } =
+      typeof options === 'object' && options !== null ? options : { includeInactive: Boolean(options) };
+    const params = new URLSearchParams();
+    if (includeInactive) params.set('include_inactive', 'true');
+    if (sort) params.set('sort', sort);
+    if (order) params.set('order', order);
+    if (cursor) params.set('cursor', cursor);
+    if (limit) params.set('limit', String(limit));
+    const query = params.toString();
+    const response = await this.request(`/super-admin/tenants${query ? `?${query}` : ''}`);
     if (!response.ok) {
       throw new Error('No se pudo obtener tenants');
     }
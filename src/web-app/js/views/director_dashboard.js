@@ -233,7 +233,7 @@ Views.directorDashboard = function() {
           <div class="card-body">
             <strong>${student.full_name}</strong> - ${Components.formatTime(e.ts)}
             <div style="margin-top: 0.5rem;">
-              <img src="assets/placeholder_photo.svg" alt="Foto" style="max-width: 200px; border-radius: 4px;">
+              <img src="${e.photo_thumb_url || 'assets/placeholder_photo.svg'}" alt="Foto" loading="lazy" style="max-width: 200px; border-radius: 4px;">
             </div>
           </div>
         </div>
@@ -21,7 +21,8 @@ Views.parentPrefs = async function() {
     INGRESO_OK: { whatsapp: true, email: false },
     SALIDA_OK: { whatsapp: true, email: false },
     NO_INGRESO_UMBRAL: { whatsapp: true, email: true },
-    CAMBIO_HORARIO: { whatsapp: true, email: true }
+    CAMBIO_HORARIO: { whatsapp: true, email: true },
+    RESUMEN_DIARIO: { whatsapp: false, email: false }
   };
 
   let prefs = { ...defaultPrefs };
@@ -49,7 +50,8 @@ Views.parentPrefs = async function() {
     { key: 'INGRESO_OK', label: 'Ingreso registrado', desc: 'Cuando su hijo/a ingresa al colegio', icon: '📥' },
     { key: 'SALIDA_OK', label: 'Salida registrada', desc: 'Cuando su hijo/a sale del colegio', icon: '📤' },
     { key: 'NO_INGRESO_UMBRAL', label: 'Alerta de no ingreso', desc: 'Si no registra ingreso antes del horario límite', icon: '⚠️' },
-    { key: 'CAMBIO_HORARIO', label: 'Cambios de horario', desc: 'Modificaciones en el horario de clases', icon: '📅' }
+    { key: 'CAMBIO_HORARIO', label: 'Cambios de horario', desc: 'Modificaciones en el horario de clases', icon: '📅' },
+    { key: 'RESUMEN_DIARIO', label: 'Resumen diario', desc: 'Un solo mensaje al final del día en vez de avisos por cada ingreso y salida', icon: '🗓️' }
   ];
 
   content.innerHTML = `
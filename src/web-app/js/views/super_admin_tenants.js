@@ -13,19 +13,27 @@ Views.superAdminTenants = async function() {
   let tenants = [];
   let filterStatus = 'all';
   let searchQuery = '';
+  let sortBy = 'name';
+  let nextCursor = null;
 
-  async function loadTenants() {
-    try {
-      const filters = {};
-      if (filterStatus !== 'all') {
-        filters.isActive = filterStatus === 'active';
-      }
-      if (searchQuery) {
-        filters.search = searchQuery;
-      }
+  const SORT_OPTIONS = {
+    name: { label: 'Nombre', order: 'asc' },
+    student_count: { label: 'Más alumnos activos', order: 'desc' },
+    created_at: { label: 'Más recientes', order: 'desc' },
+  };
 
-      const data = await SuperAdminAPI.listTenants(filters);
-      tenants = data.items || data.tenants || data || [];
+  // Pages are fetched with the cursor of the previous one; append=false starts over
+  async function loadTenants(append = false) {
+    try {
+      const data = await SuperAdminAPI.listTenants({
+        includeInactive: true,
+        sort: sortBy,
+        order: SORT_OPTIONS[sortBy].order,
+        cursor: append ? nextCursor : null,
+      });
+      const page = data.items || data.tenants || data || [];
+      tenants = append ? tenants.concat(page) : page;
+      nextCursor = data.next_cursor || null;
       renderTenants();
     } catch (error) {
       content.innerHTML = `
@@ -51,6 +59,11 @@ Views.superAdminTenants = async function() {
         <div class="search-box">
           <input type="text" id="searchInput" placeholder="Buscar por nombre o slug..." value="${Components.escapeHtml(searchQuery)}">
         </div>
+        <select id="sortSelect" class="sort-select">
+          ${Object.entries(SORT_OPTIONS).map(([value, option]) => `
+            <option value="${value}" ${sortBy === value ? 'selected' : ''}>Ordenar: ${option.label}</option>
+          `).join('')}
+        </select>
         <div class="filter-buttons">
           <button class="btn btn-sm ${filterStatus === 'all' ? 'btn-primary' : 'btn-secondary'}" onclick="setFilter('all')">Todos</button>
           <button class="btn btn-sm ${filterStatus === 'active' ? 'btn-primary' : 'btn-secondary'}" onclick="setFilter('active')">Activos</button>
@@ -65,7 +78,7 @@ Views.superAdminTenants = async function() {
               <th>Nombre</th>
               <th>Dominio</th>
               <th>Plan</th>
-              <th>Alumnos</th>
+              <th>Alumnos activos</th>
               <th>Estado</th>
               <th>Creado</th>
               <th>Acciones</th>
@@ -108,6 +121,11 @@ Views.superAdminTenants = async function() {
           </tbody>
         </table>
       </div>
+      ${nextCursor ? `
+        <div class="load-more">
+          <button class="btn btn-secondary" onclick="loadMoreTenants()">Cargar más</button>
+        </div>
+      ` : ''}
 
       <style>
         .filters-bar {
@@ -130,6 +148,16 @@ Views.superAdminTenants = async function() {
           display: flex;
           gap: 0.5rem;
         }
+        .sort-select {
+          padding: 0.5rem;
+          border: 1px solid var(--border-color, #e5e7eb);
+          border-radius: 6px;
+        }
+        .load-more {
+          display: flex;
+          justify-content: center;
+          margin-top: 1rem;
+        }
         .tenant-link {
           color: var(--primary, #3b82f6);
           text-decoration: none;
@@ -161,8 +189,15 @@ Views.superAdminTenants = async function() {
         loadTenants();
       }, 300);
     });
+
+    document.getElementById('sortSelect').addEventListener('change', (e) => {
+      sortBy = e.target.value;
+      loadTenants();
+    });
   }
 
+  window.loadMoreTenants = () => loadTenants(true);
+
   // Global functions for this view
   window.setFilter = (status) => {
     filterStatus = status;
@@ -13,6 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 # Skip tenant middleware in tests (uses SQLite, not PostgreSQL)
 os.environ.setdefault("SKIP_TENANT_MIDDLEWARE", "true")
+# No usage_stats table (public schema) in the SQLite test database
+os.environ.setdefault("USAGE_METER_ENABLED", "false")
 
 from app.db.base import Base
 from app.db.models.student import Student
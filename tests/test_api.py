@@ -123,7 +123,7 @@ def test_notifications_summary_endpoint(client):
     app, overrides = client
 
     class FakeNotificationService:
-        async def summary(self):
+        async def summary(self, window="today"):
             return NotificationSummaryResponse(
                 total=2,
                 by_status={"sent": 2},
@@ -139,6 +139,9 @@ def test_notifications_summary_endpoint(client):
         assert resp.status_code == 200
         assert resp.json()["total"] == 2
 
+        resp = test_client.get("/api/v1/notifications/summary?window=1y")
+        assert resp.status_code == 422
+
 
 def test_absences_list_endpoint(client):
     app, overrides = client
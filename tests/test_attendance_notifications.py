@@ -143,7 +143,7 @@ class TestAttendanceNotificationService:
         await db_session.flush()
 
         with patch.object(
-            AttendanceNotificationService, "_enqueue_notification"
+            AttendanceNotificationService, "_enqueue_deliveries"
         ) as mock_enqueue:
             service = AttendanceNotificationService(db_session)
             notification_ids = await service.notify_attendance_event(event)
@@ -177,7 +177,7 @@ class TestAttendanceNotificationService:
         await db_session.flush()
 
         with patch.object(
-            AttendanceNotificationService, "_enqueue_notification"
+            AttendanceNotificationService, "_enqueue_deliveries"
         ) as mock_enqueue:
             service = AttendanceNotificationService(db_session)
             notification_ids = await service.notify_attendance_event(event)
@@ -220,7 +220,7 @@ class TestAttendanceNotificationService:
         await db_session.flush()
 
         with patch.object(
-            AttendanceNotificationService, "_enqueue_notification"
+            AttendanceNotificationService, "_enqueue_deliveries"
         ) as mock_enqueue:
             service = AttendanceNotificationService(db_session)
             notification_ids = await service.notify_attendance_event(event)
@@ -272,7 +272,7 @@ class TestAttendanceNotificationService:
 
         with patch.object(
             AttendanceNotificationService,
-            "_enqueue_notification",
+            "_enqueue_deliveries",
             side_effect=capture_enqueue,
         ):
             service = AttendanceNotificationService(db_session)
@@ -327,7 +327,7 @@ class TestAttendanceNotificationService:
 
         with patch.object(
             AttendanceNotificationService,
-            "_enqueue_notification",
+            "_enqueue_deliveries",
             side_effect=capture_enqueue,
         ):
             service = AttendanceNotificationService(db_session)
@@ -401,7 +401,7 @@ class TestAttendanceNotificationService:
 
         with patch.object(
             AttendanceNotificationService,
-            "_enqueue_notification",
+            "_enqueue_deliveries",
             side_effect=capture_enqueue,
         ):
             service = AttendanceNotificationService(db_session)
@@ -423,3 +423,57 @@ class TestAttendanceNotificationService:
             assert payload["type"] == "IN"
             assert payload["date"] == "15/03/2024"
             assert payload["time"] == "08:30"
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_planned_inserted_and_enqueued_once(
+        self,
+        db_session: AsyncSession,
+        sample_student: Student,
+        sample_guardian: Guardian,
+    ):
+        """All channels and devices go through one insert and one pipelined enqueue."""
+        from app.db.models.push_subscription import PushSubscription
+
+        sample_guardian.contacts = {"whatsapp": "+56911112222", "email": "g@example.com"}
+        sample_guardian.notification_prefs = {"INGRESO_OK": {"whatsapp": True, "email": True, "push": True}}
+        db_session.add_all(
+            [
+                PushSubscription(guardian_id=sample_guardian.id, endpoint="https://push/a", p256dh="k", auth="a"),
+                PushSubscription(guardian_id=sample_guardian.id, endpoint="https://push/b", p256dh="k", auth="a"),
+                PushSubscription(
+                    guardian_id=sample_guardian.id, endpoint="https://push/old", p256dh="k", auth="a",
+                    is_active=False,
+                ),
+            ]
+        )
+        event = AttendanceEvent(
+            student_id=sample_student.id,
+            type="IN",
+            gate_id="GATE-A",
+            device_id="DEV-01",
+            occurred_at=datetime.utcnow(),
+        )
+        db_session.add(event)
+        await db_session.flush()
+
+        queue = MagicMock()
+        with patch("app.services.attendance_notification_service.settings") as mock_settings, \
+             patch.object(AttendanceNotificationService, "queue", queue):
+            mock_settings.vapid_public_key = "pub"
+            mock_settings.vapid_private_key = "priv"
+            mock_settings.notification_coalesce_seconds = 0
+            service = AttendanceNotificationService(db_session, tenant_id=5)
+            notification_ids = await service.notify_attendance_event(event, student=sample_student)
+
+        # WhatsApp + email + two active devices
+        assert len(notification_ids) == 4
+        queue.enqueue_many.assert_called_once()
+        jobs = queue.enqueue_many.call_args.args[0]
+        assert [job.func for job in jobs] == [
+            "app.workers.jobs.send_whatsapp.send_whatsapp_message",
+            "app.workers.jobs.send_email.send_email_message",
+            "app.workers.jobs.send_push.send_push_batch",
+        ]
+        push_batch = jobs[-1].args[0]
+        assert [n["subscription_info"]["endpoint"] for n in push_batch] == ["https://push/a", "https://push/b"]
+        assert jobs[0].args[4] == 5
@@ -0,0 +1,98 @@
+"""Tests for SQL-side broadcast audience resolution and segment caching."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.db.models.guardian import Guardian
+from app.db.models.push_subscription import PushSubscription
+from app.db.repositories.guardians import GuardianRepository
+from app.services.audience_cache import AudienceSegmentCache
+
+
+class DictRedis:
+    """Minimal Redis stand-in for GET/SETEX/INCR."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+
+class TestAudienceQueries:
+    @pytest.mark.asyncio
+    async def test_course_and_grade_audiences_are_distinct(self, db_session, sample_student, sample_guardian):
+        repo = GuardianRepository(db_session)
+        # Unlinked guardian must not be included
+        db_session.add(Guardian(full_name="Otro", contacts={}, notification_prefs={}))
+        await db_session.flush()
+
+        by_course = await repo.list_audience_ids(repo.audience_for_courses([sample_student.course_id]))
+        by_grade = await repo.list_audience_ids(repo.audience_for_grades(["1° Básico"]))
+        everyone = await repo.list_audience_ids(repo.audience_all())
+
+        assert by_course == [sample_guardian.id]
+        assert by_grade == [sample_guardian.id]
+        assert len(everyone) == 2
+
+    @pytest.mark.asyncio
+    async def test_channel_counts(self, db_session, sample_guardian):
+        db_session.add_all(
+            [
+                Guardian(full_name="Solo email", contacts={"email": "a@b.cl"}, notification_prefs={}),
+                Guardian(full_name="Vacío", contacts={"whatsapp": ""}, notification_prefs={}),
+                PushSubscription(
+                    guardian_id=sample_guardian.id, endpoint="https://push/1", p256dh="k", auth="a"
+                ),
+                PushSubscription(
+                    guardian_id=sample_guardian.id, endpoint="https://push/2", p256dh="k", auth="a"
+                ),
+            ]
+        )
+        await db_session.flush()
+        repo = GuardianRepository(db_session)
+
+        counts = await repo.count_audience_channels(repo.audience_all())
+
+        assert counts == {"total": 3, "whatsapp": 1, "email": 2, "push": 1}
+
+
+class TestAudienceSegmentCache:
+    def test_version_bump_invalidates_segments(self):
+        redis_client = DictRedis()
+        cache = AudienceSegmentCache(redis_client, "tenant_demo")
+
+        cache.set("global:ids", [1, 2, 3])
+        assert cache.get("global:ids") == [1, 2, 3]
+
+        redis_client.incr("audience:version:tenant_demo")
+        assert cache.get("global:ids") is None
+
+    def test_tenants_are_isolated(self):
+        redis_client = DictRedis()
+        AudienceSegmentCache(redis_client, "tenant_a").set("global:ids", [1])
+        assert AudienceSegmentCache(redis_client, "tenant_b").get("global:ids") is None
+
+    @pytest.mark.asyncio
+    async def test_commit_touching_guardians_bumps_version(self, db_session):
+        with patch("app.services.audience_cache.bump_audience_version") as mock_bump:
+            db_session.add(Guardian(full_name="Nuevo", contacts={}, notification_prefs={}))
+            await db_session.commit()
+
+        mock_bump.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_commit_changing_a_course_grade_bumps_version(self, db_session, sample_course):
+        await db_session.commit()
+        with patch("app.services.audience_cache.bump_audience_version") as mock_bump:
+            sample_course.grade = "2° Básico"
+            await db_session.commit()
+
+        mock_bump.assert_called_once()
@@ -0,0 +1,114 @@
+"""Tests for the chunked bulk broadcast pipeline."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.guardian import Guardian
+from app.db.models.notification import Notification
+from app.db.repositories.guardians import GuardianRepository
+from app.db.repositories.notifications import NotificationRepository
+from app.services.notifications.broadcast_progress import BroadcastProgress
+from app.workers.jobs import process_broadcast
+
+
+class TestBulkRepositories:
+    @pytest.mark.asyncio
+    async def test_bulk_create_returns_ids_in_order(self, db_session, sample_guardian):
+        repo = NotificationRepository(db_session)
+        rows = [
+            {"guardian_id": sample_guardian.id, "channel": ch, "template": "CAMBIO_HORARIO", "payload": {}}
+            for ch in ("WHATSAPP", "EMAIL", "WHATSAPP")
+        ]
+
+        ids = await repo.bulk_create(rows)
+
+        assert len(ids) == 3 and ids == sorted(ids)
+        stored = {n.id: n for n in (await db_session.execute(select(Notification))).scalars()}
+        assert [stored[i].channel for i in ids] == ["WHATSAPP", "EMAIL", "WHATSAPP"]
+        assert all(stored[i].status == "queued" for i in ids)
+
+    @pytest.mark.asyncio
+    async def test_list_contacts(self, db_session, sample_guardian):
+        contacts = await GuardianRepository(db_session).list_contacts([sample_guardian.id, 9999])
+        assert contacts == [(sample_guardian.id, sample_guardian.contacts)]
+
+
+class TestProcessBroadcast:
+    @pytest.mark.asyncio
+    async def test_chunks_are_bulk_inserted_and_pipelined(self, db_session, monkeypatch):
+        guardians = [
+            Guardian(full_name=f"G{i}", contacts={"whatsapp": f"+5691111{i:04d}"}, notification_prefs={})
+            for i in range(5)
+        ]
+        guardians.append(Guardian(full_name="Sin contacto", contacts={}, notification_prefs={}))
+        db_session.add_all(guardians)
+        await db_session.flush()
+
+        @asynccontextmanager
+        async def fake_scope(schema_name):
+            yield db_session
+
+        monkeypatch.setattr(process_broadcast, "tenant_session_scope", fake_scope)
+        monkeypatch.setattr(process_broadcast, "BROADCAST_CHUNK_SIZE", 4)
+        progress = MagicMock(spec=BroadcastProgress)
+
+        with patch.object(process_broadcast, "Redis"), \
+             patch.object(process_broadcast, "Queue") as mock_queue_cls, \
+             patch.object(process_broadcast, "BroadcastProgress", return_value=progress):
+            mock_queue_cls.prepare_data.side_effect = lambda func, args: (func, args)
+            await process_broadcast._process(
+                {
+                    "job_id": "abc123",
+                    "guardian_ids": [g.id for g in guardians],
+                    "payload": {"message": "Hola", "subject": "Aviso", "template": "CAMBIO_HORARIO"},
+                    "tenant_id": 7,
+                }
+            )
+
+        # Two chunks -> two pipelined enqueue_many calls, one job per reachable guardian
+        enqueue_many = mock_queue_cls.return_value.enqueue_many
+        assert enqueue_many.call_count == 2
+        jobs = [job for call in enqueue_many.call_args_list for job in call.args[0]]
+        assert len(jobs) == 5
+        func, args = jobs[0]
+        assert func == "app.workers.jobs.send_whatsapp.send_whatsapp_message"
+        assert args[2] == "CAMBIO_HORARIO"
+        assert args[3]["broadcast_id"] == "abc123"
+        assert args[4] == 7
+
+        notifications = (await db_session.execute(select(Notification))).scalars().all()
+        assert len(notifications) == 5
+        progress.incr.assert_any_call("abc123", total=1, queued=1, skipped=1)
+        progress.set_status.assert_called_with("abc123", "completed")
+
+
+class TestBroadcastStatus:
+    def test_progress_roundtrip_and_tenant_check(self):
+        from app.services.broadcast_service import BroadcastService
+
+        store: dict = {}
+        redis_client = MagicMock()
+        redis_client.hgetall.side_effect = lambda key: store.get(key, {})
+        pipe = MagicMock()
+        redis_client.pipeline.return_value = pipe
+        pipe.hset.side_effect = lambda key, mapping: store.setdefault(key, {}).update(
+            {k.encode(): str(v).encode() for k, v in mapping.items()}
+        )
+
+        with patch("app.services.broadcast_service.Redis") as mock_redis_cls:
+            mock_redis_cls.from_url.return_value = redis_client
+            service = BroadcastService(MagicMock(), tenant_id=3)
+            other = BroadcastService(MagicMock(), tenant_id=4)
+
+        service.progress.start("job1", tenant_id=3, guardians=10)
+
+        status = service.get_broadcast_status("job1")
+        assert status.status == "queued"
+        assert status.guardians == 10
+        with pytest.raises(ValueError):
+            other.get_broadcast_status("job1")
+        with pytest.raises(ValueError):
+            service.get_broadcast_status("missing")
@@ -111,8 +111,8 @@ class TestR2B3NPlus1Queries:
             "Cada estudiante genera una query individual. " \
             "Debe usar batch query: get_student_ids_with_in_event_on_date()"
 
-        # Verify fix is in place
-        assert "get_student_ids_with_in_event_on_date" in source, \
+        # Verify fix is in place (batch lookup, or the set-based INSERT ... SELECT)
+        assert "get_student_ids_with_in_event_on_date" in source or "insert_missing" in source, \
             "R2-B3 fix not found: Should use batch query get_student_ids_with_in_event_on_date()"
 
 
@@ -0,0 +1,149 @@
+"""Tests for the materialized effective-schedule calendar."""
+
+from datetime import date, datetime, time, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.db.models.absence_request import AbsenceRequest
+from app.db.models.course import Course
+from app.db.models.schedule import Schedule
+from app.db.models.schedule_exception import ScheduleException
+from app.services.attendance_service import AttendanceService
+from app.services.calendar_service import CalendarService
+from app.services.dashboard_service import DashboardService
+
+
+MONDAY = date(2024, 3, 18)
+
+
+async def _approved_absence(db_session, student_id, start, end, status="APPROVED"):
+    absence = AbsenceRequest(
+        student_id=student_id,
+        type="SICK",
+        start_date=start,
+        end_date=end,
+        status=status,
+        ts_submitted=datetime(2024, 3, 1, tzinfo=timezone.utc),
+    )
+    db_session.add(absence)
+    await db_session.flush()
+    return absence
+
+
+class TestEffectiveDays:
+    @pytest.mark.asyncio
+    async def test_exceptions_move_or_suspend_the_entry(self, db_session, sample_schedule, sample_course):
+        other = Course(name="2° Básico A", grade="2° Básico")
+        third = Course(name="3° Básico A", grade="3° Básico")
+        db_session.add_all([other, third])
+        await db_session.flush()
+        db_session.add_all([
+            Schedule(course_id=other.id, weekday=0, in_time=time(8, 0), out_time=time(13, 0)),
+            Schedule(course_id=third.id, weekday=0, in_time=time(8, 0), out_time=time(13, 0)),
+            # Whole school starts late, the second course has no class at all
+            ScheduleException(scope="GLOBAL", date=MONDAY, in_time=time(10, 0), reason="Acto"),
+            ScheduleException(scope="COURSE", course_id=other.id, date=MONDAY, in_time=None, reason="Salida"),
+            # Another day: ignored
+            ScheduleException(scope="GLOBAL", date=MONDAY + timedelta(days=7), in_time=None, reason="Feriado"),
+        ])
+        await db_session.flush()
+
+        calendar = CalendarService(db_session)
+
+        assert await calendar.entry_times(MONDAY) == {sample_course.id: time(10, 0), third.id: time(10, 0)}
+        assert await calendar.entry_times(MONDAY + timedelta(days=1)) == {}
+        days = await calendar.get_days(MONDAY, MONDAY)
+        assert days[(other.id, MONDAY)].is_school_day is False
+        assert days[(sample_course.id, MONDAY)].out_time == time(13, 30)
+
+    @pytest.mark.asyncio
+    async def test_days_are_materialized_once(self, db_session, sample_schedule, sample_course):
+        calendar = CalendarService(db_session)
+
+        days = await calendar.get_days(MONDAY, MONDAY + timedelta(days=6))
+        # Every date has a row, with class only on Monday
+        assert len(days) == 7
+        assert [key[1] for key, day in days.items() if day.is_school_day] == [MONDAY]
+
+        with patch.object(CalendarService, "materialize") as materialize:
+            await calendar.get_days(MONDAY, MONDAY + timedelta(days=6))
+        materialize.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reads_never_commit_the_callers_session(self, db_session, sample_schedule, sample_course):
+        calendar = CalendarService(db_session)
+        with patch.object(db_session, "commit") as commit:
+            days = await calendar.get_days(MONDAY, MONDAY + timedelta(days=6))
+
+        commit.assert_not_called()
+        assert len(days) == 7
+
+    @pytest.mark.asyncio
+    async def test_exception_changes_rebuild_their_date(self, db_session, sample_schedule, sample_course):
+        calendar = CalendarService(db_session)
+        assert await calendar.entry_times(MONDAY) == {sample_course.id: time(8, 0)}
+
+        db_session.add(ScheduleException(scope="GLOBAL", date=MONDAY, in_time=None, reason="Feriado"))
+        await db_session.flush()
+        await calendar.on_exception_changed(MONDAY, None)
+
+        assert await calendar.entry_times(MONDAY) == {}
+
+
+class TestExcusedDays:
+    @pytest.mark.asyncio
+    async def test_only_approved_absences_excuse(self, db_session, sample_schedule, sample_student):
+        await _approved_absence(db_session, sample_student.id, MONDAY, MONDAY + timedelta(days=1))
+        pending = await _approved_absence(
+            db_session, sample_student.id, MONDAY + timedelta(days=3), MONDAY + timedelta(days=3), status="PENDING"
+        )
+        calendar = CalendarService(db_session)
+        await calendar.get_days(MONDAY, MONDAY + timedelta(days=6))
+
+        assert await calendar.excused(MONDAY, MONDAY + timedelta(days=6)) == {
+            (sample_student.id, MONDAY),
+            (sample_student.id, MONDAY + timedelta(days=1)),
+        }
+
+        pending.status = "APPROVED"
+        await db_session.flush()
+        await calendar.on_absence_changed(sample_student.id, pending.start_date, pending.end_date)
+
+        assert (sample_student.id, MONDAY + timedelta(days=3)) in await calendar.excused(
+            MONDAY, MONDAY + timedelta(days=6)
+        )
+
+
+class TestConsumers:
+    NOW = datetime(2024, 3, 18, 9, 0, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_excused_students_and_holidays_raise_no_alerts(
+        self, db_session, sample_schedule, sample_student
+    ):
+        await _approved_absence(db_session, sample_student.id, MONDAY, MONDAY)
+        assert await AttendanceService(db_session).detect_no_show_alerts(self.NOW) == []
+
+        next_monday = self.NOW + timedelta(days=7)
+        db_session.add(ScheduleException(scope="GLOBAL", date=next_monday.date(), in_time=None, reason="Feriado"))
+        await db_session.flush()
+        assert await AttendanceService(db_session).detect_no_show_alerts(next_monday) == []
+
+    @pytest.mark.asyncio
+    async def test_report_skips_holidays_and_excused_students(
+        self, db_session, sample_schedule, sample_student, sample_course
+    ):
+        # Absent on both Mondays: excused on the first, holiday on the second
+        await _approved_absence(db_session, sample_student.id, MONDAY, MONDAY)
+        db_session.add(
+            ScheduleException(scope="GLOBAL", date=MONDAY + timedelta(days=7), in_time=None, reason="Feriado")
+        )
+        await db_session.flush()
+
+        report = await DashboardService(db_session).get_report(
+            start_date=MONDAY, end_date=MONDAY + timedelta(days=7), course_id=sample_course.id
+        )
+
+        assert report.courses[0].absent == 0
+        assert report.courses[0].late == 0
@@ -0,0 +1,104 @@
+"""Tests for the paginated expired-evidence cleanup."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.attendance_event import AttendanceEvent
+from app.workers.jobs import cleanup_photos
+
+
+NOW = datetime(2024, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakePhotoService:
+    def __init__(self, failing: set[str] | None = None):
+        self.failing = failing or set()
+        self.batches: list[list[str]] = []
+        self.closed = False
+
+    async def delete_photos(self, keys):
+        self.batches.append(list(keys))
+        return self.failing & set(keys)
+
+    def close(self):
+        self.closed = True
+
+
+def _event(student_id, days_ago, photo_ref=None, audio_ref=None, **variants):
+    return AttendanceEvent(
+        student_id=student_id,
+        type="IN",
+        gate_id="GATE-A",
+        device_id="DEV-01",
+        occurred_at=NOW - timedelta(days=days_ago),
+        photo_ref=photo_ref,
+        audio_ref=audio_ref,
+        **variants,
+    )
+
+
+class TestCleanupExpiredEvidence:
+    @pytest.mark.asyncio
+    async def test_pages_delete_photos_and_audio_and_keep_failures(self, db_session, sample_student):
+        events = [
+            _event(sample_student.id, 90, photo_ref="p/1.jpg", audio_ref="a/1.webm"),
+            _event(
+                sample_student.id, 80, photo_ref="p/2.jpg",
+                photo_thumb_ref="p/2.thumb.webp", photo_medium_ref="p/2.medium.webp",
+            ),
+            _event(sample_student.id, 70, audio_ref="a/3.webm"),
+            _event(sample_student.id, 65, photo_ref="p/4.jpg"),
+            # Still within the retention period
+            _event(sample_student.id, 10, photo_ref="p/5.jpg"),
+        ]
+        db_session.add_all(events)
+        await db_session.flush()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield db_session
+
+        service = FakePhotoService(failing={"p/4.jpg"})
+        with (
+            patch.object(cleanup_photos, "async_session", fake_session),
+            patch.object(cleanup_photos, "PhotoService", lambda storage: service),
+            patch.object(cleanup_photos, "tenant_storage", AsyncMock()),
+            patch.object(cleanup_photos.settings, "evidence_cleanup_page_size", 2),
+        ):
+            await cleanup_photos._cleanup_tenant(None, None, NOW - timedelta(days=60))
+
+        # Two pages of two events, one DeleteObjects request each
+        assert service.batches == [
+            ["p/1.jpg", "a/1.webm", "p/2.jpg", "p/2.thumb.webp", "p/2.medium.webp"],
+            ["a/3.webm", "p/4.jpg"],
+        ]
+        assert service.closed
+
+        rows = (
+            await db_session.execute(
+                select(
+                    AttendanceEvent.photo_ref, AttendanceEvent.photo_medium_ref, AttendanceEvent.audio_ref
+                ).order_by(AttendanceEvent.id)
+            )
+        ).all()
+        assert rows == [
+            (None, None, None),
+            (None, None, None),
+            (None, None, None),
+            ("p/4.jpg", None, None),
+            ("p/5.jpg", None, None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_keys_are_split_into_delete_objects_batches(self):
+        service = FakePhotoService(failing={"k1500"})
+        keys = [f"k{i}" for i in range(2500)]
+
+        failed = await cleanup_photos._delete_objects(service, keys)
+
+        assert [len(batch) for batch in service.batches] == [1000, 1000, 500]
+        assert failed == {"k1500"}
@@ -0,0 +1,138 @@
+"""Tests for bulk templated email through SES."""
+
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.models.notification import Notification
+from app.db.repositories.notifications import NotificationRepository
+from app.services.notifications.ses_email import SESEmailClient, _SESBulkTemplateMixin
+from app.workers.jobs import send_email_batch
+
+
+class StubSES:
+    """Local stand-in for the boto3 SES client."""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.templates: dict[str, dict] = {}
+        self.bulk_calls: list[dict] = []
+
+    def create_template(self, Template):
+        self.templates[Template["TemplateName"]] = Template
+
+    def send_bulk_templated_email(self, **kwargs):
+        self.bulk_calls.append(kwargs)
+        return {"Status": self.statuses[: len(kwargs["Destinations"])]}
+
+
+class TestTemplateCompilation:
+    def test_placeholders_become_triple_stash(self):
+        name, subject, html_part = send_email_batch.SES_TEMPLATES["CAMBIO_HORARIO"]
+        assert subject == "{{{subject}}}"
+        assert "{{{message}}}" in html_part
+        assert name.startswith("school-attendance-cambio_horario-")
+
+    def test_batches_are_split_by_fifty(self):
+        destinations = [{"notification_id": i, "to": f"g{i}@x.cl", "variables": {}} for i in range(120)]
+        jobs = send_email_batch.prepare_email_batches(
+            "CAMBIO_HORARIO", destinations, tenant_id=3, tenant_schema="tenant_alfa"
+        )
+        assert [len(job.args[1]) for job in jobs] == [50, 50, 20]
+        assert all(job.args[2:] == (3, "tenant_alfa") for job in jobs)
+
+
+class TestSendEmailBatch:
+    @pytest.mark.asyncio
+    async def test_results_map_back_to_notification_status(self, db_session, sample_guardian):
+        repo = NotificationRepository(db_session)
+        ids = await repo.bulk_create(
+            [
+                {"guardian_id": sample_guardian.id, "channel": "EMAIL", "template": "CAMBIO_HORARIO", "payload": {}}
+                for _ in range(3)
+            ]
+        )
+        await db_session.commit()
+
+        stub = StubSES(
+            [
+                {"Status": "Success", "MessageId": "m1"},
+                {"Status": "MessageRejected", "Error": "Email address is not verified"},
+                {"Status": "Success", "MessageId": "m3"},
+            ]
+        )
+        destinations = [
+            {"notification_id": nid, "to": f"g{nid}@x.cl", "variables": {"subject": "Aviso", "message": "<b>Hola</b>",
+                                                                        "broadcast_id": "job1"}}
+            for nid in ids
+        ]
+
+        schemas = []
+
+        @asynccontextmanager
+        async def fake_scope(tenant_schema):
+            schemas.append(tenant_schema)
+            yield db_session
+
+        _SESBulkTemplateMixin._known_templates.clear()
+        with patch.object(send_email_batch, "tenant_session_scope", fake_scope), \
+             patch.object(SESEmailClient, "_get_client", return_value=stub), \
+             patch.object(settings, "enable_real_notifications", True), \
+             patch.object(send_email_batch, "record_broadcast_delivery") as mock_progress:
+            await send_email_batch._send_batch("CAMBIO_HORARIO", destinations, None, "tenant_alfa", reserved=True)
+
+        # Results are written to the schema holding the notifications
+        assert schemas == ["tenant_alfa"]
+        assert len(stub.templates) == 1
+        assert len(stub.bulk_calls) == 1
+        call = stub.bulk_calls[0]
+        assert len(call["Destinations"]) == 3
+        # Values are pre-escaped; SES inserts them verbatim
+        assert "&lt;b&gt;Hola&lt;/b&gt;" in call["Destinations"][0]["ReplacementTemplateData"]
+
+        db_session.expire_all()
+        stored = {n.id: n for n in (await db_session.execute(select(Notification))).scalars()}
+        assert [stored[nid].status for nid in ids] == ["sent", "failed", "sent"]
+        assert stored[ids[0]].ts_sent is not None
+        assert stored[ids[1]].ts_sent is None
+        mock_progress.assert_any_call("job1", "sent", 2)
+        mock_progress.assert_any_call("job1", "failed", 1)
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_is_dead_lettered_instead_of_raised(self, db_session, sample_guardian):
+        ids = await NotificationRepository(db_session).bulk_create(
+            [
+                {"guardian_id": sample_guardian.id, "channel": "EMAIL", "template": "CAMBIO_HORARIO", "payload": {}}
+                for _ in range(2)
+            ]
+        )
+        await db_session.commit()
+        destinations = [{"notification_id": nid, "to": f"g{nid}@x.cl", "variables": {}} for nid in ids]
+
+        stub = StubSES([])
+        stub.send_bulk_templated_email = MagicMock(
+            side_effect=ClientError({"Error": {"Code": "InvalidParameterValue"}}, "SendBulkTemplatedEmail")
+        )
+
+        @asynccontextmanager
+        async def fake_scope(tenant_schema):
+            yield db_session
+
+        _SESBulkTemplateMixin._known_templates.clear()
+        with patch.object(send_email_batch, "tenant_session_scope", fake_scope), \
+             patch.object(SESEmailClient, "_get_client", return_value=stub), \
+             patch.object(settings, "enable_real_notifications", True), \
+             patch.object(send_email_batch, "defer_if_circuit_open", return_value=False), \
+             patch.object(send_email_batch, "record_broadcast_delivery"), \
+             patch.object(send_email_batch, "dead_letter") as mock_dead_letter:
+            await send_email_batch._send_batch("CAMBIO_HORARIO", destinations, None, None, reserved=True)
+
+        assert mock_dead_letter.call_args.kwargs["reason"] == "permanent_error"
+        assert mock_dead_letter.call_args.kwargs["notification_ids"] == ids
+        db_session.expire_all()
+        stored = {n.id: n.status for n in (await db_session.execute(select(Notification))).scalars()}
+        assert [stored[nid] for nid in ids] == ["failed", "failed"]
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.models.associations import student_guardian_table
+from app.db.models.attendance_event import AttendanceEvent
 from app.db.models.course import Course
 from app.db.models.guardian import Guardian
 from app.db.models.no_show_alert import NoShowAlert
 from app.db.models.student import Student
 from app.db.repositories.no_show_alerts import NoShowAlertRepository
+from app.services.attendance_service import AttendanceService
 
 
 # =============================================================================
@@ -372,3 +375,78 @@ class TestNoShowAlertRepository:
         course_count = next((c for c in counts if c["course_id"] == alert_course.id), None)
         if course_count:
             assert course_count["total"] >= 1
+
+
+class TestSetBasedDetection:
+    """Tests for the INSERT ... SELECT no-show pass."""
+
+    # Monday 2024-03-18, 08:20 UTC: the 08:00 course is past its 15-minute grace
+    NOW = datetime(2024, 3, 18, 8, 20, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_absent_students_get_one_alert_per_guardian(
+        self, db_session, sample_schedule, sample_student, sample_guardian, sample_course
+    ):
+        present = Student(full_name="Ana Presente", course_id=sample_course.id)
+        db_session.add(present)
+        await db_session.flush()
+        await db_session.execute(
+            student_guardian_table.insert().values(student_id=present.id, guardian_id=sample_guardian.id)
+        )
+        db_session.add(
+            AttendanceEvent(
+                student_id=present.id, type="IN", gate_id="GATE-A", device_id="DEV-01",
+                occurred_at=datetime(2024, 3, 18, 7, 55, tzinfo=timezone.utc),
+            )
+        )
+        await db_session.flush()
+
+        service = AttendanceService(db_session)
+        due = await service.detect_no_show_alerts(self.NOW)
+
+        assert [(e["student"].id, e["guardian"].id) for e in due] == [(sample_student.id, sample_guardian.id)]
+        assert due[0]["course"].id == sample_course.id
+
+        # A second pass creates nothing new; the alert is due again only
+        # after the reminder interval
+        repo = NoShowAlertRepository(db_session)
+        assert await repo.insert_missing(
+            cutoff=time(8, 5), alert_date=date(2024, 3, 18), alerted_at=self.NOW
+        ) == []
+        await repo.mark_notified_many([due[0]["alert"].id], self.NOW)
+        db_session.expire_all()
+        assert await service.detect_no_show_alerts(self.NOW + timedelta(minutes=5)) == []
+        reminders = await service.detect_no_show_alerts(self.NOW + timedelta(minutes=15))
+        assert [e["alert"].notification_attempts for e in reminders] == [1]
+
+    @pytest.mark.asyncio
+    async def test_courses_before_their_grace_period_are_skipped(
+        self, db_session, sample_schedule, sample_student
+    ):
+        service = AttendanceService(db_session)
+        assert await service.detect_no_show_alerts(datetime(2024, 3, 18, 8, 10, tzinfo=timezone.utc)) == []
+
+    @pytest.mark.asyncio
+    async def test_course_scoped_pass_ignores_other_courses(
+        self, db_session, sample_schedule, sample_student, sample_course
+    ):
+        service = AttendanceService(db_session)
+        # Course-scoped passes come from the timeline: no cutoff check
+        early = datetime(2024, 3, 18, 7, 30, tzinfo=timezone.utc)
+        assert await service.detect_no_show_alerts(early, {sample_course.id + 1}) == []
+        due = await service.detect_no_show_alerts(early, {sample_course.id})
+        assert [e["student"].id for e in due] == [sample_student.id]
+
+    @pytest.mark.asyncio
+    async def test_late_check_in_resolves_pending_alerts(
+        self, db_session, sample_schedule, sample_student
+    ):
+        service = AttendanceService(db_session)
+        [entry] = await service.detect_no_show_alerts(self.NOW)
+
+        await service.resolve_no_show_alerts([sample_student.id], datetime(2024, 3, 18, 9, 5, tzinfo=timezone.utc))
+        await db_session.refresh(entry["alert"])
+
+        assert entry["alert"].status == "RESOLVED"
+        assert entry["alert"].notes == "Ingreso registrado"
+        assert await service.detect_no_show_alerts(self.NOW + timedelta(hours=1)) == []
@@ -0,0 +1,133 @@
+"""Tests for the event-driven no-show timeline."""
+
+from contextlib import asynccontextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.core.tenant_middleware import current_tenant, current_tenant_schema
+from app.services.calendar_service import CalendarService
+from app.workers import no_show_timeline
+from app.workers.no_show_timeline import NoShowTimeline, threshold_instants
+
+
+MONDAY = date(2024, 3, 18)
+
+
+class SetRedis:
+    """Stand-in for the Redis set commands used by replan requests."""
+
+    def __init__(self):
+        self.sets: dict[str, set] = {}
+
+    def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member.encode())
+
+    def spop(self, key, count):
+        members = sorted(self.sets.pop(key, set()))
+        return members[:count]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def scheduler():
+    # Never started: jobs stay pending and can be inspected
+    return AsyncIOScheduler(timezone="UTC")
+
+
+def _plan_with(entry_times):
+    @asynccontextmanager
+    async def fake_session(schema=None):
+        yield None
+
+    return (
+        patch.object(no_show_timeline, "tenant_session_scope", fake_session),
+        patch.object(CalendarService, "entry_times", AsyncMock(return_value=entry_times)),
+    )
+
+
+class TestNoShowTimeline:
+    def test_courses_sharing_a_threshold_share_a_timer(self):
+        instants = threshold_instants(
+            MONDAY, {1: time(8, 0), 2: time(8, 0), 3: time(9, 30)}, timedelta(minutes=15)
+        )
+        assert instants == {
+            datetime(2024, 3, 18, 8, 15, tzinfo=timezone.utc): {1, 2},
+            datetime(2024, 3, 18, 9, 45, tzinfo=timezone.utc): {3},
+        }
+
+    @pytest.mark.asyncio
+    async def test_plan_arms_pending_thresholds_and_drops_cancelled_ones(self, scheduler):
+        timeline = NoShowTimeline(scheduler)
+        session_patch, repo_patch = _plan_with({1: time(8, 0), 2: time(9, 0)})
+        with session_patch, repo_patch:
+            await timeline._plan_tenant(MONDAY, 7, "tenant_norte")
+
+        jobs = {job.id: job for job in scheduler.get_jobs()}
+        assert set(jobs) == {
+            "no_show:tenant_norte:threshold:2024-03-18T08:15:00+00:00",
+            "no_show:tenant_norte:threshold:2024-03-18T09:15:00+00:00",
+        }
+        assert jobs["no_show:tenant_norte:threshold:2024-03-18T08:15:00+00:00"].args == (7, "tenant_norte", [1], False)
+
+        # Course 2 gets suspended and course 1 already fired
+        timeline._fired["tenant_norte"] = {1}
+        session_patch, repo_patch = _plan_with({1: time(8, 0)})
+        with session_patch, repo_patch:
+            await timeline._plan_tenant(MONDAY, 7, "tenant_norte")
+
+        assert scheduler.get_jobs() == []
+
+    @pytest.mark.asyncio
+    async def test_fire_evaluates_only_its_courses_and_arms_a_reminder(self, scheduler):
+        timeline = NoShowTimeline(scheduler)
+        detect = AsyncMock(return_value={1})
+        now = datetime(2024, 3, 18, 8, 15, tzinfo=timezone.utc)
+        with patch.object(no_show_timeline, "_detect_and_notify", detect), \
+             patch.object(no_show_timeline, "datetime") as mock_datetime:
+            mock_datetime.now.return_value = now
+            await timeline._fire(7, "tenant_norte", [1, 2])
+
+        detect.assert_awaited_once_with(now, 7, "tenant_norte", {1, 2})
+        assert timeline._fired["tenant_norte"] == {1, 2}
+        [reminder] = scheduler.get_jobs()
+        assert reminder.id == "no_show:tenant_norte:reminder:2024-03-18T08:30:00+00:00"
+        assert reminder.args == (7, "tenant_norte", [1], True)
+
+    @pytest.mark.asyncio
+    async def test_failed_run_does_not_arm_reminders(self, scheduler):
+        timeline = NoShowTimeline(scheduler)
+        with patch.object(no_show_timeline, "_detect_and_notify", AsyncMock(side_effect=RuntimeError("db down"))):
+            await timeline._fire(None, None, [1])
+
+        assert timeline._fired["public"] == {1}
+        assert scheduler.get_jobs() == []
+
+    @pytest.mark.asyncio
+    async def test_schedule_edits_replan_only_their_tenant(self, scheduler):
+        redis_client = SetRedis()
+        with patch.object(no_show_timeline.redis, "from_url", return_value=redis_client):
+            tenant_token = current_tenant.set(SimpleNamespace(id=7))
+            schema_token = current_tenant_schema.set("tenant_norte")
+            try:
+                no_show_timeline.request_replan()
+                no_show_timeline.request_replan()  # Same tenant: one rebuild
+            finally:
+                current_tenant.reset(tenant_token)
+                current_tenant_schema.reset(schema_token)
+            no_show_timeline.request_replan()  # Single-tenant deployment
+
+        timeline = NoShowTimeline(scheduler)
+        timeline._day = datetime.now(timezone.utc).date()
+        with patch.object(timeline, "_plan_tenant", AsyncMock()) as plan_tenant, \
+             patch.object(timeline, "plan", AsyncMock()) as plan:
+            assert await timeline.apply_replan_requests(redis_client) == 2
+            assert await timeline.apply_replan_requests(redis_client) == 0
+
+        plan.assert_not_awaited()
+        assert {call.args[1:] for call in plan_tenant.await_args_list} == {(None, None), (7, "tenant_norte")}
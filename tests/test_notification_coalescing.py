@@ -0,0 +1,194 @@
+"""Tests for attendance notification coalescing and the daily digest."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.db.models.attendance_event import AttendanceEvent
+from app.db.models.notification import Notification
+from app.schemas.notifications import NotificationType
+from app.services.attendance_notification_service import AttendanceNotificationService
+from app.services.notifications.coalescing import NotificationCoalescer, merge_events
+from app.workers import tenant_fanout
+from app.workers.jobs import send_daily_digest
+
+
+class ListRedis:
+    """Minimal Redis stand-in for list buffers and pipelines."""
+
+    def __init__(self):
+        self.lists: dict[str, list] = {}
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    def rpush(self, key, value):
+        self._ops.append(lambda: self._redis.lists.setdefault(key, []).append(value) or len(self._redis.lists[key]))
+
+    def expire(self, key, ttl):
+        self._ops.append(lambda: True)
+
+    def lrange(self, key, start, end):
+        self._ops.append(lambda: list(self._redis.lists.get(key, [])))
+
+    def delete(self, key):
+        self._ops.append(lambda: int(self._redis.lists.pop(key, None) is not None))
+
+    def execute(self):
+        return [op() for op in self._ops]
+
+
+def _entry(type_, student_id, name, time, photo=None):
+    return {
+        "type": type_,
+        "payload": {
+            "student_id": student_id,
+            "student_name": name,
+            "time": time,
+            "photo_url": photo,
+            "has_photo": photo is not None,
+        },
+    }
+
+
+class TestMergeEvents:
+    def test_repeated_scans_and_siblings_become_one_message(self):
+        merged = merge_events(
+            [
+                _entry("INGRESO_OK", 1, "Ana", "08:00", photo="https://x/1.jpg"),
+                _entry("INGRESO_OK", 1, "Ana", "08:01"),
+                _entry("INGRESO_OK", 2, "Pedro", "08:02", photo="https://x/2.jpg"),
+            ]
+        )
+
+        assert len(merged) == 1
+        notification_type, payload = merged[0]
+        assert notification_type == NotificationType.INGRESO_OK
+        assert payload["student_name"] == "Ana y Pedro"
+        assert payload["time"] == "08:02"
+        assert payload["has_photo"] is False
+        assert payload["coalesced_events"] == 3
+
+    def test_in_out_in_keeps_final_state(self):
+        merged = merge_events(
+            [
+                _entry("INGRESO_OK", 1, "Ana", "08:00"),
+                _entry("SALIDA_OK", 1, "Ana", "08:01"),
+                _entry("INGRESO_OK", 1, "Ana", "08:02", photo="https://x/3.jpg"),
+            ]
+        )
+
+        assert [(t, p["time"], p["has_photo"]) for t, p in merged] == [
+            (NotificationType.INGRESO_OK, "08:02", True)
+        ]
+
+    def test_buffer_opens_window_once_and_drains(self):
+        coalescer = NotificationCoalescer(ListRedis(), "tenant_demo", 60)
+
+        assert coalescer.add(7, NotificationType.INGRESO_OK, {"student_id": 1}) is True
+        assert coalescer.add(7, NotificationType.SALIDA_OK, {"student_id": 1}) is False
+        assert [e["type"] for e in coalescer.drain(7)] == ["INGRESO_OK", "SALIDA_OK"]
+        assert coalescer.drain(7) == []
+
+
+class TestCoalescedDelivery:
+    @pytest.mark.asyncio
+    async def test_two_scans_send_one_message(self, db_session, sample_student, sample_guardian):
+        sample_guardian.notification_prefs = {"INGRESO_OK": {"whatsapp": True}}
+        events = [
+            AttendanceEvent(
+                student_id=sample_student.id,
+                type="IN",
+                gate_id="GATE-A",
+                device_id="DEV-01",
+                occurred_at=datetime.utcnow() + timedelta(seconds=i),
+            )
+            for i in range(2)
+        ]
+        db_session.add_all(events)
+        await db_session.flush()
+
+        redis_client = ListRedis()
+        queue = MagicMock()
+        queue.connection = redis_client
+        with patch.object(AttendanceNotificationService, "queue", queue):
+            service = AttendanceNotificationService(db_session, tenant_id=3, tenant_schema="tenant_demo")
+            for event in events:
+                assert await service.notify_attendance_event(event, student=sample_student) == []
+
+            queue.enqueue_in.assert_called_once()
+            assert queue.enqueue_in.call_args.args[2:] == (sample_guardian.id, 3, "tenant_demo")
+
+            entries = NotificationCoalescer(redis_client, "tenant_demo", 60).drain(sample_guardian.id)
+            notification_ids = await service.deliver_coalesced(sample_guardian.id, entries)
+
+        assert len(notification_ids) == 1
+        queue.enqueue_many.assert_called_once()
+
+
+class TestDailyDigest:
+    @pytest.mark.asyncio
+    async def test_digest_replaces_per_event_messages(self, db_session, sample_student, sample_guardian):
+        sample_guardian.notification_prefs = {
+            "INGRESO_OK": {"whatsapp": True},
+            "RESUMEN_DIARIO": {"whatsapp": True, "email": False},
+        }
+        day = datetime(2024, 3, 15)
+        events = [
+            AttendanceEvent(
+                student_id=sample_student.id, type=type_, gate_id="G", device_id="D", occurred_at=at
+            )
+            for type_, at in (("IN", day.replace(hour=8, minute=5)), ("OUT", day.replace(hour=15, minute=30)))
+        ]
+        db_session.add_all(events)
+        await db_session.flush()
+
+        with patch.object(AttendanceNotificationService, "_enqueue_deliveries") as mock_enqueue:
+            service = AttendanceNotificationService(db_session)
+            assert await service.notify_attendance_event(events[0], student=sample_student) == []
+            mock_enqueue.assert_not_called()
+
+        @asynccontextmanager
+        async def fake_scope(schema_name):
+            yield db_session
+
+        with patch.object(send_daily_digest, "tenant_session_scope", fake_scope), \
+             patch.object(send_daily_digest, "Redis"), \
+             patch.object(send_daily_digest, "Queue") as mock_queue_cls:
+            mock_queue_cls.prepare_data.side_effect = lambda func, args: (func, args)
+            await send_daily_digest._send_digests(day.date(), tenant_id=3)
+
+        jobs = mock_queue_cls.return_value.enqueue_many.call_args.args[0]
+        assert len(jobs) == 1
+        func, args = jobs[0]
+        assert func == "app.workers.jobs.send_whatsapp.send_whatsapp_message"
+        assert args[2] == "RESUMEN_DIARIO"
+        assert args[3]["summary"] == f"{sample_student.full_name}: ingreso 08:05, salida 15:30"
+
+        stored = (await db_session.execute(select(Notification))).scalars().all()
+        assert [n.template for n in stored] == ["RESUMEN_DIARIO"]
+
+
+@pytest.mark.asyncio
+async def test_digest_runs_for_every_tenant_schema():
+    tenants = [(1, "alfa", "tenant_alfa"), (2, "beta", "tenant_beta")]
+    day = datetime(2024, 3, 15).date()
+
+    with patch.object(tenant_fanout, "list_active_tenants", AsyncMock(return_value=tenants)), \
+         patch.object(tenant_fanout, "_record_metrics"), \
+         patch.object(send_daily_digest, "_send_digests", AsyncMock()) as send:
+        await send_daily_digest._send_all_digests(day)
+
+    assert sorted(call.args for call in send.await_args_list) == [
+        (day, 1, "tenant_alfa"),
+        (day, 2, "tenant_beta"),
+    ]
@@ -0,0 +1,91 @@
+"""Tests for the student_id column and keyset-paginated notification history."""
+
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app import main
+from app.core import deps
+from app.core.auth import AuthUser
+from app.db.repositories.notifications import NotificationRepository
+from app.services.notification_service import NotificationService, decode_cursor, encode_cursor
+
+
+class TestNotificationHistory:
+    @pytest.mark.asyncio
+    async def test_keyset_pages_cover_every_row_once(self, db_session, sample_guardian, sample_student):
+        repo = NotificationRepository(db_session)
+        ts = datetime(2024, 3, 15, 8, 0, tzinfo=timezone.utc)
+        for minute in range(5):
+            notification = await repo.create(
+                guardian_id=sample_guardian.id, channel="WHATSAPP", template="INGRESO_OK",
+                payload={"student_id": sample_student.id}, student_id=sample_student.id,
+            )
+            # Two rows share each timestamp: the id breaks the tie
+            notification.ts_created = ts + timedelta(minutes=minute // 2)
+        await repo.create(guardian_id=sample_guardian.id, channel="EMAIL", template="INGRESO_OK", payload={})
+        await db_session.commit()
+
+        service = NotificationService(db_session)
+        seen, before = [], None
+        while True:
+            page = await service.list_notifications(student_id=sample_student.id, before=before, limit=2)
+            seen.extend(log.id for log in page)
+            if len(page) < 2:
+                break
+            before = decode_cursor(encode_cursor(page[-1].ts_created, page[-1].id))
+
+        assert len(seen) == len(set(seen)) == 5
+        assert all(log.student_id == sample_student.id for log in page)
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_stores_student_id(self, db_session, sample_guardian, sample_student):
+        repo = NotificationRepository(db_session)
+        ids = await repo.bulk_create(
+            [
+                {"guardian_id": sample_guardian.id, "channel": "WHATSAPP", "template": "INGRESO_OK",
+                 "payload": {}, "student_id": sample_student.id},
+                {"guardian_id": sample_guardian.id, "channel": "WHATSAPP", "template": "CAMBIO_HORARIO",
+                 "payload": {}},
+            ]
+        )
+        await db_session.commit()
+
+        assert [(await repo.get(nid)).student_id for nid in ids] == [sample_student.id, None]
+
+    @pytest.mark.asyncio
+    async def test_endpoint_pages_follow_next_cursor(self, db_session, sample_guardian):
+        repo = NotificationRepository(db_session)
+        for _ in range(5):
+            await repo.create(guardian_id=sample_guardian.id, channel="WHATSAPP", template="INGRESO_OK", payload={})
+        await db_session.commit()
+
+        app = main.app
+        app.dependency_overrides[deps.get_current_user] = lambda: AuthUser(
+            id=1, role="DIRECTOR", full_name="Dir", guardian_id=None
+        )
+        app.dependency_overrides[deps.get_notification_service] = lambda: NotificationService(db_session)
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                seen, url = [], "/api/v1/notifications?limit=2"
+                while True:
+                    resp = await client.get(url)
+                    assert resp.status_code == 200
+                    seen.extend(log["id"] for log in resp.json())
+                    cursor = resp.headers.get("X-Next-Cursor")
+                    if cursor is None:
+                        break
+                    # Pasted into the query string as is, without encoding
+                    assert quote(cursor, safe="") == cursor
+                    url = f"/api/v1/notifications?limit=2&cursor={cursor}"
+        finally:
+            app.dependency_overrides.pop(deps.get_current_user, None)
+            app.dependency_overrides.pop(deps.get_notification_service, None)
+
+        assert len(seen) == len(set(seen)) == 5
+
+    def test_malformed_cursor_is_rejected(self):
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
@@ -0,0 +1,117 @@
+"""Tests for per-tenant outbound notification rate limiting."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services.notifications import rate_limit
+from app.services.notifications.rate_limit import (
+    NotificationRateLimiter,
+    defer_if_rate_limited,
+    provider_throttle_delay,
+    resolve_rate_per_minute,
+)
+
+
+def _memory_limiter() -> NotificationRateLimiter:
+    limiter = NotificationRateLimiter(redis_client=MagicMock())
+    limiter._redis_available = False
+    return limiter
+
+
+class TestNotificationRateLimiter:
+    def test_burst_then_deferred(self):
+        """Bucket allows a burst, then returns increasing delays."""
+        limiter = _memory_limiter()
+        with patch.object(rate_limit.settings, "notification_rate_burst_seconds", 10):
+            # 60/min with 10s burst -> capacity 10
+            delays = [limiter.reserve(1, "WHATSAPP", 60) for _ in range(12)]
+
+        assert delays[:10] == [0.0] * 10
+        assert delays[10] == pytest.approx(1.0, abs=0.05)
+        assert delays[11] == pytest.approx(2.0, abs=0.05)
+
+    def test_tenants_have_independent_buckets(self):
+        """A tenant draining its bucket must not delay another tenant."""
+        limiter = _memory_limiter()
+        for _ in range(20):
+            limiter.reserve(1, "WHATSAPP", 6)
+
+        assert limiter.reserve(1, "WHATSAPP", 6) > 0
+        assert limiter.reserve(2, "WHATSAPP", 6) == 0.0
+        assert limiter.reserve(1, "EMAIL", 6) == 0.0
+
+    def test_zero_rate_is_unlimited(self):
+        limiter = _memory_limiter()
+        assert all(limiter.reserve(1, "EMAIL", 0) == 0.0 for _ in range(100))
+
+    def test_redis_script_result_is_parsed(self):
+        """Redis path returns the Lua string delay as float."""
+        mock_redis = MagicMock()
+        mock_redis.register_script.return_value = MagicMock(return_value="2.5")
+        limiter = NotificationRateLimiter(redis_client=mock_redis)
+
+        assert limiter.reserve(7, "WHATSAPP", 60) == 2.5
+        keys = mock_redis.register_script.return_value.call_args.kwargs["keys"]
+        assert keys == ["notif:ratelimit:7:WHATSAPP"]
+
+
+class TestResolveRate:
+    def test_tenant_override_wins(self):
+        config = SimpleNamespace(whatsapp_rate_per_minute=5, email_rate_per_minute=None)
+        assert resolve_rate_per_minute(config, "WHATSAPP") == 5
+
+    def test_falls_back_to_settings(self):
+        config = SimpleNamespace(whatsapp_rate_per_minute=None, email_rate_per_minute=None)
+        assert resolve_rate_per_minute(config, "EMAIL") == rate_limit.settings.email_rate_per_minute
+        assert resolve_rate_per_minute(None, "WHATSAPP") == rate_limit.settings.whatsapp_rate_per_minute
+
+
+class TestDeferral:
+    @pytest.mark.asyncio
+    async def test_over_limit_job_is_rescheduled(self):
+        """Over-limit sends are re-enqueued with reserved=True, not failed."""
+        limiter = MagicMock()
+        limiter.reserve.return_value = 4.0
+        job = MagicMock(origin="notifications")
+
+        with patch.object(rate_limit, "get_rate_limiter", return_value=limiter), \
+             patch("rq.get_current_job", return_value=job), \
+             patch("rq.Queue") as mock_queue_cls:
+            deferred = await defer_if_rate_limited(
+                3, "WHATSAPP", None, "app.workers.jobs.send_whatsapp.send_whatsapp_message",
+                10, "+56911112222", "INGRESO_OK", {}, 3,
+            )
+
+        assert deferred is True
+        mock_queue_cls.assert_called_once_with("notifications", connection=job.connection)
+        args, kwargs = mock_queue_cls.return_value.enqueue_in.call_args
+        assert args[0].total_seconds() == 4.0
+        assert args[1] == "app.workers.jobs.send_whatsapp.send_whatsapp_message"
+        assert kwargs == {"reserved": True}
+
+    @pytest.mark.asyncio
+    async def test_under_limit_sends_now(self):
+        limiter = MagicMock()
+        limiter.reserve.return_value = 0.0
+        with patch.object(rate_limit, "get_rate_limiter", return_value=limiter):
+            assert await defer_if_rate_limited(3, "EMAIL", None, "job") is False
+
+
+class TestProviderThrottle:
+    def test_whatsapp_429_uses_retry_after(self):
+        request = httpx.Request("POST", "https://graph.facebook.com")
+        response = httpx.Response(429, headers={"Retry-After": "30"}, request=request)
+        exc = httpx.HTTPStatusError("throttled", request=request, response=response)
+        assert provider_throttle_delay(exc) == 30.0
+
+    def test_ses_throttling(self):
+        from botocore.exceptions import ClientError
+
+        exc = ClientError({"Error": {"Code": "Throttling", "Message": "Rate exceeded"}}, "SendEmail")
+        assert provider_throttle_delay(exc) == 60.0
+
+    def test_other_errors_are_not_throttling(self):
+        assert provider_throttle_delay(ValueError("boom")) is None
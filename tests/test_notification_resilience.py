@@ -0,0 +1,277 @@
+"""Tests for send retries, circuit breaking and the dead-letter queue."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from botocore.exceptions import ClientError
+from requests.exceptions import ConnectionError
+
+from app.db.repositories.notifications import NotificationRepository
+from app.services.notifications import resilience, status_writer
+from app.services.notifications.dispatcher import NotificationDispatcher
+from app.services.notifications.resilience import CircuitBreaker, DeadLetterQueue, backoff_delay
+from app.services.notifications.status_writer import NotificationStatusWriter
+from app.workers.jobs import send_email, send_whatsapp
+
+
+class ListRedis:
+    """Stand-in for the Redis list commands used by the dead-letter queue."""
+
+    def __init__(self):
+        self.lists: dict[str, list] = {}
+        self._results: list = []
+
+    def pipeline(self, transaction=True):
+        self._results = []
+        return self
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+        self._results.append(len(self.lists[key]))
+
+    def ltrim(self, key, start, end):
+        items = self.lists.get(key, [])
+        stop = None if end == -1 else end + 1
+        self.lists[key] = items[start:stop]
+        self._results.append(True)
+
+    def lrange(self, key, start, end):
+        stop = None if end == -1 else end + 1
+        result = list(self.lists.get(key, [])[start:stop])
+        self._results.append(result)
+        return result
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def execute(self):
+        return self._results
+
+
+def _memory_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker(redis_client=MagicMock())
+    breaker._redis_available = False
+    return breaker
+
+
+class TestBackoff:
+    def test_delay_grows_exponentially_up_to_the_cap(self):
+        with patch.object(resilience.settings, "notification_retry_base_seconds", 10), \
+             patch.object(resilience.settings, "notification_retry_max_seconds", 60), \
+             patch.object(resilience.random, "uniform", side_effect=lambda low, high: high):
+            assert [backoff_delay(attempt) for attempt in range(4)] == [10, 20, 40, 60]
+
+    def test_delay_is_jittered(self):
+        delays = {backoff_delay(3) for _ in range(20)}
+        assert len(delays) > 1
+        assert all(1.0 <= delay <= resilience.settings.notification_retry_max_seconds for delay in delays)
+
+
+class TestCircuitBreaker:
+    def test_failing_tenant_pauses_without_affecting_others(self):
+        breaker = _memory_breaker()
+        with patch.object(resilience.settings, "circuit_breaker_min_requests", 4), \
+             patch.object(resilience.settings, "circuit_breaker_error_rate", 0.5):
+            for _ in range(20):
+                breaker.record("WHATSAPP", 2, success=True)
+            for _ in range(4):
+                breaker.record("WHATSAPP", 1, success=False)
+
+            assert breaker.open_for("WHATSAPP", 1) > 0
+            assert breaker.open_for("WHATSAPP", 2) == 0.0
+            assert breaker.open_for("EMAIL", 1) == 0.0
+
+    def test_provider_outage_opens_for_everyone(self):
+        breaker = _memory_breaker()
+        with patch.object(resilience.settings, "circuit_breaker_min_requests", 4):
+            for tenant_id in (1, 2, 3, 4):
+                breaker.record("EMAIL", tenant_id, success=False)
+
+            assert breaker.open_for("EMAIL", 5) > 0
+            assert breaker.open_for("EMAIL", None) > 0
+
+
+class TestDeadLetterQueue:
+    def test_entries_are_kept_per_tenant_and_popped_oldest_first(self):
+        dlq = DeadLetterQueue(ListRedis())
+        for nid in (1, 2, 3):
+            dlq.push(7, "func", (nid,), origin="notifications", reason="retries_exhausted",
+                     error="boom", notification_ids=[nid])
+        dlq.push(8, "func", (9,), origin="alerts", reason="permanent_error", error="bad", notification_ids=[9])
+
+        assert [e["notification_ids"] for e in dlq.pop(7, 2)] == [[1], [2]]
+        assert dlq.count(7) == 1
+        assert dlq.count(8) == 1
+
+
+class TestSendRetries:
+    @pytest.mark.asyncio
+    async def test_transient_error_reschedules_then_dead_letters(self, db_session, sample_guardian):
+        repo = NotificationRepository(db_session)
+        notification = await repo.create(
+            guardian_id=sample_guardian.id, channel="WHATSAPP", template="INGRESO_OK", payload={}, event_id=None
+        )
+        await db_session.commit()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield db_session
+
+        client = MagicMock()
+        client.send_template = AsyncMock(side_effect=ConnectionError("down"))
+        breaker = _memory_breaker()
+        writer = NotificationStatusWriter(flush_interval_ms=250, max_rows=200)
+        with patch.object(status_writer, "async_session", fake_session), \
+             patch.object(send_whatsapp, "get_status_writer", return_value=writer), \
+             patch.object(send_whatsapp, "WhatsAppClient", return_value=client), \
+             patch.object(send_whatsapp, "get_circuit_breaker", return_value=breaker), \
+             patch.object(send_whatsapp, "reschedule_current_job", return_value=True) as mock_reschedule, \
+             patch.object(send_whatsapp, "dead_letter") as mock_dead_letter:
+            await send_whatsapp._send(notification.id, "+56911111111", "INGRESO_OK", {}, None, reserved=True)
+
+            await db_session.refresh(notification)
+            assert notification.retries == 1
+            delay, func = mock_reschedule.call_args.args[:2]
+            assert func == send_whatsapp.JOB_FUNC
+            assert delay >= 1.0
+            assert mock_reschedule.call_args.kwargs == {"attempt": 1}
+            mock_dead_letter.assert_not_called()
+
+            # Dead-lettered, so not raised into RQ's failed registry as well
+            await send_whatsapp._send(
+                notification.id, "+56911111111", "INGRESO_OK", {}, None,
+                reserved=True, attempt=send_whatsapp.MAX_RETRIES,
+            )
+
+        await db_session.refresh(notification)
+        assert notification.status == "failed"
+        assert writer.pending == 0
+        assert mock_dead_letter.call_args.kwargs["reason"] == "retries_exhausted"
+        assert mock_dead_letter.call_args.kwargs["notification_ids"] == [notification.id]
+
+
+def _whatsapp_error(status_code: int, retry_after: str | None = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://graph.facebook.com/messages")
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    response = httpx.Response(status_code, headers=headers, request=request)
+    return httpx.HTTPStatusError(str(status_code), request=request, response=response)
+
+
+def _ses_error(code: str, status_code: int) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": code}, "ResponseMetadata": {"HTTPStatusCode": status_code}},
+        "SendEmail",
+    )
+
+
+SEND_JOBS = {
+    "WHATSAPP": (send_whatsapp, "WhatsAppClient", "send_template", "+56911111111"),
+    "EMAIL": (send_email, "SESEmailClient", "send_email", "apoderado@example.com"),
+}
+
+
+def _provider_error(channel: str, status_code: int, throttled: bool = False) -> Exception:
+    if channel == "WHATSAPP":
+        return _whatsapp_error(status_code, retry_after="30" if throttled else None)
+    return _ses_error("Throttling" if throttled else "MessageRejected", status_code)
+
+
+class TestPermanentFailures:
+    @pytest.fixture(params=["WHATSAPP", "EMAIL"])
+    async def send(self, request, db_session, sample_guardian):
+        """Run one send job whose provider call raises ``error``."""
+        channel = request.param
+        module, client_cls, method, to = SEND_JOBS[channel]
+        notification = await NotificationRepository(db_session).create(
+            guardian_id=sample_guardian.id, channel=channel, template="INGRESO_OK", payload={}, event_id=None
+        )
+        await db_session.commit()
+
+        @asynccontextmanager
+        async def fake_session():
+            yield db_session
+
+        breaker = MagicMock()
+        writer = NotificationStatusWriter(flush_interval_ms=250, max_rows=200)
+
+        async def run(error: Exception) -> SimpleNamespace:
+            client = MagicMock(**{method: AsyncMock(side_effect=error)})
+            with patch.object(status_writer, "async_session", fake_session), \
+                 patch.object(module, "get_status_writer", return_value=writer), \
+                 patch.object(module, client_cls, return_value=client), \
+                 patch.object(module, "get_circuit_breaker", return_value=breaker), \
+                 patch.object(module, "defer_if_circuit_open", return_value=False), \
+                 patch.object(module, "reschedule_current_job", return_value=True) as reschedule, \
+                 patch.object(module, "dead_letter") as dead_letter:
+                await module._send(notification.id, to, "INGRESO_OK", {}, None, reserved=True)
+            await db_session.refresh(notification)
+            return SimpleNamespace(
+                status=notification.status, breaker=breaker, reschedule=reschedule, dead_letter=dead_letter
+            )
+
+        run.channel = channel
+        return run
+
+    @pytest.mark.asyncio
+    async def test_provider_throttling_reschedules_without_failing(self, send):
+        whatsapp = send.channel == "WHATSAPP"
+        result = await send(_provider_error(send.channel, 429 if whatsapp else 400, throttled=True))
+
+        delay, func = result.reschedule.call_args.args[:2]
+        # Retry-After is honoured; SES throttling has no hint
+        assert (delay, func) == (30.0 if whatsapp else 60.0, SEND_JOBS[send.channel][0].JOB_FUNC)
+        assert result.reschedule.call_args.kwargs == {"attempt": 0}
+        assert result.status == "queued"
+        result.breaker.record.assert_not_called()
+        result.dead_letter.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_provider_outage_opens_the_circuit_and_dead_letters(self, send):
+        result = await send(_provider_error(send.channel, 503))
+
+        result.breaker.record.assert_called_once_with(send.channel, None, success=False)
+        assert result.dead_letter.call_args.kwargs["reason"] == "permanent_error"
+        assert result.status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_rejected_message_is_dead_lettered_without_blaming_the_provider(self, send):
+        result = await send(_provider_error(send.channel, 400))
+
+        result.breaker.record.assert_not_called()
+        result.reschedule.assert_not_called()
+        assert result.dead_letter.call_args.kwargs["reason"] == "permanent_error"
+        assert result.status == "failed"
+
+
+class TestReplay:
+    @pytest.mark.asyncio
+    async def test_replay_resets_notifications_and_requeues_jobs(self, db_session, sample_guardian):
+        repo = NotificationRepository(db_session)
+        notification = await repo.create(
+            guardian_id=sample_guardian.id, channel="EMAIL", template="INGRESO_OK", payload={}, event_id=None
+        )
+        notification.status = "failed"
+        notification.retries = 3
+        await db_session.commit()
+
+        with patch("app.services.notifications.dispatcher.Redis"), \
+             patch("app.services.notifications.dispatcher.Queue") as mock_queue_cls:
+            dispatcher = NotificationDispatcher(db_session, tenant_id=4)
+            dispatcher.dead_letters = DeadLetterQueue(ListRedis())
+            dispatcher.dead_letters.push(
+                4, "app.workers.jobs.send_email.send_email_message",
+                (notification.id, "g@x.cl", "INGRESO_OK", {}, 4),
+                origin="notifications", reason="retries_exhausted", error="boom",
+                notification_ids=[notification.id],
+            )
+
+            result = await dispatcher.replay_dead_letters()
+
+        assert (result.replayed_jobs, result.notifications, result.remaining) == (1, 1, 0)
+        mock_queue_cls.assert_any_call("notifications", connection=dispatcher._redis)
+        mock_queue_cls.return_value.enqueue_many.assert_called_once()
+        await db_session.refresh(notification)
+        assert (notification.status, notification.retries) == ("queued", 0)
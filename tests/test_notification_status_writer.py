@@ -0,0 +1,112 @@
+"""Tests for the batched notification status writer."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db.models.notification import Notification
+from app.db.repositories.notifications import NotificationRepository
+from app.services.notifications import status_writer
+from app.services.notifications.status_writer import NotificationStatusWriter
+
+
+async def _create(db_session, guardian_id: int, count: int) -> list[int]:
+    ids = await NotificationRepository(db_session).bulk_create(
+        [{"guardian_id": guardian_id, "channel": "WHATSAPP", "template": "INGRESO_OK", "payload": {}}] * count
+    )
+    await db_session.commit()
+    return ids
+
+
+class TestNotificationStatusWriter:
+    @pytest.mark.asyncio
+    async def test_buffered_updates_are_merged_and_written_together(self, db_session, sample_guardian):
+        ids = await _create(db_session, sample_guardian.id, 3)
+
+        @asynccontextmanager
+        async def session_factory():
+            yield db_session
+
+        sent_at = datetime(2024, 3, 15, 8, 0, tzinfo=timezone.utc)
+        writer = NotificationStatusWriter(flush_interval_ms=250, max_rows=100)
+        writer.submit(ids[0], retries=1)
+        writer.submit(ids[0], "sent", ts_sent=sent_at)
+        writer.submit(ids[1], "failed")
+        writer.submit(None, "sent")  # untracked send
+        assert writer.pending == 2
+
+        assert await writer.flush(session_factory) == 2
+
+        db_session.expire_all()
+        stored = {n.id: n for n in (await db_session.execute(select(Notification))).scalars()}
+        assert (stored[ids[0]].status, stored[ids[0]].retries) == ("sent", 1)
+        assert stored[ids[0]].ts_sent is not None
+        assert stored[ids[1]].status == "failed"
+        assert stored[ids[2]].status == "queued"
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_updates_for_next_time(self):
+        @asynccontextmanager
+        async def broken_factory():
+            raise ConnectionError("db down")
+            yield  # pragma: no cover
+
+        writer = NotificationStatusWriter(flush_interval_ms=250, max_rows=100)
+        writer.submit(1, "sent")
+        assert await writer.flush(broken_factory) == 0
+        assert writer.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_updates_are_flushed_in_their_tenant_schema(self):
+        written: list[str | None] = []
+
+        @asynccontextmanager
+        async def fake_scope(schema, session_factory):
+            if schema == "tenant_beta":
+                raise ConnectionError("db down")
+            session = MagicMock(commit=AsyncMock())
+            session.get_bind.return_value.dialect.name = "postgresql"
+            session.execute = AsyncMock()
+            yield session
+            session.execute.assert_awaited_once()
+            written.append(schema)
+
+        writer = NotificationStatusWriter(flush_interval_ms=250, max_rows=100)
+        writer.submit(1, "sent", tenant_schema="tenant_alfa")
+        writer.submit(1, "failed", tenant_schema="tenant_beta")  # same id, other tenant
+        writer.submit(2, "sent")
+        assert writer.pending == 3
+
+        with patch.object(status_writer, "tenant_session_scope", fake_scope):
+            assert await writer.flush() == 2
+
+        assert sorted(written, key=str) == [None, "tenant_alfa"]
+        assert writer.pending == 1
+        assert [u.tenant_schema for u in writer._drain()] == ["tenant_beta"]
+
+    @pytest.mark.asyncio
+    async def test_postgres_uses_single_update_from_values(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.execute = AsyncMock()
+
+        await NotificationRepository(session).apply_status_updates(
+            [{"id": 1, "status": "sent", "ts_sent": None, "retries": None}, {"id": 2, "status": None, "retries": 2}]
+        )
+
+        session.execute.assert_awaited_once()
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FROM (VALUES" in sql
+        assert sql.startswith("UPDATE notifications SET")
+
+    def test_full_buffer_wakes_background_flusher(self):
+        writer = NotificationStatusWriter(flush_interval_ms=60000, max_rows=2, background=True)
+        with patch.object(writer, "_ensure_started"):
+            writer.submit(1, "sent")
+            assert not writer._wakeup.is_set()
+            writer.submit(2, "sent")
+        assert writer._wakeup.is_set()
@@ -0,0 +1,96 @@
+"""Tests for the SQL-aggregated, Redis-cached notification summary."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.db.repositories.notifications import NotificationRepository
+from app.services import notification_service
+from app.services.notification_service import NotificationService
+from app.services.notifications.summary_cache import DayCounts
+
+
+class MemorySummaryCache:
+    """In-memory stand-in for ``NotificationSummaryCache`` (no Lua needed)."""
+
+    def __init__(self):
+        self.days: dict = {}
+
+    def load(self, tenant_id, days):
+        return {
+            day: DayCounts(dict(self.days[day].counts), self.days[day].lo, self.days[day].hi)
+            if day in self.days else None
+            for day in days
+        }
+
+    def fold(self, tenant_id, day, expected_hi, delta):
+        current = self.days.get(day)
+        if (current.hi if current else None) != expected_hi:
+            return False
+        if current is None:
+            self.days[day] = DayCounts(dict(delta.counts), delta.lo, delta.hi)
+        else:
+            for field, count in delta.counts.items():
+                current.counts[field] = current.counts.get(field, 0) + count
+            current.hi = max(current.hi, delta.hi)
+        return True
+
+
+async def _add(db_session, guardian_id, *, status="sent", channel="WHATSAPP", days_ago=0, count=1):
+    ids = await NotificationRepository(db_session).bulk_create(
+        [{"guardian_id": guardian_id, "channel": channel, "template": "INGRESO_OK", "payload": {}}] * count
+    )
+    for notification_id in ids:
+        notification = await NotificationRepository(db_session).get(notification_id)
+        notification.status = status
+        notification.ts_created = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    await db_session.commit()
+
+
+class TestNotificationSummary:
+    @pytest.mark.asyncio
+    async def test_windows_count_every_row_with_sql(self, db_session, sample_guardian):
+        await _add(db_session, sample_guardian.id, count=3)
+        await _add(db_session, sample_guardian.id, status="failed", channel="EMAIL", days_ago=3)
+        await _add(db_session, sample_guardian.id, days_ago=20, count=2)
+        await _add(db_session, sample_guardian.id, days_ago=40)
+
+        service = NotificationService(db_session, tenant_id=1)
+        with patch.object(notification_service, "get_summary_cache") as mock_cache:
+            mock_cache.return_value.load.return_value = None
+            today = await service.summary("today")
+            week = await service.summary("7d")
+            month = await service.summary("30d")
+
+        assert today.total == 3
+        assert (week.total, week.by_status, week.by_channel) == (
+            4, {"sent": 3, "failed": 1}, {"WHATSAPP": 3, "EMAIL": 1}
+        )
+        assert month.total == 6
+        assert month.window == "30d"
+
+    @pytest.mark.asyncio
+    async def test_cached_days_only_query_new_rows(self, db_session, sample_guardian):
+        await _add(db_session, sample_guardian.id, count=2)
+        await _add(db_session, sample_guardian.id, days_ago=5)
+
+        cache = MemorySummaryCache()
+        service = NotificationService(db_session, tenant_id=1)
+        with patch.object(notification_service, "get_summary_cache", return_value=cache):
+            assert (await service.summary("7d")).total == 3
+            assert len(cache.days) == 7
+
+            await _add(db_session, sample_guardian.id, status="queued")
+            with patch.object(
+                service.repository, "count_by_window", wraps=service.repository.count_by_window
+            ) as spy:
+                summary = await service.summary("7d")
+
+        # Only today and yesterday are re-read, and only past their last ID
+        windows = spy.call_args.args[0]
+        assert len(windows) == 2
+        assert windows[0][2] > 0
+        assert (summary.total, summary.by_status) == (4, {"sent": 3, "queued": 1})
+        today = datetime.now(timezone.utc).date()
+        assert cache.days[today].counts["queued|WHATSAPP|INGRESO_OK"] == 1
@@ -5,10 +5,11 @@ from __future__ import annotations
 from datetime import datetime
 from io import BytesIO
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.schemas.attendance import EvidenceKind
 from app.services.attendance_service import AttendanceService
 
 
@@ -48,6 +49,7 @@ def attendance_service():
     # Mock the photo service
     service.photo_service = MagicMock()
     service.photo_service.store_photo = AsyncMock(return_value="stored_key")
+    service._enqueue_job = MagicMock()
     return service
 
 
@@ -280,6 +282,95 @@ class TestPhotoUploadValidation:
         assert result is not None
 
 
+def _fake_event(**overrides):
+    values = dict(
+        id=1,
+        student_id=1,
+        type="IN",
+        gate_id="GATE-1",
+        device_id="DEV-1",
+        occurred_at=datetime.utcnow(),
+        local_seq=None,
+        photo_ref=None,
+        audio_ref=None,
+        synced_at=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestDirectUpload:
+    """Presigned POST upload, confirmation and asynchronous validation."""
+
+    @pytest.mark.anyio
+    async def test_ticket_is_constrained_to_the_event(self, attendance_service):
+        attendance_service.attendance_repo.get_event = AsyncMock(return_value=_fake_event())
+        attendance_service.photo_service.generate_presigned_post = AsyncMock(
+            return_value={"url": "https://s3/bucket", "fields": {"key": "k", "policy": "p"}}
+        )
+
+        ticket = await attendance_service.request_evidence_upload(
+            1, EvidenceKind.AUDIO, "audio/webm", "../../x/clip.webm"
+        )
+
+        key, content_type, max_bytes, _ = attendance_service.photo_service.generate_presigned_post.call_args[0]
+        assert key == ticket.key
+        assert key.startswith("events/1/audio_") and key.endswith(".webm")
+        assert content_type == "audio/webm"
+        assert max_bytes == AttendanceService.MAX_AUDIO_SIZE == ticket.max_bytes
+
+    @pytest.mark.anyio
+    async def test_ticket_rejects_disallowed_type(self, attendance_service):
+        attendance_service.photo_service.generate_presigned_post = AsyncMock()
+
+        with pytest.raises(ValueError, match="Tipo de archivo no permitido"):
+            await attendance_service.request_evidence_upload(1, EvidenceKind.PHOTO, "application/pdf")
+        attendance_service.photo_service.generate_presigned_post.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_confirm_rejects_keys_of_other_events(self, attendance_service):
+        attendance_service.attendance_repo.update_photo_ref = AsyncMock()
+
+        for key in ("events/2/abc.jpg", "events/1/", "events/1/../2/abc.jpg"):
+            with pytest.raises(ValueError, match="Clave de evidencia inválida"):
+                await attendance_service.confirm_evidence_upload(1, key)
+        attendance_service.attendance_repo.update_photo_ref.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_confirm_links_object_and_queues_validation(self, attendance_service):
+        attendance_service.attendance_repo.update_photo_ref = AsyncMock(
+            return_value=_fake_event(photo_ref="events/1/abc.jpg")
+        )
+
+        with patch.object(attendance_service, "_enqueue_evidence_validation") as enqueue:
+            result = await attendance_service.confirm_evidence_upload(1, "events/1/abc.jpg")
+
+        assert result.photo_ref == "events/1/abc.jpg"
+        enqueue.assert_called_once_with(1, "events/1/abc.jpg")
+
+    @pytest.mark.anyio
+    async def test_validation_accepts_matching_header(self, attendance_service):
+        attendance_service.photo_service.read_header = AsyncMock(return_value=(PNG_MAGIC[:16], "image/png"))
+        attendance_service.photo_service.delete_photo = AsyncMock()
+
+        assert await attendance_service.verify_uploaded_evidence(1, "events/1/abc.png") is True
+        attendance_service.photo_service.delete_photo.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_validation_drops_spoofed_content(self, attendance_service):
+        # Declared as JPEG, actually a GIF
+        attendance_service.photo_service.read_header = AsyncMock(return_value=(GIF_MAGIC[:16], "image/jpeg"))
+        attendance_service.photo_service.delete_photo = AsyncMock()
+        attendance_service.attendance_repo.get_event = AsyncMock(
+            return_value=_fake_event(photo_ref="events/1/abc.jpg")
+        )
+        attendance_service.attendance_repo.update_photo_ref = AsyncMock()
+
+        assert await attendance_service.verify_uploaded_evidence(1, "events/1/abc.jpg") is False
+        attendance_service.attendance_repo.update_photo_ref.assert_awaited_once_with(1, None)
+        attendance_service.photo_service.delete_photo.assert_awaited_once_with("events/1/abc.jpg")
+
+
 class TestAllowedTypes:
     """Test that all documented types are correctly configured."""
 
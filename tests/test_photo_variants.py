@@ -0,0 +1,110 @@
+"""Tests for the WebP photo variant pipeline."""
+
+import io
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.models.attendance_event import AttendanceEvent
+from app.db.repositories.attendance import AttendanceRepository
+from app.services.photo_variants import VARIANT_SIZES, render_variants, variant_key
+from app.workers.jobs import photo_variants
+
+
+class FakePhotoService:
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.deleted: list[str] = []
+
+    async def read_object(self, key):
+        return self.objects.get(key)
+
+    async def store_photo(self, key, data, content_type):
+        self.objects[key] = data
+        return key
+
+    async def delete_photos(self, keys):
+        self.deleted.extend(keys)
+        return set()
+
+    def close(self):
+        pass
+
+
+async def _photo_event(db_session, student_id, photo_ref):
+    event = AttendanceEvent(
+        student_id=student_id,
+        type="IN",
+        gate_id="GATE-A",
+        device_id="DEV-01",
+        occurred_at=datetime(2024, 3, 18, 8, 0, tzinfo=timezone.utc),
+        photo_ref=photo_ref,
+    )
+    db_session.add(event)
+    await db_session.flush()
+    return event
+
+
+def test_variant_keys_sit_next_to_the_original():
+    assert variant_key("events/1/abc.jpg", "thumb") == "events/1/abc.thumb.webp"
+    assert variant_key("events/1/abc", "medium") == "events/1/abc.medium.webp"
+
+
+def test_render_variants_downscales_to_webp():
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (3000, 2000), "white").save(buffer, format="JPEG")
+
+    variants = render_variants(buffer.getvalue())
+
+    for name, size in VARIANT_SIZES.items():
+        with Image.open(io.BytesIO(variants[name])) as rendered:
+            assert rendered.format == "WEBP"
+            assert max(rendered.size) == size
+
+
+class TestGenerateVariants:
+    @pytest.fixture
+    def session_scope(self, db_session):
+        @asynccontextmanager
+        async def fake_scope(schema=None):
+            yield db_session
+
+        with patch.object(photo_variants, "tenant_session_scope", fake_scope):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_variants_are_stored_next_to_photo_ref(self, db_session, sample_student, session_scope):
+        event = await _photo_event(db_session, sample_student.id, "events/1/abc.jpg")
+        service = FakePhotoService({"events/1/abc.jpg": b"original"})
+
+        with (
+            patch.object(photo_variants, "PhotoService", lambda storage: service),
+            patch.object(photo_variants, "tenant_storage", AsyncMock()),
+            patch.object(photo_variants, "render_variants", lambda data: {"thumb": b"t", "medium": b"m"}),
+        ):
+            assert await photo_variants._generate(event.id, "events/1/abc.jpg", None) is True
+
+        await db_session.refresh(event)
+        assert event.photo_thumb_ref == "events/1/abc.thumb.webp"
+        assert event.photo_medium_ref == "events/1/abc.medium.webp"
+        assert service.objects["events/1/abc.medium.webp"] == b"m"
+
+    @pytest.mark.asyncio
+    async def test_variants_of_a_replaced_photo_are_discarded(self, db_session, sample_student, session_scope):
+        event = await _photo_event(db_session, sample_student.id, "events/1/old.jpg")
+        await AttendanceRepository(db_session).update_photo_ref(event.id, "events/1/new.jpg")
+        service = FakePhotoService({"events/1/old.jpg": b"original"})
+
+        with (
+            patch.object(photo_variants, "PhotoService", lambda storage: service),
+            patch.object(photo_variants, "tenant_storage", AsyncMock()),
+            patch.object(photo_variants, "render_variants", lambda data: {"thumb": b"t", "medium": b"m"}),
+        ):
+            assert await photo_variants._generate(event.id, "events/1/old.jpg", None) is False
+
+        await db_session.refresh(event)
+        assert event.photo_thumb_ref is None
+        assert sorted(service.deleted) == ["events/1/old.medium.webp", "events/1/old.thumb.webp"]
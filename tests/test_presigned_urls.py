@@ -0,0 +1,114 @@
+"""Tests for batch presigned URL signing and its LRU cache."""
+
+from datetime import date, datetime, time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services import photo_service as photo_service_module
+from app.services.dashboard_service import DashboardService
+from app.services.photo_service import PhotoService, PresignedUrlCache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    photo_service_module.presigned_url_cache.clear()
+    yield
+    photo_service_module.presigned_url_cache.clear()
+
+
+class TestPresignedUrlCache:
+    def test_urls_are_reused_until_shortly_before_expiry(self):
+        cache = PresignedUrlCache(max_entries=10, min_remaining=0.25)
+        cache.put("bucket", "a.jpg", 3600, "url-a", now=0)
+
+        assert cache.get("bucket", "a.jpg", 3600, now=2699) == "url-a"
+        # Only a quarter of the lifetime left: sign again
+        assert cache.get("bucket", "a.jpg", 3600, now=2700) is None
+        # Another expiry is another URL
+        cache.put("bucket", "a.jpg", 3600, "url-a", now=0)
+        assert cache.get("bucket", "a.jpg", 86400, now=0) is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PresignedUrlCache(max_entries=2)
+        cache.put("bucket", "a.jpg", 3600, "url-a", now=0)
+        cache.put("bucket", "b.jpg", 3600, "url-b", now=0)
+        cache.get("bucket", "a.jpg", 3600, now=1)
+        cache.put("bucket", "c.jpg", 3600, "url-c", now=1)
+
+        assert cache.get("bucket", "a.jpg", 3600, now=2) == "url-a"
+        assert cache.get("bucket", "b.jpg", 3600, now=2) is None
+
+    def test_presign_urls_signs_each_key_once(self):
+        service = PhotoService()
+        try:
+            with patch.object(
+                service.storage.client, "generate_presigned_url", side_effect=lambda *a, **kw: f"u/{kw['Params']['Key']}"
+            ) as sign:
+                first = service.presign_urls(["a.jpg", "b.jpg", "a.jpg", None])
+                second = service.presign_urls(["a.jpg", "b.jpg"])
+        finally:
+            service.close()
+
+        assert first == second == {"a.jpg": "u/a.jpg", "b.jpg": "u/b.jpg"}
+        assert sign.call_count == 2
+
+
+class TestSnapshotBenchmark:
+    """500-event dashboard snapshot, signing with a real (offline) S3 client."""
+
+    EVENTS = 500
+
+    def _service(self):
+        service = DashboardService(MagicMock())
+        target_date = date(2024, 1, 10)
+        course = SimpleNamespace(id=1, name="1° Básico A")
+        students = [SimpleNamespace(id=i, course_id=1, full_name=f"Alumno {i}") for i in range(self.EVENTS)]
+        events = [
+            (
+                SimpleNamespace(
+                    id=i,
+                    student_id=i,
+                    type="IN",
+                    gate_id="G1",
+                    device_id="D1",
+                    occurred_at=datetime(2024, 1, 10, 8, 0),
+                    photo_ref=f"events/{i}/photo.jpg",
+                    photo_thumb_ref=f"events/{i}/photo.thumb.webp",
+                    photo_medium_ref=f"events/{i}/photo.medium.webp",
+                ),
+                students[i],
+                course,
+            )
+            for i in range(self.EVENTS)
+        ]
+        service.calendar = MagicMock()
+        service.calendar.school_days = AsyncMock(
+            return_value={(1, target_date): SimpleNamespace(course_id=1, date=target_date, in_time=time(8, 0))}
+        )
+        service.calendar.excused = AsyncMock(return_value=set())
+        service.student_repo = MagicMock()
+        service.student_repo.list_by_course_ids = AsyncMock(return_value=students)
+        service._fetch_events = AsyncMock(return_value=events)
+        return service, target_date
+
+    @pytest.mark.anyio("asyncio")
+    async def test_snapshot_signs_in_one_batch_and_refresh_hits_the_cache(self):
+        service, target_date = self._service()
+        try:
+            with patch.object(
+                service.photo_service.storage.client,
+                "generate_presigned_url",
+                wraps=service.photo_service.storage.client.generate_presigned_url,
+            ) as sign:
+                cold = await service.get_snapshot(target_date=target_date)
+                warm = await service.get_snapshot(target_date=target_date)
+        finally:
+            service.photo_service.close()
+
+        # Medium and thumbnail per event, signed once
+        assert sign.call_count == 2 * self.EVENTS
+        assert [event.photo_url for event in warm.events] == [event.photo_url for event in cold.events]
+        assert cold.events[0].photo_url.split("?")[0].endswith("events/0/photo.medium.webp")
+        assert cold.events[0].photo_thumb_url.split("?")[0].endswith("events/0/photo.thumb.webp")
@@ -333,7 +333,8 @@ class TestSendPushWorker:
             assert result is False
 
     def test_send_push_notification_real_mode_success(self):
-        """Test push notification in real mode with mocked webpush."""
+        """Test push notification in real mode with a mocked async sender."""
+        from app.services.notifications.web_push import PushResult
         from app.workers.jobs.send_push import send_push_notification
 
         subscription_info = {
@@ -346,12 +347,12 @@ class TestSendPushWorker:
         payload = {"title": "Real Test", "body": "Body"}
 
         with patch("app.workers.jobs.send_push.settings") as mock_settings, \
-             patch("app.workers.jobs.send_push.webpush") as mock_webpush:
+             patch("app.workers.jobs.send_push._send_push_many", new_callable=AsyncMock) as mock_send:
             mock_settings.enable_real_notifications = True
             mock_settings.vapid_private_key = "test-private-key"
             mock_settings.vapid_public_key = "test-public-key"
             mock_settings.vapid_subject = "mailto:test@test.com"
-            mock_webpush.return_value = MagicMock(status_code=201)
+            mock_send.return_value = [PushResult(subscription_info["endpoint"], "sent", 201)]
 
             result = send_push_notification(
                 notification_id=1,
@@ -360,25 +361,22 @@ class TestSendPushWorker:
             )
 
             assert result is True
-            mock_webpush.assert_called_once()
+            mock_send.assert_awaited_once()
 
     def test_send_push_notification_webpush_error(self):
-        """Test push notification handles WebPushException."""
-        from pywebpush import WebPushException  # noqa: F401 - available due to skipif
+        """Test push notification handles an invalid subscription."""
         from app.workers.jobs.send_push import send_push_notification
 
         subscription_info = {"endpoint": "https://test.com", "keys": {}}
         payload = {"title": "Test"}
 
         with patch("app.workers.jobs.send_push.settings") as mock_settings, \
-             patch("app.workers.jobs.send_push.webpush") as mock_webpush:
+             patch("app.workers.jobs.send_push._record_results", new_callable=AsyncMock):
             mock_settings.enable_real_notifications = True
             mock_settings.vapid_private_key = "test-private-key"
             mock_settings.vapid_public_key = "test-public-key"
             mock_settings.vapid_subject = "mailto:test@test.com"
-
-            # Simulate WebPushException
-            mock_webpush.side_effect = WebPushException("Test error")
+            mock_settings.push_concurrency = 5
 
             result = send_push_notification(
                 notification_id=1,
@@ -416,6 +414,71 @@ class TestSendPushWorker:
             assert result["failed"] == 0
 
 
+def _vapid_private_key() -> str:
+    import base64
+
+    from py_vapid import Vapid
+
+    vapid = Vapid()
+    vapid.generate_keys()
+    raw = vapid.private_key.private_numbers().private_value.to_bytes(32, "big")
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.skipif(not HAS_PYWEBPUSH, reason="pywebpush not installed")
+class TestAsyncWebPushSender:
+    """Tests for concurrent push delivery and VAPID header reuse."""
+
+    def test_vapid_headers_are_reused_per_origin(self):
+        from app.services.notifications.web_push import VapidHeaderCache
+
+        cache = VapidHeaderCache(_vapid_private_key(), "mailto:test@test.com")
+
+        first = cache.headers_for("https://fcm.googleapis.com/fcm/send/a")
+        again = cache.headers_for("https://fcm.googleapis.com/fcm/send/b")
+        other = cache.headers_for("https://updates.push.services.mozilla.com/wpush/v2/c")
+
+        assert first is again
+        assert other["Authorization"] != first["Authorization"]
+
+    async def test_results_and_expired_subscriptions(self, sample_subscription: PushSubscription):
+        import httpx
+
+        from app.services.notifications.web_push import AsyncWebPushSender, VapidHeaderCache
+
+        status_by_path = {"/ok": 201, "/gone": 410, "/boom": 500}
+        seen_auth = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_auth.append(request.headers["authorization"])
+            assert request.headers["content-encoding"] == "aes128gcm"
+            return httpx.Response(status_by_path[request.url.path])
+
+        keys = {"p256dh": sample_subscription.p256dh, "auth": sample_subscription.auth}
+        messages = [
+            ({"endpoint": f"https://push.example{path}", "keys": keys}, {"title": "Hola"})
+            for path in status_by_path
+        ]
+        vapid = VapidHeaderCache(_vapid_private_key(), "mailto:test@test.com")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            results = await AsyncWebPushSender(client, vapid, concurrency=2).send_many(messages)
+
+        assert [r.status for r in results] == ["sent", "expired", "failed"]
+        assert len(set(seen_auth)) == 1
+
+    async def test_deactivate_by_endpoints(
+        self, push_repo: PushSubscriptionRepository, sample_subscription: PushSubscription
+    ):
+        count = await push_repo.deactivate_by_endpoints(
+            [sample_subscription.endpoint, "https://push.example/unknown"]
+        )
+
+        assert count == 1
+        subscription = await push_repo.get_by_id(sample_subscription.id)
+        assert subscription.is_active is False
+
+
 # ============================================================================
 # API Tests
 # ============================================================================
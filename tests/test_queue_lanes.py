@@ -0,0 +1,139 @@
+"""Tests for RQ queue lanes and their wait-time metrics."""
+
+import asyncio
+import inspect
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rq import SimpleWorker
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
+from app.db import session as db_session_module
+from app.workers import queues
+from app.workers.queues import (
+    ALERTS_QUEUE,
+    BULK_QUEUE,
+    LANES,
+    REALTIME_QUEUE,
+    LaneMetrics,
+    SimpleLaneWorker,
+    _LaneMetricsMixin,
+    parse_lane_workers,
+)
+
+
+class SampleRedis:
+    """Stand-in for the Redis list commands used by LaneMetrics."""
+
+    def __init__(self):
+        self.lists: dict[str, list] = {}
+
+    def pipeline(self):
+        return self
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, str(value))
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:end + 1]
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    def execute(self):
+        return []
+
+
+class TestLanes:
+    def test_bulk_workers_never_take_realtime_or_alert_jobs(self):
+        assert REALTIME_QUEUE not in LANES["bulk"]
+        assert ALERTS_QUEUE not in LANES["bulk"]
+        assert LANES["realtime"] == (REALTIME_QUEUE,)
+        # Alert workers may help with check-ins, after their own queue
+        assert LANES["alerts"] == (ALERTS_QUEUE, REALTIME_QUEUE)
+
+    def test_parse_lane_workers(self):
+        assert parse_lane_workers("realtime=3, bulk=1") == {"realtime": 3, "bulk": 1}
+        with pytest.raises(ValueError):
+            parse_lane_workers("urgent=2")
+        with pytest.raises(ValueError):
+            parse_lane_workers("bulk=0")
+
+    def test_jobs_are_routed_to_their_lane(self):
+        from app.services.notifications.dispatcher import NotificationDispatcher
+
+        with patch("app.services.notifications.dispatcher.Redis"), \
+             patch("app.services.notifications.dispatcher.Queue") as mock_queue_cls:
+            NotificationDispatcher(MagicMock())
+        assert mock_queue_cls.call_args.args[0] == ALERTS_QUEUE
+
+        from app.workers.jobs import process_broadcast
+
+        assert "Queue(BULK_QUEUE" in inspect.getsource(process_broadcast)
+
+
+class TestLaneMetrics:
+    def test_wait_samples_are_capped_and_summarized(self):
+        redis_client = SampleRedis()
+        metrics = LaneMetrics(redis_client)
+        with patch.object(LaneMetrics, "MAX_SAMPLES", 10):
+            for seconds in range(1, 21):
+                metrics.record_wait(BULK_QUEUE, seconds)
+
+        stats = metrics.wait_stats(BULK_QUEUE)
+        # Only the 10 most recent samples (11..20) are kept
+        assert stats == {"samples": 10, "p50": 16.0, "p95": 20.0, "max": 20.0}
+        assert metrics.wait_stats(REALTIME_QUEUE)["samples"] == 0
+
+    def test_worker_records_time_spent_in_queue(self):
+        class BaseWorker:
+            def prepare_job_execution(self, job, remove_from_intermediate_queue=False):
+                pass
+
+        class Worker(_LaneMetricsMixin, BaseWorker):
+            connection = SampleRedis()
+
+        worker = Worker()
+        job = SimpleNamespace(
+            origin=REALTIME_QUEUE,
+            enqueued_at=datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=5),
+        )
+        worker.prepare_job_execution(job)
+
+        stats = LaneMetrics(worker.connection).wait_stats(REALTIME_QUEUE)
+        assert stats["samples"] == 1
+        assert 5 <= stats["max"] < 10
+
+    def test_simple_worker_marks_the_process_as_running_jobs_in_process(self):
+        with (
+            patch.object(queues, "_jobs_in_process", False),
+            patch.object(SimpleWorker, "__init__", return_value=None),
+            patch.object(db_session_module, "use_unpooled_engine"),
+        ):
+            assert queues.jobs_run_in_process() is False
+            SimpleLaneWorker([REALTIME_QUEUE], connection=MagicMock())
+            assert queues.jobs_run_in_process() is True
+
+    def test_back_to_back_in_process_jobs_get_connections_from_their_own_loop(self):
+        original_engine = db_session_module.engine
+
+        async def job() -> int:
+            # What a send job does: one asyncio.run per job, sessions from async_session
+            async with db_session_module.async_session() as session:
+                return await session.scalar(text("SELECT 1"))
+
+        try:
+            with (
+                patch.object(queues, "_jobs_in_process", False),
+                patch.object(SimpleWorker, "__init__", return_value=None),
+                patch.object(db_session_module.settings, "database_url", "sqlite+aiosqlite://"),
+            ):
+                SimpleLaneWorker([REALTIME_QUEUE], connection=MagicMock())
+                assert isinstance(db_session_module.async_session.kw["bind"].pool, NullPool)
+                assert [asyncio.run(job()), asyncio.run(job())] == [1, 1]
+        finally:
+            db_session_module.engine = original_engine
+            db_session_module.async_session.configure(bind=original_engine)
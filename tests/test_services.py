@@ -54,6 +54,7 @@ async def test_attendance_service_registers_event(monkeypatch) -> None:
         synced_at=None,
     )
     service.attendance_repo.create_event = AsyncMock(return_value=fake_event)
+    service.no_show_repo.resolve_checked_in = AsyncMock(return_value=1)
 
     payload = AttendanceEventCreate(
         student_id=1,
@@ -66,6 +67,7 @@ async def test_attendance_service_registers_event(monkeypatch) -> None:
 
     assert result.id == 42
     service.attendance_repo.create_event.assert_awaited()
+    service.no_show_repo.resolve_checked_in.assert_awaited_once()
     session.commit.assert_awaited()
 
 
@@ -75,6 +77,7 @@ async def test_schedule_service_creates_rule(monkeypatch) -> None:
     session.commit = AsyncMock()
 
     service = ScheduleService(session)
+    service.calendar = AsyncMock()
     fake_schedule = SimpleNamespace(
         id=7,
         course_id=1,
@@ -89,6 +92,7 @@ async def test_schedule_service_creates_rule(monkeypatch) -> None:
 
     assert result.id == 7
     service.repository.create.assert_awaited()
+    service.calendar.on_schedule_changed.assert_awaited_with(1)
     session.commit.assert_awaited()
 
 
@@ -314,23 +318,23 @@ async def test_broadcast_service_preview_and_enqueue(monkeypatch) -> None:
         def __init__(self, session):
             self.session = session
 
-        async def list_all(self):
-            return [SimpleNamespace(id=1)]
+        @staticmethod
+        def audience_all():
+            return "all"
 
-        async def list_by_student_ids(self, ids):
-            return [SimpleNamespace(id=2)]
+        @staticmethod
+        def audience_for_courses(course_ids):
+            return ("courses", tuple(course_ids))
 
-    class FakeStudentRepo:
-        def __init__(self, session):
-            self.session = session
+        async def list_audience_ids(self, audience):
+            return [1] if audience == "all" else [2]
 
-        async def list_by_course(self, course_id: int):
-            return [SimpleNamespace(id=10)]
+        async def count_audience_channels(self, audience):
+            return {"total": 1, "whatsapp": 1, "email": 0, "push": 0}
 
     monkeypatch.setattr("app.services.broadcast_service.Redis", FakeRedis)
     monkeypatch.setattr("app.services.broadcast_service.Queue", FakeQueue)
     monkeypatch.setattr("app.services.broadcast_service.GuardianRepository", FakeGuardianRepo)
-    monkeypatch.setattr("app.services.broadcast_service.StudentRepository", FakeStudentRepo)
 
     service = BroadcastService(MagicMock())
     payload = BroadcastCreate(
@@ -342,6 +346,7 @@ async def test_broadcast_service_preview_and_enqueue(monkeypatch) -> None:
 
     preview = await service.preview_broadcast(payload)
     assert preview.recipients == 1
+    assert preview.with_whatsapp == 1
 
     job_id = await service.enqueue_broadcast(payload)
     assert job_id
@@ -363,46 +368,43 @@ async def test_detect_no_show_alerts(monkeypatch) -> None:
     student = SimpleNamespace(id=1, full_name="Sofía", guardians=[guardian])
     guardian.students = [student]
 
-    schedule = SimpleNamespace(
-        id=3,
-        course_id=1,
-        in_time=time(8, 0),
-        course=SimpleNamespace(name="1° Básico A"),
-    )
-
-    service.schedule_repo.list_by_weekday = AsyncMock(return_value=[schedule])
-    service.student_repo.list_by_course = AsyncMock(return_value=[student])
-    # R2-B3 fix: Mock the new batch query method instead of the individual method
-    service.attendance_repo.get_student_ids_with_in_event_on_date = AsyncMock(return_value=set())
+    course = SimpleNamespace(id=1, name="1° Básico A")
     fake_alert = SimpleNamespace(
         id=5,
         status="PENDING",
         notification_attempts=0,
         last_notification_at=None,
-        course_id=schedule.course_id,
+        course_id=course.id,
+        student=student,
+        guardian=guardian,
+        course=course,
     )
 
     class FakeAlertRepo:
         def __init__(self):
-            self.created = []
+            self.inserted = []
+            self.due_calls = []
 
-        async def get_by_unique(self, student_id, guardian_id, alert_date):
-            return None
+        async def insert_missing(self, **kwargs):
+            self.inserted.append(kwargs)
+            return [fake_alert.id]
 
-        async def create(self, **kwargs):
-            self.created.append(kwargs)
-            return fake_alert
-
-        async def get_or_create(self, **kwargs):
-            self.created.append(kwargs)
-            return fake_alert, True
+        async def list_due(self, alert_date, notified_before, course_ids=None):
+            self.due_calls.append((alert_date, notified_before))
+            return [fake_alert]
 
     service.no_show_repo = FakeAlertRepo()
+    service.calendar = AsyncMock()
 
     alerts = await service.detect_no_show_alerts(datetime(2024, 1, 10, 9, 0, tzinfo=timezone.utc))
     assert len(alerts) == 1
     assert alerts[0]["alert"] is fake_alert
     assert alerts[0]["guardian"].id == guardian.id
+    assert alerts[0]["course"] is course
+    # 09:00 minus the grace period, on the day materialized in the calendar
+    assert service.no_show_repo.inserted[0]["cutoff"] == time(8, 45)
+    assert service.no_show_repo.inserted[0]["alert_date"] == date(2024, 1, 10)
+    service.calendar.get_days.assert_awaited_with(date(2024, 1, 10), date(2024, 1, 10))
 
 
 @pytest.mark.anyio("asyncio")
@@ -443,16 +445,16 @@ async def test_dashboard_service_computes_stats(monkeypatch) -> None:
     session = MagicMock()
     service = DashboardService(session)
 
-    service.schedule_repo = MagicMock()
+    service.calendar = MagicMock()
     service.student_repo = MagicMock()
-    # R12-P5 fix: generate_presigned_url is now async
-    async def async_presigned_url(key, expires=3600):
-        return f"https://cdn/{key}"
-    service.photo_service = SimpleNamespace(generate_presigned_url=async_presigned_url)
+    def presign_urls(keys, expires=3600):
+        return {key: f"https://cdn/{key}" for key in keys if key}
+    service.photo_service = SimpleNamespace(presign_urls=presign_urls)
 
     target_date = date(2024, 1, 10)
-    schedule = SimpleNamespace(course_id=1, in_time=time(8, 0))
-    service.schedule_repo.list_by_weekday = AsyncMock(return_value=[schedule])
+    calendar_day = SimpleNamespace(course_id=1, date=target_date, in_time=time(8, 0))
+    service.calendar.school_days = AsyncMock(return_value={(1, target_date): calendar_day})
+    service.calendar.excused = AsyncMock(return_value=set())
 
     students = [
         SimpleNamespace(id=1, course_id=1, full_name="Ana"),
@@ -471,6 +473,8 @@ async def test_dashboard_service_computes_stats(monkeypatch) -> None:
                 device_id="D1",
                 occurred_at=datetime(2024, 1, 10, 8, 5),
                 photo_ref="photos/p1",
+                photo_thumb_ref="photos/p1.thumb.webp",
+                photo_medium_ref=None,
             ),
             students[0],
             SimpleNamespace(id=1, name="1° Básico A"),
@@ -484,6 +488,8 @@ async def test_dashboard_service_computes_stats(monkeypatch) -> None:
                 device_id="D1",
                 occurred_at=datetime(2024, 1, 10, 8, 45),
                 photo_ref=None,
+                photo_thumb_ref=None,
+                photo_medium_ref=None,
             ),
             students[1],
             SimpleNamespace(id=1, name="1° Básico A"),
@@ -508,6 +514,7 @@ async def test_dashboard_service_computes_stats(monkeypatch) -> None:
     assert snapshot.stats.no_in_count == 1
     assert snapshot.stats.with_photos == 1
     assert snapshot.events[0].photo_url == "https://cdn/photos/p1"
+    assert snapshot.events[0].photo_thumb_url == "https://cdn/photos/p1.thumb.webp"
 
 
 @pytest.mark.anyio("asyncio")
@@ -516,14 +523,18 @@ async def test_dashboard_service_report(monkeypatch) -> None:
     service = DashboardService(session)
 
     course = SimpleNamespace(id=1, name="1° Básico A")
-    schedule = SimpleNamespace(course_id=1, in_time=time(8, 0), weekday=2)
-    schedule_next = SimpleNamespace(course_id=1, in_time=time(8, 0), weekday=3)
+    school_days = {
+        (1, day): SimpleNamespace(course_id=1, date=day, in_time=time(8, 0))
+        for day in (date(2024, 1, 10), date(2024, 1, 11))
+    }
     students = [
         SimpleNamespace(id=1, course_id=1, full_name="Ana"),
         SimpleNamespace(id=2, course_id=1, full_name="Ben"),
     ]
 
-    service.schedule_repo.list_by_course_ids = AsyncMock(return_value=[schedule, schedule_next])
+    service.calendar = MagicMock()
+    service.calendar.school_days = AsyncMock(return_value=school_days)
+    service.calendar.excused = AsyncMock(return_value=set())
     service.student_repo.list_by_course_ids = AsyncMock(return_value=students)
 
     events_raw = [
@@ -651,6 +662,7 @@ async def test_schedule_service_updates_entry() -> None:
     session.commit = AsyncMock()
 
     service = ScheduleService(session)
+    service.calendar = AsyncMock()
     fake_schedule = SimpleNamespace(
         id=9,
         course_id=1,
@@ -665,6 +677,7 @@ async def test_schedule_service_updates_entry() -> None:
 
     assert result.id == fake_schedule.id
     service.repository.update.assert_awaited_with(fake_schedule.id, weekday=2, in_time=fake_schedule.in_time, out_time=fake_schedule.out_time)
+    service.calendar.on_schedule_changed.assert_awaited_with(1)
     session.commit.assert_awaited()
 
 
@@ -714,10 +727,12 @@ async def test_absence_service_updates_status() -> None:
     repo.update_status = AsyncMock(return_value=absence)
     service = AbsenceService(session)
     service.absence_repo = repo  # type: ignore
+    service.calendar = AsyncMock()
 
     result = await service.update_status(1, AbsenceStatus.APPROVED)
     assert result.status == "PENDING" or result.status  # status is updated inside repo
     repo.update_status.assert_awaited_with(1, "APPROVED")
+    service.calendar.on_absence_changed.assert_awaited_with(1, date(2024, 1, 10), date(2024, 1, 11))
     session.commit.assert_awaited()
 
 
@@ -738,6 +753,10 @@ async def test_notification_service_list_and_summary(monkeypatch) -> None:
         payload={"recipient": "+56912345678"},
     )
     repo.list_notifications = AsyncMock(return_value=[notification])
+    repo.count_by_window = AsyncMock(return_value=[(0, "sent", "WHATSAPP", "INGRESO_OK", 1, 1, 1)])
+    cache = MagicMock()
+    cache.load.return_value = None  # Redis unavailable: plain GROUP BY
+    monkeypatch.setattr("app.services.notification_service.get_summary_cache", lambda: cache)
 
     service = NotificationService(session)
     service.repository = repo  # type: ignore
@@ -751,3 +770,4 @@ async def test_notification_service_list_and_summary(monkeypatch) -> None:
     summary = await service.summary()
     assert summary.total == 1
     assert summary.by_channel["WHATSAPP"] == 1
+    assert summary.by_status == {"sent": 1}
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import date, datetime, time, timezone
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -36,7 +36,9 @@ class TestScheduleService:
 
     @pytest.fixture
     def schedule_service(self, mock_session):
-        return ScheduleService(mock_session)
+        service = ScheduleService(mock_session)
+        service.calendar = AsyncMock()
+        return service
 
     @pytest.mark.asyncio
     async def test_list_course_schedule(self, schedule_service):
@@ -129,16 +131,38 @@ class TestScheduleService:
     @pytest.mark.asyncio
     async def test_delete_exception_success(self, schedule_service, mock_session):
         """Should delete a schedule exception."""
+        schedule_service.repository.get_exception = AsyncMock(
+            return_value=SimpleNamespace(id=1, date=date(2025, 12, 25), course_id=None)
+        )
         schedule_service.repository.delete_exception = AsyncMock(return_value=True)
 
         await schedule_service.delete_exception(1)
 
+        schedule_service.calendar.on_exception_changed.assert_awaited_once_with(date(2025, 12, 25), None)
         mock_session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_exceptions_for_today_replan_no_show_timers(self, schedule_service):
+        """Only today's exceptions move thresholds that are already armed."""
+        today = datetime.now(timezone.utc).date()
+        schedule_service.repository.get_exception = AsyncMock(
+            side_effect=[
+                SimpleNamespace(id=1, date=today, course_id=3),
+                SimpleNamespace(id=2, date=date(2025, 12, 25), course_id=None),
+            ]
+        )
+        schedule_service.repository.delete_exception = AsyncMock(return_value=True)
+
+        with patch("app.services.schedule_service.request_replan") as mock_replan:
+            await schedule_service.delete_exception(1)
+            mock_replan.assert_called_once_with()
+            await schedule_service.delete_exception(2)
+            mock_replan.assert_called_once_with()
+
     @pytest.mark.asyncio
     async def test_delete_exception_not_found(self, schedule_service):
         """Should raise error when exception not found."""
-        schedule_service.repository.delete_exception = AsyncMock(return_value=False)
+        schedule_service.repository.get_exception = AsyncMock(return_value=None)
 
         with pytest.raises(ValueError, match="Excepción no encontrada"):
             await schedule_service.delete_exception(999)
@@ -160,7 +184,9 @@ class TestAbsenceService:
 
     @pytest.fixture
     def absence_service(self, mock_session):
-        return AbsenceService(mock_session)
+        service = AbsenceService(mock_session)
+        service.calendar = AsyncMock()
+        return service
 
     @pytest.fixture
     def admin_user(self):
@@ -396,12 +422,17 @@ class TestAbsenceService:
     @pytest.mark.asyncio
     async def test_update_status(self, absence_service, mock_session):
         """Should update absence status."""
-        fake_record = SimpleNamespace(id=1, status="APPROVED")
+        fake_record = SimpleNamespace(
+            id=1, student_id=3, start_date=date(2025, 1, 15), end_date=date(2025, 1, 16), status="APPROVED"
+        )
         absence_service.absence_repo.update_status = AsyncMock(return_value=fake_record)
 
         result = await absence_service.update_status(1, AbsenceStatus.APPROVED)
 
         assert result.status == "APPROVED"
+        absence_service.calendar.on_absence_changed.assert_awaited_once_with(
+            3, date(2025, 1, 15), date(2025, 1, 16)
+        )
         mock_session.commit.assert_called_once()
 
 
@@ -0,0 +1,139 @@
+"""Tests for the pluggable evidence storage backends."""
+
+import io
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from urllib.parse import urlsplit
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import storage as storage_api
+from app.core.config import settings
+from app.services.photo_service import PhotoService
+from app.services.storage import registry
+from app.services.storage.local import LocalStorage
+from app.services.storage.s3 import S3Storage
+
+
+@pytest.fixture
+def local_backend(tmp_path):
+    with (
+        patch.object(settings, "storage_backend", "local"),
+        patch.object(settings, "local_storage_root", str(tmp_path)),
+    ):
+        registry.reset_storage()
+        yield registry.get_storage()
+    registry.reset_storage()
+
+
+@pytest.fixture
+def storage_client(local_backend):
+    app = FastAPI()
+    app.include_router(storage_api.router, prefix="/api/v1/storage")
+    with TestClient(app) as client:
+        yield client
+
+
+class TestLocalStorage:
+    @pytest.mark.asyncio
+    async def test_photo_service_round_trip(self, tmp_path):
+        service = PhotoService(LocalStorage(tmp_path, prefix="colegio-a"))
+
+        await service.store_photo("events/1/abc.jpg", b"\xff\xd8\xffdata", "image/jpeg")
+
+        assert (tmp_path / "colegio-a/events/1/abc.jpg").read_bytes() == b"\xff\xd8\xffdata"
+        assert await service.read_object("events/1/abc.jpg") == b"\xff\xd8\xffdata"
+        assert await service.read_header("events/1/abc.jpg", 3) == (b"\xff\xd8\xff", "image/jpeg")
+        assert await service.delete_photos(["events/1/abc.jpg", "events/1/missing.jpg"]) == set()
+        assert await service.read_object("events/1/abc.jpg") is None
+        assert await service.read_header("events/1/abc.jpg") is None
+
+    def test_keys_cannot_escape_the_root(self, tmp_path):
+        backend = LocalStorage(tmp_path / "evidence")
+
+        with pytest.raises(ValueError):
+            backend.put("../outside.jpg", io.BytesIO(b"x"), "image/jpeg")
+
+    def test_signed_url_serves_the_file(self, local_backend, storage_client):
+        local_backend.put("events/1/abc.jpg", io.BytesIO(b"jpeg-bytes"), "image/jpeg")
+        url = urlsplit(local_backend.presign_get("events/1/abc.jpg", 60))
+
+        response = storage_client.get(f"{url.path}?{url.query}")
+
+        assert response.status_code == 200
+        assert response.content == b"jpeg-bytes"
+        assert response.headers["content-type"] == "image/jpeg"
+
+    def test_tampered_or_expired_url_is_rejected(self, local_backend, storage_client):
+        local_backend.put("events/1/abc.jpg", io.BytesIO(b"jpeg-bytes"), "image/jpeg")
+        url = urlsplit(local_backend.presign_get("events/1/abc.jpg", 60))
+        other = urlsplit(local_backend.presign_get("events/1/abc.jpg", -1))
+
+        assert storage_client.get(f"{url.path.replace('abc', 'xyz')}?{url.query}").status_code == 403
+        assert storage_client.get(f"{other.path}?{other.query}").status_code == 403
+
+    def test_presigned_post_upload(self, local_backend, storage_client):
+        ticket = local_backend.presign_post("events/2/a.png", "image/png", 8, 60)
+        path = urlsplit(ticket["url"]).path
+
+        too_big = storage_client.post(path, data=ticket["fields"], files={"file": ("a.png", b"123456789")})
+        wrong_type = storage_client.post(
+            path, data={**ticket["fields"], "Content-Type": "image/jpeg"}, files={"file": ("a.png", b"1")}
+        )
+        ok = storage_client.post(path, data=ticket["fields"], files={"file": ("a.png", b"png")})
+
+        assert too_big.status_code == 413
+        assert wrong_type.status_code == 403
+        assert ok.status_code == 204
+        assert local_backend.read_range("events/2/a.png", 16) == (b"png", "image/png")
+
+
+class TestTenantRouting:
+    @pytest.fixture(autouse=True)
+    def s3_backend(self):
+        with (
+            patch.object(settings, "storage_backend", "s3"),
+            patch.object(registry, "create_s3_client", MagicMock(side_effect=lambda: MagicMock())) as create,
+        ):
+            registry.reset_storage()
+            yield create
+        registry.reset_storage()
+
+    @pytest.mark.asyncio
+    async def test_tenant_bucket_and_prefix_share_one_client(self, s3_backend):
+        configs = {
+            1: SimpleNamespace(s3_bucket="colegio-a", s3_prefix="fotos"),
+            2: SimpleNamespace(s3_bucket=None, s3_prefix="colegio-b"),
+            3: None,
+        }
+        cache = SimpleNamespace(get=AsyncMock(side_effect=lambda session, tenant_id: configs[tenant_id]))
+
+        with (
+            patch("app.services.tenant_config_cache.tenant_config_cache", cache),
+            patch.object(registry, "async_session", MagicMock()),
+        ):
+            first = await registry.tenant_storage(tenant_id=1)
+            again = await registry.tenant_storage(tenant_id=1)
+            second = await registry.tenant_storage(tenant_id=2)
+            default = await registry.tenant_storage(tenant_id=3)
+
+        assert isinstance(first, S3Storage)
+        assert first is again
+        assert (first.bucket, first.prefix) == ("colegio-a", "fotos/")
+        assert (second.bucket, second.prefix) == (settings.s3_bucket, "colegio-b/")
+        assert default is registry.get_storage()
+        assert first.client is second.client is default.client
+        assert s3_backend.call_count == 1
+
+    def test_s3_keys_are_prefixed_and_failures_unprefixed(self):
+        client = MagicMock()
+        client.delete_objects.return_value = {"Errors": [{"Key": "fotos/events/1/b.jpg", "Message": "denied"}]}
+        backend = S3Storage(client, "colegio-a", "fotos")
+
+        failed = backend.delete_many(["events/1/a.jpg", "events/1/b.jpg"])
+
+        objects = client.delete_objects.call_args.kwargs["Delete"]["Objects"]
+        assert objects == [{"Key": "fotos/events/1/a.jpg"}, {"Key": "fotos/events/1/b.jpg"}]
+        assert failed == {"events/1/b.jpg"}
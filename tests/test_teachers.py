@@ -165,13 +165,23 @@ def test_teacher_bulk_attendance_success(app_with_teacher_auth):
         async def create_event(self, **kwargs):
             return SimpleNamespace(id=1, **kwargs)
 
+    class FakeAlertRepo:
+        def __init__(self):
+            self.resolved = []
+
+        async def resolve_checked_in(self, student_ids, alert_date, resolved_at):
+            self.resolved.append(set(student_ids))
+            return 0
+
     class FakeSession:
         async def commit(self):
             pass
 
-    from app.api.v1.teachers import get_teacher_repo, get_attendance_repo
+    alert_repo = FakeAlertRepo()
+    from app.api.v1.teachers import get_teacher_repo, get_attendance_repo, get_no_show_repo
     app.dependency_overrides[get_teacher_repo] = lambda: FakeTeacherRepo()
     app.dependency_overrides[get_attendance_repo] = lambda: FakeAttendanceRepo()
+    app.dependency_overrides[get_no_show_repo] = lambda: alert_repo
     app.dependency_overrides[deps.get_db] = lambda: FakeSession()
 
     with TestClient(app) as client:
@@ -188,6 +198,7 @@ def test_teacher_bulk_attendance_success(app_with_teacher_auth):
         data = resp.json()
         assert data["processed"] == 2
         assert data["errors"] == []
+        assert alert_repo.resolved == [{1, 2}]
 
 
 def test_teacher_bulk_attendance_wrong_course(app_with_teacher_auth):
@@ -0,0 +1,94 @@
+"""Tests for cached Fernet and decrypted tenant config cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from cryptography.fernet import Fernet, MultiFernet
+
+from app.core import encryption
+from app.db.repositories.tenant_configs import DecryptedTenantConfig
+from app.services.tenant_config_cache import TenantConfigCache
+
+
+def _config(tenant_id: int = 1, token: str = "tok") -> DecryptedTenantConfig:
+    return DecryptedTenantConfig(
+        tenant_id=tenant_id,
+        whatsapp_access_token=token,
+        whatsapp_phone_number_id="123",
+        ses_region="us-east-1",
+        ses_source_email=None,
+        ses_access_key=None,
+        ses_secret_key=None,
+        s3_bucket=None,
+        s3_prefix=None,
+        device_api_key=None,
+    )
+
+
+class TestFernetCache:
+    def test_fernet_instance_is_reused(self):
+        assert encryption._get_fernet() is encryption._get_fernet()
+
+    def test_multi_key_rotation(self):
+        """First key encrypts; older keys still decrypt."""
+        old_key = Fernet.generate_key().decode()
+        new_key = Fernet.generate_key().decode()
+        old_token = Fernet(old_key.encode()).encrypt(b"secret")
+
+        with patch.object(encryption.settings, "encryption_key", f"{new_key},{old_key}"):
+            assert isinstance(encryption._get_fernet(), MultiFernet)
+            assert encryption.decrypt(old_token) == "secret"
+            assert Fernet(new_key.encode()).decrypt(encryption.encrypt("x")) == b"x"
+
+
+class TestTenantConfigCache:
+    @pytest.mark.asyncio
+    async def test_hit_skips_database(self):
+        cache = TenantConfigCache(ttl_seconds=60, redis_client=MagicMock(get=MagicMock(return_value="1")))
+        with patch(
+            "app.services.tenant_config_cache.TenantConfigRepository.get_decrypted",
+            new_callable=AsyncMock,
+            return_value=_config(),
+        ) as mock_get:
+            first = await cache.get(MagicMock(), 1)
+            second = await cache.get(MagicMock(), 1)
+
+        assert first is second
+        mock_get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_version_bump_reloads(self):
+        """Another process bumping the Redis version forces a reload."""
+        redis_client = MagicMock()
+        redis_client.get.side_effect = ["1", "2"]
+        cache = TenantConfigCache(ttl_seconds=60, redis_client=redis_client)
+        with patch(
+            "app.services.tenant_config_cache.TenantConfigRepository.get_decrypted",
+            new_callable=AsyncMock,
+            side_effect=[_config(token="old"), _config(token="new")],
+        ):
+            assert (await cache.get(MagicMock(), 1)).whatsapp_access_token == "old"
+            assert (await cache.get(MagicMock(), 1)).whatsapp_access_token == "new"
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_reloads(self):
+        cache = TenantConfigCache(ttl_seconds=0, redis_client=MagicMock(get=MagicMock(return_value=None)))
+        with patch(
+            "app.services.tenant_config_cache.TenantConfigRepository.get_decrypted",
+            new_callable=AsyncMock,
+            return_value=_config(),
+        ) as mock_get:
+            await cache.get(MagicMock(), 1)
+            await cache.get(MagicMock(), 1)
+
+        assert mock_get.await_count == 2
+
+    def test_invalidate_bumps_redis_version(self):
+        redis_client = MagicMock()
+        cache = TenantConfigCache(redis_client=redis_client)
+        cache._entries[5] = (float("inf"), "0", _config(5))
+
+        cache.invalidate(5)
+
+        assert 5 not in cache._entries
+        redis_client.incr.assert_called_once_with("tenant_config:version:5")
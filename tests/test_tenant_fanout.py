@@ -0,0 +1,76 @@
+"""Tests for running scheduled jobs across tenants."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.workers import tenant_fanout
+from app.workers.jobs import detect_no_ingreso
+
+
+TENANTS = [(1, "norte", "tenant_norte"), (2, "sur", "tenant_sur"), (3, "centro", "tenant_centro")]
+
+
+@pytest.fixture
+def no_metrics():
+    with patch.object(tenant_fanout, "_record_metrics") as mock_metrics:
+        yield mock_metrics
+
+
+class TestRunForEachTenant:
+    @pytest.mark.asyncio
+    async def test_tenants_run_concurrently_up_to_the_limit(self, no_metrics):
+        running, peak = 0, 0
+
+        async def job(tenant_id, schema):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        with patch.object(tenant_fanout, "list_active_tenants", AsyncMock(return_value=TENANTS)):
+            results = await tenant_fanout.run_for_each_tenant("test", job, concurrency=2, timeout=5)
+
+        assert peak == 2
+        assert [r.status for r in results] == ["ok", "ok", "ok"]
+        no_metrics.assert_called_once_with("test", results)
+
+    @pytest.mark.asyncio
+    async def test_slow_and_failing_tenants_do_not_stop_the_others(self, no_metrics):
+        done = []
+
+        async def job(tenant_id, schema):
+            if tenant_id == 1:
+                await asyncio.sleep(5)
+            if tenant_id == 2:
+                raise RuntimeError("schema missing")
+            done.append(schema)
+
+        with patch.object(tenant_fanout, "list_active_tenants", AsyncMock(return_value=TENANTS)):
+            results = await tenant_fanout.run_for_each_tenant("test", job, concurrency=3, timeout=0.05)
+
+        assert [(r.tenant, r.status) for r in results] == [("norte", "timeout"), ("sur", "error"), ("centro", "ok")]
+        assert results[1].error == "schema missing"
+        assert done == ["tenant_centro"]
+
+    @pytest.mark.asyncio
+    async def test_single_tenant_deployment_runs_on_public_schema(self, no_metrics):
+        job = AsyncMock()
+        with patch.object(tenant_fanout, "list_active_tenants", AsyncMock(return_value=[])):
+            results = await tenant_fanout.run_for_each_tenant("test", job)
+
+        job.assert_awaited_once_with(None, None)
+        assert results[0].tenant == "public"
+
+
+@pytest.mark.asyncio
+async def test_no_show_detection_fans_out_per_tenant(no_metrics):
+    with patch.object(tenant_fanout, "list_active_tenants", AsyncMock(return_value=TENANTS)), \
+         patch.object(detect_no_ingreso, "_detect_and_notify", AsyncMock()) as mock_detect:
+        await detect_no_ingreso._detect_all_tenants()
+
+    assert sorted(call.args[1:] for call in mock_detect.await_args_list) == [
+        (1, "tenant_norte"), (2, "tenant_sur"), (3, "tenant_centro"),
+    ]
@@ -0,0 +1,104 @@
+"""Tests for the paginated super-admin tenant list and recorded student counts."""
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.super_admin import tenants as tenants_api
+from app.db.models.tenant import Tenant
+from app.db.models.usage_stat import UsageStat
+from app.db.repositories.tenants import TenantRepository
+from app.db.repositories.usage_stats import UsageStatRepository
+
+ACTIVE = UsageStat.METRIC_ACTIVE_STUDENTS
+
+
+@pytest.fixture
+async def public_session():
+    """SQLite session with ``public`` and two tenant schemas as attached databases."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def attach_schemas(dbapi_connection, connection_record):
+        for schema in ("public", "tenant_alfa", "tenant_beta"):
+            dbapi_connection.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Tenant.__table__.create)
+        await conn.run_sync(UsageStat.__table__.create)
+        for schema in ("tenant_alfa", "tenant_beta"):
+            await conn.execute(text(f"CREATE TABLE {schema}.students (id INTEGER PRIMARY KEY, status VARCHAR(32))"))
+
+    async with async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _tenants(session, *names):
+    tenants = [
+        Tenant(slug=name.lower(), name=name, created_at=datetime(2024, 1, index + 1, tzinfo=timezone.utc))
+        for index, name in enumerate(names)
+    ]
+    session.add_all(tenants)
+    await session.flush()
+    return tenants
+
+
+class TestTenantRepository:
+    @pytest.mark.asyncio
+    async def test_student_counts_use_one_union_query(self, public_session):
+        await public_session.execute(
+            text("INSERT INTO tenant_alfa.students (status) VALUES ('ACTIVE'), ('ACTIVE'), ('INACTIVE')")
+        )
+        await public_session.execute(text("INSERT INTO tenant_beta.students (status) VALUES ('ACTIVE')"))
+
+        counts = await TenantRepository(public_session).count_active_students({1: "tenant_alfa", 2: "tenant_beta"})
+
+        assert counts == {1: 2, 2: 1}
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_the_keyset_in_either_direction(self, public_session):
+        alfa, beta, gamma, delta = await _tenants(public_session, "Alfa", "Beta", "Gamma", "Delta")
+        usage = UsageStatRepository(public_session)
+        await usage.set_values(ACTIVE, date(2024, 5, 1), {alfa.id: 900, beta.id: 10, gamma.id: 300})
+        # Only the latest day counts
+        await usage.set_values(ACTIVE, date(2024, 5, 2), {alfa.id: 50})
+        repo = TenantRepository(public_session)
+
+        first = await repo.list_page(sort="student_count", descending=True, limit=2)
+        rest = await repo.list_page(sort="student_count", descending=True, after=(first[-1][1], first[-1][0].id))
+        by_name = await repo.list_page(sort="name", after=("Beta", beta.id))
+
+        assert [(tenant.name, count) for tenant, count in first] == [("Gamma", 300), ("Alfa", 50)]
+        assert [(tenant.name, count) for tenant, count in rest] == [("Beta", 10), ("Delta", None)]
+        assert [tenant.name for tenant, _ in by_name] == ["Delta", "Gamma"]
+
+
+class TestListTenantsEndpoint:
+    @pytest.mark.asyncio
+    async def test_missing_counts_are_computed_and_cursor_continues(self, public_session):
+        alfa, beta, gamma = await _tenants(public_session, "Alfa", "Beta", "Gamma")
+        await UsageStatRepository(public_session).set_values(ACTIVE, date(2024, 5, 1), {alfa.id: 7})
+        # student_count only covers ACTIVE students, also when counted live
+        await public_session.execute(
+            text("INSERT INTO tenant_beta.students (status) VALUES ('ACTIVE'), ('INACTIVE'), ('WITHDRAWN')")
+        )
+        admin = SimpleNamespace(id=1)
+
+        first = await tenants_api.list_tenants(
+            include_inactive=False, sort="name", order="asc", cursor=None, limit=2,
+            admin=admin, session=public_session,
+        )
+        second = await tenants_api.list_tenants(
+            include_inactive=False, sort="name", order="asc", cursor=first.next_cursor, limit=2,
+            admin=admin, session=public_session,
+        )
+
+        assert [(item.name, item.student_count) for item in first.items] == [("Alfa", 7), ("Beta", 1)]
+        assert first.total == 3
+        assert [item.name for item in second.items] == ["Gamma"]
+        assert second.next_cursor is None
@@ -0,0 +1,94 @@
+"""Tests for tenant schema building and the spare schema pool."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+
+from app.db import tenant_schemas
+from app.services.tenant_provisioning_service import TenantProvisioningService
+
+
+def test_tenant_tables_cover_every_model_without_schema():
+    names = {table.name for table in tenant_schemas.tenant_tables()}
+
+    # Missing from the old hand-written list (or misspelt in it)
+    assert {"push_subscriptions", "student_guardians", "teacher_courses"} <= names
+    assert not names & {"tenants", "tenant_configs", "usage_stats"}
+
+
+def test_tables_are_created_inside_the_schema():
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS tenant_alfa")
+
+    with engine.begin() as conn:
+        tenant_schemas.create_tables(conn, "tenant_alfa")
+        created = set(inspect(conn).get_table_names(schema="tenant_alfa"))
+        main = set(inspect(conn).get_table_names())
+
+    assert created == {table.name for table in tenant_schemas.tenant_tables()}
+    assert main == set()
+
+
+def test_invalid_schema_names_are_rejected():
+    with pytest.raises(ValueError):
+        tenant_schemas.create_tables(MagicMock(), "public; DROP SCHEMA public")
+
+
+class TestProvisionSchema:
+    @pytest.fixture
+    def schemas(self):
+        with (
+            patch.object(tenant_schemas, "head_revision", MagicMock(return_value="0002")),
+            patch.object(tenant_schemas, "database_revision", AsyncMock(return_value="0002")),
+            patch.object(tenant_schemas, "claim_spare", AsyncMock(return_value=True)) as claim,
+            patch.object(tenant_schemas, "build_schema", AsyncMock()) as build,
+        ):
+            yield claim, build
+
+    @pytest.mark.asyncio
+    async def test_spare_schema_is_claimed_when_available(self, schemas):
+        claim, build = schemas
+        service = TenantProvisioningService(MagicMock())
+
+        assert await service._provision_schema("tenant_alfa") is True
+        claim.assert_awaited_once_with(service.session, "tenant_alfa")
+        build.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_schema_is_built_when_the_pool_is_empty(self, schemas):
+        claim, build = schemas
+        claim.return_value = False
+        service = TenantProvisioningService(MagicMock())
+
+        assert await service._provision_schema("tenant_alfa") is False
+        build.assert_awaited_once_with(service.session, "tenant_alfa")
+
+    @pytest.mark.asyncio
+    async def test_database_behind_the_code_is_refused(self, schemas):
+        claim, build = schemas
+        tenant_schemas.database_revision.return_value = "0001"
+
+        with pytest.raises(RuntimeError, match="alembic upgrade head"):
+            await TenantProvisioningService(MagicMock())._provision_schema("tenant_alfa")
+        claim.assert_not_awaited()
+        build.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_spares_are_replaced():
+    session = MagicMock(execute=AsyncMock(), commit=AsyncMock())
+    spares = {"tenant__spare_aaa": "0001", "tenant__spare_bbb": "0002"}
+
+    with (
+        patch.object(tenant_schemas, "head_revision", MagicMock(return_value="0002")),
+        patch.object(tenant_schemas, "list_spares", AsyncMock(return_value=spares)),
+        patch.object(tenant_schemas, "build_schema", AsyncMock()) as build,
+    ):
+        assert await tenant_schemas.replenish_spares(session, 3) == (2, 1)
+
+    assert str(session.execute.await_args_list[0].args[0]) == "DROP SCHEMA tenant__spare_aaa CASCADE"
+    assert all(call.args[1].startswith(tenant_schemas.SPARE_SCHEMA_PREFIX) for call in build.await_args_list)
@@ -0,0 +1,132 @@
+"""Tests for the in-process usage meter and the per-tenant usage series."""
+
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.api.v1.super_admin import tenants as tenants_api
+from app.db.models.tenant import Tenant
+from app.db.models.usage_stat import UsageStat
+from app.services import usage_meter as usage_meter_module
+from app.services.notifications import summary_cache
+from app.services.usage_meter import UsageMeter
+
+EVENTS = UsageStat.METRIC_ATTENDANCE_EVENTS
+
+
+@pytest.fixture
+async def session_factory():
+    """SQLite engine with an attached ``public`` database holding the usage tables."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def attach_public(dbapi_connection, connection_record):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Tenant.__table__.create)
+        await conn.run_sync(UsageStat.__table__.create)
+
+    yield async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    await engine.dispose()
+
+
+async def _values(session_factory) -> dict[tuple[int, str], int]:
+    async with session_factory() as session:
+        rows = (await session.execute(select(UsageStat))).scalars().all()
+    return {(row.tenant_id, row.metric_name): row.value for row in rows}
+
+
+class TestUsageMeter:
+    def test_counts_are_aggregated_per_tenant_and_metric(self):
+        meter = UsageMeter(30)
+
+        meter.record(1, EVENTS)
+        meter.record(1, EVENTS, 4)
+        meter.record(2, EVENTS)
+        meter.record(None, EVENTS)  # Single-tenant deployments are not metered
+        meter.record(1, EVENTS, 0)
+
+        today = datetime.now(timezone.utc).date()
+        assert meter._drain() == {(1, today, EVENTS): 5, (2, today, EVENTS): 1}
+
+    def test_disabled_meter_records_nothing(self):
+        meter = UsageMeter(30, enabled=False)
+
+        meter.record(1, EVENTS)
+
+        assert meter.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_flushes_add_to_existing_rows(self, session_factory):
+        meter = UsageMeter(30)
+
+        meter.record(1, EVENTS, 3)
+        meter.record(1, UsageStat.METRIC_API_CALLS)
+        assert await meter.flush(session_factory) == 2
+        meter.record(1, EVENTS, 2)
+        await meter.flush(session_factory)
+
+        assert await _values(session_factory) == {(1, EVENTS): 5, (1, UsageStat.METRIC_API_CALLS): 1}
+        assert meter.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_the_counts(self):
+        meter = UsageMeter(30)
+        meter.record(1, EVENTS, 3)
+
+        def broken_session():
+            raise RuntimeError("db down")
+
+        assert await meter.flush(broken_session) == 0
+        meter.record(1, EVENTS)
+
+        assert meter._drain() == {(1, datetime.now(timezone.utc).date(), EVENTS): 4}
+
+    def test_sent_notifications_are_metered_by_channel(self):
+        meter = UsageMeter(30)
+        with (
+            patch.object(usage_meter_module, "_usage_meter", meter),
+            patch.object(summary_cache, "get_summary_cache"),
+        ):
+            summary_cache.record_send_outcomes(7, "EMAIL", "INGRESO_OK", {1: "sent", 2: "failed", 3: "sent"})
+
+        counts = {metric: value for (_, _, metric), value in meter._drain().items()}
+        assert counts == {UsageStat.METRIC_NOTIFICATIONS_SENT: 2, UsageStat.METRIC_EMAIL_MESSAGES: 2}
+
+
+class TestTenantUsageEndpoint:
+    @pytest.mark.asyncio
+    async def test_series_has_one_entry_per_day(self, session_factory):
+        async with session_factory() as session:
+            tenant = Tenant(slug="alfa", name="Alfa")
+            session.add(tenant)
+            await session.commit()
+        meter = UsageMeter(30)
+        meter.record(tenant.id, EVENTS, 12)
+        await meter.flush(session_factory)
+        today = datetime.now(timezone.utc).date()
+
+        async with session_factory() as session:
+            usage = await tenants_api.get_tenant_usage(
+                tenant_id=tenant.id, start=today - timedelta(days=2), end=today, metric=[EVENTS],
+                admin=SimpleNamespace(id=1), session=session,
+            )
+            with pytest.raises(HTTPException) as exc_info:
+                await tenants_api.get_tenant_usage(
+                    tenant_id=tenant.id, start=None, end=date(2024, 1, 1), metric=["unknown"],
+                    admin=SimpleNamespace(id=1), session=session,
+                )
+
+        assert [(day.date, day.values) for day in usage.days] == [
+            (today - timedelta(days=2), {EVENTS: 0}),
+            (today - timedelta(days=1), {EVENTS: 0}),
+            (today, {EVENTS: 12}),
+        ]
+        assert exc_info.value.status_code == 400